@@ -1,6 +1,16 @@
-"""OntoPlan Agent Package."""
+"""OntoPlan Agent Package.
 
-from .graph import graph
-from .state import OverallState
+Submodules are not imported here, so importing agent.plan_store or
+agent.run_log does not build the LangGraph workflow. The compiled graph is
+agent.graph.graph (agent/main.py for langgraph.json).
+"""
 
-__all__ = ["graph", "OverallState"]
+import importlib
+
+__all__ = ["OverallState"]
+
+
+def __getattr__(name):
+    if name == "OverallState":
+        return importlib.import_module(".state", __name__).OverallState
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
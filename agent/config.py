@@ -17,6 +17,26 @@ class Configuration(BaseModel):
     # Temperature settings
     temperature: float = 0.0
 
+    # Re-derive each world delta by diffing the edited TTL text (slow, for debugging)
+    verify_world_deltas: bool = False
+
+    # Simulate the whole plan against the initial world in plan_reader and reject it if a step is invalid
+    # (skipped if the reasoned static facts, e.g. hasPathTo, cannot be read from Neo4j)
+    dry_run_plans: bool = True
+
+    # Queue SPARQL updates and compute the next action's delta while the server reasons
+    pipeline_world_updates: bool = False
+    pipeline_depth: int = 4
+
+    # Rollbacks a run may continue from with the replanner's plan (0: end the run at the first rollback)
+    max_recoveries: int = 1
+
+    # Messages kept in graph state during execution (older ones are dropped; 0 keeps all)
+    max_state_messages: int = 20
+
+    # Seconds between run log flushes (action/log/run_<id>.jsonl)
+    run_log_flush_interval: float = 2.0
+
     @classmethod
     def from_runnable_config(
         cls, config: Optional[RunnableConfig] = None
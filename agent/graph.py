@@ -1,6 +1,5 @@
 """Main LangGraph definition for world update system."""
 
-from dotenv import load_dotenv
 from langgraph.graph import StateGraph, START, END
 
 from .state import OverallState
@@ -9,9 +8,6 @@ from .nodes.next_action import next_action
 from .nodes.world_update import world_update
 
 
-load_dotenv()
-
-
 def should_continue(state: OverallState) -> str:
     """
     Determine if we should continue processing more actions.
@@ -20,49 +16,73 @@ def should_continue(state: OverallState) -> str:
         "continue" if there are remaining actions to process
         "end" if all actions are executed or execution failed
     """
-    remaining_actions = state.get("remaining_actions", [])
     execution_status = state.get("execution_status")
     
     # Stop if execution failed
     if execution_status == "failed":
         return "end"
     
-    # Continue if there are remaining actions
-    if remaining_actions:
+    # Continue if the cursor has not reached the end of the plan
+    if state.get("plan_cursor", 0) < state.get("plan_step_count", 0):
         return "continue"
     
     # Otherwise, end (all actions executed)
     return "end"
 
 
+def plan_accepted(state: OverallState) -> str:
+    """
+    Check whether plan_reader accepted the plan.
+    
+    Returns:
+        "execute" if the plan passed the dry run
+        "end" if it was rejected (no action reaches the ontology server)
+    """
+    if state.get("execution_status") == "failed":
+        return "end"
+    return "execute"
+
+
 def build_workflow() -> StateGraph:
     """Build the workflow graph for world update system.
     
     Workflow:
-    START → plan_reader → next_action → world_update → (continue/end)
+    START → plan_reader → (execute/end) → next_action → world_update → (continue/end)
     
     The workflow processes all actions in the plan:
-    - Each action creates a new version of TTL files (dynamic_N.ttl, static_N.ttl)
-    - Each action execution is logged to action/log/N.json
+    - Each action appends a triple delta to the world store (action/world/deltas.jsonl)
+    - Each action execution is appended to the run log action/log/run_<id>.jsonl
     - Continues until all actions are executed
     
     The plan_reader node:
     1. Reads solution.plan file from action/plan/ directory
     2. Parses PDDL actions from the plan
-    3. Creates initial TTL files (dynamic_0.ttl, static_0.ttl) in action/world/
-    4. Stores plan data in state for environment updates
+    3. Resets the world store in action/world/ to the environment TTL (version 0)
+    4. Registers the parsed plan in the plan store (state keeps plan_id + plan_cursor)
+    5. Dry-runs the whole plan against version 0 and ends the run at the
+       first step whose preconditions do not hold (dry_run_plans)
     
     The next_action node:
-    1. Extracts the next action from remaining_actions
+    1. Reads the action at plan_cursor from the plan store
     2. Stores as current_action
-    3. Updates remaining_actions
+    3. Advances plan_cursor
     
     The world_update node:
-    1. Parses current_action (e.g., move action)
-    2. Updates TTL files (incremental versioning)
+    1. Computes current_action's triple delta from its domain.pddl effects
+    2. Commits the action's triple delta as a new world version
     3. Updates ontology via SPARQL UPDATE
-    4. Saves execution log to action/log/N.json
+    4. Appends a record with per-stage timings to the run log
     5. Updates executed_action_count
+    
+    With pipeline_world_updates=True the SPARQL UPDATE of each version is
+    queued with its version as sequence number, so world_update for the
+    next action runs while the server reasons over the previous one. The
+    last action waits for all acknowledgements; a failed update rolls the
+    world back to the last acknowledged version. If the replanner (loaded
+    from the problem.pddl next to solution.plan) confirms the remaining
+    plan or computes a recovery plan, next_action continues with it
+    (execution_status "recovered", at most max_recoveries times);
+    otherwise the run ends.
     """
     workflow = StateGraph(OverallState)
 
@@ -73,7 +93,14 @@ def build_workflow() -> StateGraph:
 
     # Workflow edges
     workflow.add_edge(START, "plan_reader")
-    workflow.add_edge("plan_reader", "next_action")
+    workflow.add_conditional_edges(
+        "plan_reader",
+        plan_accepted,
+        {
+            "execute": "next_action",
+            "end": END  # Plan rejected by dry run
+        }
+    )
     workflow.add_edge("next_action", "world_update")
     
     # Conditional edge: continue processing or end
@@ -91,5 +118,3 @@ def build_workflow() -> StateGraph:
 
 # Build and compile the graph
 graph = build_workflow().compile()
-
-print("LangGraph world update agent initialized successfully")
\ No newline at end of file
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Import Budget - Measure startup imports with `python -X importtime` and enforce a budget.
+
+Each target module is imported in a fresh interpreter (best of --repeat runs).
+A target fails if its import takes longer than its budget, loads a package
+that must stay deferred until first use (owlready2, Neo4j, OpenAI, ...), or
+prints anything while being imported.
+
+Usage:
+    python agent/import_budget.py
+    python agent/import_budget.py --top 15 --repeat 5
+    python agent/import_budget.py --target agent.graph --budget-ms 800
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Module -> import budget (wall ms, best of --repeat) and packages it must not load
+BUDGETS: Dict[str, Dict[str, Any]] = {
+    "agent.graph": {
+        "budget_ms": 1500,
+        "deferred": ["owlready2", "neo4j", "rdflib", "requests", "fastapi", "openai", "langchain_openai", "dotenv"],
+    },
+    "agent.tools.pddl_plan": {
+        "budget_ms": 1200,
+        "deferred": ["owlready2", "neo4j", "rdflib", "fastapi", "openai", "langchain_openai"],
+    },
+    "ontology_server.core.client": {
+        "budget_ms": 400,
+        "deferred": ["owlready2", "neo4j", "fastapi", "openai", "numpy"],
+    },
+}
+
+_ELAPSED_PREFIX = "__import_ms__="
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `-X importtime` lines into {module, self_us, cumulative_us, depth}."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            entries.append({
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            })
+        except ValueError:
+            continue
+    return entries
+
+
+def measure(module: str) -> Dict[str, Any]:
+    """Import module in a fresh interpreter and return its timings, loaded modules and stdout."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        f"print('{_ELAPSED_PREFIX}%.3f' % ((time.perf_counter() - start) * 1000))\n"
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"module": module, "error": result.stderr.strip().splitlines()[-1] if result.stderr else "failed"}
+
+    output = result.stdout.splitlines()
+    elapsed = [line for line in output if line.startswith(_ELAPSED_PREFIX)]
+    entries = parse_importtime(result.stderr)
+    return {
+        "module": module,
+        "elapsed_ms": float(elapsed[-1][len(_ELAPSED_PREFIX):]) if elapsed else None,
+        "entries": entries,
+        "loaded": {entry["module"] for entry in entries},
+        "printed": [line for line in output if not line.startswith(_ELAPSED_PREFIX)],
+    }
+
+
+def package_self_ms(entries: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Self import time per top-level package in ms (e.g. langgraph -> 312.5)."""
+    totals: Dict[str, float] = {}
+    for entry in entries:
+        package = entry["module"].split(".")[0]
+        totals[package] = totals.get(package, 0.0) + entry["self_us"] / 1000
+    return totals
+
+
+def check(module: str, budget_ms: float, deferred: List[str], repeat: int = 3, top: int = 10) -> bool:
+    """Measure module, print the slowest packages and return True if it is within budget."""
+    runs = [measure(module) for _ in range(max(1, repeat))]
+    failed = [run for run in runs if "error" in run]
+    if failed:
+        print(f"  ❌ {module}: import failed: {failed[0]['error']}")
+        return False
+    best = min(runs, key=lambda run: run["elapsed_ms"])
+
+    ok = best["elapsed_ms"] <= budget_ms
+    mark = "✓" if ok else "❌"
+    print(f"  {mark} {module}: {best['elapsed_ms']:.1f} ms (budget {budget_ms:.0f} ms, "
+          f"{len(best['loaded'])} modules)")
+
+    loaded_deferred = sorted({name.split(".")[0] for name in best["loaded"]} & set(deferred))
+    if loaded_deferred:
+        ok = False
+        print(f"     ❌ Loads deferred packages at import: {', '.join(loaded_deferred)}")
+    if best["printed"]:
+        ok = False
+        print(f"     ❌ Prints at import: {best['printed'][0]!r}")
+
+    for package, ms in sorted(package_self_ms(best["entries"]).items(), key=lambda item: -item[1])[:top]:
+        print(f"     {package:<28}{ms:>9.1f} ms")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check agent startup imports against their budget")
+    parser.add_argument("--target", action="append", help="Module to check (default: all in BUDGETS)")
+    parser.add_argument("--budget-ms", type=float, help="Override the budget of every target")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh imports per target (best is used)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest packages to list per target")
+    args = parser.parse_args(argv)
+
+    print("Import Budget")
+    print("=" * 50)
+    failed = 0
+    for module in args.target or list(BUDGETS):
+        spec = BUDGETS.get(module, {"budget_ms": 1000, "deferred": []})
+        budget_ms = args.budget_ms if args.budget_ms is not None else spec["budget_ms"]
+        if not check(module, budget_ms, spec["deferred"], args.repeat, args.top):
+            failed += 1
+
+    if failed:
+        print(f"\n{failed} target(s) failed the import budget")
+        return 1
+    print("\n ✓ All imports within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
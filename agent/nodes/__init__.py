@@ -1,11 +1,5 @@
-"""Agent nodes package."""
+"""Agent nodes package.
 
-from .plan_reader import plan_reader
-from .next_action import next_action
-from .world_update import world_update
-
-__all__ = [
-    "plan_reader",
-    "next_action",
-    "world_update"
-]
+Import nodes from their modules (agent.nodes.plan_reader, agent.nodes.next_action,
+agent.nodes.world_update, ...) so only the nodes in use are loaded.
+"""
@@ -3,19 +3,10 @@
 import uuid
 from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-import sys
-from pathlib import Path
-
-# Add ontology_server to path for config access
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "ontology_server"))
 
 from ..state import OverallState
 from ..prompts import scenario_generator_prompt
-
-# Import TTL reader - needs path setup in ttl_reader module
 from ..tools.ttl_reader import get_complete_environment_info
 
 
@@ -72,7 +63,10 @@ def goal_generator(state: OverallState, config: RunnableConfig) -> dict:
             ("human", human_message)
         ])
         
-        # Initialize LLM
+        # Initialize LLM (langchain_openai is only loaded when a goal is generated)
+        from dotenv import load_dotenv
+        from langchain_openai import ChatOpenAI
+        load_dotenv()
         llm = ChatOpenAI(model="gpt-4o", temperature=0.7)
         
         # Generate goal formula
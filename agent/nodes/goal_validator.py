@@ -4,16 +4,15 @@ import re
 import uuid
 from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
-import sys
 from pathlib import Path
 
-# Add ontology_server to path for config access
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "ontology_server"))
+from pddl.scripts.pddl_goal_ast import GoalParseError, parse_goal, format_goal
 
 from ..state import OverallState
 from ..tools.ttl_reader import read_ttl_file, get_ttl_summary
 
+project_root = Path(__file__).parent.parent.parent
+
 
 def format_goal_formula(goal_formula: str) -> str:
     """
@@ -26,40 +25,12 @@ def format_goal_formula(goal_formula: str) -> str:
     Returns:
         Formatted goal formula string
     """
-    # Remove extra whitespace
     goal_formula = goal_formula.strip()
-    
-    # If it starts with (and, format it nicely
-    if goal_formula.startswith('(and'):
-        # Extract the content inside (and ...)
-        match = re.match(r'\(and\s+(.+)\)', goal_formula, re.DOTALL)
-        if match:
-            content = match.group(1).strip()
-            # Split by parentheses to find individual predicates
-            predicates = []
-            depth = 0
-            current = ""
-            
-            for char in content:
-                current += char
-                if char == '(':
-                    depth += 1
-                elif char == ')':
-                    depth -= 1
-                    if depth == 0:
-                        predicates.append(current.strip())
-                        current = ""
-            
-            # Format each predicate on a new line
-            formatted = "(and\n"
-            for pred in predicates:
-                if pred:  # Skip empty strings
-                    formatted += f"  {pred}\n"
-            formatted = formatted.rstrip() + "\n)"
-            return formatted
-    
-    # If not (and, return as is but with basic formatting
-    return goal_formula
+    try:
+        return format_goal(parse_goal(goal_formula, normalize=False))
+    except GoalParseError:
+        # Not valid PDDL, return as is
+        return goal_formula
 
 
 def goal_validator(state: OverallState, config: RunnableConfig) -> dict:
@@ -186,8 +157,8 @@ def goal_validator(state: OverallState, config: RunnableConfig) -> dict:
         
         # 3. Check object availability and affordances
         # Get TTL data
-        from core.config import get_config
-        from core.env import EnvManager
+        from ontology_server.core.config import get_config
+        from ontology_server.core.env import EnvManager
         
         config_obj = get_config()
         env_manager = EnvManager()
@@ -1,65 +1,69 @@
 """Next Action Node - Extracts the first action from the plan to execute."""
 
+from pathlib import Path
+
 from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
 
-from ..state import OverallState
+from ..config import Configuration
+from ..state import OverallState, drop_old_messages
+from ..plan_store import get_plan
+
+# plan_reader writes plan_<id>.json here; used when a resumed run has not loaded the plan yet
+PLAN_DIR = Path(__file__).parent.parent.parent / "action" / "plan"
 
 
 def next_action(state: OverallState, config: RunnableConfig) -> dict:
     """
-    Extract the first action from the plan to execute.
+    Extract the next action from the plan to execute.
     
     Workflow:
-    1. Get plan_actions from state
-    2. Extract first action
+    1. Look up the plan by plan_id in the plan store
+    2. Read the action at plan_cursor
     3. Store as current_action
-    4. Store remaining actions (excluding first one)
+    4. Advance plan_cursor
+    5. Drop messages beyond max_state_messages from the state
     
     Returns:
-        State updates with current_action and remaining_actions
+        State updates with current_action and plan_cursor
     """
     try:
-        plan_actions = state.get("plan_actions", [])
-        remaining_actions = state.get("remaining_actions")
-        
-        # If no remaining_actions in state, use plan_actions (first call)
-        if remaining_actions is None:
-            remaining_actions = plan_actions
-        
-        if not plan_actions and not remaining_actions:
+        plan_id = state.get("plan_id")
+        if not plan_id:
             error_msg = "ERROR: No actions found in plan. Please ensure plan_reader has loaded the plan."
             return {
                 "messages": [AIMessage(content=error_msg)]
             }
         
-        # Extract first action from remaining actions
-        if not remaining_actions:
+        plan = get_plan(plan_id, PLAN_DIR)
+        cursor = state.get("plan_cursor", 0)
+        
+        if cursor >= len(plan):
             error_msg = "ERROR: No actions remaining to execute."
             return {
                 "messages": [AIMessage(content=error_msg)],
-                "current_action": None,
-                "remaining_actions": []
+                "current_action": None
             }
         
-        current_action = remaining_actions[0]
-        new_remaining_actions = remaining_actions[1:]  # All actions except the first one
+        current_action = plan.action(cursor)
+        remaining_count = len(plan) - cursor
         
         # Create success message
         success_msg = f"Next action to execute:\n"
         success_msg += f"  {current_action}\n\n"
-        success_msg += f"Remaining actions: {len(remaining_actions)}\n"
-        if remaining_actions:
-            success_msg += f"Next actions:\n"
-            for i, action in enumerate(remaining_actions[:5], 1):  # Show first 5
-                success_msg += f"  {i}. {action}\n"
-            if len(remaining_actions) > 5:
-                success_msg += f"  ... and {len(remaining_actions) - 5} more\n"
+        success_msg += f"Remaining actions: {remaining_count}\n"
+        success_msg += f"Next actions:\n"
+        for i, action in enumerate(plan.action_strings(cursor, cursor + 5), 1):  # Show first 5
+            success_msg += f"  {i}. {action}\n"
+        if remaining_count > 5:
+            success_msg += f"  ... and {remaining_count - 5} more\n"
         
+        settings = Configuration.from_runnable_config(config)
         return {
-            "messages": [AIMessage(content=success_msg)],
+            "messages": drop_old_messages(state.get("messages", []), settings.max_state_messages)
+                        + [AIMessage(content=success_msg)],
             "current_action": current_action,
-            "remaining_actions": new_remaining_actions
+            "plan_cursor": cursor + 1
         }
         
     except Exception as e:
@@ -69,4 +73,3 @@ def next_action(state: OverallState, config: RunnableConfig) -> dict:
         return {
             "messages": [AIMessage(content=error_msg)]
         }
-
@@ -1,18 +1,21 @@
 """Plan Reader Node - Reads PDDL plan from solution.plan file."""
 
 import re
-import sys
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
 from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
 
-# Add ontology_server to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "ontology_server"))
-
 from ..state import OverallState
-from core.config import get_config
+from ..config import Configuration
+from ..run_log import start_run
+from ..plan_store import register_plan
+from .world_update import get_world_effect_engine, load_replanner
+from ontology_server.core.config import get_config
+from ontology_server.core.world_store import WorldStore, get_world_store
+
+project_root = Path(__file__).parent.parent.parent
 
 
 def parse_plan_file(plan_path: Path) -> Dict[str, Any]:
@@ -66,13 +69,17 @@ def parse_plan_file(plan_path: Path) -> Dict[str, Any]:
 
 def plan_reader(state: OverallState, config: RunnableConfig) -> dict:
     """
-    Read PDDL plan from solution.plan file and create initial TTL files.
+    Read PDDL plan from solution.plan file and reset the world store.
     
     Workflow:
     1. Read solution.plan file from action/plan/ directory
     2. Parse actions from the plan
-    3. Create initial TTL files (dynamic_0.ttl, static_0.ttl) in action/world/
-    4. Store plan data in state
+    3. Reset the world store in action/world/ to the environment TTL (version 0)
+    4. Register the parsed plan in the plan store; state keeps its ID and a cursor
+    5. Dry-run the whole plan against version 0 (preconditions + effects, no
+       server round-trip) and reject it at the first invalid step
+    6. Load the incremental replanner from action/plan/problem.pddl (the
+       problem the plan was computed for), or unload it if there is none
     
     Returns:
         State updates with plan data
@@ -83,59 +90,95 @@ def plan_reader(state: OverallState, config: RunnableConfig) -> dict:
         plan_path = project_root / "action" / "plan" / "solution.plan"
         world_dir = project_root / "action" / "world"
         
-        # Parse plan file
+        settings = Configuration.from_runnable_config(config)
+        
+        # Parse plan file (problem.pddl next to it, if present, is the problem it was computed for)
         plan_data = parse_plan_file(plan_path)
+        problem_path = plan_path.with_name("problem.pddl")
+        plan = register_plan(plan_data['actions'], cost=plan_data['cost'],
+                             raw_path=plan_path, plan_dir=plan_path.parent,
+                             problem_path=problem_path if problem_path.exists() else None)
+        run_log = start_run(f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{plan.plan_id}",
+                            log_dir=project_root / "action" / "log",
+                            flush_interval=settings.run_log_flush_interval)
         
-        # Step 1: Create initial TTL files (dynamic_0.ttl, static_0.ttl)
-        # Copy from ontology_server data directory
-        from core.config import get_config
+        # Step 1: Reset the world store to the environment's TTL files (version 0)
         config_obj = get_config()
         active_env = config_obj.get_active_env()
         
         ontology_server_dir = project_root / "ontology_server"
         env_dir = ontology_server_dir / "data" / "envs" / active_env
         
-        # Create world directory if it doesn't exist
-        world_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Copy original TTL files to world directory as version 0
-        import shutil
         original_dynamic = env_dir / "dynamic.ttl"
         original_static = env_dir / "static.ttl"
         
-        initial_dynamic = world_dir / "dynamic_0.ttl"
-        initial_static = world_dir / "static_0.ttl"
-        
+        store = get_world_store(world_dir)
         if original_dynamic.exists():
-            shutil.copy2(original_dynamic, initial_dynamic)
-            print(f"Created initial TTL: {initial_dynamic}")
+            store.initialize(original_dynamic, original_static)
+            print(f"Initialized world store: {store.base_dir}")
         else:
             print(f"WARNING: Original dynamic.ttl not found at {original_dynamic}")
-        
-        if original_static.exists():
-            shutil.copy2(original_static, initial_static)
-            print(f"Created initial TTL: {initial_static}")
-        else:
+        if not original_static.exists():
             print(f"WARNING: Original static.ttl not found at {original_static}")
         
+        # Step 2: Dry-run the plan locally before any action reaches the ontology server
+        # (against the asserted TTL plus the reasoned static facts the planner saw, e.g. hasPathTo)
+        dry_run = None
+        if settings.dry_run_plans and store.base_dynamic_path.exists():
+            engine = get_world_effect_engine(store, 0, reload=True)
+            if not engine.background:
+                print("  ⚠️  WARNING: Dry run skipped: no reasoned static facts (hasPathTo) available")
+            else:
+                dry_run = engine.dry_run(plan.action_strings())
+                if not dry_run["valid"]:
+                    step = dry_run["failed_index"] + 1
+                    error_msg = (f"ERROR: Plan rejected by dry run at step {step}/{len(plan)}: "
+                                 f"{dry_run['failed_action']}\n  {dry_run['reason']}")
+                    print(error_msg)
+                    run_log.write({
+                        "action_number": step,
+                        "action": {"raw": dry_run["failed_action"], "error": dry_run["reason"]},
+                        "timings_ms": {"dry_run": dry_run["elapsed_ms"]},
+                        "status": "plan_rejected",
+                        "error_type": "PreconditionError"
+                    })
+                    run_log.flush()
+                    return {
+                        "messages": [AIMessage(content=error_msg)],
+                        "plan_id": plan.plan_id,
+                        "plan_cursor": 0,
+                        "plan_cost": plan_data['cost'],
+                        "plan_step_count": len(plan),
+                        "execution_status": "failed"
+                    }
+                print(f"  ✓ Dry run: {len(plan)} actions valid ({dry_run['elapsed_ms']} ms), "
+                      f"projected delta: {len(dry_run['removed'])} removed, {len(dry_run['added'])} added")
+        
+        # Step 3: Track this plan's problem in the incremental replanner (used when a rollback needs a new plan)
+        if not load_replanner(plan):
+            print(f"  ⚠️  WARNING: No {problem_path.name} next to {plan_path.name}; replanning after a rollback is disabled")
+        
         # Create success message
         success_msg = f"Plan loaded successfully:\n"
         success_msg += f"- Total actions: {plan_data['step_count']}\n"
+        success_msg += f"- Plan ID: {plan.plan_id} (action/plan/plan_{plan.plan_id}.json)\n"
+        success_msg += f"- Plan file: {plan_path}\n"
+        success_msg += f"- Run log: {run_log.path}\n"
         if plan_data['cost']:
             success_msg += f"- Cost: {plan_data['cost']}\n"
-        success_msg += f"\nInitial TTL files created:\n"
-        success_msg += f"  - {initial_dynamic.name}\n"
-        success_msg += f"  - {initial_static.name}\n"
-        success_msg += f"\nActions:\n"
-        for i, action in enumerate(plan_data['actions'], 1):
-            success_msg += f"{i}. {action}\n"
+        if dry_run is not None:
+            success_msg += f"- Dry run: all preconditions hold ({dry_run['elapsed_ms']} ms)\n"
+        success_msg += f"\nWorld store initialized (version 0):\n"
+        success_msg += f"  - {store.base_dir}\n"
         
         return {
             "messages": [AIMessage(content=success_msg)],
-            "plan_actions": plan_data['actions'],
+            "plan_id": plan.plan_id,
+            "plan_cursor": 0,
             "plan_cost": plan_data['cost'],
-            "plan_step_count": plan_data['step_count'],
-            "plan_raw_content": plan_data['raw_content']
+            "plan_step_count": len(plan),
+            "plan_base_version": 0,
+            "recovery_count": 0
         }
         
     except FileNotFoundError as e:
@@ -151,3 +194,30 @@ def plan_reader(state: OverallState, config: RunnableConfig) -> dict:
             "messages": [AIMessage(content=error_msg)]
         }
 
+
+
+if __name__ == "__main__":
+    # Dry-run the example plans against Darden_2 (python -m agent.nodes.plan_reader)
+    import tempfile
+    from .world_update import load_world_triples
+    
+    env_dir = project_root / "ontology_server" / "data" / "envs" / "Darden_2"
+    store = WorldStore(Path(tempfile.mkdtemp()))
+    store.initialize(env_dir / "dynamic.ttl", env_dir / "static.ttl")
+    engine = get_world_effect_engine(store, 0, reload=True)
+    if not engine.background:
+        # No Neo4j: stand in for the reasoner (isDoorOf/isOpeningOf/isStairsOf ⊑ hasPathTo, symmetric)
+        print("  ⚠️  WARNING: Using hasPathTo derived from the TTL portals instead of the reasoned world")
+        engine.set_background(
+            fact
+            for subject, prop, obj in load_world_triples([env_dir / "static.ttl"])
+            if prop in ("isDoorOf", "isOpeningOf", "isStairsOf")
+            for fact in (("hasPathTo", subject, obj), ("hasPathTo", obj, subject))
+        )
+    
+    for plan_path in (project_root / "action" / "plan" / "solution.plan",
+                      project_root / "action" / "plan" / "key_safe.plan"):
+        actions = parse_plan_file(plan_path)["actions"]
+        result = engine.dry_run(actions)
+        print(f"{plan_path.name}: {len(actions)} actions, valid={result['valid']} ({result['elapsed_ms']} ms)"
+              + (f", step {result['failed_index'] + 1}: {result['reason']}" if not result["valid"] else ""))
@@ -5,7 +5,6 @@ from typing import Literal
 from pydantic import BaseModel, Field
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
-from langchain_openai import ChatOpenAI
 
 from ..state import OverallState, SystemStatus
 from ..config import Configuration
@@ -43,7 +42,10 @@ def task_planner(state: OverallState, config: RunnableConfig) -> dict:
     """
     cfg = Configuration.from_runnable_config(config)
 
-    # Initialize LLM with structured output
+    # Initialize LLM with structured output (langchain_openai is only loaded when planning)
+    from dotenv import load_dotenv
+    from langchain_openai import ChatOpenAI
+    load_dotenv()
     llm = ChatOpenAI(
         model=cfg.task_planner_model,
         temperature=cfg.temperature
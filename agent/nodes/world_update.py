@@ -1,24 +1,29 @@
 """World Update Node - Updates environment state based on executed action."""
 
 import re
-import sys
-import json
-import time
-import requests
 from pathlib import Path
-from typing import Tuple, Set, Dict, List, Optional
-from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Tuple, Set, Dict, List, Optional
 from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
 
-# Add ontology_server to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "ontology_server"))
-
 from ..state import OverallState
-from core.config import get_config
-from core.ontology import OntologyManager
-import owlready2 as owl
+from ..config import Configuration
+from ..plan_store import Plan, get_plan, register_plan
+from ..run_log import StageTimer, get_run_log
+from .next_action import PLAN_DIR
+from ontology_server.core.config import get_settings
+from ontology_server.core.world_store import WorldStore, get_world_store
+from ontology_server.core.world_model import WorldModel, literal_value, local_name, uri
+from ontology_server.core.relationship_mapping import CompiledMapping, get_compiled_mapping
+from pddl.scripts.pddl_replan import get_replanner
+from pddl.scripts.pddl_effects import EffectEngine, PreconditionError, get_effect_engine
+
+if TYPE_CHECKING:
+    # HTTP client (requests) and OntologyManager (owlready2, Neo4j) are imported at first use
+    from ontology_server.core.client import OntologyClient, UpdatePipeline
+    from ontology_server.core.ontology import OntologyManager
+
+project_root = Path(__file__).parent.parent.parent
 
 
 def parse_move_action(action: str) -> dict:
@@ -43,29 +48,151 @@ def parse_move_action(action: str) -> dict:
     }
 
 
-def get_next_ttl_version(ttl_dir: Path, base_name: str) -> int:
+ONTOLOGY_NAMESPACE = "http://www.semanticweb.org/namh_woo/ontologies/2025/9/untitled-ontology-10#"
+
+
+def _ontology_uri(local_name: str):
+    """Full ontology URIRef for a local name (e.g. "robot1")."""
+    from rdflib import URIRef
+    return URIRef(f"{ONTOLOGY_NAMESPACE}{local_name}")
+
+
+def to_rdf_triple(triple: Tuple) -> Tuple:
     """
-    Get the next version number for TTL file.
+    Convert an effect engine triple (local names, bool for data properties) to rdflib terms.
+    
+    Example: ("fridge_2", "isOpen", True) -> (:fridge_2, :isOpen, "true"^^xsd:boolean)
+    """
+    from rdflib import Literal
+    from rdflib.namespace import XSD
+    
+    subject, prop, obj = triple
+    obj_term = Literal(obj, datatype=XSD.boolean) if isinstance(obj, bool) else _ontology_uri(obj)
+    return (_ontology_uri(subject), _ontology_uri(prop), obj_term)
+
+
+def load_world_triples(ttl_paths: List[Path]) -> List[Tuple]:
+    """
+    Read ontology-namespace triples from TTL files as local names.
+    
+    Boolean literals become Python bools; other literals are skipped.
+    """
+    model = WorldModel.load(*[path for path in ttl_paths if path.exists()])
+    
+    triples = []
+    prefix = f"<{ONTOLOGY_NAMESPACE}"
+    for s, p, o in model.triples():
+        if not (s.startswith(prefix) and p.startswith(prefix)):
+            continue
+        if o.startswith('"'):
+            value = literal_value(o)
+            if not isinstance(value, bool):
+                continue
+        elif o.startswith(prefix):
+            value = local_name(o)
+        else:
+            continue
+        triples.append((local_name(s), local_name(p), value))
+    return triples
+
+
+_reasoned_static: Dict[Tuple[str, float], List[Tuple[str, ...]]] = {}
+
+
+def load_reasoned_static_facts(engine: EffectEngine, static_path: Path, reload: bool = False) -> List[Tuple[str, ...]]:
+    """
+    Static facts of the reasoned world (Neo4j), e.g. hasPathTo.
+    
+    The TTL files only hold asserted triples, while the planner reads the
+    reasoner's output: hasPathTo follows from isDoorOf/isStairsOf and the
+    robot.owx axioms and is never asserted. Relationships of the engine's
+    static_predicates() are read once per static TTL (again on reload).
     
-    Args:
-        ttl_dir: Directory containing TTL files
-        base_name: Base name (e.g., "dynamic" or "static")
-        
     Returns:
-        Next version number (e.g., 1, 2, 3, ...)
+        PDDL facts, or an empty list if Neo4j could not be read
     """
-    version = 1
-    while (ttl_dir / f"{base_name}_{version}.ttl").exists():
-        version += 1
-    return version
+    key = (str(static_path), static_path.stat().st_mtime if static_path.exists() else 0.0)
+    if reload or key not in _reasoned_static:
+        properties = sorted({
+            engine.predicate_table[predicate]["property"] for predicate in engine.static_predicates()
+            if engine.predicate_table[predicate]["kind"] == "object"
+        })
+        try:
+            from ontology_server.core.neo4j_pool import execute_read
+            records = execute_read(
+                """
+                MATCH (a:Individual)-[r]->(b:Individual)
+                WHERE type(r) IN $properties
+                RETURN a.id AS subject, type(r) AS property, b.id AS object
+                """,
+                {"properties": properties}
+            )
+            facts = sorted(engine.facts_from_triples(
+                (record["subject"], record["property"], record["object"]) for record in records
+            ))
+            print(f"  ✓ Loaded {len(facts)} reasoned static facts ({', '.join(properties)})")
+        except Exception as e:
+            print(f"  ⚠️  WARNING: Could not read reasoned static facts from Neo4j: {type(e).__name__}: {e}")
+            facts = []
+        _reasoned_static.clear()
+        _reasoned_static[key] = facts
+    return _reasoned_static[key]
+
+
+def get_world_effect_engine(store: WorldStore, version: int, reload: bool = False) -> EffectEngine:
+    """
+    Get the effect engine positioned at world version.
+    
+    The engine keeps its state across actions in the same process; the TTL
+    is only parsed when the engine is at a different version (first action
+    or after a restart), or when reload is set (store re-initialized).
+    The reasoned static facts are set as the engine's background; it is
+    empty if Neo4j could not be read, and preconditions cannot be checked.
+    """
+    engine = get_effect_engine(project_root / "pddl" / "domain.pddl", project_root / "action" / "relationship_mapping.json")
+    if reload or engine.version != version:
+        print(f"  Loading world version {version} into effect engine...")
+        engine.set_background(load_reasoned_static_facts(engine, store.static_path, reload=reload))
+        engine.load_triples(load_world_triples([store.materialize(version), store.static_path]), version)
+    return engine
+
+
+def verify_delta_with_ttl(original_ttl_path: Path, updated_ttl_path: Path, robot_id: str, from_location: str, to_location: str, added_triples: Set[Tuple], removed_triples: Set[Tuple]) -> Dict:
+    """
+    Verification mode: re-derive the delta by editing and diffing the TTL text.
+    
+    Returns:
+        Dictionary with 'match' and any triples missing/extra in the emitted delta
+    """
+    if not save_incremental_update_to_ttl(original_ttl_path, updated_ttl_path, robot_id, from_location, to_location):
+        return {"match": False, "error": "Failed to update TTL file"}
+    
+    text_added, text_removed = extract_changes_with_rdflib(original_ttl_path, updated_ttl_path)
+    
+    def n3(triples):
+        return {tuple(t.n3() for t in triple) for triple in triples}
+    
+    result = {
+        "match": n3(text_added) == n3(added_triples) and n3(text_removed) == n3(removed_triples),
+        "missing_added": sorted(n3(text_added) - n3(added_triples)),
+        "extra_added": sorted(n3(added_triples) - n3(text_added)),
+        "missing_removed": sorted(n3(text_removed) - n3(removed_triples)),
+        "extra_removed": sorted(n3(removed_triples) - n3(text_removed))
+    }
+    if result["match"]:
+        print(f"  ✓ Emitted delta matches TTL text diff")
+    else:
+        print(f"  ⚠️  Emitted delta differs from TTL text diff: {result}")
+    return result
 
 
 def save_incremental_update_to_ttl(original_ttl_path: Path, new_ttl_path: Path, robot_id: str, from_location: str, to_location: str) -> bool:
     """
-    Save incremental update to TTL file - only modified parts are updated.
+    Save the robot's new location to a TTL file through the indexed world model.
     
-    This reads the original TTL file and updates only the changed relationship,
-    keeping everything else unchanged. Much more efficient than exporting the entire ontology.
+    The original TTL is parsed once into a WorldModel, robotIsInSpace is
+    updated with O(1) index operations and the result is streamed out as
+    canonical Turtle.
     
     Args:
         original_ttl_path: Path to original TTL file (e.g., dynamic.ttl)
@@ -82,53 +209,19 @@ def save_incremental_update_to_ttl(original_ttl_path: Path, new_ttl_path: Path,
             print(f"ERROR: Original TTL file not found: {original_ttl_path}")
             return False
         
-        # Read original TTL file
-        with open(original_ttl_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        model = WorldModel.load(original_ttl_path)
+        robot, predicate = uri(robot_id), uri("robotIsInSpace")
         
-        # Find and update robotIsInSpace line
-        updated = False
-        robot_block_start = -1
-        
-        for i, line in enumerate(lines):
-            # Find robot block start (e.g., ":robot1 rdf:type :Robot ;")
-            if f":{robot_id}" in line and ("rdf:type" in line or "rdf:type" in lines[max(0, i-1)]):
-                robot_block_start = i
-            
-            # Find robotIsInSpace line within robot block
-            if robot_block_start >= 0 and f":robotIsInSpace" in line:
-                # Check if this line contains the old location
-                if f":{from_location}" in line:
-                    # Replace old location with new location
-                    new_line = line.replace(f":{from_location}", f":{to_location}")
-                    lines[i] = new_line
-                    updated = True
-                    print(f"  Updated line {i+1}: {line.strip()} -> {new_line.strip()}")
-                    break
-                # If we've moved past the robot block, reset
-                elif ";" in line and i > robot_block_start + 10:  # Robot block should be within 10 lines
-                    robot_block_start = -1
-        
-        if not updated:
-            print(f"WARNING: Could not find robotIsInSpace relationship for {robot_id} in TTL file")
-            print(f"  Attempting alternative search...")
-            # Alternative: search for any line with robotIsInSpace and from_location
-            for i, line in enumerate(lines):
-                if f":robotIsInSpace" in line and f":{from_location}" in line:
-                    new_line = line.replace(f":{from_location}", f":{to_location}")
-                    lines[i] = new_line
-                    updated = True
-                    print(f"  Updated line {i+1}: {line.strip()} -> {new_line.strip()}")
-                    break
-        
-        if not updated:
-            print(f"ERROR: Failed to find and update robotIsInSpace relationship")
+        if (robot, predicate, uri(from_location)) not in model:
+            current = [local_name(o) for o in model.objects(robot, predicate)]
+            print(f"ERROR: {robot_id} robotIsInSpace {from_location} not found in TTL (found: {current})")
             return False
         
-        # Save updated TTL file
+        model.set(robot, predicate, uri(to_location))
+        print(f"  Updated: {robot_id} robotIsInSpace {from_location} -> {to_location}")
+        
         new_ttl_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(new_ttl_path, 'w', encoding='utf-8') as f:
-            f.writelines(lines)
+        model.write(new_ttl_path)
         
         print(f"✓ Saved incremental update to TTL file: {new_ttl_path}")
         return True
@@ -178,94 +271,60 @@ def extract_changes_with_rdflib(original_ttl_path: Path, updated_ttl_path: Path)
         return set(), set()
 
 
-def load_relationship_mapping(project_root: Path) -> Optional[Dict]:
+def get_relationship_mapping(project_root: Path) -> Optional[CompiledMapping]:
     """
-    Load relationship mapping from relationship_mapping.json.
+    Get the compiled relationship mapping (action/relationship_mapping.json).
     
-    Args:
-        project_root: Project root directory (relationship_mapping.json is in action/ directory)
-        
-    Returns:
-        Dictionary with relationship mappings, or None if file not found
+    The JSON is parsed and compiled into predicate -> expansion tables once
+    and reused until the file changes.
     """
-    mapping_path = project_root / "action" / "relationship_mapping.json"
-    if not mapping_path.exists():
-        print(f"  WARNING: relationship_mapping.json not found at {mapping_path}")
-        return None
-    
     try:
-        with open(mapping_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return get_compiled_mapping(project_root / "action" / "relationship_mapping.json")
     except Exception as e:
         print(f"  ERROR loading relationship_mapping.json: {e}")
         return None
 
 
-def get_inferred_relationships_for_delete(asserted_predicate: str, subject: str, object_: str, mapping: Dict, namespace: str = "http://www.semanticweb.org/namh_woo/ontologies/2025/9/untitled-ontology-10#") -> List[Tuple[str, str, str]]:
+_static_objects: Dict[Tuple[str, float], Dict[Tuple[str, str], List[str]]] = {}
+
+
+def get_chain_lookup(engine: EffectEngine, static_path: Path) -> Callable[[str, str], List[str]]:
     """
-    Get inferred relationships that should be deleted when an asserted relationship is deleted.
+    Object lookup for property chain expansion over the world before the action.
+    
+    Static relationships (e.g. spaceIsInStorey) are indexed once per static
+    TTL; dynamic ones come from the effect engine's current (uncommitted) facts
+    and are only indexed if a chain actually needs them.
     
-    Args:
-        asserted_predicate: The asserted predicate (e.g., "robotIsInSpace")
-        subject: Subject URI or local name
-        object_: Object URI or local name
-        mapping: Relationship mapping dictionary
-        namespace: Ontology namespace
-        
     Returns:
-        List of (subject, predicate, object) tuples for inferred relationships to delete
+        lookup(property, subject) -> list of object local names
     """
-    inferred_triples = []
-    
-    # Get mapping for this asserted predicate
-    predicate_mapping = mapping.get("mappings", {}).get(asserted_predicate)
-    if not predicate_mapping:
-        return inferred_triples
-    
-    # Extract local name from predicate if it's a full URI
-    if "#" in asserted_predicate:
-        asserted_predicate_local = asserted_predicate.split("#")[-1]
-    else:
-        asserted_predicate_local = asserted_predicate
+    key = (str(static_path), static_path.stat().st_mtime if static_path.exists() else 0.0)
+    static = _static_objects.get(key)
+    if static is None:
+        static = {}
+        for s, p, o in load_world_triples([static_path]):
+            if not isinstance(o, bool):
+                static.setdefault((p, s), []).append(o)
+        _static_objects.clear()
+        _static_objects[key] = static
     
-    # Get inferred relationships
-    inferred_rels = predicate_mapping.get("inferred_relationships", [])
+    dynamic = None
     
-    for inferred_rel in inferred_rels:
-        inferred_predicate = inferred_rel["relationship"]
-        inference_type = inferred_rel["type"]
-        
-        # Format predicate as full URI
-        if not inferred_predicate.startswith("http"):
-            inferred_predicate_uri = f"{namespace}#{inferred_predicate}"
-        else:
-            inferred_predicate_uri = inferred_predicate
-        
-        # Format subject and object
-        if not subject.startswith("http"):
-            subject_uri = f"{namespace}#{subject}" if not subject.startswith(":") else f"{namespace}{subject}"
-        else:
-            subject_uri = subject
-        
-        if not object_.startswith("http"):
-            object_uri = f"{namespace}#{object_}" if not object_.startswith(":") else f"{namespace}{object_}"
-        else:
-            object_uri = object_
-        
-        # Handle different inference types
-        if inference_type == "inverse_inference":
-            # For inverse relationships, swap subject and object
-            # Example: objectIsInSpace(robot, space) → spaceHasObject(space, robot)
-            inferred_triples.append((object_uri, inferred_predicate_uri, subject_uri))
-        else:
-            # For subproperty and property chain, keep same subject and object
-            # Example: robotIsInSpace(robot, space) → objectIsInSpace(robot, space)
-            inferred_triples.append((subject_uri, inferred_predicate_uri, object_uri))
+    def lookup(prop: str, subject: str) -> List[str]:
+        nonlocal dynamic
+        if dynamic is None:
+            dynamic = {}
+            for fact in engine.state:
+                entry = engine.predicate_table.get(fact[0])
+                if entry and entry["kind"] == "object":
+                    dynamic.setdefault((entry["property"], fact[1]), []).append(fact[2])
+        return static.get((prop, subject), []) + dynamic.get((prop, subject), [])
     
-    return inferred_triples
+    return lookup
 
 
-def generate_sparql_update(added_triples: Set[Tuple], removed_triples: Set[Tuple], project_root: Optional[Path] = None, namespace: str = "http://www.semanticweb.org/namh_woo/ontologies/2025/9/untitled-ontology-10#") -> str:
+def generate_sparql_update(added_triples: Set[Tuple], removed_triples: Set[Tuple], project_root: Optional[Path] = None, namespace: str = ONTOLOGY_NAMESPACE, lookup: Optional[Callable[[str, str], List[str]]] = None) -> str:
     """
     Generate SPARQL UPDATE query from added and removed triples.
     When an asserted relationship is deleted, also delete its inferred relationships.
@@ -275,6 +334,8 @@ def generate_sparql_update(added_triples: Set[Tuple], removed_triples: Set[Tuple
         removed_triples: Set of triples to remove
         project_root: Project root directory (relationship_mapping.json is in action/ directory) (optional)
         namespace: Namespace for the ontology
+        lookup: Object lookup over the world before the change (see get_chain_lookup);
+            property chain inferences are only deleted when it is given
         
     Returns:
         SPARQL UPDATE query string
@@ -298,70 +359,23 @@ def generate_sparql_update(added_triples: Set[Tuple], removed_triples: Set[Tuple
             else:
                 return str(term)
         
-        # Load relationship mapping if project_root is provided
-        mapping = None
-        if project_root:
-            mapping = load_relationship_mapping(project_root)
+        # Compiled relationship mapping (cached) if project_root is provided
+        mapping = get_relationship_mapping(project_root) if project_root else None
         
         # Build DELETE clause - include both asserted and inferred relationships
-        delete_clauses = []
-        delete_triples_set = set()  # Track what we've added to avoid duplicates
+        delete_clauses = [f"    {format_term(s)} {format_term(p)} {format_term(o)} ." for s, p, o in removed_triples]
         
-        # First, add all removed triples (asserted relationships)
-        for s, p, o in removed_triples:
-            triple_key = (str(s), str(p), str(o))
-            if triple_key not in delete_triples_set:
-                delete_clauses.append(f"    {format_term(s)} {format_term(p)} {format_term(o)} .")
-                delete_triples_set.add(triple_key)
-        
-        # For each removed asserted relationship, add its inferred relationships
+        # Expand all removed asserted relationships at once into their inferred relationships
         if mapping:
-            # Asserted predicates that we track
-            asserted_predicates = ["robotIsInSpace", "artifactIsInSpace", "isInsideOf", "isOntopOf", "carries", "spaceIsInStorey"]
-            
-            for s, p, o in removed_triples:
-                # Extract predicate local name
-                predicate_str = str(p)
-                if "#" in predicate_str:
-                    predicate_local = predicate_str.split("#")[-1]
-                elif predicate_str.endswith("robotIsInSpace") or predicate_str.endswith("artifactIsInSpace"):
-                    predicate_local = predicate_str.split("/")[-1] if "/" in predicate_str else predicate_str
-                else:
-                    predicate_local = None
-                
-                # Check if this is an asserted predicate
-                if predicate_local in asserted_predicates:
-                    # Extract subject and object local names
-                    subject_str = str(s)
-                    object_str = str(o)
-                    
-                    # Extract local names
-                    if "#" in subject_str:
-                        subject_local = subject_str.split("#")[-1]
-                    elif subject_str.startswith(":"):
-                        subject_local = subject_str[1:]
-                    else:
-                        subject_local = subject_str.split("/")[-1] if "/" in subject_str else subject_str
-                    
-                    if "#" in object_str:
-                        object_local = object_str.split("#")[-1]
-                    elif object_str.startswith(":"):
-                        object_local = object_str[1:]
-                    else:
-                        object_local = object_str.split("/")[-1] if "/" in object_str else object_str
-                    
-                    # Get inferred relationships
-                    inferred_triples = get_inferred_relationships_for_delete(
-                        predicate_local, subject_local, object_local, mapping, namespace
-                    )
-                    
-                    # Add inferred relationships to DELETE clause
-                    for inf_s, inf_p, inf_o in inferred_triples:
-                        triple_key = (inf_s, inf_p, inf_o)
-                        if triple_key not in delete_triples_set:
-                            delete_clauses.append(f"    <{inf_s}> <{inf_p}> <{inf_o}> .")
-                            delete_triples_set.add(triple_key)
-                            print(f"    Added inferred DELETE: {inf_p.split('#')[-1]} {subject_local} -> {object_local}")
+            removed_local = {
+                tuple(str(term)[len(namespace):] for term in triple)
+                for triple in removed_triples
+                if all(isinstance(term, URIRef) and str(term).startswith(namespace) for term in triple)
+            }
+            inferred_triples = mapping.expand(removed_local, lookup) - removed_local
+            for inf_s, inf_p, inf_o in sorted(inferred_triples):
+                delete_clauses.append(f"    <{namespace}{inf_s}> <{namespace}{inf_p}> <{namespace}{inf_o}> .")
+                print(f"    Added inferred DELETE: {inf_p} {inf_s} -> {inf_o}")
         
         # Build INSERT clause
         insert_clauses = []
@@ -399,48 +413,28 @@ def generate_sparql_update(added_triples: Set[Tuple], removed_triples: Set[Tuple
         return ""
 
 
-def send_sparql_update(sparql_query: str, endpoint_url: str) -> bool:
+def send_sparql_update(sparql_query: str, client: "OntologyClient") -> Dict:
     """
-    Send SPARQL UPDATE query to SPARQL endpoint.
+    Send SPARQL UPDATE query to the ontology server's /sparql/update endpoint.
     
     Args:
         sparql_query: SPARQL UPDATE query string
-        endpoint_url: SPARQL endpoint URL (should be /sparql/update)
+        client: Shared OntologyClient (keep-alive session, gzip, retries)
         
     Returns:
-        True if successful, False otherwise
+        Server result dict ('status', 'message', server-side 'timings')
     """
-    try:
-        # Send to /sparql/update endpoint
-        response = requests.post(
-            endpoint_url,
-            json={"update": sparql_query},
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("status") == "success":
-                print(f"✓ SPARQL UPDATE sent successfully to {endpoint_url}")
-                print(f"  Server response: {result.get('message', '')}")
-                return True
-            else:
-                print(f"ERROR: SPARQL UPDATE failed: {result.get('message', 'Unknown error')}")
-                return False
-        else:
-            print(f"ERROR: SPARQL UPDATE failed with status {response.status_code}")
-            print(f"  Response: {response.text}")
-            return False
-                
-    except Exception as e:
-        print(f"ERROR sending SPARQL UPDATE: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    result = client.sparql_update(sparql_query)
+    latency = client.stats().get("POST /sparql/update", {}).get("last_ms")
+    if result.get("status") == "success":
+        print(f"✓ SPARQL UPDATE sent successfully to {client.base_url}/sparql/update ({latency} ms)")
+        print(f"  Server response: {result.get('message', '')}")
+    else:
+        print(f"ERROR: SPARQL UPDATE failed: {result.get('message', 'Unknown error')}")
+    return result
 
 
-def update_robot_location_ontology(ontology_manager: OntologyManager, robot_id: str, from_location: str, to_location: str, save_ttl_path: Path = None) -> bool:
+def update_robot_location_ontology(ontology_manager: "OntologyManager", robot_id: str, from_location: str, to_location: str, save_ttl_path: Path = None) -> bool:
     """
     Update robot location by modifying the original data (A) in ontology, then reasoning.
     
@@ -563,6 +557,7 @@ def update_robot_location_ontology(ontology_manager: OntologyManager, robot_id:
         # IMPORTANT: Before reasoning, we need to clear old inferred relationships
         # Reasoning will regenerate relationships, but old ones might persist if not cleared first
         print(f"  Step 2.1: Running preliminary reasoning to clear old inferred relationships...")
+        import owlready2 as owl
         with ontology_manager.ontology:
             owl.sync_reasoner_hermit(ontology_manager.world, infer_property_values=True)
         
@@ -664,20 +659,125 @@ def update_robot_location_ontology(ontology_manager: OntologyManager, robot_id:
         return False
 
 
+def load_replanner(plan: Plan, executed: int = 0) -> bool:
+    """
+    Point the incremental replanner at plan's problem and replay its first executed actions.
+    
+    The replanner is unloaded if the plan has no problem.pddl (or it cannot
+    be read), so it never tracks the problem of another plan.
+    
+    Returns:
+        True if the replanner is tracking plan
+    """
+    replanner = get_replanner()
+    if not plan.problem_path or not Path(plan.problem_path).exists():
+        replanner.unload()
+        return False
+    try:
+        replanner.load(project_root / "pddl" / "domain.pddl", Path(plan.problem_path), plan.action_strings())
+        for action in plan.action_strings(0, executed):
+            replanner.observe_executed(action)
+    except Exception as e:
+        print(f"  ⚠️  Incremental replanner not loaded: {type(e).__name__}: {e}")
+        replanner.unload()
+        return False
+    return True
+
+
+def rollback_to_acked_version(state: OverallState, store: WorldStore, pipeline: "UpdatePipeline",
+                              settings: Configuration) -> dict:
+    """
+    Roll the local world back to the last version the server acknowledged.
+    
+    Drops unacknowledged versions from the world store, reloads the
+    replanner with the current plan's problem up to the acknowledged
+    version and asks it for a plan from there. If the remaining plan still
+    holds, the cursor is set right after the acknowledged action; if the
+    replanner computed a new plan, it is registered and becomes the run's
+    plan (plan_base_version = acknowledged version). Either way the run
+    continues (execution_status "recovered") up to max_recoveries times.
+    """
+    failure = pipeline.failure or {}
+    acked = pipeline.rollback()
+    store.truncate(acked)
+    
+    plan = get_plan(state["plan_id"], PLAN_DIR)
+    cursor = acked - state.get("plan_base_version", 0)  # plan index right after the acknowledged version
+    error_msg = f"ERROR: SPARQL UPDATE for world version {failure.get('version')} failed: {failure.get('message', 'Unknown error')}\n"
+    error_msg += f"  Rolled back to acknowledged version {acked}; {len(plan) - cursor} action(s) not applied"
+    
+    updates = {
+        "execution_status": "failed",
+        "executed_action_count": acked,
+        "plan_cursor": cursor,
+        "last_executed_action": next(store.iter_deltas(acked, acked))["action"] if acked else None
+    }
+    recovered = False
+    if load_replanner(plan, cursor):
+        try:
+            recovery = get_replanner().replan()
+        except Exception as e:
+            recovery = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+        
+        if recovery["status"] in ("reused", "goal_reached"):
+            error_msg += f"\n  Remaining plan is still valid from version {acked}; resume at step {cursor + 1}"
+            recovered = True
+        elif recovery["status"] == "replanned":
+            recovery_plan = register_plan(recovery["actions"], cost=recovery.get("plan_cost"),
+                                          raw_path=Path(recovery["solution_path"]), plan_dir=PLAN_DIR,
+                                          problem_path=Path(recovery["problem_path"]))
+            updates.update(plan_id=recovery_plan.plan_id, plan_cursor=0, plan_step_count=len(recovery_plan),
+                           plan_cost=recovery_plan.cost, plan_base_version=acked)
+            error_msg += f"\n  Recovery plan {recovery_plan.plan_id} ({len(recovery_plan)} actions) computed from version {acked}"
+            recovered = True
+        else:
+            error_msg += f"\n  Replanning from version {acked} failed: {recovery.get('error', recovery['status'])}"
+    else:
+        error_msg += f"\n  No problem.pddl for plan {plan.plan_id}; cannot check the remaining plan"
+    
+    recovery_count = state.get("recovery_count", 0)
+    if recovered and recovery_count < settings.max_recoveries:
+        updates.update(execution_status="recovered", recovery_count=recovery_count + 1)
+        error_msg += f"\n  Continuing (recovery {recovery_count + 1}/{settings.max_recoveries})"
+    
+    print(error_msg)
+    return dict(updates, messages=[AIMessage(content=error_msg)])
+
+
+def _failure_record(state: OverallState, error: str, error_type: str, timer: Optional[StageTimer]) -> dict:
+    """Run log record for a failed action."""
+    return {
+        "action_number": state.get("executed_action_count", 0) + 1,
+        "action": {"raw": state.get("current_action", "unknown"), "error": error},
+        "timings_ms": dict(timer.stages, total=timer.total_ms) if timer else {},
+        "status": "failed",
+        "error_type": error_type
+    }
+
+
 def world_update(state: OverallState, config: RunnableConfig) -> dict:
     """
     Update world state based on current action.
     
-    For move actions:
-    1. Parse action to extract robot, from, to locations
-    2. Update Neo4j: delete old robotIsInSpace, create new robotIsInSpace
+    For any domain.pddl action:
+    1. Compute the exact triple delta from the action's effects (EffectEngine)
+    2. Optionally verify move deltas against the TTL text diff (verify_world_deltas)
+    3. Send it as SPARQL UPDATE and append it to the world store
+    4. Append a record with per-stage timings to the run log (action/log/run_<id>.jsonl)
+    
+    With pipeline_world_updates, the SPARQL UPDATE is queued with its version
+    as sequence number (and the run log's run_id, so the server can tell a
+    new run from a retry) and the node returns without waiting for the server,
+    so the next action's delta is computed while the server reasons over this
+    one. A failed update rolls the world back to the last acknowledged version.
     
     Returns:
         State updates with execution status
     """
+    timer = None
+    run_log = None
     try:
-        # Start timing
-        start_time = time.time()
+        timer = StageTimer()
         
         current_action = state.get("current_action")
         
@@ -687,181 +787,200 @@ def world_update(state: OverallState, config: RunnableConfig) -> dict:
                 "messages": [AIMessage(content=error_msg)]
             }
         
-        # Check if it's a move action
-        if not current_action.strip().startswith("(move"):
-            # For now, only handle move actions
-            warning_msg = f"WARNING: Action type not yet supported: {current_action}\n"
-            warning_msg += "Only 'move' actions are currently implemented."
-            return {
-                "messages": [AIMessage(content=warning_msg)]
-            }
-        
-        # Parse move action
-        action_data = parse_move_action(current_action)
-        robot_id = action_data["robot"]
-        from_location = action_data["from_location"]
-        to_location = action_data["to_location"]
-        
-        # Get config for OntologyManager
-        config_obj = get_config()
-        neo4j_config = config_obj.get_neo4j_config()
-        active_env = config_obj.get_active_env()
+        settings = Configuration.from_runnable_config(config)
+        verify_deltas = settings.verify_world_deltas
+        run_log = get_run_log(settings.run_log_flush_interval)
+        is_last_action = state.get("plan_cursor", 0) >= state.get("plan_step_count", 0)
         
         # Get world directory path (where TTL files are stored)
         world_dir = project_root / "action" / "world"
         world_dir.mkdir(parents=True, exist_ok=True)
         
-        # Get log directory path
-        log_dir = project_root / "action" / "log"
-        log_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Get ontology_server directory path
-        ontology_server_dir = project_root / "ontology_server"
-        env_dir = ontology_server_dir / "data" / "envs" / active_env
-        
-        # Get server config for SPARQL endpoint
-        server_config = config_obj.get_server_config()
-        base_url = server_config.get("base_url", "http://localhost:8000")
+        # Server base URL for the SPARQL endpoint (re-read if config.yaml changed)
+        base_url = get_settings().server.base_url
         sparql_endpoint = f"{base_url}/sparql"
         
-        # Step 1: Get next version number and prepare TTL file paths
-        # Version 0 is initial state (created in plan_reader)
-        # Version 1, 2, ... are updates
+        # Step 1: Resolve the current world version from the store
+        # Version 0 is the base snapshot (created in plan_reader)
+        # Version 1, 2, ... are delta log entries
         executed_count = state.get("executed_action_count", 0)
         version = executed_count + 1  # Next version to create
-        print(f"Step 1: Preparing TTL files (version {version})...")
-        
-        # Original TTL paths: use previous version (version 0 for first update, version N-1 for subsequent)
-        original_dynamic_path = world_dir / f"dynamic_{executed_count}.ttl"
-        original_static_path = world_dir / f"static_{executed_count}.ttl"
-        
-        updated_dynamic_path = world_dir / f"dynamic_{version}.ttl"
-        updated_static_path = world_dir / f"static_{version}.ttl"
-        
-        if not original_dynamic_path.exists():
-            error_msg = f"ERROR: Original dynamic TTL file not found: {original_dynamic_path}"
+        print(f"Step 1: Preparing world version {version}...")
+        
+        store = get_world_store(world_dir)
+        if store.head_version > executed_count:
+            # Leftover versions from an interrupted run
+            store.truncate(executed_count)
+        if store.head_version < executed_count or not store.base_dynamic_path.exists():
+            error_msg = f"ERROR: World store at version {store.head_version}, expected {executed_count}: {world_dir}"
+            run_log.write(_failure_record(state, error_msg, "WorldStoreError", timer))
+            run_log.flush()
             return {
                 "messages": [AIMessage(content=error_msg)],
                 "execution_status": "failed"
             }
         
-        print(f"  Using original: {original_dynamic_path.name}")
-        print(f"  Creating new version: {updated_dynamic_path.name}")
-        
-        # Step 2: Update TTL file (dynamic only, static is unchanged)
-        print(f"Step 2: Updating TTL file...")
-        if not save_incremental_update_to_ttl(original_dynamic_path, updated_dynamic_path, robot_id, from_location, to_location):
-            error_msg = f"ERROR: Failed to update TTL file"
-            return {
-                "messages": [AIMessage(content=error_msg)],
-                "execution_status": "failed"
-            }
-        
-        # Copy static TTL (no changes, just version it)
-        if original_static_path.exists():
-            import shutil
-            shutil.copy2(original_static_path, updated_static_path)
-            print(f"  Copied static TTL: {updated_static_path}")
-        
-        # Step 3: Extract changes using rdflib
-        print(f"Step 3: Extracting changes with rdflib...")
-        added_triples, removed_triples = extract_changes_with_rdflib(original_dynamic_path, updated_dynamic_path)
-        
-        if not added_triples and not removed_triples:
-            print(f"  WARNING: No changes detected between TTL files")
+        from ontology_server.core.client import get_client, get_pipeline
+
+        client = get_client(base_url)
+        pipeline = None
+        if settings.pipeline_world_updates:
+            pipeline = get_pipeline(base_url, depth=settings.pipeline_depth)
+            if executed_count == 0:
+                pipeline.reset(0, run_id=run_log.run_id)
+            if pipeline.failure is not None:
+                run_log.write(_failure_record(state, pipeline.failure["message"], "PipelineError", timer))
+                run_log.flush()
+                return rollback_to_acked_version(state, store, pipeline, settings)
+        
+        # Step 2: Compute the action's triple delta from its domain.pddl effects
+        with timer.stage("engine_load"):
+            engine = get_world_effect_engine(store, executed_count)
+        with timer.stage("delta"):
+            try:
+                delta = engine.compute(current_action, check=bool(engine.background))
+            except PreconditionError as e:
+                error_msg = f"ERROR: {e}\n  No world update sent for version {version}"
+                print(error_msg)
+                run_log.write(_failure_record(state, str(e), "PreconditionError", timer))
+                run_log.flush()
+                return {
+                    "messages": [AIMessage(content=error_msg)],
+                    "execution_status": "failed"
+                }
+            action_type = delta["action"]
+            added_triples = {to_rdf_triple(t) for t in delta["added"]}
+            removed_triples = {to_rdf_triple(t) for t in delta["removed"]}
+        print(f"Step 2: Action delta: {len(removed_triples)} removed, {len(added_triples)} added")
+        
+        # Step 3: Optional verification against the TTL text diff (move actions only)
+        verification = None
+        head_source = None
+        if verify_deltas and action_type == "move":
+            print(f"Step 3: Verifying delta against TTL text diff...")
+            with timer.stage("verify"):
+                action_data = parse_move_action(current_action)
+                original_dynamic_path = store.materialize(executed_count)
+                head_source = store.head_dir / "dynamic.next.ttl"
+                verification = verify_delta_with_ttl(
+                    original_dynamic_path, head_source,
+                    action_data["robot"], action_data["from_location"], action_data["to_location"],
+                    added_triples, removed_triples
+                )
+            if "error" in verification:
+                head_source = None
         
         # Step 4: Generate SPARQL UPDATE query (including inferred relationships)
         print(f"Step 4: Generating SPARQL UPDATE query...")
-        sparql_query = generate_sparql_update(added_triples, removed_triples, project_root=project_root)
+        with timer.stage("sparql_generation"):
+            sparql_query = generate_sparql_update(
+                added_triples, removed_triples, project_root=project_root,
+                lookup=get_chain_lookup(engine, store.static_path)
+            )
         
         if not sparql_query:
             error_msg = f"ERROR: Failed to generate SPARQL UPDATE query"
+            run_log.write(_failure_record(state, error_msg, "SparqlGenerationError", timer))
+            run_log.flush()
             return {
                 "messages": [AIMessage(content=error_msg)],
                 "execution_status": "failed"
             }
         
-        # Step 5: Send SPARQL UPDATE to endpoint
-        print(f"Step 5: Sending SPARQL UPDATE to endpoint...")
-        update_endpoint = sparql_endpoint.rstrip('/') + '/update'
-        if not send_sparql_update(sparql_query, update_endpoint):
-            error_msg = f"ERROR: Failed to send SPARQL UPDATE to endpoint"
-            return {
-                "messages": [AIMessage(content=error_msg)],
-                "execution_status": "failed"
-            }
-        
-        # Step 6: Server will handle incremental reasoning
-        print(f"Step 6: Server will process changes and run incremental HermiT reasoning...")
-        print(f"  (This is handled by the ontology server)")
-        
-        # Calculate elapsed time
-        elapsed_time = time.time() - start_time
+        # Step 5: Send SPARQL UPDATE to endpoint (pipelined: queue it behind earlier versions)
+        if pipeline is not None:
+            print(f"Step 5: Queueing SPARQL UPDATE for version {version} ({pipeline.in_flight} in flight)...")
+            with timer.stage("queue"):
+                pipeline.submit(version, sparql_query)
+        else:
+            print(f"Step 5: Sending SPARQL UPDATE to endpoint...")
+            with timer.stage("http"):
+                result = send_sparql_update(sparql_query, client)
+            for stage, ms in (result.get("timings") or {}).items():
+                timer.add(f"server_{stage[:-3]}", ms)
+            if result.get("status") != "success":
+                error_msg = f"ERROR: Failed to send SPARQL UPDATE to endpoint: {result.get('message', 'Unknown error')}"
+                run_log.write(_failure_record(state, error_msg, "SparqlUpdateError", timer))
+                run_log.flush()
+                return {
+                    "messages": [AIMessage(content=error_msg)],
+                    "execution_status": "failed"
+                }
+        
+        # Step 6: Commit the delta to the world store (fsync'd append)
+        with timer.stage("store_append"):
+            store.append(added_triples, removed_triples, action=current_action, head_source=head_source)
+            engine.commit()
+        print(f"Step 6: World version {version} committed ({len(added_triples)} added, {len(removed_triples)} removed)")
+        
+        # Step 7: Advance the incremental replanner's copy of the problem state
+        replanner = get_replanner()
+        if replanner.is_loaded:
+            with timer.stage("replanner"):
+                replanner.observe_executed(current_action)
+        
+        # Last action: wait for the server to acknowledge every queued version
+        if pipeline is not None and is_last_action:
+            print(f"  Waiting for {pipeline.in_flight} queued SPARQL UPDATE(s)...")
+            with timer.stage("drain"):
+                pipeline.drain()
+            if pipeline.failure is not None:
+                run_log.write(_failure_record(state, pipeline.failure["message"], "PipelineError", timer))
+                run_log.flush()
+                return rollback_to_acked_version(state, store, pipeline, settings)
+            print(f"  ✓ Server acknowledged world version {pipeline.acked_version}")
         
         # Update executed action count
         new_executed_count = executed_count + 1
+        timings = dict(timer.stages, total=timer.total_ms)
         
-        # Step 7: Save log to JSON file
-        log_data = {
+        # Step 8: Append the action record to the run log (buffered)
+        run_log.write({
             "action_number": new_executed_count,
-            "timestamp": datetime.now().isoformat(),
             "action": {
                 "raw": current_action,
-                "type": "move",
-                "robot": robot_id,
-                "from_location": from_location,
-                "to_location": to_location
+                "type": action_type,
+                "args": delta["args"]
             },
             "updates": {
-                "ttl_files": {
-                    "original": {
-                        "dynamic": original_dynamic_path.name,
-                        "static": original_static_path.name
-                    },
-                    "updated": {
-                        "dynamic": updated_dynamic_path.name,
-                        "static": updated_static_path.name
-                    }
+                "delta_verification": verification,
+                "world_store": {
+                    "original_version": executed_count,
+                    "version": version
                 },
                 "relationships": {
-                    "removed": len(removed_triples),
-                    "added": len(added_triples),
-                    "changed": {
-                        "robotIsInSpace": {
-                            "robot": robot_id,
-                            "from": from_location,
-                            "to": to_location
-                        }
-                    }
+                    "added": sorted([list(t) for t in delta["added"]], key=str),
+                    "removed": sorted([list(t) for t in delta["removed"]], key=str)
                 },
-                "sparql_endpoint": sparql_endpoint
-            },
-            "performance": {
-                "elapsed_time_seconds": round(elapsed_time, 3),
-                "elapsed_time_formatted": f"{elapsed_time:.3f}s"
+                "sparql_endpoint": sparql_endpoint,
+                "pipeline": pipeline.stats() if pipeline is not None else None
             },
+            "timings_ms": timings,
             "status": "success"
-        }
-        
-        # Save log file
-        log_file = log_dir / f"{new_executed_count}.json"
-        with open(log_file, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, indent=2, ensure_ascii=False)
-        print(f"  Log saved: {log_file}")
+        })
+        if is_last_action:
+            run_log.flush()
         
         success_msg = f"World updated successfully:\n"
         success_msg += f"  Action: {current_action}\n"
-        success_msg += f"  Robot {robot_id} moved from {from_location} to {to_location}\n\n"
+        success_msg += f"  Type: {action_type}\n\n"
         success_msg += f"  Workflow completed:\n"
-        success_msg += f"    1. TTL files updated: dynamic_{version}.ttl, static_{version}.ttl\n"
-        success_msg += f"    2. Changes extracted: {len(removed_triples)} removed, {len(added_triples)} added\n"
-        success_msg += f"    3. SPARQL UPDATE sent to: {sparql_endpoint}\n"
+        success_msg += f"    1. World version {version} appended to {store.log_path.name}\n"
+        success_msg += f"    2. Delta emitted: {len(removed_triples)} removed, {len(added_triples)} added\n"
+        if pipeline is not None:
+            success_msg += f"    3. SPARQL UPDATE queued for: {sparql_endpoint} (acknowledged up to version {pipeline.acked_version})\n"
+        else:
+            success_msg += f"    3. SPARQL UPDATE sent to: {sparql_endpoint}\n"
         success_msg += f"    4. Server will process changes and run incremental reasoning\n"
-        success_msg += f"    5. Log saved: {log_file.name}\n\n"
-        success_msg += f"  Updated relationship:\n"
-        success_msg += f"    - robotIsInSpace: {robot_id} -> {to_location}\n"
+        success_msg += f"    5. Run log: {run_log.path.name}\n\n"
+        success_msg += f"  Updated relationships:\n"
+        for subject, prop, obj in sorted(delta["removed"], key=str):
+            success_msg += f"    - {prop}: {subject} -> {obj}\n"
+        for subject, prop, obj in sorted(delta["added"], key=str):
+            success_msg += f"    + {prop}: {subject} -> {obj}\n"
         success_msg += f"  Derived relationships will be inferred by server's incremental reasoning\n\n"
-        success_msg += f"  Performance: {elapsed_time:.3f}s"
+        success_msg += f"  Performance: {timings['total'] / 1000:.3f}s "
+        success_msg += "(" + ", ".join(f"{stage} {ms:.1f}ms" for stage, ms in timer.stages.items()) + ")"
         
         return {
             "messages": [AIMessage(content=success_msg)],
@@ -870,78 +989,20 @@ def world_update(state: OverallState, config: RunnableConfig) -> dict:
             "executed_action_count": new_executed_count
         }
         
-    except ValueError as e:
-        # Calculate elapsed time even on error
-        elapsed_time = time.time() - start_time if 'start_time' in locals() else 0
-        
-        # Get log directory
-        log_dir = project_root / "action" / "log"
-        log_dir.mkdir(parents=True, exist_ok=True)
-        
-        executed_count = state.get("executed_action_count", 0)
-        new_executed_count = executed_count + 1
-        
-        # Save error log
-        error_log_data = {
-            "action_number": new_executed_count,
-            "timestamp": datetime.now().isoformat(),
-            "action": {
-                "raw": state.get("current_action", "unknown"),
-                "error": str(e)
-            },
-            "performance": {
-                "elapsed_time_seconds": round(elapsed_time, 3),
-                "elapsed_time_formatted": f"{elapsed_time:.3f}s"
-            },
-            "status": "failed",
-            "error_type": "ValueError"
-        }
-        
-        log_file = log_dir / f"{new_executed_count}.json"
-        with open(log_file, 'w', encoding='utf-8') as f:
-            json.dump(error_log_data, f, indent=2, ensure_ascii=False)
-        
-        error_msg = f"ERROR parsing action: {str(e)}"
-        return {
-            "messages": [AIMessage(content=error_msg)],
-            "execution_status": "failed"
-        }
     except Exception as e:
-        # Calculate elapsed time even on error
-        elapsed_time = time.time() - start_time if 'start_time' in locals() else 0
-        
-        # Get log directory
-        log_dir = project_root / "action" / "log"
-        log_dir.mkdir(parents=True, exist_ok=True)
-        
-        executed_count = state.get("executed_action_count", 0)
-        new_executed_count = executed_count + 1
-        
-        # Save error log
-        error_log_data = {
-            "action_number": new_executed_count,
-            "timestamp": datetime.now().isoformat(),
-            "action": {
-                "raw": state.get("current_action", "unknown"),
-                "error": str(e)
-            },
-            "performance": {
-                "elapsed_time_seconds": round(elapsed_time, 3),
-                "elapsed_time_formatted": f"{elapsed_time:.3f}s"
-            },
-            "status": "failed",
-            "error_type": type(e).__name__
-        }
-        
-        log_file = log_dir / f"{new_executed_count}.json"
-        with open(log_file, 'w', encoding='utf-8') as f:
-            json.dump(error_log_data, f, indent=2, ensure_ascii=False)
-        
-        error_msg = f"ERROR in world_update: {type(e).__name__}: {str(e)}"
-        import traceback
-        traceback.print_exc()
+        error_type = type(e).__name__
+        if run_log is None:
+            run_log = get_run_log()
+        run_log.write(_failure_record(state, str(e), error_type, timer))
+        run_log.flush()
+        
+        if isinstance(e, ValueError):
+            error_msg = f"ERROR parsing action: {str(e)}"
+        else:
+            error_msg = f"ERROR in world_update: {error_type}: {str(e)}"
+            import traceback
+            traceback.print_exc()
         return {
             "messages": [AIMessage(content=error_msg)],
             "execution_status": "failed"
         }
-
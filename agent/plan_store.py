@@ -0,0 +1,183 @@
+"""Plan Store - Parsed plans kept once outside the graph state, referenced by ID."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Grounded action as a tuple: ("move", "robot1", "corridor_14", "door_9")
+Action = Tuple[str, ...]
+
+
+def parse_action_tuple(action: str) -> Action:
+    """Parse "(move robot1 a b)" into ("move", "robot1", "a", "b")."""
+    tokens = action.strip().strip("()").split()
+    if not tokens:
+        raise ValueError(f"Invalid action format: {action}")
+    return tuple(tokens)
+
+
+def format_action(action: Action) -> str:
+    """Format an action tuple back into PDDL: ("move", "robot1", "a", "b") -> "(move robot1 a b)"."""
+    return f"({' '.join(action)})"
+
+
+class Plan:
+    """
+    Immutable parsed plan.
+
+    Graph state only carries plan_id and a cursor index; the actions live
+    here (and in action/plan/plan_<id>.json so a resumed run can reload
+    them), so a state checkpoint does not grow with the plan length (the
+    messages channel is bounded separately, see state.drop_old_messages).
+    """
+
+    __slots__ = ("plan_id", "actions", "cost", "raw_path", "problem_path")
+
+    def __init__(self, plan_id: str, actions: Tuple[Action, ...], cost: Optional[int] = None,
+                 raw_path: Optional[str] = None, problem_path: Optional[str] = None):
+        self.plan_id = plan_id
+        self.actions = actions
+        self.cost = cost
+        self.raw_path = raw_path
+        self.problem_path = problem_path
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def action(self, index: int) -> str:
+        """PDDL string of the action at index."""
+        return format_action(self.actions[index])
+
+    def action_strings(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """PDDL strings of actions[start:end]."""
+        return [format_action(a) for a in self.actions[start:end]]
+
+    def to_dict(self) -> Dict:
+        return {
+            "plan_id": self.plan_id,
+            "cost": self.cost,
+            "raw_path": self.raw_path,
+            "problem_path": self.problem_path,
+            "actions": [list(a) for a in self.actions],
+        }
+
+
+_plans: Dict[str, Plan] = {}
+
+
+def _plan_file(plan_dir: Path, plan_id: str) -> Path:
+    return Path(plan_dir) / f"plan_{plan_id}.json"
+
+
+def register_plan(actions: List[str], cost: Optional[int] = None, raw_path: Optional[Path] = None,
+                  plan_dir: Optional[Path] = None, problem_path: Optional[Path] = None) -> Plan:
+    """
+    Store a plan once and return it; the ID is a hash of the actions.
+
+    Args:
+        actions: PDDL action strings in order
+        cost: Plan cost if known
+        raw_path: Plan file the actions came from (kept as a reference, not embedded)
+        plan_dir: Directory for plan_<id>.json (skipped if None)
+        problem_path: problem.pddl the plan was computed for (lets the replanner track it)
+
+    Returns:
+        Plan (the cached instance if the same plan was registered before)
+    """
+    parsed = tuple(parse_action_tuple(a) for a in actions)
+    digest = hashlib.sha1("\n".join(format_action(a) for a in parsed).encode("utf-8")).hexdigest()[:12]
+    plan = _plans.get(digest)
+    if plan is None:
+        plan = Plan(digest, parsed, cost, str(raw_path) if raw_path else None,
+                    str(problem_path) if problem_path else None)
+        _plans[digest] = plan
+    elif problem_path and plan.problem_path is None:
+        plan.problem_path = str(problem_path)
+
+    if plan_dir is not None:
+        path = _plan_file(plan_dir, digest)
+        if not path.exists() or problem_path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(plan.to_dict(), f)
+    return plan
+
+
+def get_plan(plan_id: str, plan_dir: Optional[Path] = None) -> Plan:
+    """
+    Look up a registered plan, loading plan_<id>.json from plan_dir if needed.
+
+    Raises:
+        KeyError: If the plan is unknown
+    """
+    plan = _plans.get(plan_id)
+    if plan is not None:
+        return plan
+    if plan_dir is not None and _plan_file(plan_dir, plan_id).exists():
+        with open(_plan_file(plan_dir, plan_id), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        plan = Plan(plan_id, tuple(tuple(a) for a in data["actions"]), data.get("cost"), data.get("raw_path"),
+                    data.get("problem_path"))
+        _plans[plan_id] = plan
+        return plan
+    raise KeyError(f"Unknown plan: {plan_id}")
+
+
+if __name__ == "__main__":
+    # Checkpoint size and step time per action, messages channel included:
+    # list-slicing state vs plan_id + cursor, with and without dropping old messages
+    # (python -m agent.plan_store)
+    import pickle
+    import tempfile
+    import time
+
+    from langchain_core.messages import AIMessage
+    from langgraph.graph import add_messages
+
+    from agent.state import drop_old_messages
+
+    def run(n: int, compact: bool, keep: int) -> Tuple[int, int, int, float]:
+        actions = [f"(move robot1 room_{i} room_{i + 1})" for i in range(n)]
+        if compact:
+            plan = register_plan(actions, plan_dir=Path(tmp))
+            state = {"plan_id": plan.plan_id, "plan_cursor": 0, "plan_step_count": len(plan)}
+            loaded = f"Plan loaded successfully:\n- Total actions: {n}\n- Plan ID: {plan.plan_id}\n"
+        else:
+            state = {"plan_actions": actions, "plan_raw_content": "\n".join(actions), "remaining_actions": None}
+            loaded = "Plan loaded successfully:\n" + "".join(f"{i}. {a}\n" for i, a in enumerate(actions, 1))
+        state["messages"] = add_messages([], [AIMessage(content=loaded)])
+
+        sizes = []
+        start = time.perf_counter()
+        for _ in range(n):
+            # next_action
+            if compact:
+                plan = get_plan(state["plan_id"])
+                cursor = state["plan_cursor"]
+                action, upcoming = plan.action(cursor), plan.action_strings(cursor, cursor + 5)
+                state = dict(state, current_action=action, plan_cursor=cursor + 1)
+            else:
+                remaining = state["remaining_actions"]
+                remaining = state["plan_actions"] if remaining is None else remaining
+                action, upcoming = remaining[0], remaining[:5]
+                state = dict(state, current_action=action, remaining_actions=remaining[1:])
+            update = drop_old_messages(state["messages"], keep) + [
+                AIMessage(content=f"Next action to execute:\n  {action}\n\nNext actions:\n" + "\n".join(upcoming))]
+            state["messages"] = add_messages(state["messages"], update)
+            # world_update
+            state["messages"] = add_messages(state["messages"], [AIMessage(
+                content=f"World updated successfully:\n  Action: {action}\n  Delta emitted: 1 removed, 1 added\n")])
+            sizes.append(len(pickle.dumps(state)))  # what a checkpointer writes per step
+        elapsed = time.perf_counter() - start
+        return sizes[0], sizes[-1], sum(sizes), elapsed
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (100, 1000):
+            for compact, keep, label in ((False, 0, "list slicing, all messages    "),
+                                         (True, 0, "plan_id + cursor, all messages"),
+                                         (True, 20, "plan_id + cursor, 20 messages ")):
+                first, last, total, elapsed = run(n, compact, keep)
+                print(f"{n:5d} actions, {label}: checkpoint {first}B first / {last}B last, "
+                      f"{total / 1024:.0f} KiB total, {elapsed * 1000 / n:.3f} ms/step")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Run Log - Buffered JSON Lines execution log with per-stage timings, plus a query CLI.
+
+Each plan run appends one record per executed action to
+action/log/run_<run_id>.jsonl. Records are buffered and flushed every
+flush_interval seconds (and on flush()/exit), so a long run touches the
+filesystem a handful of times instead of once per action.
+
+Usage:
+    python agent/run_log.py list
+    python agent/run_log.py summary [--run RUN_ID]
+    python agent/run_log.py show --action 3 [--run RUN_ID]
+    python agent/run_log.py slowest --stage http [--top 10] [--run RUN_ID]
+"""
+
+import argparse
+import atexit
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+DEFAULT_LOG_DIR = Path(__file__).parent.parent / "action" / "log"
+
+
+class StageTimer:
+    """Collect wall-clock milliseconds per named stage of one action."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block; repeated names accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, ms: Optional[float]):
+        """Record an externally measured stage (e.g. server-reported reasoning time)."""
+        if ms is not None:
+            self.stages[name] = round(self.stages.get(name, 0.0) + ms, 3)
+
+    @property
+    def total_ms(self) -> float:
+        return round((time.perf_counter() - self.start) * 1000, 3)
+
+
+class RunLog:
+    """Append-only JSON Lines log for one run with buffered writes."""
+
+    def __init__(self, log_dir: Path, run_id: str, flush_interval: float = 2.0):
+        """
+        Initialize run log.
+
+        Args:
+            log_dir: Directory for run_<run_id>.jsonl
+            run_id: Run identifier
+            flush_interval: Seconds between buffer flushes (0 writes every record)
+        """
+        self.log_dir = Path(log_dir)
+        self.run_id = run_id
+        self.path = self.log_dir / f"run_{run_id}.jsonl"
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self.records_written = 0
+        self.flushes = 0
+
+    def write(self, record: Dict[str, Any]):
+        """Buffer one record; flushes when flush_interval has elapsed."""
+        record = dict(record, run_id=self.run_id)
+        record.setdefault("timestamp", datetime.now().isoformat())
+        self._buffer.append(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records to disk."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(self._buffer)
+        self.records_written += len(self._buffer)
+        self.flushes += 1
+        self._buffer = []
+
+
+_run_log: Optional[RunLog] = None
+
+
+def start_run(run_id: Optional[str] = None, log_dir: Path = DEFAULT_LOG_DIR,
+              flush_interval: float = 2.0) -> RunLog:
+    """Start a new process-wide run log (flushes the previous one)."""
+    global _run_log
+    if _run_log is not None:
+        _run_log.flush()
+    run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+    _run_log = RunLog(log_dir, run_id, flush_interval)
+    return _run_log
+
+
+def get_run_log(flush_interval: Optional[float] = None) -> RunLog:
+    """Get the current run log (starts one if no run was started)."""
+    if _run_log is None:
+        start_run(flush_interval=flush_interval if flush_interval is not None else 2.0)
+    elif flush_interval is not None:
+        _run_log.flush_interval = flush_interval
+    return _run_log
+
+
+@atexit.register
+def _flush_on_exit():
+    if _run_log is not None:
+        _run_log.flush()
+
+
+# ----------------------------------------------------------------------
+# Query CLI
+# ----------------------------------------------------------------------
+
+def list_runs(log_dir: Path = DEFAULT_LOG_DIR) -> List[Path]:
+    """Run log files, oldest first."""
+    return sorted(Path(log_dir).glob("run_*.jsonl"), key=lambda p: p.stat().st_mtime)
+
+
+def read_run(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield records of a run log (skips a torn last line)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Counts per status/action type and latency statistics per stage."""
+    stages: Dict[str, List[float]] = {}
+    statuses: Dict[str, int] = {}
+    types: Dict[str, int] = {}
+    for record in records:
+        statuses[record.get("status", "unknown")] = statuses.get(record.get("status", "unknown"), 0) + 1
+        action_type = (record.get("action") or {}).get("type")
+        if action_type:
+            types[action_type] = types.get(action_type, 0) + 1
+        for stage, ms in (record.get("timings_ms") or {}).items():
+            stages.setdefault(stage, []).append(ms)
+
+    stage_stats = {
+        stage: {
+            "count": len(values),
+            "total_ms": round(sum(values), 1),
+            "avg_ms": round(sum(values) / len(values), 2),
+            "p50_ms": round(_percentile(values, 0.5), 2),
+            "p95_ms": round(_percentile(values, 0.95), 2),
+            "max_ms": round(max(values), 2),
+        }
+        for stage, values in stages.items()
+    }
+    return {"actions": len(records), "status": statuses, "action_types": types, "stages": stage_stats}
+
+
+def _resolve_run(log_dir: Path, run_id: Optional[str]) -> Optional[Path]:
+    if run_id:
+        path = Path(log_dir) / f"run_{run_id}.jsonl"
+        return path if path.exists() else None
+    runs = list_runs(log_dir)
+    return runs[-1] if runs else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query action execution run logs")
+    parser.add_argument("--log-dir", type=Path, default=DEFAULT_LOG_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List runs")
+    summary_parser = sub.add_parser("summary", help="Per-stage latency summary of a run")
+    summary_parser.add_argument("--run", help="Run ID (default: latest)")
+    show_parser = sub.add_parser("show", help="Show one action record")
+    show_parser.add_argument("--run", help="Run ID (default: latest)")
+    show_parser.add_argument("--action", type=int, required=True, help="Action number")
+    slow_parser = sub.add_parser("slowest", help="Slowest actions for a stage")
+    slow_parser.add_argument("--run", help="Run ID (default: latest)")
+    slow_parser.add_argument("--stage", default="total", help="Stage name (default: total)")
+    slow_parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for path in list_runs(args.log_dir):
+            records = list(read_run(path))
+            failed = sum(1 for r in records if r.get("status") != "success")
+            print(f"{path.stem[4:]}  {len(records):5d} actions  {failed} failed  {path.stat().st_size} bytes")
+        return 0
+
+    path = _resolve_run(args.log_dir, args.run)
+    if path is None:
+        print(f"ERROR: No run log found in {args.log_dir}")
+        return 1
+    records = list(read_run(path))
+
+    if args.command == "summary":
+        summary = summarize(records)
+        print(f"Run {path.stem[4:]}: {summary['actions']} actions, status {summary['status']}")
+        print(f"Action types: {summary['action_types']}")
+        print(f"{'stage':<20}{'count':>7}{'total':>11}{'avg':>9}{'p50':>9}{'p95':>9}{'max':>9}  (ms)")
+        for stage, stats in sorted(summary["stages"].items(), key=lambda item: -item[1]["total_ms"]):
+            print(f"{stage:<20}{stats['count']:>7}{stats['total_ms']:>11}{stats['avg_ms']:>9}"
+                  f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['max_ms']:>9}")
+    elif args.command == "show":
+        matches = [r for r in records if r.get("action_number") == args.action]
+        if not matches:
+            print(f"ERROR: Action {args.action} not in run {path.stem[4:]}")
+            return 1
+        for record in matches:
+            print(json.dumps(record, indent=2, ensure_ascii=False))
+    elif args.command == "slowest":
+        timed = [r for r in records if args.stage in (r.get("timings_ms") or {})]
+        timed.sort(key=lambda r: -r["timings_ms"][args.stage])
+        for record in timed[:args.top]:
+            action = (record.get("action") or {}).get("raw")
+            print(f"#{record.get('action_number'):<5} {record['timings_ms'][args.stage]:>10.2f} ms  {action}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import List, Optional
 from typing_extensions import TypedDict, Annotated
 
+from langchain_core.messages import RemoveMessage
 from langgraph.graph import add_messages
 
 
@@ -13,14 +14,29 @@ class OverallState(TypedDict, total=False):
     messages: Annotated[List, add_messages]
 
     # Plan data (from solution.plan file)
-    plan_actions: Optional[List[str]]  # List of PDDL action strings
+    # The parsed plan is stored once in agent.plan_store; state only references it
+    plan_id: Optional[str]  # Plan store ID (see agent/plan_store.py)
+    plan_cursor: Optional[int]  # Index of the next action to execute
     plan_cost: Optional[int]  # Plan cost if available
     plan_step_count: Optional[int]  # Number of actions in plan
-    plan_raw_content: Optional[str]  # Raw plan file content
+    plan_base_version: Optional[int]  # World version the plan starts from (0, or the rollback version of a recovery plan)
+    recovery_count: Optional[int]  # Rollbacks this run continued from (see Configuration.max_recoveries)
     
     # Action execution state
     current_action: Optional[str]  # Current action being executed
-    remaining_actions: Optional[List[str]]  # Remaining actions to execute
     last_executed_action: Optional[str]  # Last successfully executed action
     execution_status: Optional[str]  # "success", "failed", etc.
-    executed_action_count: Optional[int]  # Number of actions executed so far (default: 0)
\ No newline at end of file
+    executed_action_count: Optional[int]  # Number of actions executed so far (default: 0)
+
+
+def drop_old_messages(messages: List, keep: int) -> List[RemoveMessage]:
+    """
+    add_messages update removing all but the newest keep messages.
+
+    Every action adds messages to the channel; dropping old ones keeps the
+    per-step checkpoint from growing with the run length (the run log keeps
+    every action record).
+    """
+    if keep <= 0 or len(messages) <= keep:
+        return []
+    return [RemoveMessage(id=message.id) for message in messages[:-keep] if getattr(message, "id", None)]
@@ -1,5 +1,5 @@
-"""Agent tools package."""
+"""Agent tools package.
 
-from .pddl_plan import pddl_plan
-
-__all__ = ["pddl_plan"]
+Import tools from their modules (agent.tools.pddl_plan, agent.tools.ttl_reader)
+so only the tools in use are loaded.
+"""
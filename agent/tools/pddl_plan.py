@@ -1,42 +1,50 @@
 """PDDL Planning Tool - Runs PDDL planner and returns solution."""
 
-import sys
-import subprocess
-import shutil
 import re
 import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
 from langchain_core.tools import tool
-from neo4j import GraphDatabase
 
-# Add parent directory to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "ontology_server"))
-sys.path.insert(0, str(project_root / "pddl"))
-
-from scripts.pddl_parser import PDDLDomainParser
-from scripts.pddl_generator import PDDLGenerator
-from scripts.pddl_writer import PDDLWriter
-from scripts.pddl_goal_utils import (
+from pddl.scripts.pddl_parser import PDDLDomainParser
+from pddl.scripts.pddl_generator import PDDLGenerator
+from pddl.scripts.pddl_writer import PDDLWriter
+from pddl.scripts.pddl_relevance import RelevanceAnalyzer
+from pddl.scripts.pddl_object_index import get_object_index
+from pddl.scripts.pddl_replan import get_replanner
+from pddl.scripts.pddl_fast_downward import FAST_DOWNWARD_PATH, build_planner_command, run_fast_downward
+from pddl.scripts.pddl_goal_ast import GoalParseError, parse_goal, to_pddl, goal_hash, iter_literals
+from pddl.scripts.pddl_goal_utils import (
     extract_object_ids_from_goal, 
     classify_objects_by_domain_type,
     validate_goal_affordances
 )
-from core.config import get_config
 
+project_root = Path(__file__).parent.parent.parent
+
+
+_planner_subscribed = False
+
+
+def _on_planner_settings_changed(keys, settings):
+    """Point the incremental replanner at the reloaded planner settings."""
+    planner = settings.planner
+    replanner = get_replanner()
+    replanner.search_cmd = build_planner_command(planner.solver, planner.heuristic, planner.weight)
+    replanner.timeout = planner.timeout
+    print(f"Planner settings reloaded: --search {replanner.search_cmd} (timeout {planner.timeout}s)")
 
-def build_planner_command(solver: str = "lazy_wastar", heuristic: str = "ff", weight: int = 2) -> str:
-    """Build Fast Downward search command."""
-    if solver == 'lazy_wastar':
-        return f"lazy_wastar([{heuristic}()], w={weight})"
-    elif solver == 'astar':
-        return f"astar({heuristic}())"
-    elif solver == 'lama':
-        return "lazy(alt([lama_synergy()], boost=1000), preferred=[lama_synergy()])"
-    else:
-        return f"lazy_wastar([{heuristic}()], w={weight})"
+
+def get_planner_settings():
+    """Typed planner section of config.yaml (reloads are applied to the replanner as well)."""
+    global _planner_subscribed
+    from ontology_server.core.config import get_config
+    config = get_config()
+    if not _planner_subscribed:
+        config.subscribe(_on_planner_settings_changed, prefixes=["planner"])
+        _planner_subscribed = True
+    return config.settings.planner
 
 
 def normalize_goal_formula(goal_formula: str) -> str:
@@ -44,7 +52,7 @@ def normalize_goal_formula(goal_formula: str) -> str:
     Normalize goal formula by converting unsupported predicates to supported ones
     and fixing syntax errors.
     
-    Converts:
+    Converts (via the alias tables in scripts.pddl_goal_ast, in a single parse):
     - (isClosed ?a) -> (not (isOpen ?a))
     - (isInSpace ?a ?l) -> (artifactIsInSpace ?a ?l)  (domain uses artifactIsInSpace, not isInSpace)
     - Case-insensitive predicate matching for common typos
@@ -56,107 +64,12 @@ def normalize_goal_formula(goal_formula: str) -> str:
     Returns:
         Normalized goal formula with domain-compatible predicates
     """
-    # Define predicate mappings (case-insensitive matching)
-    # Format: (pattern, correct_predicate, num_args, special_handling)
-    # special_handling: None or function to handle special cases
-    predicate_mappings = [
-        # isInSpace -> artifactIsInSpace (domain uses artifactIsInSpace, not isInSpace)
-        (r'\(isInSpace\s+(\w+)\s+(\w+)\)', 'artifactIsInSpace', 2, None),
-        
-        # isOnTopOf -> isOntopOf (domain uses isOntopOf, not isOnTopOf)
-        (r'\(isOnTopOf\s+(\w+)\s+(\w+)\)', 'isOntopOf', 2, None),
-        (r'\(isOnTop\s+(\w+)\)', 'isON', 1, None),  # isOnTop -> isON (common typo)
-        
-        # Standard predicates with case-insensitive matching
-        (r'\(isON\s+(\w+)\)', 'isON', 1, None),
-        (r'\(isOpen\s+(\w+)\)', 'isOpen', 1, None),
-        (r'\(isHeldBy\s+(\w+)\s+(\w+)\)', 'isHeldBy', 2, None),
-        (r'\(isInsideOf\s+(\w+)\s+(\w+)\)', 'isInsideOf', 2, None),
-        (r'\(isOntopOf\s+(\w+)\s+(\w+)\)', 'isOntopOf', 2, None),
-        (r'\(robotIsInSpace\s+(\w+)\s+(\w+)\)', 'robotIsInSpace', 2, None),
-        (r'\(artifactIsOnFloorOf\s+(\w+)\s+(\w+)\)', 'artifactIsOnFloorOf', 2, None),
-        (r'\(artifactIsInSpace\s+(\w+)\s+(\w+)\)', 'artifactIsInSpace', 2, None),
-        (r'\(isAdjacentTo\s+(\w+)\s+(\w+)\)', 'isAdjacentTo', 2, None),
-        (r'\(isLocked\s+(\w+)\)', 'isLocked', 1, None),
-        (r'\(isOpenDoor\s+(\w+)\)', 'isOpenDoor', 1, None),
-    ]
-    
-    # Apply all predicate mappings with case-insensitive matching
-    for pattern, correct_pred, num_args, special_handler in predicate_mappings:
-        def make_replacer(pred_name, num_args, handler):
-            if handler:
-                return handler
-            elif num_args == 1:
-                def replacer(match):
-                    arg1 = match.group(1)
-                    return f"({pred_name} {arg1})"
-                return replacer
-            elif num_args == 2:
-                def replacer(match):
-                    arg1 = match.group(1)
-                    arg2 = match.group(2)
-                    return f"({pred_name} {arg1} {arg2})"
-                return replacer
-            else:
-                return lambda m: m.group(0)  # No change
-        
-        replacer = make_replacer(correct_pred, num_args, special_handler)
-        # Use case-insensitive matching to handle all case variations
-        goal_formula = re.sub(pattern, replacer, goal_formula, flags=re.IGNORECASE)
-    
-    # Convert isClosed to (not (isOpen ...))
-    # Pattern: (isClosed artifact_id) -> (not (isOpen artifact_id))
-    def replace_isclosed(match):
-        artifact_id = match.group(1)
-        return f"(not (isOpen {artifact_id}))"
-    
-    # Match (isClosed artifact_id) - case-insensitive
-    goal_formula = re.sub(r'\(isClosed\s+(\w+)\)', replace_isclosed, goal_formula, flags=re.IGNORECASE)
-    
-    # Fix: not (predicate) -> (not (predicate))
-    # This handles cases like: (and ... not (predicate)) -> (and ... (not (predicate)))
-    # Pattern: "not (" that is not already wrapped in parentheses
-    # We need to match "not (" followed by a complete predicate and wrap it
-    
-    # Simple approach: find "not (" that's not already "(not ("
-    # and wrap the entire predicate including parentheses
-    def fix_not_syntax(text):
-        # Find "not (" patterns and wrap them
-        # Match: whitespace or opening paren, then "not ", then opening paren
-        # But not if it's already "(not ("
-        result = []
-        i = 0
-        while i < len(text):
-            # Look for "not (" pattern
-            if i + 4 < len(text) and text[i:i+5] == "not (":
-                # Check if it's already wrapped (look back one char)
-                if i == 0 or text[i-1] != '(':
-                    # Find matching closing paren for the predicate
-                    depth = 1
-                    j = i + 5  # Start after "not ("
-                    while j < len(text) and depth > 0:
-                        if text[j] == '(':
-                            depth += 1
-                        elif text[j] == ')':
-                            depth -= 1
-                        j += 1
-                    
-                    if depth == 0:
-                        # Found complete predicate, wrap "not (predicate)" with parentheses
-                        result.append("(not ")
-                        result.append(text[i+4:j])  # "(" + predicate content + ")"
-                        result.append(")")
-                        i = j
-                        continue
-            
-            result.append(text[i])
-            i += 1
-        
-        return ''.join(result)
-    
-    goal_formula = fix_not_syntax(goal_formula)
-    
-    return goal_formula
+    try:
+        return to_pddl(parse_goal(goal_formula, normalize=True))
+    except GoalParseError as e:
+        # Leave malformed goals untouched; the planner reports the syntax error
+        print(f"⚠️  WARNING: Could not parse goal formula ({e}), using it as-is")
+        return goal_formula.strip()
 
 
 def extract_task_description(task_description: str = None, goal_formula: str = None) -> str:
@@ -238,6 +151,7 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
             "timestamp_folder": timestamp,
             "task_description": task_desc,
             "goal_formula": goal_formula,
+            "goal_hash": None,
             "task_description_input": task_description,
             "status": "started",
             "files": {
@@ -247,6 +161,17 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
             }
         }
 
+        # Parse goal once; hash and isHeldBy pairs come from the same AST
+        try:
+            goal_ast = parse_goal(goal_formula, normalize=False)
+            debug_log["goal_hash"] = goal_hash(goal_ast)
+            isHeldBy_matches = [
+                atom.args for atom, _ in iter_literals(goal_ast)
+                if atom.predicate == "isHeldBy" and len(atom.args) == 2
+            ]
+        except GoalParseError:
+            isHeldBy_matches = []
+
         # Verify domain exists
         if not domain_path.exists():
             return f"ERROR: Domain file not found at {domain_path}"
@@ -254,19 +179,19 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
         # Parse domain
         parser = PDDLDomainParser(domain_path)
 
-        # Connect to Neo4j
-        sys_config = get_config()
-        neo4j_config = sys_config.get_neo4j_config()
-        driver = GraphDatabase.driver(
-            neo4j_config['uri'],
-            auth=(neo4j_config['user'], neo4j_config['password'])
-        )
+        # Shared Neo4j driver (created once per process, connections pooled across calls);
+        # planning only reads, so sessions are READ mode after the last world write's bookmarks
+        from ontology_server.core.neo4j_pool import ReadDriver
+        driver = ReadDriver()
 
-        # Initialize generator
-        generator = PDDLGenerator(driver, parser)
+        # In-process ID/type/affordance index (reloaded only after a noted world write)
+        object_index = get_object_index(driver, parser)
+
+        # Initialize generator (types/affordances served from the index)
+        generator = PDDLGenerator(driver, parser, object_index=object_index)
 
         # Extract objects from goal
-        goal_object_ids = extract_object_ids_from_goal(goal_formula, driver)
+        goal_object_ids = extract_object_ids_from_goal(goal_formula, driver, object_index=object_index)
         debug_log["extracted_objects"] = {
             "goal_object_ids": goal_object_ids,
             "count": len(goal_object_ids)
@@ -295,8 +220,6 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
         # If goal_types_map is empty or objects weren't classified, 
         # ensure goal objects are at least added to artifact_ids as fallback
         # But exclude Hand objects from isHeldBy predicate
-        import re
-        isHeldBy_matches = re.findall(r'\(isHeldBy\s+(\w+)\s+(\w+)\)', goal_formula)
         hand_ids_in_goal = set()
         for artifact_id, hand_id in isHeldBy_matches:
             hand_ids_in_goal.add(hand_id)
@@ -381,7 +304,6 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
         print(f"\n🤖 STEP 2: Getting robot's current location...")
         robot_info = generator.get_robot_info()
         if not robot_info:
-            driver.close()
             return "ERROR: No robot found in knowledge graph"
 
         robot_location = robot_info.get('location')
@@ -490,7 +412,6 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
         
         # Ensure all goal objects are in types_map (they may not be found in Neo4j)
         # Try to infer type from goal formula if not found
-        isHeldBy_matches = re.findall(r'\(isHeldBy\s+(\w+)\s+(\w+)\)', goal_formula)
         hand_ids_in_goal = set()
         artifact_ids_in_isHeldBy = set()
         for artifact_id, hand_id in isHeldBy_matches:
@@ -722,6 +643,12 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
                 print(f"  {warning}")
             print("  This may cause planning to fail if required affordances are missing.\n")
         
+        debug_log["object_index"] = {
+            "version": object_index.version,
+            "individuals": len(object_index.ids),
+            "stats": dict(object_index.stats)
+        }
+
         # Always add affordance validation info to debug log (even if no issues)
         debug_log["affordance_validation"] = {
             "warnings": affordance_warnings,
@@ -733,6 +660,33 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
             }
         }
 
+        # Relevance pruning: backchain from the goal through domain action schemas
+        # and drop objects/facts that cannot contribute to reaching the goal
+        print(f"\n✂️  Relevance pruning (backchaining from goal through action schemas)...")
+        pruned = RelevanceAnalyzer(parser).prune_problem(
+            goal_formula,
+            types_map,
+            topology,
+            robot_info,
+            artifact_locs,
+            affordances_map,
+            door_states,
+            key_safe_rels
+        )
+        prune_stats = pruned["stats"]
+        types_map = pruned["types_map"]
+        topology = pruned["topology"]
+        robot_info = pruned["robot_info"]
+        artifact_locs = pruned["artifact_locs"]
+        affordances_map = pruned["affordances_map"]
+        door_states = pruned["door_states"]
+        key_safe_rels = pruned["key_safe_rels"]
+        debug_log["relevance_pruning"] = prune_stats
+        print(f"   Objects: {prune_stats['objects_before']} -> {prune_stats['objects_after']} "
+              f"({prune_stats['objects_pruned']} pruned)")
+        print(f"   Init facts: {prune_stats['facts_before']} -> {prune_stats['facts_after']} "
+              f"({prune_stats['facts_pruned']} pruned)")
+
         # Write problem file in log directory
         problem_path = log_dir / "problem.pddl"
         debug_log["files"]["problem"] = str(problem_path)
@@ -795,6 +749,7 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
             "locations": location_count,
             "robot_id": robot_info['robot_id'],
             "robot_location": robot_info.get('location'),
+            "content_hash": writer.content_hash,
             "artifact_ids": artifact_ids,
             "location_ids": list(location_ids)
         }
@@ -803,14 +758,12 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
         print(f"  Goal: {goal_formula}")
         print(f"  Objects: {len(types_map)} ({artifact_count} artifacts, {location_count} locations)")
 
-        driver.close()
-
-        # Run Fast Downward
-        fd_path = base_dir / "fast-downward" / "fast-downward.py"
-        if not fd_path.exists():
-            return f"ERROR: Fast Downward not found at {fd_path}"
+        # Run Fast Downward (in log_dir, so concurrent runs keep their own sas_plan)
+        if not FAST_DOWNWARD_PATH.exists():
+            return f"ERROR: Fast Downward not found at {FAST_DOWNWARD_PATH}"
 
-        search_cmd = build_planner_command()
+        planner = get_planner_settings()
+        search_cmd = build_planner_command(planner.solver, planner.heuristic, planner.weight)
         solution_path = log_dir / "solution.plan"
         debug_log["files"]["solution"] = str(solution_path)
         debug_log["planner"] = {
@@ -818,68 +771,35 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
             "domain": str(domain_path),
             "problem": str(problem_path)
         }
-        sas_plan_path = base_dir / "sas_plan"
-
-        result = subprocess.run(
-            [
-                "python", str(fd_path),
-                str(domain_path),
-                str(problem_path),
-                "--search", search_cmd
-            ],
-            capture_output=True,
-            text=True,
-            cwd=base_dir,
-            timeout=60
-        )
-        
-        debug_log["planner"]["returncode"] = result.returncode
-        debug_log["planner"]["stdout"] = result.stdout
-        debug_log["planner"]["stderr"] = result.stderr
+
+        result = run_fast_downward(domain_path, problem_path, log_dir, search_cmd, planner.timeout)
+
+        if result["status"] == "timeout":
+            debug_log["status"] = "timeout"
+            debug_log["error"] = {"type": "timeout", "timeout_seconds": planner.timeout}
+            log_path = log_dir / "debug.json"
+            debug_log["files"]["log"] = str(log_path)
+            with open(log_path, 'w') as f:
+                json.dump(debug_log, f, indent=2)
+            return f"ERROR: Planner timed out after {planner.timeout} seconds\nDebug log: {log_path}"
+
+        debug_log["planner"]["returncode"] = result["returncode"]
+        debug_log["planner"]["stdout"] = result["stdout"]
+        debug_log["planner"]["stderr"] = result["stderr"]
 
         # Check result
-        if result.returncode == 0:
+        if result["returncode"] == 0:
             # Success - read solution
-            if sas_plan_path.exists():
-                shutil.copy(sas_plan_path, solution_path)
-                sas_plan_path.unlink()
-
             if solution_path.exists():
+                metrics = result["metrics"]
+                plan_length = result["plan_length"]
+                plan_cost = result["plan_cost"]
+                action_lines = result["actions"]
+
+                # Cost comment written by the planner (e.g. "; cost = 12 (general cost)")
                 with open(solution_path, 'r') as f:
-                    solution_content = f.read()
-
-                # Extract plan metrics
-                metrics = []
-                plan_length = None
-                plan_cost = None
-                for line in result.stdout.split('\n'):
-                    if 'Plan length' in line:
-                        metrics.append(line.strip())
-                        # Extract number
-                        match = re.search(r'(\d+)', line)
-                        if match:
-                            plan_length = int(match.group(1))
-                    elif 'Plan cost' in line:
-                        metrics.append(line.strip())
-                        # Extract number
-                        match = re.search(r'(\d+)', line)
-                        if match:
-                            plan_cost = int(match.group(1))
-
-                # Parse solution content and format nicely
-                plan_lines = solution_content.strip().split('\n')
-                action_lines = []
-                cost_line = None
-                
-                for line in plan_lines:
-                    line = line.strip()
-                    if not line or line.startswith(';'):
-                        if 'cost' in line.lower():
-                            cost_line = line
-                        continue
-                    # Only include action lines (lines starting with '(')
-                    if line.startswith('('):
-                        action_lines.append(line)
+                    cost_line = next((line.strip() for line in f
+                                      if line.strip().startswith(';') and 'cost' in line.lower()), None)
 
                 # Format plan with numbered steps
                 formatted_plan = []
@@ -899,6 +819,15 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
                 }
                 debug_log["files"]["solution"] = str(solution_path)
 
+                # Keep problem and plan so execution can replan incrementally (optional bookkeeping:
+                # a problem the replanner cannot read must not turn the plan into an error)
+                try:
+                    replanner = get_replanner()
+                    replanner.search_cmd, replanner.timeout = search_cmd, planner.timeout
+                    replanner.load(domain_path, problem_path, action_lines)
+                except Exception as e:
+                    print(f"  ⚠️  Incremental replanner not loaded: {type(e).__name__}: {e}")
+
                 # Format response with file paths for debugging
                 response = "SUCCESS:\n\n"
                 response += "Plan:\n"
@@ -918,14 +847,14 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
                 
                 return response
             else:
-                return f"SUCCESS: Planning completed but solution file not found.\n\nFiles saved in: {log_dir}\nProblem file: {problem_path}\nPlanner output:\n{result.stdout}"
+                return f"SUCCESS: Planning completed but solution file not found.\n\nFiles saved in: {log_dir}\nProblem file: {problem_path}\nPlanner output:\n{result['stdout']}"
 
         else:
             # Failure - update debug log and return error logs
             debug_log["status"] = "failed"
             debug_log["error"] = {
                 "type": "planner_error",
-                "returncode": result.returncode
+                "returncode": result["returncode"]
             }
             
             # Save debug log even on failure
@@ -939,9 +868,9 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
             error_msg += f"Files saved in: {log_dir}\n"
             error_msg += f"  - problem.pddl\n"
             error_msg += f"  - debug.json\n\n"
-            error_msg += "STDOUT:\n" + result.stdout + "\n\n"
-            if result.stderr:
-                error_msg += "STDERR:\n" + result.stderr
+            error_msg += "STDOUT:\n" + result["stdout"] + "\n\n"
+            if result["stderr"]:
+                error_msg += "STDERR:\n" + result["stderr"]
             error_msg += f"\n\nTo debug:\n"
             error_msg += f"  1. Check problem file: {problem_path}\n"
             error_msg += f"  2. Check domain file: {domain_path}\n"
@@ -949,17 +878,6 @@ def pddl_plan(goal_formula: str, task_description: str = None) -> str:
             error_msg += f"  4. Verify goal formula and object IDs in Neo4j\n"
             return error_msg
 
-    except subprocess.TimeoutExpired:
-        debug_log["status"] = "timeout"
-        debug_log["error"] = {"type": "timeout", "timeout_seconds": 60}
-        log_path = log_dir / "debug.json"
-        debug_log["files"]["log"] = str(log_path)
-        try:
-            with open(log_path, 'w') as f:
-                json.dump(debug_log, f, indent=2)
-            return f"ERROR: Planner timed out after 60 seconds\nDebug log: {log_path}"
-        except:
-            return f"ERROR: Planner timed out after 60 seconds"
     except Exception as e:
         debug_log["status"] = "error"
         debug_log["error"] = {
@@ -1,17 +1,12 @@
 """TTL Reader Tool - Read and parse TTL files to extract object information."""
 
-import sys
 import re
 from pathlib import Path
 from typing import Dict, List, Any
-from rdflib import Graph, Namespace, RDF
 
-# Add ontology_server to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "ontology_server"))
+from ontology_server.core.config import get_config
 
-from core.config import get_config
-from core.env import EnvManager
+project_root = Path(__file__).parent.parent.parent
 
 
 def read_ttl_file(ttl_path: Path) -> Dict[str, Any]:
@@ -24,6 +19,8 @@ def read_ttl_file(ttl_path: Path) -> Dict[str, Any]:
     Returns:
         Dictionary with objects, categories, locations, and affordances
     """
+    from rdflib import Graph, Namespace, RDF
+
     g = Graph()
     g.parse(str(ttl_path), format='turtle')
     
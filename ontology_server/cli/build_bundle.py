@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Environment Bundle Builder
+Precompile environments (reasoned world, Neo4j rows, embedding matrix, topology) for fast switching
+via POST /spaces/{env_id}/activate
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+
+def main():
+    """Main function for command-line usage."""
+    # Add parent directory to path for imports
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+    import owlready2 as owl
+    from ontology_server.core.config import get_config
+    from ontology_server.core.env import EnvManager
+    from ontology_server.core.env_bundle import EnvBundle, build_bundle
+    from ontology_server.core.world_cache import WorldCache
+
+    parser = argparse.ArgumentParser(description="Build environment bundles for /spaces/{env_id}/activate")
+    parser.add_argument("env_ids", nargs="*", help="Environments to build (default: all)")
+    parser.add_argument("--force", action="store_true", help="Rebuild bundles that are up to date")
+    parser.add_argument("--no-reason", action="store_true", help="Skip HermiT (asserted triples only)")
+    parser.add_argument("--activate", metavar="ENV_ID", help="Activate this environment on the running server")
+    args = parser.parse_args()
+
+    env_manager = EnvManager()
+    bundles_dir = Path(get_config().get_persistence_config()['bundles_dir'])
+    owl_path = env_manager.get_ontology_path()
+    fingerprint = WorldCache.schema_fingerprint(owl_path, owl.VERSION)
+    env_ids = args.env_ids or [env["env_id"] for env in env_manager.list_envs()]
+
+    print("Environment Bundle Builder")
+    print("=" * 50)
+    print(f"Ontology: {owl_path}")
+    print(f"Bundles:  {bundles_dir}")
+    print()
+
+    failed = 0
+    for env_id in env_ids:
+        static_path = env_manager.get_static_file_path(env_id)
+        if not env_manager.env_exists(env_id) or not static_path:
+            print(f"  ❌ {env_id}: environment or static.ttl not found")
+            failed += 1
+            continue
+
+        bundle = EnvBundle(bundles_dir / env_id)
+        reason = bundle.check(fingerprint)
+        if reason is None and not args.force:
+            print(f"  ✓ {env_id}: up to date")
+            continue
+
+        print(f"Building {env_id} ({reason or 'forced'})...")
+        ttl_paths = [p for p in (static_path, env_manager.get_dynamic_file_path(env_id)) if p]
+        result = build_bundle(owl_path, env_id, ttl_paths, env_manager.get_env_path(env_id),
+                              bundle.bundle_dir, reason=not args.no_reason)
+        if result["status"] != "success":
+            print(f"  ❌ {env_id}: {result.get('message')}")
+            failed += 1
+            continue
+        print(f"  ✓ {env_id}: {result['individuals']} individuals, {result['relationships']} relationships, "
+              f"{result['embeddings']} embeddings, {result['locations']} locations")
+        print(f"    Build timings (ms): {result['timings']}")
+
+    if args.activate:
+        from ontology_server.core.client import get_client
+
+        print(f"\nActivating {args.activate} on the server...")
+        result = get_client().activate_env(args.activate)
+        if result.get("status") != "success":
+            print(f"  ❌ {result.get('message')}")
+            sys.exit(1)
+        print(f"  ✓ Activated in {sum(result.get('timings', {}).values()):.0f} ms: {result.get('timings')}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
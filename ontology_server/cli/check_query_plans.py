@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Query Plan Check
+EXPLAIN the Cypher queries of GraphTools, PDDLGenerator and pddl_goal_utils against a
+populated Neo4j database and fail if any of them plans a full node scan (AllNodesScan)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+
+def main():
+    """Main function for command-line usage."""
+    # Add parent directory to path for imports
+    project_root = Path(__file__).parent.parent.parent
+    sys.path.insert(0, str(project_root / "ontology_server"))
+    sys.path.insert(0, str(project_root / "pddl"))
+
+    from core.config import get_config
+    from core.neo4j_pool import close_drivers, get_driver
+    from core.query_plans import PlanChecker
+    from tools.graph_tools import GraphTools
+    from scripts.pddl_parser import PDDLDomainParser
+    from scripts.pddl_generator import PDDLGenerator
+    from scripts.pddl_goal_utils import filter_valid_object_ids
+    from scripts.pddl_object_index import ObjectIndex
+
+    parser = argparse.ArgumentParser(description="Fail if a registered Cypher query plans an AllNodesScan")
+    parser.add_argument("--database", help="Neo4j database to check (default: default database)")
+    parser.add_argument("--verbose", action="store_true", help="Print the operators of every statement")
+    args = parser.parse_args()
+
+    neo4j_config = get_config().get_neo4j_config()
+    driver = get_driver()
+    checker = PlanChecker(driver, database=args.database)
+
+    # Sample IDs from the loaded environment
+    with driver.session(database=args.database) as session:
+        samples = {record["cls"]: record["ids"] for record in session.run("""
+            MATCH (n:Individual)-[:INSTANCE_OF]->(c:Class)
+            WHERE c.name IN ['Space', 'Door', 'Artifact', 'Robot']
+            RETURN c.name AS cls, collect(n.id)[..3] AS ids
+        """)}
+    spaces, doors, artifacts = (samples.get(cls, []) for cls in ("Space", "Door", "Artifact"))
+    if not spaces or not artifacts:
+        print("ERROR: No Space/Artifact individuals in Neo4j. Load an environment first.")
+        close_drivers()
+        sys.exit(1)
+    all_ids = spaces + doors + artifacts + samples.get("Robot", [])
+
+    tools = GraphTools(neo4j_config['uri'], neo4j_config['user'], neo4j_config['password'])
+    tools.driver = checker
+    domain_parser = PDDLDomainParser(project_root / "pddl" / "domain.pddl")
+    generator = PDDLGenerator(checker, domain_parser)
+    object_index = ObjectIndex(checker, domain_parser)
+
+    # Registered queries: name -> call that runs them
+    registry = {
+        "GraphTools.get_object_info": lambda: tools.get_object_info(all_ids),
+        "GraphTools.filter_objects(class, relationship)": lambda: tools.filter_objects(
+            class_name="Artifact", relationships={"isInSpace": spaces[0]}),
+        "GraphTools.filter_objects(category)": lambda: tools.filter_objects(category="cup"),
+        "PDDLGenerator.get_types": lambda: generator.get_types(all_ids),
+        "PDDLGenerator.get_robot_info": generator.get_robot_info,
+        "PDDLGenerator.get_locations_with_paths": lambda: generator.get_locations_with_paths(spaces + doors),
+        "PDDLGenerator.get_topology": lambda: generator.get_topology(set(spaces + doors)),
+        "PDDLGenerator.get_artifact_locations": lambda: generator.get_artifact_locations(artifacts + ["missing_0"]),
+        "PDDLGenerator.get_affordances": lambda: generator.get_affordances(artifacts),
+        "PDDLGenerator.get_door_states": lambda: generator.get_door_states(doors),
+        "PDDLGenerator.get_key_safe_relationships": lambda: generator.get_key_safe_relationships(artifacts),
+        "PDDLGenerator.get_artifact_states": lambda: generator.get_artifact_states(artifacts),
+        "pddl_goal_utils.filter_valid_object_ids": lambda: filter_valid_object_ids(set(all_ids), checker),
+        "ObjectIndex.load": object_index.load,
+    }
+
+    print("Query Plan Check")
+    print("=" * 50)
+    print(f"Database: {args.database or 'default'}")
+    print(f"Samples:  {len(spaces)} spaces, {len(doors)} doors, {len(artifacts)} artifacts")
+    print()
+
+    failed = 0
+    for name, call in registry.items():
+        checker.current = name
+        try:
+            call()
+        except Exception as e:
+            print(f"  ❌ {name}: {e}")
+            failed += 1
+    close_drivers()
+
+    if args.verbose:
+        for statement in checker.statements:
+            print(f"  {statement['name']}: {' <- '.join(statement['operators'])}")
+    scans = checker.full_scans()
+    for statement in scans:
+        print(f"  ❌ {statement['name']} plans a full node scan:")
+        print(f"     {statement['query'][:200]}")
+
+    print(f"\n{len(checker.statements)} statement(s) planned, {len(scans)} with AllNodesScan, {failed} failed")
+    if scans or failed:
+        sys.exit(1)
+    print(" ✓ No full node scans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Read Routing Check
+Write/read-back rounds through the shared driver to verify that bookmarked read sessions never
+return stale data, then measure read throughput and which servers answered the reads.
+Against a cluster (neo4j:// routing URI) reads should spread over the followers/read replicas.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+
+def main():
+    """Main function for command-line usage."""
+    # Add parent directory to path for imports
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+    from ontology_server.core.neo4j_pool import close_drivers, execute_write, get_driver, pool_metrics, read_session
+
+    parser = argparse.ArgumentParser(description="Check read routing and read-your-writes through bookmarks")
+    parser.add_argument("--uri", help="Neo4j URI (default: neo4j.uri from config.yaml; use neo4j:// for a cluster)")
+    parser.add_argument("--database", help="Database (default: default database)")
+    parser.add_argument("--rounds", type=int, default=50, help="Write/read-back rounds")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads for the throughput run")
+    parser.add_argument("--reads", type=int, default=200, help="Reads per reader thread")
+    args = parser.parse_args()
+
+    driver = get_driver(args.uri)
+
+    print("Read Routing Check")
+    print("=" * 50)
+    print(f"Database: {args.database or 'default'}")
+    print()
+
+    # 1. Read-your-writes: every read right after a write must see it
+    stale = 0
+    servers = Counter()
+    for seq in range(1, args.rounds + 1):
+        execute_write("MERGE (p:RoutingProbe {id: 'probe'}) SET p.seq = $seq", {"seq": seq},
+                      database=args.database, driver=driver)
+        with read_session(driver, args.database) as session:
+            result = session.run("MATCH (p:RoutingProbe {id: 'probe'}) RETURN p.seq AS seq")
+            record = result.single()
+            servers[str(result.consume().server.address)] += 1
+        if record is None or record["seq"] != seq:
+            stale += 1
+            print(f"  ❌ Round {seq}: read {record['seq'] if record else None}")
+    print(f"  {'✓' if not stale else '❌'} Read-your-writes: {args.rounds - stale}/{args.rounds} rounds fresh")
+
+    # 2. Read throughput over concurrent read sessions
+    def reader(counts: Counter):
+        for _ in range(args.reads):
+            with read_session(driver, args.database) as session:
+                result = session.run("MATCH (p:RoutingProbe {id: 'probe'}) RETURN p.seq AS seq")
+                result.single()
+                counts[str(result.consume().server.address)] += 1
+
+    counters = [Counter() for _ in range(args.readers)]
+    threads = [threading.Thread(target=reader, args=(counts,)) for counts in counters]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    for counts in counters:
+        servers.update(counts)
+    total = args.readers * args.reads
+    print(f"  ✓ Throughput: {total} reads in {elapsed:.2f} s ({total / elapsed:.0f} reads/s, "
+          f"{args.readers} readers)")
+    print("  Reads per server:")
+    for address, count in servers.most_common():
+        print(f"    {address}: {count}")
+
+    execute_write("MATCH (p:RoutingProbe) DELETE p", database=args.database, driver=driver)
+    print(f"\nDriver metrics: {pool_metrics()['drivers'][0]}")
+    close_drivers()
+
+    if stale:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
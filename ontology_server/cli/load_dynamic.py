@@ -5,7 +5,6 @@ Load dynamic instances from TTL file and send to ontology manager
 Reads active space from config.yaml
 """
 
-import requests
 from pathlib import Path
 from typing import Dict, Any, Optional
 import sys
@@ -16,12 +15,9 @@ class DynamicLoader:
 
     def __init__(self, api_url: Optional[str] = None):
         """Initialize dynamic loader."""
-        if api_url is None:
-            from ontology_server.core.config import get_config
-            config = get_config()
-            server_config = config.get_server_config()
-            api_url = server_config.get('base_url', 'http://localhost:8000')
-        self.api_url = api_url
+        from ontology_server.core.client import get_client
+        self.client = get_client(api_url)
+        self.api_url = self.client.base_url
 
     def load_from_ttl(self, ttl_path: str) -> Dict[str, Any]:
         """
@@ -44,30 +40,17 @@ class DynamicLoader:
             # Send to API
             print(f"Sending request to server...")
 
-            try:
-                response = requests.post(
-                    f"{self.api_url}/load_ttl",
-                    json={"file_path": str(ttl_path)},
-                    timeout=120
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    added_count = result.get("added", 0)
-                    failed_count = result.get("failed", 0)
-
-                    print(f"\n Successfully loaded {added_count} individuals")
-                    if failed_count > 0:
-                        print(f"WARNING: Failed to load {failed_count} individuals")
-                    print(f"Status: Status: {result.get('status', 'unknown')}")
-                else:
-                    error_detail = response.json().get("detail", "Unknown error")
-                    print(f"ERROR: Request failed: {error_detail}")
-                    return {"status": "error", "message": error_detail}
-
-            except Exception as e:
-                print(f"ERROR: Error in request: {e}")
-                return {"status": "error", "message": str(e)}
+            result = self.client.load_ttl(ttl_path, timeout=120)
+            if result.get("status") == "error":
+                print(f"ERROR: Request failed: {result.get('message')}")
+                return result
+
+            added_count = result.get("added", 0)
+            failed_count = result.get("failed", 0)
+            print(f"\n Successfully loaded {added_count} individuals")
+            if failed_count > 0:
+                print(f"WARNING: Failed to load {failed_count} individuals")
+            print(f"Status: Status: {result.get('status', 'unknown')}")
 
             return {
                 "status": "success",
@@ -81,21 +64,12 @@ class DynamicLoader:
 
     def check_server(self) -> bool:
         """Check if ontology manager server is running."""
-        try:
-            response = requests.get(f"{self.api_url}/health", timeout=5)
-            if response.status_code == 200:
-                print(f" Server is running at {self.api_url}")
-                return True
-            else:
-                print(f"ERROR: Server returned status {response.status_code}")
-                return False
-        except requests.exceptions.ConnectionError:
-            print(f"ERROR: Cannot connect to server at {self.api_url}")
-            print("  Make sure the server is running: python cli/run_server.py")
-            return False
-        except Exception as e:
-            print(f"ERROR: Error checking server: {e}")
-            return False
+        if self.client.health():
+            print(f" Server is running at {self.api_url}")
+            return True
+        print(f"ERROR: Cannot reach server at {self.api_url}")
+        print("  Make sure the server is running: python cli/run_server.py")
+        return False
 
 
 def main():
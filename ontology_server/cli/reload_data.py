@@ -5,7 +5,6 @@ Reloads TTL data to Neo4j without restarting server or Docker.
 This is faster than reset_neo4j.sh + start.sh
 """
 
-import requests
 import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -13,6 +12,7 @@ from typing import Dict, Any, Optional
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from ontology_server.core.client import get_client
 from ontology_server.core.config import get_config
 from ontology_server.core.env import EnvManager
 
@@ -22,29 +22,17 @@ class FastReloader:
 
     def __init__(self, api_url: Optional[str] = None):
         """Initialize fast reloader."""
-        if api_url is None:
-            config = get_config()
-            server_config = config.get_server_config()
-            api_url = server_config.get('base_url', 'http://localhost:8000')
-        self.api_url = api_url
+        self.client = get_client(api_url)
+        self.api_url = self.client.base_url
 
     def check_server(self) -> bool:
         """Check if ontology manager server is running."""
-        try:
-            response = requests.get(f"{self.api_url}/health", timeout=5)
-            if response.status_code == 200:
-                print(f"✓ Server is running at {self.api_url}")
-                return True
-            else:
-                print(f"✗ Server returned status {response.status_code}")
-                return False
-        except requests.exceptions.ConnectionError:
-            print(f"✗ Cannot connect to server at {self.api_url}")
-            print("  Make sure the server is running: python cli/run_server.py")
-            return False
-        except Exception as e:
-            print(f"✗ Error checking server: {e}")
-            return False
+        if self.client.health():
+            print(f"✓ Server is running at {self.api_url}")
+            return True
+        print(f"✗ Cannot reach server at {self.api_url}")
+        print("  Make sure the server is running: python cli/run_server.py")
+        return False
 
     def clear_neo4j_individuals(self) -> bool:
         """
@@ -52,26 +40,12 @@ class FastReloader:
         This is faster than deleting all nodes.
         """
         try:
-            # Use direct Neo4j connection to clear individuals
-            from ontology_server.core.ontology import OntologyManager
-            
-            # Get manager instance (this will connect to Neo4j)
-            config = get_config()
-            neo4j_config = config.get_neo4j_config()
-            
-            from neo4j import GraphDatabase
-            driver = GraphDatabase.driver(
-                neo4j_config['uri'],
-                auth=(neo4j_config['user'], neo4j_config['password'])
-            )
-            
-            with driver.session() as session:
-                result = session.run("MATCH (i:Individual) DETACH DELETE i RETURN count(i) as deleted")
-                record = result.single()
-                deleted_count = record["deleted"] if record else 0
-                print(f"✓ Cleared {deleted_count} individual nodes from Neo4j")
-            
-            driver.close()
+            # Direct write through the shared driver (managed transaction, retried on transient errors)
+            from ontology_server.core.neo4j_pool import execute_write
+
+            records = execute_write("MATCH (i:Individual) DETACH DELETE i RETURN count(i) as deleted")
+            deleted_count = records[0]["deleted"] if records else 0
+            print(f"✓ Cleared {deleted_count} individual nodes from Neo4j")
             return True
         except Exception as e:
             print(f"✗ Failed to clear Neo4j individuals: {e}")
@@ -79,57 +53,37 @@ class FastReloader:
 
     def reload_static(self, ttl_path: str) -> Dict[str, Any]:
         """Reload static TTL data."""
-        try:
-            print(f"\n📂 Loading static data from: {ttl_path}")
-            response = requests.post(
-                f"{self.api_url}/load_ttl",
-                json={"file_path": str(ttl_path)},
-                timeout=300
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                added_count = result.get("added", 0)
-                failed_count = result.get("failed", 0)
-                print(f"✓ Successfully loaded {added_count} static individuals")
-                if failed_count > 0:
-                    print(f"⚠ Failed to load {failed_count} individuals")
-                return result
-            else:
-                error_detail = response.json().get("detail", "Unknown error")
-                print(f"✗ Request failed: {error_detail}")
-                return {"status": "error", "message": error_detail}
-
-        except Exception as e:
-            print(f"✗ Error loading static data: {e}")
-            return {"status": "error", "message": str(e)}
+        print(f"\n📂 Loading static data from: {ttl_path}")
+        result = self.client.load_ttl(ttl_path, timeout=300)
+        if result.get("status") == "error":
+            print(f"✗ Error loading static data: {result.get('message')}")
+            return result
+
+        added_count = result.get("added", 0)
+        failed_count = result.get("failed", 0)
+        print(f"✓ Successfully loaded {added_count} static individuals")
+        if failed_count > 0:
+            print(f"⚠ Failed to load {failed_count} individuals")
+        if result.get("timings"):
+            print(f"  Timings (ms): {result['timings']}")
+        return result
 
     def reload_dynamic(self, ttl_path: str) -> Dict[str, Any]:
         """Reload dynamic TTL data."""
-        try:
-            print(f"\n📂 Loading dynamic data from: {ttl_path}")
-            response = requests.post(
-                f"{self.api_url}/load_ttl",
-                json={"file_path": str(ttl_path)},
-                timeout=300
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                added_count = result.get("added", 0)
-                failed_count = result.get("failed", 0)
-                print(f"✓ Successfully loaded {added_count} dynamic individuals")
-                if failed_count > 0:
-                    print(f"⚠ Failed to load {failed_count} individuals")
-                return result
-            else:
-                error_detail = response.json().get("detail", "Unknown error")
-                print(f"✗ Request failed: {error_detail}")
-                return {"status": "error", "message": error_detail}
-
-        except Exception as e:
-            print(f"✗ Error loading dynamic data: {e}")
-            return {"status": "error", "message": str(e)}
+        print(f"\n📂 Loading dynamic data from: {ttl_path}")
+        result = self.client.load_ttl(ttl_path, timeout=300)
+        if result.get("status") == "error":
+            print(f"✗ Error loading dynamic data: {result.get('message')}")
+            return result
+
+        added_count = result.get("added", 0)
+        failed_count = result.get("failed", 0)
+        print(f"✓ Successfully loaded {added_count} dynamic individuals")
+        if failed_count > 0:
+            print(f"⚠ Failed to load {failed_count} individuals")
+        if result.get("timings"):
+            print(f"  Timings (ms): {result['timings']}")
+        return result
 
 
 def main():
@@ -203,6 +157,8 @@ def main():
     print("=" * 60)
     print(f"Static: {static_result.get('added', 0)} individuals")
     print(f"Dynamic: {dynamic_result.get('added', 0)} individuals")
+    for endpoint, stats in reloader.client.stats().items():
+        print(f"{endpoint}: {stats['calls']} call(s), {stats['avg_ms']} ms avg")
     print("\nNote: Server and Neo4j are still running - no restart needed!")
 
 
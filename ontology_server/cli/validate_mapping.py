@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Relationship Mapping Validator
+Check action/relationship_mapping.json against the object property axioms in robot.owx
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def main():
+    """Main function for command-line usage."""
+    # Add parent directory to path for imports
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+    from ontology_server.core.relationship_mapping import validate_mapping
+
+    project_root = Path(__file__).parent.parent.parent
+    parser = argparse.ArgumentParser(description="Validate relationship_mapping.json against robot.owx")
+    parser.add_argument("--mapping", type=Path, default=project_root / "action" / "relationship_mapping.json")
+    parser.add_argument("--ontology", type=Path, default=project_root / "ontology_server" / "data" / "robot.owx")
+    args = parser.parse_args()
+
+    for path in (args.mapping, args.ontology):
+        if not path.exists():
+            print(f"ERROR: File not found: {path}")
+            sys.exit(1)
+
+    print("Relationship Mapping Validator")
+    print("=" * 50)
+    print(f"Mapping:  {args.mapping}")
+    print(f"Ontology: {args.ontology}")
+    print()
+
+    with open(args.mapping, "r", encoding="utf-8") as f:
+        result = validate_mapping(json.load(f), args.ontology)
+
+    for error in result["errors"]:
+        print(f"  ❌ {error}")
+    for warning in result["warnings"]:
+        print(f"  ⚠️  {warning}")
+
+    if result["errors"]:
+        print(f"\n{len(result['errors'])} error(s), {len(result['warnings'])} warning(s)")
+        sys.exit(1)
+    print(f"\n ✓ Mapping matches ontology ({len(result['warnings'])} warning(s))")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,22 @@
 """
 Core Module - Ontology Management
+Exports are imported on first access, so `core.config` or `core.client` do not load owlready2, Neo4j and FastAPI.
 """
-from .ontology import OntologyManager
-from .env import EnvManager
-from .config import get_config
-from .api import app
+import importlib
+
+_EXPORTS = {
+    'OntologyManager': '.ontology',
+    'EnvManager': '.env',
+    'get_config': '.config',
+    'app': '.api',
+}
 
 __all__ = ['OntologyManager', 'EnvManager', 'get_config', 'app']
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -4,21 +4,109 @@ FastAPI Server for Ontology Management
 Real-time REST API for ontology operations
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from .ontology import OntologyManager
 from .env import EnvManager
+from .env_bundle import EnvBundle
+from .env_pool import EnvPool, HostedEnv
+from .world_cache import WorldCache
 from .embedding import EmbeddingManager
-from .config import get_config
+from .config import get_config, get_settings
+from .neo4j_pool import close_drivers, pool_metrics
 from .models import IndividualData, IndividualUpdate, StatusResponse, OperationResponse, BatchIndividualsData
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import gzip
 import os
+import owlready2 as owl
+import time
 
 # Global manager instances
-manager: OntologyManager = None
+pool: Optional[EnvPool] = None  # hosted environments, one OntologyManager each
 env_manager: EnvManager = None
-current_env_id: Optional[str] = None
+query_embedder: Optional[EmbeddingManager] = None  # built from the embedding settings on first search
+
+
+def get_query_embedder() -> EmbeddingManager:
+    """EmbeddingManager for search queries (rebuilt after the embedding settings change)."""
+    global query_embedder
+    if query_embedder is None:
+        embedding = get_settings().embedding
+        query_embedder = EmbeddingManager(
+            category_model=embedding.category.model,
+            category_dimensions=embedding.category.dimensions,
+            description_model=embedding.description.model,
+            description_dimensions=embedding.description.dimensions
+        )
+    return query_embedder
+
+
+def on_embedding_settings_changed(keys: List[str], settings):
+    """Drop the query embedder so the next search embeds queries with the new model."""
+    global query_embedder
+    query_embedder = None
+    print(f"Embedding settings changed ({', '.join(keys)}): query embedder reset")
+    print("  NOTE: Stored embeddings and vector indexes are rebuilt with the new model after a restart")
+
+
+def get_world_path(env_id: Optional[str]) -> Optional[str]:
+    """Persistent world file of an environment (None if persistence is disabled)."""
+    persistence_config = get_config().get_persistence_config()
+    if not persistence_config['enabled']:
+        return None
+    return str(Path(persistence_config['dir']) / f"world_{env_id or 'default'}.sqlite3")
+
+
+def get_bundle(env_id: str) -> EnvBundle:
+    """Bundle directory of an environment (see cli/build_bundle.py)."""
+    return EnvBundle(Path(get_config().get_persistence_config()['bundles_dir']) / env_id)
+
+
+def get_neo4j_database(env_id: Optional[str]) -> Optional[str]:
+    """Neo4j database of an environment from hosting.neo4j_database (None: default database)."""
+    template = get_config().get_hosting_config()['neo4j_database']
+    if not template or not env_id:
+        return None
+    return template.format(env=env_id.lower().replace('_', '-'))
+
+
+def open_env(env_id: Optional[str], populate: bool = True) -> OntologyManager:
+    """
+    Create the OntologyManager of an environment.
+
+    With populate, an environment that is not already in its persistent world
+    is loaded from its bundle if that is current, otherwise from its TTL files.
+    """
+    config = get_config()
+    neo4j_config = config.get_neo4j_config()
+
+    manager = OntologyManager(
+        owl_path=str(env_manager.get_ontology_path()),
+        env_id=env_id,
+        neo4j_uri=neo4j_config['uri'],
+        neo4j_user=neo4j_config['user'],
+        neo4j_password=neo4j_config['password'],
+        # Persistent world (optional): reopened on restart while schema and TTL inputs are unchanged
+        world_path=get_world_path(env_id),
+        neo4j_database=get_neo4j_database(env_id)
+    )
+    if not populate or not env_id or (manager.warm_start and manager.world_cache.inputs):
+        return manager
+
+    bundle = get_bundle(env_id)
+    if bundle.check(WorldCache.schema_fingerprint(Path(manager.owl_path), owl.VERSION)) is None:
+        results = [manager.activate_bundle(bundle, env_id)]
+    else:
+        ttl_paths = [env_manager.get_static_file_path(env_id), env_manager.get_dynamic_file_path(env_id)]
+        results = [manager.load_instances_from_ttl(str(path)) for path in ttl_paths if path]
+    errors = [r["message"] for r in results if r["status"] == "error"]
+    if errors:
+        manager.close()
+        raise RuntimeError("; ".join(errors))
+    return manager
 
 
 def get_lifespan(env_id: Optional[str] = None):
@@ -26,31 +114,32 @@ def get_lifespan(env_id: Optional[str] = None):
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         """Lifespan context manager for startup/shutdown."""
-        global manager, env_manager, current_env_id
+        global pool, env_manager
 
         # Startup
         print("Starting Ontology Manager Server...")
 
         # Initialize space manager
         env_manager = EnvManager()
-        current_env_id = env_id
 
-        # Get ontology path
-        ontology_path = str(env_manager.get_ontology_path())
-
-        # Get Neo4j config
         config = get_config()
-        neo4j_config = config.get_neo4j_config()
         server_config = config.get_server_config()
-
-        # Initialize ontology manager with space
-        manager = OntologyManager(
-            owl_path=ontology_path,
-            env_id=env_id,
-            neo4j_uri=neo4j_config['uri'],
-            neo4j_user=neo4j_config['user'],
-            neo4j_password=neo4j_config['password']
-        )
+        hosting_config = config.get_hosting_config()
+        max_envs = hosting_config['max_envs']
+        if max_envs > 1 and not hosting_config['neo4j_database']:
+            # Every manager clears and rebuilds its Neo4j database on startup
+            print("WARNING: hosting.max_envs > 1 needs hosting.neo4j_database (one database per "
+                  "environment); hosting one environment at a time")
+            max_envs = 1
+
+        pool = EnvPool(open_env, max_envs=max_envs, idle_timeout=hosting_config['idle_timeout'],
+                       default_env_id=env_id or config.get_active_env())
+
+        # The startup environment starts empty; start.sh / load_static.py load its TTLs
+        if pool.default_env_id:
+            pool.add(pool.default_env_id, open_env(pool.default_env_id, populate=False))
+        else:
+            print("WARNING: No active environment; requests must select one with X-Env-Id")
 
         if env_id:
             space_config = env_manager.get_env_config(env_id)
@@ -58,6 +147,10 @@ def get_lifespan(env_id: Optional[str] = None):
                 env_name = space_config.get('env_name', space_config.get('name', env_id))
                 print(f"Active environment: {env_name} ({env_id})")
 
+        # Hot reload: config.yaml is re-read while the server runs
+        config.subscribe(on_embedding_settings_changed, prefixes=["embedding"])
+        config.watch()
+
         print("Server ready!\n")
         base_url = server_config.get('base_url', 'http://localhost:8000')
         print(f"API Documentation: {base_url}/docs")
@@ -67,13 +160,87 @@ def get_lifespan(env_id: Optional[str] = None):
 
         # Shutdown
         print("\nShutting down Ontology Manager Server...")
-        if manager:
-            manager.close()
+        get_config().stop_watching()
+        if pool:
+            pool.close()
+        close_drivers()
         print("Server stopped")
 
     return lifespan
 
 
+class GZipRequestMiddleware:
+    """Decompress request bodies sent with Content-Encoding: gzip (see core.client)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (b"content-encoding", b"gzip") not in scope["headers"]:
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        try:
+            body = gzip.decompress(b"".join(chunks))
+        except (OSError, EOFError):
+            response = JSONResponse({"detail": "Invalid gzip request body"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        headers = [(k, v) for k, v in scope["headers"] if k not in (b"content-encoding", b"content-length")]
+        headers.append((b"content-length", str(len(body)).encode()))
+        body_sent = False
+
+        async def receive_body():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(dict(scope, headers=headers), receive_body, send)
+
+
+class EnvRoutingMiddleware:
+    """Route /envs/{env_id}/<path> to /<path> for that environment (sets the X-Env-Id header)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/envs/"):
+            env_id, _, rest = scope["path"][len("/envs/"):].partition("/")
+            headers = [(k, v) for k, v in scope["headers"] if k != b"x-env-id"]
+            headers.append((b"x-env-id", env_id.encode()))
+            path = "/" + rest
+            scope = dict(scope, path=path, raw_path=path.encode(), headers=headers)
+        await self.app(scope, receive, send)
+
+
+async def get_hosted_env(x_env_id: Optional[str] = Header(None)) -> HostedEnv:
+    """
+    Environment a request is for: the X-Env-Id header (or /envs/{env_id}/ prefix),
+    else the default environment. Environments are opened on first use.
+    """
+    if not pool or not env_manager:
+        raise HTTPException(status_code=503, detail="Manager not initialized")
+    env_id = x_env_id or pool.default_env_id
+    if not env_id:
+        raise HTTPException(status_code=400, detail="No environment selected (set X-Env-Id or active_env)")
+    if env_id not in pool and not env_manager.env_exists(env_id):
+        raise HTTPException(status_code=404, detail=f"Space '{env_id}' not found")
+    try:
+        return pool.get(env_id)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Environment '{env_id}' could not be loaded: {e}")
+
+
 # Get space from environment variable (for server startup)
 ENV_ID = os.getenv("ONTOLOGY_ENV_ID", None)
 
@@ -84,6 +251,9 @@ app = FastAPI(
     version="2.0.0",
     lifespan=get_lifespan(ENV_ID)
 )
+app.add_middleware(GZipRequestMiddleware)
+app.add_middleware(EnvRoutingMiddleware)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 
 @app.get("/", response_model=Dict[str, str])
@@ -97,18 +267,14 @@ async def root():
 
 
 @app.get("/status", response_model=StatusResponse)
-async def get_status():
+async def get_status(hosted: HostedEnv = Depends(get_hosted_env)):
     """Get current ontology status."""
-    if not manager:
-        raise HTTPException(status_code=503, detail="Manager not initialized")
-
-    status = manager.get_status()
+    status = hosted.manager.get_status()
     # Add space information
-    if current_env_id and env_manager:
-        space_config = env_manager.get_env_config(current_env_id)
-        if space_config:
-            status["env_id"] = current_env_id
-            status["env_name"] = space_config.get("env_name")
+    space_config = env_manager.get_env_config(hosted.env_id)
+    if space_config:
+        status["env_id"] = hosted.env_id
+        status["env_name"] = space_config.get("env_name")
     return status
 
 
@@ -123,11 +289,13 @@ async def list_spaces():
 
 @app.get("/spaces/summary")
 async def get_spaces_summary():
-    """Get summary of all spaces."""
+    """Get summary of all spaces, with the hosted ones and their memory use."""
     if not env_manager:
         raise HTTPException(status_code=503, detail="Space manager not initialized")
 
-    return env_manager.get_summary()
+    summary = env_manager.get_summary()
+    summary["hosting"] = pool.summary() if pool else None
+    return summary
 
 
 @app.get("/spaces/{env_id}")
@@ -144,23 +312,89 @@ async def get_space_info(env_id: str):
     static_path = env_manager.get_static_file_path(env_id)
     dynamic_path = env_manager.get_dynamic_file_path(env_id)
 
+    bundle = get_bundle(env_id)
     return {
         "config": config,
         "static_file": str(static_path) if static_path else None,
         "dynamic_file": str(dynamic_path) if dynamic_path else None,
-        "is_active": env_id == current_env_id
+        "bundle": bundle.manifest(),
+        "is_active": pool is not None and env_id == pool.default_env_id,
+        "is_hosted": pool is not None and env_id in pool
     }
 
 
+@app.post("/spaces/{env_id}/activate", response_model=OperationResponse)
+async def activate_space(env_id: str):
+    """
+    Make env_id the default environment (requests without X-Env-Id).
+
+    When only one environment is hosted at a time (hosting.max_envs: 1),
+    the hosted manager switches to env_id from its precompiled bundle: the
+    world and the Neo4j individuals are replaced in seconds instead of
+    reloading TTLs, reasoning and re-embedding. Build bundles first:
+
+        python cli/build_bundle.py Darden
+
+    A missing or outdated bundle (schema, TTL or embedding cache changed)
+    is rejected with 409. Otherwise (several hosted environments or one
+    Neo4j database per environment) env_id is opened like any request for
+    it would: from its bundle if current, else from its TTL files.
+    """
+    if not pool or not env_manager:
+        raise HTTPException(status_code=503, detail="Manager not initialized")
+    if not env_manager.env_exists(env_id):
+        raise HTTPException(status_code=404, detail=f"Space '{env_id}' not found")
+
+    if env_id in pool:
+        pool.default_env_id = env_id
+        pool.get(env_id)
+        return {"status": "success", "message": f"Space '{env_id}' already hosted"}
+
+    hosted = next(iter(pool.envs.values()), None)
+    if pool.max_envs > 1 or hosted is None or hosted.manager.neo4j_database != get_neo4j_database(env_id):
+        hosted = await get_hosted_env(env_id)
+        pool.default_env_id = env_id
+        return {"status": "success", "message": f"Space '{env_id}' opened",
+                "individuals": hosted.memory()["individuals"], "bookmarks": hosted.manager.last_bookmarks}
+
+    # Single environment on a shared Neo4j database: switch the hosted manager in place
+    manager = hosted.manager
+    bundle = get_bundle(env_id)
+    fingerprint = WorldCache.schema_fingerprint(Path(manager.owl_path), owl.VERSION)
+    reason = bundle.check(fingerprint)
+    if reason is not None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Bundle for '{env_id}' cannot be used ({reason}); run: python cli/build_bundle.py {env_id}"
+        )
+
+    manager.world_path = get_world_path(env_id)
+    result = manager.activate_bundle(bundle, env_id)
+    if result["status"] == "error":
+        raise HTTPException(status_code=500, detail=result["message"])
+
+    pool.rename(hosted.env_id, env_id)
+    pool.default_env_id = env_id
+    return result
+
+
+@app.get("/topology")
+async def get_topology(hosted: HostedEnv = Depends(get_hosted_env)):
+    """hasPathTo connections and hop distances between locations of the activated bundle."""
+    if hosted.manager.topology is None:
+        raise HTTPException(status_code=404, detail="No topology loaded (activate an environment bundle first)")
+
+    return dict(hosted.manager.topology, status="success", env_id=hosted.env_id)
+
+
 @app.post("/individuals", response_model=OperationResponse)
-async def add_individual(data: IndividualData):
+async def add_individual(data: IndividualData, hosted: HostedEnv = Depends(get_hosted_env)):
     """
     Add a new individual to the ontology.
 
     Automatically runs reasoner and syncs to Neo4j.
     """
-    if not manager:
-        raise HTTPException(status_code=503, detail="Manager not initialized")
+    manager = hosted.manager
 
     # Convert Pydantic model to dict
     individual_dict = {
@@ -171,6 +405,7 @@ async def add_individual(data: IndividualData):
     }
 
     result = manager.add_individual(individual_dict)
+    manager.mark_world_modified()
 
     if result["status"] == "error":
         raise HTTPException(status_code=400, detail=result["message"])
@@ -179,15 +414,14 @@ async def add_individual(data: IndividualData):
 
 
 @app.post("/individuals/batch", response_model=OperationResponse)
-async def add_individuals_batch(data: BatchIndividualsData):
+async def add_individuals_batch(data: BatchIndividualsData, hosted: HostedEnv = Depends(get_hosted_env)):
     """
     Add multiple individuals at once (batch operation).
 
     Runs reasoner only once after all individuals are added.
     Much faster than adding individuals one by one.
     """
-    if not manager:
-        raise HTTPException(status_code=503, detail="Manager not initialized")
+    manager = hosted.manager
 
     # Convert Pydantic models to dicts
     individuals_dicts = []
@@ -201,6 +435,7 @@ async def add_individuals_batch(data: BatchIndividualsData):
         individuals_dicts.append(individual_dict)
 
     result = manager.add_individuals_batch(individuals_dicts)
+    manager.mark_world_modified()
 
     if result["status"] == "error":
         raise HTTPException(status_code=400, detail=result["message"])
@@ -209,14 +444,13 @@ async def add_individuals_batch(data: BatchIndividualsData):
 
 
 @app.put("/individuals/{individual_id}", response_model=OperationResponse)
-async def update_individual(individual_id: str, data: IndividualUpdate):
+async def update_individual(individual_id: str, data: IndividualUpdate, hosted: HostedEnv = Depends(get_hosted_env)):
     """
     Update an existing individual.
 
     Automatically runs reasoner and syncs to Neo4j.
     """
-    if not manager:
-        raise HTTPException(status_code=503, detail="Manager not initialized")
+    manager = hosted.manager
 
     # Convert Pydantic model to dict
     update_dict = {}
@@ -226,6 +460,7 @@ async def update_individual(individual_id: str, data: IndividualUpdate):
         update_dict["object_properties"] = data.object_properties
 
     result = manager.update_individual(individual_id, update_dict)
+    manager.mark_world_modified()
 
     if result["status"] == "error":
         raise HTTPException(status_code=404, detail=result["message"])
@@ -234,16 +469,16 @@ async def update_individual(individual_id: str, data: IndividualUpdate):
 
 
 @app.delete("/individuals/{individual_id}", response_model=OperationResponse)
-async def delete_individual(individual_id: str):
+async def delete_individual(individual_id: str, hosted: HostedEnv = Depends(get_hosted_env)):
     """
     Delete an individual from the ontology.
 
     Automatically runs reasoner and syncs to Neo4j.
     """
-    if not manager:
-        raise HTTPException(status_code=503, detail="Manager not initialized")
+    manager = hosted.manager
 
     result = manager.delete_individual(individual_id)
+    manager.mark_world_modified()
 
     if result["status"] == "error":
         raise HTTPException(status_code=404, detail=result["message"])
@@ -252,7 +487,7 @@ async def delete_individual(individual_id: str):
 
 
 @app.post("/load_ttl", response_model=OperationResponse)
-async def load_ttl(file_path: dict):
+async def load_ttl(file_path: dict, hosted: HostedEnv = Depends(get_hosted_env)):
     """
     Load individuals from a TTL file.
 
@@ -263,8 +498,7 @@ async def load_ttl(file_path: dict):
 
     Automatically runs reasoner and syncs to Neo4j after loading.
     """
-    if not manager:
-        raise HTTPException(status_code=503, detail="Manager not initialized")
+    manager = hosted.manager
 
     ttl_path = file_path.get("file_path")
     if not ttl_path:
@@ -279,14 +513,13 @@ async def load_ttl(file_path: dict):
 
 
 @app.post("/sync", response_model=OperationResponse)
-async def sync_ontology():
+async def sync_ontology(hosted: HostedEnv = Depends(get_hosted_env)):
     """
     Manually trigger reasoner and Neo4j sync.
 
     Note: Sync is automatically triggered after add/update/delete operations.
     """
-    if not manager:
-        raise HTTPException(status_code=503, detail="Manager not initialized")
+    manager = hosted.manager
 
     result = manager.sync_to_neo4j()
 
@@ -297,7 +530,7 @@ async def sync_ontology():
 
 
 @app.post("/sparql")
-async def execute_sparql(query: dict):
+async def execute_sparql(query: dict, hosted: HostedEnv = Depends(get_hosted_env)):
     """
     Execute SPARQL query on the loaded ontology.
 
@@ -306,8 +539,7 @@ async def execute_sparql(query: dict):
         "query": "SELECT ?s ?p ?o WHERE { ?s ?p ?o } LIMIT 10"
     }
     """
-    if not manager:
-        raise HTTPException(status_code=503, detail="Manager not initialized")
+    manager = hosted.manager
 
     sparql_query = query.get("query")
     if not sparql_query:
@@ -341,7 +573,7 @@ async def execute_sparql(query: dict):
 
 
 @app.post("/sparql/update")
-async def execute_sparql_update(update: dict):
+async def execute_sparql_update(update: dict, hosted: HostedEnv = Depends(get_hosted_env)):
     """
     Execute SPARQL UPDATE query and run incremental reasoning.
     
@@ -352,22 +584,53 @@ async def execute_sparql_update(update: dict):
     
     Request body:
     {
-        "update": "DELETE { ... } INSERT { ... } WHERE { }"
+        "update": "DELETE { ... } INSERT { ... } WHERE { }",
+        "sequence": 3,       # optional world version this update produces
+        "run_id": "..."      # run the sequence belongs to
     }
+    
+    Sequenced updates must arrive in order within a run: a new run_id
+    starts counting from version 1 again, a repeated sequence is
+    acknowledged without being applied again, and a gap is rejected with
+    409. The response's "version" is the last applied world version.
     """
-    if not manager:
-        raise HTTPException(status_code=503, detail="Manager not initialized")
+    manager = hosted.manager
+    world_version = hosted.world_version
     
     sparql_update = update.get("update")
     if not sparql_update:
         raise HTTPException(status_code=400, detail="SPARQL UPDATE query is required")
     
+    sequence = update.get("sequence")
+    run_id = update.get("run_id")
+    if sequence is not None:
+        sequence = int(sequence)
+        if run_id != hosted.run_id:
+            # New run: its versions count from its own base world
+            world_version = None
+        if world_version is not None and sequence <= world_version:
+            return {
+                "status": "success",
+                "message": f"World version {sequence} already applied",
+                "version": world_version,
+                "duplicate": True
+            }
+        if sequence != (world_version or 0) + 1:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Out-of-order update: got version {sequence}, expected {(world_version or 0) + 1}"
+            )
+    
     try:
         import owlready2 as owl
         from rdflib import Graph, URIRef, Literal, BNode
         
+        timings = {}
+        stage_start = time.perf_counter()
+        
         # Step 1: Parse SPARQL UPDATE and apply changes to ontology
         print(f"Applying SPARQL UPDATE to ontology...")
+        manager.mark_world_modified()
         
         # Parse DELETE and INSERT clauses from SPARQL UPDATE
         # Simple parsing (assumes DELETE { ... } INSERT { ... } WHERE { } format)
@@ -450,6 +713,9 @@ async def execute_sparql_update(update: dict):
                                 setattr(individual, prop_name, current_values + [obj_individual])
                                 print(f"  Added: {subj_str.split('#')[-1]} {prop_name} {obj_str.split('#')[-1]}")
         
+        timings["apply_ms"] = round((time.perf_counter() - stage_start) * 1000, 3)
+        stage_start = time.perf_counter()
+        
         # Step 2: Delete old relationships in Neo4j (before reasoning)
         # This helps ensure clean state before reasoning
         print(f"Step 2: Deleting old relationships in Neo4j...")
@@ -465,7 +731,7 @@ async def execute_sparql_update(update: dict):
                     break
         
         if robot_id and old_location:
-            with manager.driver.session() as session:
+            with manager.session() as session:
                 # Delete all relationships between robot and old location
                 delete_result = session.run("""
                     MATCH (r:Individual {id: $robot_id})-[rel]->(loc:Individual {id: $old_location})
@@ -486,6 +752,9 @@ async def execute_sparql_update(update: dict):
                 deleted_reverse = delete_reverse.single()["deleted_count"] if delete_reverse.peek() else 0
                 print(f"    Deleted {deleted_reverse} reverse relationships: {old_location} -> {robot_id}")
         
+        timings["neo4j_delete_ms"] = round((time.perf_counter() - stage_start) * 1000, 3)
+        stage_start = time.perf_counter()
+        
         # Step 3: Run reasoning ONCE (after DELETE and INSERT are both applied)
         # HermiT will recalculate all relationships based on current state
         print(f"Step 3: Running HermiT reasoning (single pass)...")
@@ -494,14 +763,24 @@ async def execute_sparql_update(update: dict):
         
         print(f"Reasoning completed")
         
+        timings["reasoning_ms"] = round((time.perf_counter() - stage_start) * 1000, 3)
+        stage_start = time.perf_counter()
+        
         # Step 4: Sync to Neo4j (skip reasoning since we already did it)
         print(f"Step 4: Syncing to Neo4j...")
         result = manager.sync_to_neo4j(skip_reasoning=True)
+        timings["sync_ms"] = round((time.perf_counter() - stage_start) * 1000, 3)
         
         if result.get("status") == "success":
+            if sequence is not None:
+                world_version = hosted.world_version = sequence
+                hosted.run_id = run_id
             return {
                 "status": "success",
-                "message": "SPARQL UPDATE applied and incremental reasoning completed"
+                "message": "SPARQL UPDATE applied and incremental reasoning completed",
+                "version": world_version,
+                "bookmarks": result.get("bookmarks"),
+                "timings": timings
             }
         else:
             raise HTTPException(
@@ -519,7 +798,7 @@ async def execute_sparql_update(update: dict):
 
 
 @app.post("/semantic_search")
-async def semantic_search(query: str, top_k: int = 5, search_type: str = "description"):
+async def semantic_search(query: str, top_k: int = 5, search_type: str = "description", hosted: HostedEnv = Depends(get_hosted_env)):
     """
     Semantic search using natural language query with dual embedding support.
 
@@ -533,30 +812,25 @@ async def semantic_search(query: str, top_k: int = 5, search_type: str = "descri
     Returns:
         List of similar individuals with their descriptions and similarity scores
     """
-    if not manager:
-        raise HTTPException(status_code=503, detail="Ontology manager not initialized")
+    manager = hosted.manager
 
     # Validate search_type
     if search_type not in ["category", "description"]:
         raise HTTPException(status_code=400, detail="search_type must be 'category' or 'description'")
 
     try:
-        # Generate embedding for the query
-        from .config import get_config
-        config = get_config()
-        embedding_config = config.get_embedding_config()
-
-        embedding_manager = EmbeddingManager(
-            model=embedding_config.get('model', 'text-embedding-3-small'),
-            dimensions=embedding_config.get('dimensions')  # None = use recommended default
-        )
-        query_embedding = embedding_manager.generate_embedding(query)
+        # Embed the query with the model of the index it is compared against
+        embedder = get_query_embedder()
+        if search_type == "category":
+            query_embedding = embedder.generate_category_embedding(query)
+        else:
+            query_embedding = embedder.generate_description_embedding(query)
 
         # Choose index based on search_type
         index_name = "categoryEmbeddingIndex" if search_type == "category" else "descriptionEmbeddingIndex"
 
         # Perform vector similarity search in Neo4j
-        with manager.driver.session() as session:
+        with manager.read_session() as session:
             result = session.run("""
                 CALL db.index.vector.queryNodes(
                     $index_name,
@@ -596,7 +870,20 @@ async def semantic_search(query: str, top_k: int = 5, search_type: str = "descri
         raise HTTPException(status_code=500, detail=f"Semantic search failed: {str(e)}")
 
 
+@app.get("/world/version")
+async def get_world_version(hosted: HostedEnv = Depends(get_hosted_env)):
+    """Last world version acknowledged through sequenced SPARQL updates (with its Neo4j bookmarks)."""
+    return {"status": "success", "version": hosted.world_version, "run_id": hosted.run_id, "env_id": hosted.env_id,
+            "bookmarks": hosted.manager.last_bookmarks}
+
+
+@app.get("/neo4j/pool")
+async def get_neo4j_pool():
+    """Shared Neo4j driver usage and connection pool state (see core.neo4j_pool)."""
+    return {"status": "success", **pool_metrics()}
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "manager_ready": manager is not None}
+    return {"status": "healthy", "manager_ready": pool is not None and bool(pool.envs)}
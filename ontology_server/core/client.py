@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+Ontology Server Client
+Shared HTTP client for the agent and CLI tools (keep-alive pool, gzip, retries, latency metrics)
+"""
+
+import gzip
+import json
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Transient statuses worth retrying (server restarting / overloaded)
+RETRY_STATUSES = {502, 503, 504}
+
+class _LatencyMetrics:
+    """Per-endpoint call counts and latencies."""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, key: str, seconds: float, ok: bool, attempts: int):
+        stats = self._stats.setdefault(key, {
+            'calls': 0, 'errors': 0, 'retries': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0
+        })
+        ms = seconds * 1000
+        stats['calls'] += 1
+        stats['errors'] += 0 if ok else 1
+        stats['retries'] += attempts - 1
+        stats['total_ms'] += ms
+        stats['max_ms'] = max(stats['max_ms'], ms)
+        stats['last_ms'] = ms
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            key: {**{k: round(v, 2) for k, v in stats.items()},
+                  'avg_ms': round(stats['total_ms'] / stats['calls'], 2)}
+            for key, stats in self._stats.items()
+        }
+
+
+def _resolve_settings(base_url: Optional[str], **overrides) -> Dict[str, Any]:
+    """Client settings: explicit arguments, then config.yaml client/server sections (typed defaults)."""
+    from .config import get_settings
+    config = get_settings()
+    settings = config.client.model_dump()
+    if base_url is None:
+        base_url = config.server.base_url
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    settings['base_url'] = base_url
+    return settings
+
+
+def _backoff_delay(backoff: float, attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, backoff * (2 ** attempt))
+
+
+def _encode_body(payload: Any, compress_min_bytes: int) -> tuple:
+    """JSON-encode payload, gzip it when large enough. Returns (body, headers)."""
+    body = json.dumps(payload).encode('utf-8')
+    headers = {'Content-Type': 'application/json'}
+    if compress_min_bytes is not None and len(body) >= compress_min_bytes:
+        body = gzip.compress(body, compresslevel=5)
+        headers['Content-Encoding'] = 'gzip'
+    return body, headers
+
+
+class OntologyClient:
+    """
+    Synchronous client for the ontology server.
+
+    One pooled keep-alive requests.Session is reused for every call.
+    Request bodies above compress_min_bytes are gzip-compressed and gzip
+    responses are decoded transparently. Connection errors and 502/503/504
+    responses are retried with jittered exponential backoff; read timeouts
+    are only retried for idempotent calls. Neo4j bookmarks returned by world
+    writes are noted in core.neo4j_pool, so this process's graph reads see them.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None,
+                 retries: Optional[int] = None, backoff: Optional[float] = None,
+                 compress_min_bytes: Optional[int] = None, pool_size: Optional[int] = None):
+        """
+        Initialize client (unset options come from config.yaml server/client sections).
+
+        Args:
+            base_url: Server base URL (e.g. http://localhost:8000)
+            timeout: Default per-request timeout in seconds
+            retries: Retries after the first attempt
+            backoff: Base backoff in seconds
+            compress_min_bytes: Gzip request bodies at least this large
+            pool_size: Keep-alive connections kept per host
+        """
+        settings = _resolve_settings(base_url, timeout=timeout, retries=retries, backoff=backoff,
+                                     compress_min_bytes=compress_min_bytes, pool_size=pool_size)
+        self.base_url = settings['base_url'].rstrip('/')
+        self.timeout = settings['timeout']
+        self.retries = settings['retries']
+        self.backoff = settings['backoff']
+        self.compress_min_bytes = settings['compress_min_bytes']
+
+        self.session = requests.Session()
+        self._mount(settings['pool_size'])
+        self.session.headers.update({'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'})
+        self.metrics = _LatencyMetrics()
+
+    def _mount(self, pool_size: int):
+        """Mount a keep-alive adapter holding up to pool_size connections per host."""
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def apply_settings(self, client_settings: Dict[str, Any]):
+        """Apply reloaded config.yaml client settings (new connections use the new pool size)."""
+        self.timeout = client_settings['timeout']
+        self.retries = client_settings['retries']
+        self.backoff = client_settings['backoff']
+        self.compress_min_bytes = client_settings['compress_min_bytes']
+        self._mount(client_settings['pool_size'])
+
+    def request(self, method: str, path: str, payload: Any = None, timeout: Optional[float] = None,
+                idempotent: bool = False) -> requests.Response:
+        """
+        Send a request with retries.
+
+        Args:
+            method: HTTP method
+            path: Endpoint path (e.g. /sparql/update)
+            payload: JSON body
+            timeout: Override the default timeout
+            idempotent: Also retry read timeouts (safe for GETs)
+
+        Returns:
+            Final requests.Response (may be a non-2xx status)
+
+        Raises:
+            requests.exceptions.RequestException: If every attempt failed
+        """
+        url = f"{self.base_url}{path}"
+        body, headers = (None, None) if payload is None else _encode_body(payload, self.compress_min_bytes)
+        timeout = timeout if timeout is not None else self.timeout
+        retryable = (requests.exceptions.ConnectionError, requests.exceptions.Timeout) if idempotent \
+            else (requests.exceptions.ConnectionError,)
+
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.session.request(method, url, data=body, headers=headers, timeout=timeout)
+            except retryable:
+                if attempt > self.retries:
+                    self.metrics.record(f"{method} {path}", time.perf_counter() - start, False, attempt)
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt > self.retries:
+                    self.metrics.record(f"{method} {path}", time.perf_counter() - start,
+                                        response.status_code < 400, attempt)
+                    return response
+            time.sleep(_backoff_delay(self.backoff, attempt - 1))
+
+    def get(self, path: str, timeout: Optional[float] = None) -> requests.Response:
+        return self.request('GET', path, timeout=timeout, idempotent=True)
+
+    def post(self, path: str, payload: Any, timeout: Optional[float] = None,
+             idempotent: bool = False) -> requests.Response:
+        return self.request('POST', path, payload, timeout=timeout, idempotent=idempotent)
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    def health(self, timeout: float = 5) -> bool:
+        """True if /health answers 200."""
+        try:
+            return self.get('/health', timeout=timeout).status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+
+    def sparql_update(self, update: str, timeout: Optional[float] = None,
+                      sequence: Optional[int] = None, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        POST a SPARQL UPDATE to /sparql/update.
+
+        Args:
+            update: SPARQL UPDATE text
+            timeout: Override the default timeout
+            sequence: World version the update produces; the server applies
+                sequenced updates in order and acknowledges repeats, so they
+                are safe to retry after a read timeout
+            run_id: Run the sequence belongs to; a new run_id restarts the
+                server's version count at 1
+
+        Returns:
+            Server result dict ('version' is the acknowledged world version);
+            {"status": "error", ...} on HTTP or connection failure
+        """
+        payload = {"update": update}
+        if sequence is not None:
+            payload["sequence"] = sequence
+            payload["run_id"] = run_id
+        try:
+            response = self.post('/sparql/update', payload, timeout=timeout, idempotent=sequence is not None)
+        except requests.exceptions.RequestException as e:
+            return {"status": "error", "message": str(e)}
+        return _note_bookmarks(_result(response), self.base_url)
+
+    def load_ttl(self, file_path: str, timeout: float = 300) -> Dict[str, Any]:
+        """
+        Ask the server to load a TTL file (/load_ttl).
+
+        Loading the same file twice is harmless, so read timeouts are retried.
+        """
+        try:
+            response = self.post('/load_ttl', {"file_path": str(file_path)}, timeout=timeout, idempotent=True)
+        except requests.exceptions.RequestException as e:
+            return {"status": "error", "message": str(e)}
+        return _note_bookmarks(_result(response), self.base_url)
+
+    def activate_env(self, env_id: str, timeout: float = 120) -> Dict[str, Any]:
+        """Switch the server to an environment from its bundle (/spaces/{env_id}/activate)."""
+        try:
+            response = self.post(f'/spaces/{env_id}/activate', {}, timeout=timeout, idempotent=True)
+        except requests.exceptions.RequestException as e:
+            return {"status": "error", "message": str(e)}
+        return _note_bookmarks(_result(response), self.base_url)
+
+    def world_version(self) -> Optional[int]:
+        """Last world version the server acknowledged (None if unknown)."""
+        try:
+            response = self.get('/world/version', timeout=5)
+        except requests.exceptions.RequestException:
+            return None
+        return _note_bookmarks(_result(response), self.base_url).get("version")
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-endpoint latency metrics."""
+        return self.metrics.summary()
+
+    def close(self):
+        self.session.close()
+
+
+def _note_bookmarks(result: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """Pass the Neo4j bookmarks of a server-side world write on to this process's read sessions."""
+    if result.get("bookmarks"):
+        try:
+            from .neo4j_pool import note_bookmarks
+        except ImportError:
+            return result  # no Neo4j driver here: nothing in this process reads the graph
+        note_bookmarks(result["bookmarks"], source)
+    return result
+
+
+def _result(response) -> Dict[str, Any]:
+    """Decode a JSON response into a result dict with a 'status' key."""
+    try:
+        result = response.json()
+    except ValueError:
+        result = {"message": response.text}
+    if response.status_code != 200:
+        detail = result.get("detail", result.get("message", "Unknown error")) if isinstance(result, dict) else result
+        return {"status": "error", "message": detail, "http_status": response.status_code}
+    return result
+
+
+class AsyncOntologyClient:
+    """
+    Async counterpart of OntologyClient built on httpx (optional dependency).
+
+    Lets callers keep several submissions in flight on one connection pool.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None,
+                 retries: Optional[int] = None, backoff: Optional[float] = None,
+                 compress_min_bytes: Optional[int] = None, pool_size: Optional[int] = None):
+        """Initialize client; options as in OntologyClient."""
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("AsyncOntologyClient requires httpx: pip install httpx")
+        self._httpx = httpx
+        settings = _resolve_settings(base_url, timeout=timeout, retries=retries, backoff=backoff,
+                                     compress_min_bytes=compress_min_bytes, pool_size=pool_size)
+        self.base_url = settings['base_url'].rstrip('/')
+        self.timeout = settings['timeout']
+        self.retries = settings['retries']
+        self.backoff = settings['backoff']
+        self.compress_min_bytes = settings['compress_min_bytes']
+        pool_size = settings['pool_size']
+
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={'Accept-Encoding': 'gzip'},
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=self.timeout,
+        )
+        self.metrics = _LatencyMetrics()
+
+    async def request(self, method: str, path: str, payload: Any = None, timeout: Optional[float] = None,
+                      idempotent: bool = False):
+        """Send a request with retries (same policy as OntologyClient.request)."""
+        import asyncio
+
+        httpx = self._httpx
+        body, headers = (None, None) if payload is None else _encode_body(payload, self.compress_min_bytes)
+        timeout = timeout if timeout is not None else self.timeout
+        retryable = (httpx.TransportError,) if idempotent else (httpx.ConnectError,)
+
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self.client.request(method, path, content=body, headers=headers, timeout=timeout)
+            except retryable:
+                if attempt > self.retries:
+                    self.metrics.record(f"{method} {path}", time.perf_counter() - start, False, attempt)
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt > self.retries:
+                    self.metrics.record(f"{method} {path}", time.perf_counter() - start,
+                                        response.status_code < 400, attempt)
+                    return response
+            await asyncio.sleep(_backoff_delay(self.backoff, attempt - 1))
+
+    async def health(self, timeout: float = 5) -> bool:
+        try:
+            response = await self.request('GET', '/health', timeout=timeout, idempotent=True)
+            return response.status_code == 200
+        except self._httpx.HTTPError:
+            return False
+
+    async def sparql_update(self, update: str, timeout: Optional[float] = None,
+                            sequence: Optional[int] = None, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Async POST to /sparql/update; returns the server result dict."""
+        payload = {"update": update}
+        if sequence is not None:
+            payload["sequence"] = sequence
+            payload["run_id"] = run_id
+        try:
+            response = await self.request('POST', '/sparql/update', payload, timeout=timeout,
+                                          idempotent=sequence is not None)
+        except self._httpx.HTTPError as e:
+            return {"status": "error", "message": str(e)}
+        return _note_bookmarks(_result(response), self.base_url)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return self.metrics.summary()
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class UpdatePipeline:
+    """
+    Ordered background submission of sequenced SPARQL updates.
+
+    The caller computes world version N+1 locally while the server is still
+    applying version N. Updates are sent one at a time in sequence order
+    by a single worker thread; each success acknowledges its version. After
+    the first failure nothing further is sent, and the caller rolls back to
+    acked_version. At most `depth` updates wait in the queue; submit()
+    blocks beyond that.
+    """
+
+    def __init__(self, client: OntologyClient, depth: int = 4):
+        """
+        Initialize pipeline.
+
+        Args:
+            client: Client used by the worker thread
+            depth: Maximum number of queued, unacknowledged updates
+        """
+        self.client = client
+        self.depth = depth
+        self._queue: "queue.Queue" = queue.Queue(maxsize=depth)
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self.reset(0)
+
+    def reset(self, base_version: int, run_id: Optional[str] = None):
+        """Start a new run at base_version (waits for queued updates first); run_id is sent with every update."""
+        if self._worker is not None:
+            self._queue.join()
+        with self._lock:
+            self.run_id = run_id
+            self.acked_version = base_version
+            self.submitted_version = base_version
+            self.failure: Optional[Dict[str, Any]] = None
+            self._stats = {'submitted': 0, 'acked': 0, 'max_in_flight': 0, 'blocked_ms': 0.0}
+
+    @property
+    def in_flight(self) -> int:
+        """Submitted versions not yet acknowledged."""
+        return self.submitted_version - self.acked_version
+
+    def submit(self, version: int, update: str):
+        """
+        Queue the update that produces version (must be the next version).
+
+        Raises:
+            RuntimeError: If an earlier update failed (roll back first)
+            ValueError: If version is not the next version in sequence
+        """
+        if self.failure is not None:
+            raise RuntimeError(f"Pipeline stopped at version {self.acked_version}: {self.failure['message']}")
+        if version != self.submitted_version + 1:
+            raise ValueError(f"Out-of-order submission: got version {version}, expected {self.submitted_version + 1}")
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="ontology-update-pipeline", daemon=True)
+            self._worker.start()
+
+        start = time.perf_counter()
+        self._queue.put((version, update))
+        with self._lock:
+            self.submitted_version = version
+            self._stats['submitted'] += 1
+            self._stats['blocked_ms'] += (time.perf_counter() - start) * 1000
+            self._stats['max_in_flight'] = max(self._stats['max_in_flight'], self.in_flight)
+
+    def _run(self):
+        while True:
+            version, update = self._queue.get()
+            try:
+                if self.failure is not None:
+                    continue
+                result = self.client.sparql_update(update, sequence=version, run_id=self.run_id)
+                acked = result.get("version")
+                with self._lock:
+                    if result.get("status") == "success" and (acked is None or acked >= version):
+                        self.acked_version = version
+                        self._stats['acked'] += 1
+                    else:
+                        self.failure = {"version": version,
+                                        "message": result.get("message", "Unknown error")}
+            except Exception as e:
+                with self._lock:
+                    self.failure = {"version": version, "message": str(e)}
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> int:
+        """Wait until every queued update was sent; returns acked_version."""
+        self._queue.join()
+        return self.acked_version
+
+    def rollback(self) -> int:
+        """Drop the failure state after the caller rolled back; returns acked_version."""
+        self._queue.join()
+        with self._lock:
+            self.submitted_version = self.acked_version
+            self.failure = None
+        return self.acked_version
+
+    def stats(self) -> Dict[str, Any]:
+        """Submission counters and current in-flight count."""
+        with self._lock:
+            return dict(self._stats, blocked_ms=round(self._stats['blocked_ms'], 2),
+                        acked_version=self.acked_version, in_flight=self.in_flight)
+
+
+_clients: Dict[str, OntologyClient] = {}
+_subscribed = False
+
+
+def _on_settings_changed(keys, settings):
+    """Apply reloaded client settings to shared clients; a new server.base_url gets a new default client."""
+    if any(key.startswith('client') for key in keys):
+        for client in _clients.values():
+            client.apply_settings(settings.client.model_dump())
+    if 'server.base_url' in keys:
+        _clients.pop(None, None)
+
+
+def get_client(base_url: Optional[str] = None) -> OntologyClient:
+    """Get the process-wide client for base_url (default: config.yaml server.base_url)."""
+    global _subscribed
+    if not _subscribed:
+        from .config import get_config
+        get_config().subscribe(_on_settings_changed, prefixes=['client', 'server.base_url'])
+        _subscribed = True
+    key = base_url.rstrip('/') if base_url else None
+    if key not in _clients:
+        _clients[key] = OntologyClient(base_url)
+    return _clients[key]
+
+
+_pipelines: Dict[str, UpdatePipeline] = {}
+
+
+def get_pipeline(base_url: Optional[str] = None, depth: int = 4) -> UpdatePipeline:
+    """Get the process-wide update pipeline for base_url (uses the shared client)."""
+    client = get_client(base_url)
+    if client.base_url not in _pipelines:
+        _pipelines[client.base_url] = UpdatePipeline(client, depth=depth)
+    return _pipelines[client.base_url]
+
+
+if __name__ == "__main__":
+    # Round trips against a local stub server: gzip bodies, retry on 503, metrics
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    calls = {'count': 0, 'version': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            calls['count'] += 1
+            raw = self.rfile.read(int(self.headers['Content-Length']))
+            if self.headers.get('Content-Encoding') == 'gzip':
+                raw = gzip.decompress(raw)
+            if calls['count'] == 1:
+                self._reply(503, {"detail": "warming up"})
+                return
+            payload = json.loads(raw)
+            if "FAIL" in payload["update"]:
+                self._reply(500, {"detail": "reasoner error"})
+                return
+            time.sleep(0.05)  # server-side reasoning
+            if payload.get("sequence") is not None:
+                calls['version'] = payload["sequence"]
+            self._reply(200, {"status": "success", "message": f"{len(payload['update'])} chars",
+                              "version": calls['version'],
+                              "gzip": self.headers.get('Content-Encoding') == 'gzip'})
+
+        def do_GET(self):
+            self._reply(200, {"status": "healthy", "version": calls['version']})
+
+        def _reply(self, status, payload):
+            body = gzip.compress(json.dumps(payload).encode())
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = OntologyClient(f"http://127.0.0.1:{server.server_port}", timeout=5, retries=2,
+                            backoff=0.01, compress_min_bytes=256, pool_size=2)
+    print(f"Health: {client.health()}")
+    print(f"Small update: {client.sparql_update('INSERT DATA { }')}")
+    print(f"Large update: {client.sparql_update('INSERT DATA { ' + ' '.join(['<a> <b> <c> .'] * 200) + ' }')}")
+
+    # Local delta computation (sleep) overlaps with server reasoning when pipelined
+    calls['version'] = 0
+    start = time.perf_counter()
+    for version in range(1, 7):
+        time.sleep(0.05)
+        client.sparql_update(f"INSERT DATA {{ <v{version}> <a> <b> . }}", sequence=version)
+    sequential = time.perf_counter() - start
+
+    pipeline = UpdatePipeline(client, depth=2)
+    start = time.perf_counter()
+    for version in range(1, 7):
+        time.sleep(0.05)
+        pipeline.submit(version, f"INSERT DATA {{ <v{version}> <a> <b> . }}")
+    acked = pipeline.drain()
+    print(f"6 versions: sequential {sequential:.2f}s, pipelined {time.perf_counter() - start:.2f}s "
+          f"(acked={acked}), stats={pipeline.stats()}")
+
+    for version in range(7, 10):
+        pipeline.submit(version, "FAIL" if version == 8 else f"INSERT DATA {{ <v{version}> <a> <b> . }}")
+    pipeline.drain()
+    print(f"Failure at version {pipeline.failure['version']}: rollback to {pipeline.rollback()}")
+
+    for key, stats in client.stats().items():
+        print(f"  {key}: {stats}")
+    client.close()
+    server.shutdown()
@@ -1,16 +1,157 @@
 #!/usr/bin/env python3
 """
 Configuration Loader
-Load configuration from config.yaml
+Load config.yaml into typed settings, validated once per load, and reload them when the file changes
 """
 
+import threading
+import time
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
+
+# Recommended dimensions per embedding model (balanced performance/storage)
+RECOMMENDED_DIMENSIONS = {
+    "text-embedding-3-small": 512,
+    "text-embedding-3-large": 1024,
+    "text-embedding-ada-002": 1536,  # Fixed for ada-002
+}
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Settings that are only read at startup; changing them in a running process needs a restart
+RESTART_REQUIRED = ("server.host", "server.port", "neo4j", "hosting", "data")
+
+
+class _Section(BaseModel):
+    """Config section (unknown keys are kept)."""
+
+    model_config = ConfigDict(extra="allow")
+
+
+class ServerSettings(_Section):
+    host: str = "0.0.0.0"
+    port: int = 8000
+    base_url: str = "http://localhost:8000"
+
+
+class ClientSettings(_Section):
+    timeout: float = 30
+    retries: int = 3
+    backoff: float = 0.5
+    compress_min_bytes: Optional[int] = 1024
+    pool_size: int = 4
+
+
+class PersistenceSettings(_Section):
+    enabled: bool = False
+    dir: str = "data/cache"
+    bundles_dir: str = "data/bundles"
+
+
+class HostingSettings(_Section):
+    max_envs: int = 1
+    idle_timeout: float = 0
+    neo4j_database: Optional[str] = None
+
+
+class Neo4jPoolSettings(_Section):
+    max_connection_pool_size: int = 50
+    connection_acquisition_timeout: float = 30.0
+    liveness_check_timeout: float = 30.0
+    max_connection_lifetime: float = 3600
+    max_transaction_retry_time: float = 15.0
+
+
+class Neo4jSettings(_Section):
+    uri: Optional[str] = None
+    user: Optional[str] = None
+    password: Optional[str] = None
+    pool: Neo4jPoolSettings = Field(default_factory=Neo4jPoolSettings)
+
+
+class EmbeddingModelSettings(_Section):
+    model: str = DEFAULT_EMBEDDING_MODEL
+    dimensions: Optional[int] = None  # None = recommended for the model
+
+    @property
+    def resolved_dimensions(self) -> int:
+        """Configured dimensions, or the recommended ones for the model."""
+        return self.dimensions or RECOMMENDED_DIMENSIONS.get(self.model, 512)
+
+
+class EmbeddingSettings(_Section):
+    generate: bool = True
+    category: EmbeddingModelSettings = Field(default_factory=EmbeddingModelSettings)
+    description: EmbeddingModelSettings = Field(default_factory=EmbeddingModelSettings)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _legacy_single_model(cls, data: Any) -> Any:
+        """Legacy format (embedding.model/dimensions): same model for category and description."""
+        if isinstance(data, dict) and ("category" not in data or "description" not in data):
+            model = {"model": data.get("model", DEFAULT_EMBEDDING_MODEL), "dimensions": data.get("dimensions")}
+            data = {"generate": data.get("generate", True), "category": model, "description": dict(model)}
+        return data
+
+
+class DataSettings(_Section):
+    root: str = "data"
+    ontology: str = "data/robot.owx"
+    envs_dir: str = "data/envs"
+
+
+class PlannerSettings(_Section):
+    solver: str = "lazy_wastar"  # lazy_wastar, astar, lama
+    heuristic: str = "ff"
+    weight: int = 2
+    timeout: int = 60
+
+
+class Settings(_Section):
+    """Typed config.yaml (every section has defaults)."""
+
+    active_env: Optional[str] = None
+    reload_interval: float = 2.0  # seconds between config.yaml checks (0: no hot reload)
+    server: ServerSettings = Field(default_factory=ServerSettings)
+    client: ClientSettings = Field(default_factory=ClientSettings)
+    persistence: PersistenceSettings = Field(default_factory=PersistenceSettings)
+    hosting: HostingSettings = Field(default_factory=HostingSettings)
+    neo4j: Neo4jSettings = Field(default_factory=Neo4jSettings)
+    embedding: EmbeddingSettings = Field(default_factory=EmbeddingSettings)
+    data: DataSettings = Field(default_factory=DataSettings)
+    planner: PlannerSettings = Field(default_factory=PlannerSettings)
+    environments: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _empty_sections(cls, data: Any) -> Any:
+        """YAML sections left empty (`client:`) load as None; treat them as defaults."""
+        if isinstance(data, dict):
+            data = {key: value for key, value in data.items() if value is not None}
+        return data
+
+
+def changed_keys(old: Any, new: Any, prefix: str = "") -> List[str]:
+    """Dotted keys whose values differ between two nested dicts (e.g. "planner.weight")."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        keys = []
+        for key in sorted(set(old) | set(new), key=str):
+            keys.extend(changed_keys(old.get(key), new.get(key), f"{prefix}{key}."))
+        return keys
+    return [prefix[:-1]] if old != new else []
 
 
 class ConfigLoader:
-    """Load and manage configuration."""
+    """
+    Load and manage configuration.
+
+    config.yaml is parsed and validated into `settings` once; reload()
+    re-reads it when its modification time changes and notifies subscribers
+    with the dotted keys that changed. get_config() checks at most every
+    reload_interval seconds, watch() checks from a background thread.
+    """
 
     def __init__(self, config_path: Optional[str] = None):
         """Initialize config loader."""
@@ -19,7 +160,23 @@ class ConfigLoader:
             config_path = Path(__file__).parent.parent / "config.yaml"
 
         self.config_path = Path(config_path)
+        self._lock = threading.Lock()
+        self._subscribers: List[tuple] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._mtime = self._stat()
+        self._checked_at = time.monotonic()
         self._config = self._load_config()
+        try:
+            self.settings = Settings.model_validate(self._config)
+        except ValidationError as e:
+            raise ValueError(f"Invalid configuration in {self.config_path}:\n{e}") from e
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return self.config_path.stat().st_mtime
+        except OSError:
+            return None
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -29,38 +186,120 @@ class ConfigLoader:
         with open(self.config_path, 'r') as f:
             config = yaml.safe_load(f)
 
-        return config
+        return config or {}
 
     @property
     def config(self) -> Dict[str, Any]:
         """Get raw configuration dict."""
         return self._config
 
+    def subscribe(self, callback: Callable[[List[str], Settings], None], prefixes: Iterable[str] = ()):
+        """
+        Call callback(changed_keys, settings) after a reload changes settings.
+
+        Args:
+            callback: Change handler (exceptions are printed, not raised)
+            prefixes: Only notify for keys under these dotted prefixes (e.g. "embedding", "planner.weight")
+        """
+        self._subscribers.append((callback, tuple(prefixes)))
+
+    def reload(self, force: bool = False) -> List[str]:
+        """
+        Re-read config.yaml if it changed on disk.
+
+        An invalid file is reported and ignored (the previous settings stay
+        active). Returns the dotted keys that changed.
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            mtime = self._stat()
+            if mtime is None or (mtime == self._mtime and not force):
+                return []
+            self._mtime = mtime
+            try:
+                raw = self._load_config()
+                settings = Settings.model_validate(raw)
+            except (OSError, yaml.YAMLError, ValidationError) as e:
+                print(f"WARNING: Ignoring invalid {self.config_path.name} (keeping previous settings): {e}")
+                return []
+            changed = changed_keys(self.settings.model_dump(), settings.model_dump())
+            self._config, self.settings = raw, settings
+
+        if changed:
+            print(f"Config reloaded: {', '.join(changed)}")
+            restart = [key for key in changed if key.startswith(RESTART_REQUIRED)]
+            if restart:
+                print(f"  NOTE: Restart the server to apply {', '.join(restart)}")
+            for callback, prefixes in list(self._subscribers):
+                keys = [key for key in changed
+                        if not prefixes or any(key == p or key.startswith(p + ".") for p in prefixes)]
+                if keys:
+                    try:
+                        callback(keys, settings)
+                    except Exception as e:
+                        print(f"WARNING: Config change handler failed: {e}")
+        return changed
+
+    def maybe_reload(self) -> List[str]:
+        """reload() at most once per reload_interval seconds."""
+        interval = self.settings.reload_interval
+        if interval <= 0 or time.monotonic() - self._checked_at < interval:
+            return []
+        return self.reload()
+
+    def watch(self):
+        """Check config.yaml every reload_interval seconds from a daemon thread (idempotent)."""
+        if self._watcher is not None or self.settings.reload_interval <= 0:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(max(self.settings.reload_interval, 0.1)):
+                self.reload()
+
+        self._watcher = threading.Thread(target=run, name="config-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        """Stop the watch() thread."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
     def get_active_env(self) -> Optional[str]:
         """Get active environment ID."""
-        return self._config.get('active_env')
+        return self.settings.active_env
 
     def get_server_config(self) -> Dict[str, Any]:
         """Get server configuration."""
-        return self._config.get('server', {
-            'host': '0.0.0.0',
-            'port': 8000,
-            'base_url': 'http://localhost:8000'
-        })
+        return self.settings.server.model_dump()
+
+    def get_client_config(self) -> Dict[str, Any]:
+        """Get HTTP client configuration (agent/CLI -> server calls)."""
+        return self.settings.client.model_dump()
+
+    def get_persistence_config(self) -> Dict[str, Any]:
+        """Get persistent world configuration (owlready2 SQLite quadstore)."""
+        return self.settings.persistence.model_dump()
+
+    def get_hosting_config(self) -> Dict[str, Any]:
+        """Get multi-environment hosting configuration (environments kept open per server)."""
+        return self.settings.hosting.model_dump()
 
     def get_neo4j_config(self) -> Dict[str, Any]:
         """Get Neo4j configuration."""
-        neo4j_config = self._config.get('neo4j')
-        if not neo4j_config:
+        if not self._config.get('neo4j'):
             raise ValueError(
                 "Neo4j configuration not found in config.yaml. "
                 "Please set neo4j.uri, neo4j.user, and neo4j.password"
             )
 
         # Validate required fields
+        neo4j_config = self.settings.neo4j.model_dump()
         required_fields = ['uri', 'user', 'password']
         for field in required_fields:
-            if field not in neo4j_config or not neo4j_config[field]:
+            if not neo4j_config.get(field):
                 raise ValueError(
                     f"Neo4j configuration missing required field: {field}. "
                     f"Please set neo4j.{field} in config.yaml"
@@ -68,13 +307,13 @@ class ConfigLoader:
 
         return neo4j_config
 
+    def get_neo4j_pool_config(self) -> Dict[str, Any]:
+        """Get Neo4j driver pool settings (keyword arguments for GraphDatabase.driver)."""
+        return self.settings.neo4j.pool.model_dump()
+
     def get_data_config(self) -> Dict[str, Any]:
         """Get data paths configuration."""
-        return self._config.get('data', {
-            'root': 'data',
-            'ontology': 'data/robot.owx',
-            'envs_dir': 'data/envs'
-        })
+        return self.settings.data.model_dump()
 
     def get_embedding_config(self) -> Dict[str, Any]:
         """Get embedding configuration for semantic search.
@@ -86,33 +325,11 @@ class ConfigLoader:
             'description': {'model': str, 'dimensions': int}
         }
         """
-        embedding_config = self._config.get('embedding', {})
-
-        # Check if new dual-model config exists
-        if 'category' in embedding_config and 'description' in embedding_config:
-            # New format - return as-is
-            return {
-                'generate': embedding_config.get('generate', True),
-                'category': embedding_config['category'],
-                'description': embedding_config['description']
-            }
-        else:
-            # Legacy format - convert to new format
-            # Use same model for both category and description
-            model = embedding_config.get('model', 'text-embedding-3-small')
-            dimensions = embedding_config.get('dimensions')  # None = use default
-
-            return {
-                'generate': embedding_config.get('generate', True),
-                'category': {
-                    'model': model,
-                    'dimensions': dimensions
-                },
-                'description': {
-                    'model': model,
-                    'dimensions': dimensions
-                }
-            }
+        return self.settings.embedding.model_dump()
+
+    def get_planner_config(self) -> Dict[str, Any]:
+        """Get Fast Downward planner settings (solver, heuristic, weight, timeout)."""
+        return self.settings.planner.model_dump()
 
     def get_all(self) -> Dict[str, Any]:
         """Get entire configuration."""
@@ -124,13 +341,20 @@ _config_loader = None
 
 
 def get_config() -> ConfigLoader:
-    """Get global config loader instance."""
+    """Get global config loader instance (reloaded if config.yaml changed, see ConfigLoader.maybe_reload)."""
     global _config_loader
     if _config_loader is None:
         _config_loader = ConfigLoader()
+    else:
+        _config_loader.maybe_reload()
     return _config_loader
 
 
+def get_settings() -> Settings:
+    """Current typed settings of the global config loader."""
+    return get_config().settings
+
+
 if __name__ == "__main__":
     # Test configuration loading
     config = get_config()
@@ -156,5 +380,16 @@ if __name__ == "__main__":
     neo4j_config = config.get_neo4j_config()
     print(f"Neo4j: {neo4j_config['uri']}")
 
+    settings = config.settings
+    print(f"Embedding: category={settings.embedding.category.model}"
+          f"({settings.embedding.category.resolved_dimensions}D), "
+          f"description={settings.embedding.description.model}"
+          f"({settings.embedding.description.resolved_dimensions}D)")
+    print(f"Planner: {settings.planner.solver} {settings.planner.heuristic} w={settings.planner.weight}")
+
+    # Hot reload: a change to config.yaml is picked up by the next reload()
+    config.subscribe(lambda keys, new: print(f"Changed: {keys}"))
+    print(f"Changed since load: {config.reload() or 'nothing'}")
+
     print()
     print("=" * 60)
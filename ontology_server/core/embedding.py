@@ -5,21 +5,19 @@ import os
 from typing import List, Optional
 from openai import OpenAI
 
+from .config import DEFAULT_EMBEDDING_MODEL, RECOMMENDED_DIMENSIONS
+
 
 class EmbeddingManager:
     """Manages embedding generation using OpenAI's text-embedding models with dual-model support."""
 
-    # Recommended dimensions per model (balanced performance/storage)
-    RECOMMENDED_DIMENSIONS = {
-        "text-embedding-3-small": 512,
-        "text-embedding-3-large": 1024,
-        "text-embedding-ada-002": 1536,  # Fixed for ada-002
-    }
+    # Recommended dimensions per model (defined with the embedding settings in core.config)
+    RECOMMENDED_DIMENSIONS = RECOMMENDED_DIMENSIONS
 
     def __init__(self, api_key: Optional[str] = None,
-                 category_model: str = "text-embedding-3-small",
+                 category_model: str = DEFAULT_EMBEDDING_MODEL,
                  category_dimensions: Optional[int] = None,
-                 description_model: str = "text-embedding-3-small",
+                 description_model: str = DEFAULT_EMBEDDING_MODEL,
                  description_dimensions: Optional[int] = None):
         """
         Initialize EmbeddingManager with OpenAI API and dual model support.
@@ -5,7 +5,7 @@ EnvManager: Manage multiple environments with shared ontology
 
 from pathlib import Path
 from typing import Dict, Any, List, Optional
-from .config import get_config
+from .config import get_settings
 
 
 class EnvManager:
@@ -13,13 +13,13 @@ class EnvManager:
 
     def __init__(self):
         """Initialize environment manager."""
-        config = get_config()
-        self.data_root = Path(config.get_data_config()['root'])
-        self.envs_dir = Path(config.get_data_config()['envs_dir'])
-        self.ontology_path = Path(config.get_data_config()['ontology'])
+        settings = get_settings()
+        self.data_root = Path(settings.data.root)
+        self.envs_dir = Path(settings.data.envs_dir)
+        self.ontology_path = Path(settings.data.ontology)
 
         # Get environment configurations from config.yaml
-        self._envs = config.config.get('environments', {})
+        self._envs = settings.environments
 
     def list_envs(self) -> List[Dict[str, Any]]:
         """List all available environments."""
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Environment Bundles
+Precompiled per-environment snapshots (reasoned world, Neo4j rows, embedding matrix, topology)
+for switching environments without reloading TTLs, reasoning or re-embedding
+"""
+
+import json
+import shutil
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .world_cache import WorldCache
+
+BUNDLE_FORMAT = 1
+# Node classes that make up the navigation graph (same set as PDDLGenerator's path queries)
+LOCATION_CLASSES = ("Space", "Door", "Stairs", "Opening")
+
+
+class EnvBundle:
+    """
+    One environment's bundle directory (data/bundles/<env_id>/).
+
+    Files:
+        world.sqlite3 (+ .meta.json)  reasoned owlready2 quadstore and its WorldCache fingerprints
+        nodes.json, relationships.json  Neo4j rows (see OntologyManager.export_graph_rows)
+        embeddings.npz  description embedding matrix with its individual ids
+        topology.json  hasPathTo connections and all-pairs hop distances between locations
+        manifest.json  format, build settings, counts and embedding metadata
+    """
+
+    def __init__(self, bundle_dir: Path):
+        """
+        Initialize bundle.
+
+        Args:
+            bundle_dir: Bundle directory (need not exist yet)
+        """
+        self.bundle_dir = Path(bundle_dir)
+        self.world_path = self.bundle_dir / "world.sqlite3"
+        self.manifest_path = self.bundle_dir / "manifest.json"
+
+    @property
+    def world_cache(self) -> WorldCache:
+        return WorldCache(self.world_path)
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        """Bundle manifest, or None if the bundle was never built."""
+        if not self.manifest_path.exists():
+            return None
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def check(self, schema_fingerprint: str) -> Optional[str]:
+        """
+        Check whether the bundle is current.
+
+        Returns:
+            None if it can be activated, otherwise the reason to rebuild
+        """
+        manifest = self.manifest()
+        if manifest is None:
+            return "no bundle"
+        if manifest.get("format") != BUNDLE_FORMAT:
+            return f"bundle format {manifest.get('format')} (expected {BUNDLE_FORMAT})"
+        reason = self.world_cache.check(schema_fingerprint)
+        if reason is not None:
+            return reason
+        for entry in manifest.get("embedding_sources", []):
+            path = Path(entry["path"])
+            if not path.exists() or path.stat().st_mtime != entry["mtime"]:
+                return f"embedding cache changed: {path.name}"
+        return None
+
+    def load_graph_rows(self) -> Dict[str, List]:
+        """Neo4j node and relationship rows."""
+        rows = {}
+        for key in ("nodes", "relationships"):
+            with open(self.bundle_dir / f"{key}.json", "r", encoding="utf-8") as f:
+                rows[key] = json.load(f)
+        return rows
+
+    def load_embeddings(self) -> List[Dict[str, Any]]:
+        """Description embeddings as [{id, description_embedding}] rows."""
+        path = self.bundle_dir / "embeddings.npz"
+        if not path.exists():
+            return []
+        with np.load(path) as data:
+            return [{"id": str(i), "description_embedding": vector.tolist()}
+                    for i, vector in zip(data["ids"], data["description"])]
+
+    def load_topology(self) -> Dict[str, Any]:
+        """Location graph: 'locations', 'connections' and 'distances' (id -> id -> hops)."""
+        with open(self.bundle_dir / "topology.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def compute_topology(rows: Dict[str, List]) -> Dict[str, Any]:
+    """
+    hasPathTo connections and all-pairs hop distances between locations.
+
+    Distances follow hasPathTo in either direction, like the planner's
+    shortestPath((a)-[:hasPathTo*]-(b)) queries; unreachable pairs are omitted.
+    """
+    locations = sorted(node["id"] for node in rows["nodes"]
+                       if any(cls in LOCATION_CLASSES for cls in node["classes"]))
+    location_set = set(locations)
+    connections = sorted({(s, o) for s, p, o in rows["relationships"]
+                          if p == "hasPathTo" and s in location_set and o in location_set and s != o})
+
+    neighbours: Dict[str, set] = {loc: set() for loc in locations}
+    for s, o in connections:
+        neighbours[s].add(o)
+        neighbours[o].add(s)
+
+    distances = {}
+    for source in locations:
+        found = {source: 0}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            for nxt in neighbours[current]:
+                if nxt not in found:
+                    found[nxt] = found[current] + 1
+                    queue.append(nxt)
+        del found[source]
+        distances[source] = found
+
+    return {"locations": locations, "connections": [list(c) for c in connections], "distances": distances}
+
+
+def collect_embeddings(env_dir: Path, ids: List[str]) -> Dict[str, Any]:
+    """
+    Merge an environment's description embedding caches into one matrix.
+
+    dynamic_embeddings.json is read after static_embeddings.json, so it wins
+    for individuals in both; individuals not in ids are dropped.
+
+    Returns:
+        Dict with 'ids', 'matrix' (float32, one row per id), 'metadata' and 'sources'
+    """
+    known = set(ids)
+    vectors: Dict[str, List[float]] = {}
+    metadata, sources = {}, []
+    for name in ("static_embeddings.json", "dynamic_embeddings.json"):
+        path = env_dir / name
+        if not path.exists():
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            metadata = data.get("metadata", metadata)
+            data = data.get("embeddings", [])
+        for item in data:
+            if item.get("description_embedding") is not None and item["id"] in known:
+                vectors[item["id"]] = item["description_embedding"]
+        sources.append({"path": str(path.absolute()), "mtime": path.stat().st_mtime})
+
+    embedded = sorted(vectors)
+    matrix = np.array([vectors[i] for i in embedded], dtype=np.float32)
+    return {"ids": embedded, "matrix": matrix, "metadata": metadata, "sources": sources}
+
+
+def build_bundle(owl_path: Path, env_id: str, ttl_paths: List[Path], env_dir: Path,
+                 bundle_dir: Path, reason: bool = True) -> Dict[str, Any]:
+    """
+    Build an environment bundle offline (no Neo4j needed).
+
+    The bundle is written next to bundle_dir and swapped in when complete,
+    so an interrupted build leaves the previous bundle intact.
+
+    Args:
+        owl_path: Shared ontology schema (robot.owx)
+        env_id: Environment ID
+        ttl_paths: TTL files in load order (static.ttl, dynamic.ttl)
+        env_dir: Environment directory holding the *_embeddings.json caches
+        bundle_dir: Output bundle directory
+        reason: Run HermiT before exporting (requires Java)
+
+    Returns:
+        Status dictionary with counts and per-phase 'timings'
+    """
+    from .ontology import OntologyManager
+
+    timings = {}
+    start = time.perf_counter()
+
+    def lap(phase: str):
+        nonlocal start
+        now = time.perf_counter()
+        timings[phase] = round((now - start) * 1000, 3)
+        start = now
+
+    bundle_dir = Path(bundle_dir)
+    build_dir = bundle_dir.with_name(bundle_dir.name + ".building")
+    if build_dir.exists():
+        shutil.rmtree(build_dir)
+    build_dir.mkdir(parents=True)
+    bundle = EnvBundle(build_dir)
+
+    manager = OntologyManager(owl_path=str(owl_path), env_id=env_id,
+                              world_path=str(bundle.world_path), offline=True)
+    error = None
+    try:
+        for ttl_path in ttl_paths:
+            result = manager.bulk_import_ttl(str(ttl_path))
+            if result["status"] == "error":
+                error = result
+                break
+        if error is None:
+            lap("import_ms")
+            if reason:
+                manager.run_reasoner()
+            lap("reason_ms")
+
+            rows = manager.export_graph_rows()
+            manager.world.save()
+            for ttl_path in ttl_paths:
+                manager.world_cache.add_input(ttl_path)
+    finally:
+        manager.close(cleanup_neo4j=False)
+    if error is not None:
+        shutil.rmtree(build_dir)
+        return error
+
+    for key in ("nodes", "relationships"):
+        with open(build_dir / f"{key}.json", "w", encoding="utf-8") as f:
+            json.dump(rows[key], f)
+    lap("export_ms")
+
+    embeddings = collect_embeddings(Path(env_dir), [node["id"] for node in rows["nodes"]])
+    if embeddings["ids"]:
+        np.savez(build_dir / "embeddings.npz", ids=np.array(embeddings["ids"]),
+                 description=embeddings["matrix"])
+    lap("embeddings_ms")
+
+    topology = compute_topology(rows)
+    with open(build_dir / "topology.json", "w", encoding="utf-8") as f:
+        json.dump(topology, f)
+    lap("topology_ms")
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "env_id": env_id,
+        "built_at": datetime.now().isoformat(),
+        "reasoned": reason,
+        "individuals": len(rows["nodes"]),
+        "relationships": len(rows["relationships"]),
+        "embeddings": len(embeddings["ids"]),
+        "embedding_metadata": embeddings["metadata"],
+        "embedding_sources": embeddings["sources"],
+        "locations": len(topology["locations"]),
+        "timings": timings
+    }
+    with open(bundle.manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    if bundle_dir.exists():
+        shutil.rmtree(bundle_dir)
+    build_dir.rename(bundle_dir)
+    return dict(manifest, status="success")
+
+
+if __name__ == "__main__":
+    # Topology of a small corridor graph
+    rows = {
+        "nodes": [
+            {"id": "kitchen_1", "classes": ["Space"]},
+            {"id": "door_1", "classes": ["Door", "Portal"]},
+            {"id": "corridor_1", "classes": ["Space"]},
+            {"id": "cup_1", "classes": ["Artifact"]},
+        ],
+        "relationships": [
+            ["kitchen_1", "hasPathTo", "door_1"],
+            ["door_1", "hasPathTo", "corridor_1"],
+            ["cup_1", "artifactIsOnFloorOf", "kitchen_1"],
+        ],
+    }
+    topology = compute_topology(rows)
+    print(f"Locations: {topology['locations']}")
+    print(f"kitchen_1 -> corridor_1: {topology['distances']['kitchen_1']['corridor_1']} hops")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+EnvPool: Host several environments (one OntologyManager each) in one server process
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import owlready2 as owl
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (None where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class HostedEnv:
+    """One loaded environment: its manager plus per-environment server state."""
+
+    def __init__(self, env_id: str, manager, load_rss_bytes: Optional[int] = None):
+        """
+        Initialize hosted environment.
+
+        Args:
+            env_id: Environment ID
+            manager: OntologyManager serving this environment
+            load_rss_bytes: Process RSS growth while the environment was loaded
+        """
+        self.env_id = env_id
+        self.manager = manager
+        self.load_rss_bytes = load_rss_bytes
+        self.loaded_at = time.time()
+        self.last_used = time.monotonic()
+        self.requests = 0
+        # Last world version applied through sequenced /sparql/update calls (None: no run yet)
+        self.world_version: Optional[int] = None
+        # Run the sequence numbers belong to (sent by the client with each sequenced update)
+        self.run_id: Optional[str] = None
+
+    def touch(self):
+        self.last_used = time.monotonic()
+        self.requests += 1
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_used
+
+    def memory(self) -> Dict[str, Any]:
+        """Memory held by this environment (quadstore pages, topology table, load-time RSS growth)."""
+        world_bytes = None
+        individuals = None
+        world = self.manager.world
+        try:
+            db = world.graph.db
+            page_count = db.execute("PRAGMA page_count").fetchone()[0]
+            page_size = db.execute("PRAGMA page_size").fetchone()[0]
+            world_bytes = page_count * page_size
+            individuals = db.execute("SELECT COUNT(*) FROM objs WHERE p = ? AND o = ?",
+                                     (owl.rdf_type, owl.owl_named_individual)).fetchone()[0]
+        except Exception:
+            pass
+
+        topology = self.manager.topology
+        return {
+            "world_bytes": world_bytes,
+            "individuals": individuals,
+            "topology_distances": sum(len(d) for d in topology["distances"].values()) if topology else 0,
+            "load_rss_bytes": self.load_rss_bytes,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "env_id": self.env_id,
+            "neo4j_database": self.manager.neo4j_database,
+            "loaded_at": self.loaded_at,
+            "idle_seconds": round(self.idle_seconds(), 1),
+            "requests": self.requests,
+            "world_version": self.world_version,
+            "run_id": self.run_id,
+            "memory": self.memory(),
+        }
+
+
+class EnvPool:
+    """
+    Loaded environments keyed by env_id, least recently used first.
+
+    Environments are opened on first use through open_env. Beyond max_envs
+    the least recently used one is closed, and environments idle for longer
+    than idle_timeout are closed on the next lookup. The default environment
+    serves requests that name none.
+    """
+
+    def __init__(self, open_env: Callable[[str], Any], max_envs: int = 1,
+                 idle_timeout: Optional[float] = None, default_env_id: Optional[str] = None):
+        """
+        Initialize pool.
+
+        Args:
+            open_env: env_id -> OntologyManager (loaded and ready to serve)
+            max_envs: Maximum number of environments kept open
+            idle_timeout: Seconds without requests before an environment is closed
+                (None or 0: never)
+            default_env_id: Environment for requests without one
+        """
+        self.open_env = open_env
+        self.max_envs = max(1, max_envs)
+        self.idle_timeout = idle_timeout or None
+        self.default_env_id = default_env_id
+        self.envs: "OrderedDict[str, HostedEnv]" = OrderedDict()
+
+    def __contains__(self, env_id: str) -> bool:
+        return env_id in self.envs
+
+    def add(self, env_id: str, manager) -> HostedEnv:
+        """Host an already opened manager (closing least recently used environments beyond max_envs)."""
+        self.evict(env_id, reason="replaced")
+        self._make_room()
+        hosted = self.envs[env_id] = HostedEnv(env_id, manager)
+        return hosted
+
+    def rename(self, env_id: str, new_env_id: str) -> HostedEnv:
+        """Re-key a hosted environment whose manager now serves another environment."""
+        hosted = self.envs.pop(env_id)
+        hosted.env_id = new_env_id
+        hosted.world_version = None
+        hosted.run_id = None
+        self.envs[new_env_id] = hosted
+        return hosted
+
+    def get(self, env_id: Optional[str] = None) -> HostedEnv:
+        """
+        Hosted environment for env_id (default environment if None), opening it if needed.
+
+        Raises:
+            KeyError: If no env_id is given and there is no default environment
+        """
+        env_id = env_id or self.default_env_id
+        if env_id is None:
+            raise KeyError("No environment selected and no default environment")
+        self.evict_idle(keep=env_id)
+
+        hosted = self.envs.get(env_id)
+        if hosted is None:
+            self._make_room()
+            rss_before = process_rss_bytes()
+            manager = self.open_env(env_id)
+            rss_after = process_rss_bytes()
+            load_rss = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            hosted = self.envs[env_id] = HostedEnv(env_id, manager, load_rss)
+
+        self.envs.move_to_end(env_id)
+        hosted.touch()
+        return hosted
+
+    def _make_room(self):
+        """Close least recently used environments first, so the limit holds while opening one."""
+        while len(self.envs) >= self.max_envs:
+            self.evict(next(iter(self.envs)), reason="least recently used")
+
+    def evict(self, env_id: str, reason: str = "evicted"):
+        """Close an environment's manager and drop it from the pool."""
+        hosted = self.envs.pop(env_id, None)
+        if hosted is None:
+            return
+        print(f"Closing environment {env_id} ({reason})")
+        try:
+            hosted.manager.close()
+        except Exception as e:
+            print(f"WARNING: Failed to close environment {env_id}: {e}")
+
+    def evict_idle(self, keep: Optional[str] = None) -> List[str]:
+        """Close environments idle for longer than idle_timeout (except keep)."""
+        if self.idle_timeout is None:
+            return []
+        idle = [env_id for env_id, hosted in self.envs.items()
+                if env_id != keep and hosted.idle_seconds() > self.idle_timeout]
+        for env_id in idle:
+            self.evict(env_id, reason=f"idle > {self.idle_timeout:.0f}s")
+        return idle
+
+    def summary(self) -> Dict[str, Any]:
+        """Hosted environments with per-environment memory, most recently used last."""
+        return {
+            "default_env_id": self.default_env_id,
+            "max_envs": self.max_envs,
+            "idle_timeout": self.idle_timeout,
+            "process_rss_bytes": process_rss_bytes(),
+            "hosted": [hosted.summary() for hosted in self.envs.values()],
+        }
+
+    def close(self):
+        """Close every hosted environment."""
+        for env_id in list(self.envs):
+            self.evict(env_id, reason="shutdown")
+
+
+if __name__ == "__main__":
+    # LRU behaviour with stand-in managers
+    class _Manager:
+        def __init__(self, env_id):
+            self.env_id = env_id
+            self.neo4j_database = env_id.lower().replace("_", "-")
+            self.world = None
+            self.topology = None
+
+        def close(self):
+            pass
+
+    pool = EnvPool(_Manager, max_envs=2, default_env_id="Darden")
+    for env_id in (None, "Adairsville", "Darden", "Darden_2"):
+        pool.get(env_id)
+        print(f"get({env_id}) -> hosted: {list(pool.envs)}")
+    print(f"Process RSS: {process_rss_bytes()} bytes")
@@ -32,6 +32,8 @@ class StatusResponse(BaseModel):
     classes_count: Optional[int] = None
     individuals: Optional[List[str]] = None
     message: Optional[str] = None
+    env_id: Optional[str] = None
+    env_name: Optional[str] = None
 
 
 class OperationResponse(BaseModel):
@@ -43,6 +45,10 @@ class OperationResponse(BaseModel):
     relationships: Optional[int] = None
     added: Optional[int] = None
     failed: Optional[int] = None
+    triples: Optional[int] = None
+    embeddings: Optional[int] = None
+    bookmarks: Optional[List[str]] = None
+    timings: Optional[Dict[str, float]] = None
 
 
 class BatchIndividualsData(BaseModel):
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Neo4j Driver Registry
+One pooled driver per (URI, user, password), shared by the server, agent tools and CLIs.
+Reads run in READ access mode (routed to followers/read replicas in a cluster) and start
+after the latest known world write through causal bookmarks.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from neo4j import READ_ACCESS, Bookmarks, GraphDatabase
+
+_lock = threading.Lock()
+_entries: Dict[Tuple[str, str, str], "_DriverEntry"] = {}
+# Bookmarks of the latest world write per source (database written in this process,
+# or the URL of the ontology server that reported them)
+_bookmarks: Dict[str, Set[str]] = {}
+
+
+class _DriverEntry:
+    """A registered driver with its usage counters."""
+
+    def __init__(self, uri: str, user: str, driver, pool_config: Dict[str, Any]):
+        self.uri = uri
+        self.user = user
+        self.driver = driver
+        self.pool_config = pool_config
+        self.created_at = time.time()
+        self.lookups = 0
+        self.transactions = {"read": 0, "write": 0}
+        self.attempts = 0
+        self.failures = 0
+        self.tx_seconds = 0.0
+
+    def metrics(self) -> Dict[str, Any]:
+        transactions = sum(self.transactions.values())
+        return {
+            "uri": self.uri,
+            "user": self.user,
+            "created_at": self.created_at,
+            "lookups": self.lookups,
+            "read_transactions": self.transactions["read"],
+            "write_transactions": self.transactions["write"],
+            "retries": max(0, self.attempts - transactions - self.failures),
+            "failures": self.failures,
+            "avg_tx_ms": round(self.tx_seconds * 1000 / transactions, 3) if transactions else None,
+            "connections": _pool_connections(self.driver),
+            "config": self.pool_config,
+        }
+
+
+def _pool_connections(driver) -> Optional[Dict[str, int]]:
+    """Open/in-use/idle connection counts (driver internals; None if unavailable)."""
+    try:
+        connections = [c for conns in driver._pool.connections.values() for c in conns]
+    except AttributeError:
+        return None
+    in_use = sum(1 for c in connections if getattr(c, "in_use", False))
+    return {"open": len(connections), "in_use": in_use, "idle": len(connections) - in_use}
+
+
+def get_driver(uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None):
+    """
+    Shared driver for the given credentials (neo4j section of config.yaml if omitted).
+
+    The driver is created on first use with the neo4j.pool settings and kept
+    for the life of the process; callers must not close it (see close_drivers).
+    """
+    entry = _get_entry(uri, user, password)
+    entry.lookups += 1
+    return entry.driver
+
+
+def _get_entry(uri: Optional[str], user: Optional[str], password: Optional[str]) -> _DriverEntry:
+    from .config import get_config
+
+    if not uri or not user or not password:
+        neo4j_config = get_config().get_neo4j_config()
+        uri, user, password = uri or neo4j_config['uri'], user or neo4j_config['user'], \
+            password or neo4j_config['password']
+
+    key = (uri, user, password)
+    entry = _entries.get(key)
+    if entry is not None:
+        return entry
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            pool_config = get_config().get_neo4j_pool_config()
+            driver = GraphDatabase.driver(uri, auth=(user, password), **pool_config)
+            entry = _entries[key] = _DriverEntry(uri, user, driver, pool_config)
+    return entry
+
+
+def _entry_for(driver) -> Optional[_DriverEntry]:
+    for entry in _entries.values():
+        if entry.driver is driver:
+            return entry
+    return None
+
+
+def note_bookmarks(values: Iterable[str], source: str = ""):
+    """Record the bookmarks of a completed write; later reads wait until they are applied."""
+    values = set(values or ())
+    if values:
+        _bookmarks[source] = values
+
+
+def current_bookmarks() -> List[str]:
+    """Bookmarks every read session starts from (latest write of each source)."""
+    return sorted(set().union(*_bookmarks.values()))
+
+
+def session_bookmarks(session) -> List[str]:
+    """Bookmarks of a session's last completed transaction."""
+    return sorted(session.last_bookmarks().raw_values)
+
+
+def read_session(driver=None, database: Optional[str] = None, **kwargs):
+    """
+    Read-mode session starting from current_bookmarks().
+
+    In a cluster the driver routes it to a follower or read replica, which
+    waits until the bookmarked writes are applied before answering.
+    """
+    return (driver or get_driver()).session(database=database, default_access_mode=READ_ACCESS,
+                                            bookmarks=Bookmarks.from_raw_values(current_bookmarks()),
+                                            **kwargs)
+
+
+class ReadDriver:
+    """
+    Driver stand-in whose sessions are read_session()s.
+
+    Hand it to read-only code that takes a driver (PDDLGenerator,
+    ObjectIndex, pddl_goal_utils) to route its queries as reads.
+    """
+
+    def __init__(self, driver=None, database: Optional[str] = None):
+        self.driver = driver or get_driver()
+        self.database = database
+
+    def session(self, **kwargs):
+        kwargs["database"] = kwargs.get("database") or self.database
+        return read_session(self.driver, **kwargs)
+
+    def close(self):
+        pass
+
+
+def _execute(mode: str, query: str, parameters: Optional[Dict[str, Any]], database: Optional[str],
+             driver) -> List[Any]:
+    driver = driver or get_driver()
+    entry = _entry_for(driver)
+
+    def work(tx):
+        if entry is not None:
+            entry.attempts += 1
+        # Consume inside the transaction function so a retry starts from scratch
+        return list(tx.run(query, parameters or {}))
+
+    start = time.perf_counter()
+    try:
+        if mode == "read":
+            with read_session(driver, database) as session:
+                records = session.execute_read(work)
+        else:
+            with driver.session(database=database) as session:
+                records = session.execute_write(work)
+                note_bookmarks(session_bookmarks(session), database or "")
+    except Exception:
+        if entry is not None:
+            entry.failures += 1
+        raise
+    if entry is not None:
+        entry.transactions[mode] += 1
+        entry.tx_seconds += time.perf_counter() - start
+    return records
+
+
+def execute_read(query: str, parameters: Optional[Dict[str, Any]] = None, database: Optional[str] = None,
+                 driver=None) -> List[Any]:
+    """
+    Run a read query in a managed read transaction (retried on transient errors).
+
+    The session starts from current_bookmarks(), so it sees the latest noted write.
+
+    Args:
+        query: Cypher query
+        parameters: Query parameters
+        database: Database name (None: default database)
+        driver: Driver to use (default: get_driver())
+
+    Returns:
+        List of records
+    """
+    return _execute("read", query, parameters, database, driver)
+
+
+def execute_write(query: str, parameters: Optional[Dict[str, Any]] = None, database: Optional[str] = None,
+                  driver=None) -> List[Any]:
+    """Run a write query in a managed transaction (retried on transient errors); see execute_read."""
+    return _execute("write", query, parameters, database, driver)
+
+
+def pool_metrics() -> Dict[str, Any]:
+    """Per-driver usage counters, connection pool state and the bookmarks reads start from."""
+    return {"drivers": [entry.metrics() for entry in list(_entries.values())],
+            "bookmarks": current_bookmarks()}
+
+
+def close_drivers():
+    """Close every registered driver (process shutdown)."""
+    with _lock:
+        for entry in _entries.values():
+            try:
+                entry.driver.close()
+            except Exception as e:
+                print(f"WARNING: Failed to close Neo4j driver for {entry.uri}: {e}")
+        _entries.clear()
+
+
+if __name__ == "__main__":
+    # Register a driver and report the pool (no connection is opened until first use)
+    driver = get_driver()
+    print(f"Same driver on second lookup: {get_driver() is driver}")
+    print(f"Pool metrics: {pool_metrics()}")
+    close_drivers()
@@ -4,16 +4,40 @@ OntologyManager: Core ontology management with owlready2 + reasoner + Neo4j
 """
 
 import owlready2 as owl
-from neo4j import GraphDatabase
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import traceback
 import os
+import shutil
+import tempfile
+import time
+import uuid
 from dotenv import load_dotenv
 
+from .neo4j_pool import get_driver, note_bookmarks, read_session, session_bookmarks
+from .world_cache import WorldCache
+from .world_model import RDF_TYPE, WorldModel, literal_value, local_name
+
 # Load environment variables from .env file
 load_dotenv()
 
+ONTOLOGY_IRI = "http://www.semanticweb.org/namh_woo/ontologies/2025/10/untitled-ontology-10"
+# Rows per UNWIND statement when writing individuals and relationships to Neo4j
+NEO4J_BATCH_SIZE = 1000
+# Part of the Neo4j schema fingerprint; bump when the synced schema layout changes
+NEO4J_SCHEMA_VERSION = 1
+# Uniqueness constraints managed by the server: (name, label, property)
+NEO4J_CONSTRAINTS = (
+    ("individual_id_unique", "Individual", "id"),
+    ("class_id_unique", "Class", "id"),
+    ("class_name_unique", "Class", "name"),
+    ("property_id_unique", "Property", "id"),
+)
+# Range indexes for non-key lookups (e.g. GraphTools.filter_objects by category)
+NEO4J_LOOKUP_INDEXES = (
+    ("individual_category_lookup", "Individual", "category"),
+)
+
 
 class OntologyManager:
     """Manage OWL ontology with real-time Neo4j synchronization."""
@@ -22,7 +46,10 @@ class OntologyManager:
                  env_id: Optional[str] = None,
                  neo4j_uri: Optional[str] = None,
                  neo4j_user: Optional[str] = None,
-                 neo4j_password: Optional[str] = None):
+                 neo4j_password: Optional[str] = None,
+                 world_path: Optional[str] = None,
+                 offline: bool = False,
+                 neo4j_database: Optional[str] = None):
         """Initialize ontology manager.
 
         Args:
@@ -31,39 +58,62 @@ class OntologyManager:
             neo4j_uri: Neo4j connection URI (required if not in config)
             neo4j_user: Neo4j username (required if not in config)
             neo4j_password: Neo4j password (required if not in config)
+            world_path: SQLite file for a persistent world (optional); reopened
+                as-is on restart while the schema and loaded TTLs are unchanged
+            offline: Load the schema without connecting to Neo4j (environment bundle builds)
+            neo4j_database: Neo4j database for this environment (created if missing;
+                None: the server's default database)
         """
         self.owl_path = owl_path
         self.env_id = env_id
+        self.world_path = world_path
         self.neo4j_uri = neo4j_uri
         self.neo4j_user = neo4j_user
         self.neo4j_password = neo4j_password
+        self.neo4j_database = neo4j_database
 
         self.world = None
         self.ontology = None
         self.driver = None
         self.current_data_type = None  # "static" or "dynamic" - tracks current loading context
+        self._schema_index = None  # local name -> storid for classes and properties (see _get_schema_index)
+        self.world_cache: Optional[WorldCache] = None  # fingerprints of the persistent world (world_path)
+        self.warm_start = False  # True if the persistent world was reopened instead of rebuilt
+        self.topology: Optional[Dict[str, Any]] = None  # location graph of the activated bundle
+        self._scratch_world_path: Optional[Path] = None  # working copy of a bundle world (no world_path)
+        self.last_bookmarks: List[str] = []  # causal bookmarks of the last Neo4j world write
 
         # Load OWL schema
         self._load_ontology()
 
+        if offline:
+            print("OntologyManager initialized offline (no Neo4j)")
+            return
+
         # Connect to Neo4j
         self._connect_neo4j()
 
         # Initialize Neo4j with schema
         self._initialize_neo4j_schema()
 
+        # A reopened world already holds the reasoned individuals; only Neo4j needs them again
+        if self.warm_start and self.world_cache.inputs:
+            self.sync_to_neo4j(skip_reasoning=True)
+
         space_info = f" (space: {env_id})" if env_id else ""
         print(f"OntologyManager initialized successfully{space_info}")
 
     def _load_ontology(self):
         """Load OWL ontology schema."""
         try:
-            self.world = owl.World()
-            self.world.get_ontology(f"file://{Path(self.owl_path).absolute()}").load()
+            if self.world_path:
+                self._open_persistent_world()
+            else:
+                self.world = owl.World()
+                self.world.get_ontology(f"file://{Path(self.owl_path).absolute()}").load()
 
             # Get ontology by IRI
-            ontology_iri = "http://www.semanticweb.org/namh_woo/ontologies/2025/10/untitled-ontology-10"
-            self.ontology = self.world.get_ontology(ontology_iri)
+            self.ontology = self.world.get_ontology(ONTOLOGY_IRI)
 
             if not self.ontology:
                 self.ontology = list(self.world.ontologies())[0]
@@ -79,8 +129,34 @@ class OntologyManager:
             print(f"ERROR: Failed to load ontology: {e}")
             raise
 
+    def _open_persistent_world(self):
+        """Reopen the SQLite world if its fingerprints match, otherwise rebuild it from the schema."""
+        start = time.perf_counter()
+        self.world_cache = WorldCache(Path(self.world_path))
+        fingerprint = WorldCache.schema_fingerprint(Path(self.owl_path), owl.VERSION)
+        reason = self.world_cache.check(fingerprint)
+
+        if reason is None:
+            self.world = owl.World(filename=str(self.world_path))
+            self.warm_start = True
+            inputs = ", ".join(Path(e["path"]).name for e in self.world_cache.inputs) or "schema only"
+            print(f"Reopened persistent world {self.world_path} ({inputs}) "
+                  f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return
+
+        print(f"Rebuilding persistent world {self.world_path}: {reason}")
+        self.world_cache.reset(fingerprint)
+        self.world = owl.World(filename=str(self.world_path))
+        self.world.get_ontology(f"file://{Path(self.owl_path).absolute()}").load()
+        self.world.save()
+
+    def mark_world_modified(self):
+        """Record a change not described by the loaded TTLs (next restart rebuilds the persistent world)."""
+        if self.world_cache is not None:
+            self.world_cache.mark_dirty()
+
     def _connect_neo4j(self):
-        """Connect to Neo4j database."""
+        """Connect to Neo4j database (through the shared driver for these credentials)."""
         if not self.neo4j_uri or not self.neo4j_user or not self.neo4j_password:
             raise ValueError(
                 "Neo4j credentials not provided. Please provide neo4j_uri, "
@@ -88,155 +164,216 @@ class OntologyManager:
             )
 
         try:
-            self.driver = GraphDatabase.driver(
-                self.neo4j_uri,
-                auth=(self.neo4j_user, self.neo4j_password)
-            )
-            with self.driver.session() as session:
+            self.driver = get_driver(self.neo4j_uri, self.neo4j_user, self.neo4j_password)
+            if self.neo4j_database:
+                with self.driver.session(database="system") as session:
+                    session.run(f"CREATE DATABASE `{self.neo4j_database}` IF NOT EXISTS WAIT")
+            with self.session() as session:
                 session.run("RETURN 1")
-            print("Connected to Neo4j")
+            print(f"Connected to Neo4j (database: {self.neo4j_database or 'default'})")
         except Exception as e:
             print(f"ERROR: Neo4j connection failed: {e}")
             raise
 
+    def session(self):
+        """Neo4j session on this environment's database."""
+        return self.driver.session(database=self.neo4j_database)
+
+    def read_session(self):
+        """Read-mode session on this environment's database, after the last world write."""
+        return read_session(self.driver, self.neo4j_database)
+
+    def _note_world_write(self, session):
+        """Keep the bookmarks of a world write so reads (here and in API clients) see it."""
+        self.last_bookmarks = session_bookmarks(session)
+        note_bookmarks(self.last_bookmarks, self.neo4j_database or "")
+
+    def _schema_rows(self) -> Dict[str, List]:
+        """Classes, properties and their hierarchy/domain/range edges as UNWIND rows."""
+        classes = list(self.ontology.classes())
+        object_props = list(self.ontology.object_properties())
+        data_props = list(self.ontology.data_properties())
+        return {
+            "classes": [{"id": cls.name, "uri": str(cls.iri)} for cls in classes],
+            "subclass_of": [[cls.name, parent.name] for cls in classes for parent in cls.is_a
+                            if hasattr(parent, 'name') and parent != owl.Thing],
+            "properties": [{"id": prop.name, "uri": str(prop.iri), "type": "ObjectProperty"}
+                           for prop in object_props] +
+                          [{"id": prop.name, "uri": str(prop.iri), "type": "DataProperty"}
+                           for prop in data_props],
+            "has_domain": [[prop.name, domain.name] for prop in object_props
+                           for domain in prop.domain if hasattr(domain, 'name')],
+            "has_range": [[prop.name, range_cls.name] for prop in object_props
+                          for range_cls in prop.range if hasattr(range_cls, 'name')],
+            "subproperty_of": [[prop.name, parent.name] for prop in object_props for parent in prop.is_a
+                               if hasattr(parent, 'name') and parent != owl.ObjectProperty
+                               and parent.name not in ['SymmetricProperty', 'TransitiveProperty',
+                                                       'topObjectProperty']],
+        }
+
     def _initialize_neo4j_schema(self):
-        """Initialize Neo4j with OWL schema (classes, properties, hierarchy)."""
+        """
+        Initialize Neo4j with OWL schema (classes, properties, hierarchy).
+
+        The schema is written with one UNWIND statement per node/edge kind and
+        stamped with a fingerprint of robot.owx on a SchemaMeta node. If the
+        stored fingerprint matches, the schema is left as is and only stale
+        individuals are removed.
+        """
         try:
-            with self.driver.session() as session:
+            start = time.perf_counter()
+            fingerprint = WorldCache.schema_fingerprint(Path(self.owl_path), f"neo4j-{NEO4J_SCHEMA_VERSION}")
+            with self.session() as session:
+                record = session.run("MATCH (m:SchemaMeta {id: 'schema'}) RETURN m.fingerprint AS fingerprint").single()
+                if record is not None and record["fingerprint"] == fingerprint:
+                    session.run("MATCH (i:Individual) DETACH DELETE i")
+                    self._setup_constraints(session)
+                    self._setup_vector_index(session)
+                    print(f"Neo4j schema unchanged, skipped sync ({(time.perf_counter() - start) * 1000:.0f} ms)")
+                    return
+
                 # Clear all data
                 session.run("MATCH (n) DETACH DELETE n")
 
-                # Sync classes
-                for cls in self.ontology.classes():
-                    session.run("""
-                        MERGE (c:Class {id: $class_id})
-                        SET c.name = $class_name,
-                            c.uri = $class_uri
-                    """, class_id=cls.name, class_name=cls.name, class_uri=str(cls.iri))
-
-                # Sync class hierarchy
-                for cls in self.ontology.classes():
-                    for parent in cls.is_a:
-                        if hasattr(parent, 'name') and parent != owl.Thing:
-                            session.run("""
-                                MATCH (child:Class {id: $child_id})
-                                MATCH (parent:Class {id: $parent_id})
-                                MERGE (child)-[:SUBCLASS_OF]->(parent)
-                            """, child_id=cls.name, parent_id=parent.name)
-
-                # Sync properties
-                for prop in self.ontology.object_properties():
-                    session.run("""
-                        MERGE (p:Property {id: $prop_id})
-                        SET p.name = $prop_name,
-                            p.uri = $prop_uri,
-                            p.type = 'ObjectProperty'
-                    """, prop_id=prop.name, prop_name=prop.name, prop_uri=str(prop.iri))
-
-                for prop in self.ontology.data_properties():
-                    session.run("""
-                        MERGE (p:Property {id: $prop_id})
-                        SET p.name = $prop_name,
-                            p.uri = $prop_uri,
-                            p.type = 'DataProperty'
-                    """, prop_id=prop.name, prop_name=prop.name, prop_uri=str(prop.iri))
-
-                # Sync property domains and ranges
-                for prop in self.ontology.object_properties():
-                    for domain in prop.domain:
-                        if hasattr(domain, 'name'):
-                            session.run("""
-                                MATCH (p:Property {id: $prop_id})
-                                MATCH (c:Class {id: $class_id})
-                                MERGE (p)-[:HAS_DOMAIN]->(c)
-                            """, prop_id=prop.name, class_id=domain.name)
-
-                    for range_cls in prop.range:
-                        if hasattr(range_cls, 'name'):
-                            session.run("""
-                                MATCH (p:Property {id: $prop_id})
-                                MATCH (c:Class {id: $class_id})
-                                MERGE (p)-[:HAS_RANGE]->(c)
-                            """, prop_id=prop.name, class_id=range_cls.name)
-
-                # Sync property hierarchy
-                for prop in self.ontology.object_properties():
-                    for parent in prop.is_a:
-                        if hasattr(parent, 'name') and parent != owl.ObjectProperty:
-                            if parent.name not in ['SymmetricProperty', 'TransitiveProperty', 'topObjectProperty']:
-                                session.run("""
-                                    MATCH (child:Property {id: $child_id})
-                                    MATCH (parent:Property {id: $parent_id})
-                                    MERGE (child)-[:SUBPROPERTY_OF]->(parent)
-                                """, child_id=prop.name, parent_id=parent.name)
+                # Constraints first, so the MERGEs below look nodes up by index
+                self._setup_constraints(session)
+
+                rows = self._schema_rows()
+                session.run("""
+                    UNWIND $rows AS row
+                    MERGE (c:Class {id: row.id})
+                    SET c.name = row.id, c.uri = row.uri
+                """, rows=rows["classes"])
+                session.run("""
+                    UNWIND $rows AS row
+                    MERGE (p:Property {id: row.id})
+                    SET p.name = row.id, p.uri = row.uri, p.type = row.type
+                """, rows=rows["properties"])
+
+                # Hierarchy, domains and ranges
+                for rel_type, key, source, target in (
+                        ("SUBCLASS_OF", "subclass_of", "Class", "Class"),
+                        ("HAS_DOMAIN", "has_domain", "Property", "Class"),
+                        ("HAS_RANGE", "has_range", "Property", "Class"),
+                        ("SUBPROPERTY_OF", "subproperty_of", "Property", "Property")):
+                    session.run(f"""
+                        UNWIND $pairs AS pair
+                        MATCH (a:{source} {{id: pair[0]}})
+                        MATCH (b:{target} {{id: pair[1]}})
+                        MERGE (a)-[:{rel_type}]->(b)
+                    """, pairs=rows[key])
 
                 # Setup vector index for semantic search
                 self._setup_vector_index(session)
 
-            print("Initialized Neo4j with OWL schema")
+                session.run("""
+                    MERGE (m:SchemaMeta {id: 'schema'})
+                    SET m.fingerprint = $fingerprint, m.synced_at = datetime()
+                """, fingerprint=fingerprint)
+
+            print(f"Initialized Neo4j with OWL schema: {len(rows['classes'])} classes, "
+                  f"{len(rows['properties'])} properties ({(time.perf_counter() - start) * 1000:.0f} ms)")
 
         except Exception as e:
             print(f"ERROR: Failed to initialize Neo4j schema: {e}")
             raise
 
+    def _setup_constraints(self, session):
+        """
+        Ensure the declared uniqueness constraints and lookup indexes exist.
+
+        Server-managed constraints and indexes (names ending in _unique or
+        _lookup) that are no longer declared are dropped. Each uniqueness
+        constraint is backed by an index, so {id: ...} lookups on labeled
+        nodes are index seeks instead of scans.
+        """
+        try:
+            existing_constraints = {record["name"] for record in session.run("SHOW CONSTRAINTS YIELD name RETURN name")}
+            existing_indexes = {record["name"] for record in session.run("SHOW INDEXES YIELD name RETURN name")}
+            declared_constraints = {name for name, _, _ in NEO4J_CONSTRAINTS}
+            declared_indexes = {name for name, _, _ in NEO4J_LOOKUP_INDEXES}
+
+            for name in sorted(existing_constraints - declared_constraints):
+                if name.endswith("_unique"):
+                    session.run(f"DROP CONSTRAINT `{name}` IF EXISTS")
+                    print(f"Dropped constraint {name}")
+            for name in sorted(existing_indexes - declared_indexes):
+                if name.endswith("_lookup"):
+                    session.run(f"DROP INDEX `{name}` IF EXISTS")
+                    print(f"Dropped index {name}")
+
+            created = []
+            for name, label, prop in NEO4J_CONSTRAINTS:
+                if name in existing_constraints:
+                    continue
+                try:
+                    session.run(f"CREATE CONSTRAINT `{name}` IF NOT EXISTS "
+                                f"FOR (n:`{label}`) REQUIRE n.`{prop}` IS UNIQUE")
+                    created.append(name)
+                except Exception as e:
+                    print(f"WARNING: Failed to create constraint {name} on :{label}({prop}): {e}")
+            for name, label, prop in NEO4J_LOOKUP_INDEXES:
+                if name in existing_indexes:
+                    continue
+                try:
+                    session.run(f"CREATE INDEX `{name}` IF NOT EXISTS FOR (n:`{label}`) ON (n.`{prop}`)")
+                    created.append(name)
+                except Exception as e:
+                    print(f"WARNING: Failed to create index {name} on :{label}({prop}): {e}")
+
+            if created:
+                print(f"Created Neo4j constraints/indexes: {', '.join(created)}")
+        except Exception as e:
+            print(f"WARNING: Constraint setup failed: {e}")
+            print("  (Lookups by id will fall back to label scans)")
+
     def _setup_vector_index(self, session):
-        """Setup dual vector indices for category and description embeddings with different dimensions."""
+        """
+        Ensure the category and description vector indices exist with the configured dimensions.
+
+        An index is only dropped and recreated when it is missing or its
+        dimensions differ from the embedding configuration.
+        """
         try:
-            from .config import get_config
-
-            # Load embedding configuration
-            config = get_config()
-            embedding_config = config.get_embedding_config()
-
-            # Extract dimensions for category and description
-            category_config = embedding_config.get('category', {})
-            description_config = embedding_config.get('description', {})
-
-            # Use recommended defaults if not specified
-            from .embedding import EmbeddingManager
-            category_dims = category_config.get('dimensions') or \
-                          EmbeddingManager.RECOMMENDED_DIMENSIONS.get(
-                              category_config.get('model', 'text-embedding-3-small'), 512)
-            description_dims = description_config.get('dimensions') or \
-                             EmbeddingManager.RECOMMENDED_DIMENSIONS.get(
-                                 description_config.get('model', 'text-embedding-3-small'), 512)
-
-            # Always recreate indices to ensure correct dimensions
+            from .config import get_settings
+
+            # Configured dimensions (recommended for the model if not set)
+            embedding = get_settings().embedding
+            wanted = {
+                "categoryEmbeddingIndex": ("category_embedding", embedding.category.resolved_dimensions),
+                "descriptionEmbeddingIndex": ("description_embedding", embedding.description.resolved_dimensions),
+            }
+
             # Drop old single embedding index if exists (for backward compatibility)
             session.run("DROP INDEX individualEmbeddingIndex IF EXISTS")
 
-            # Drop existing dual embedding indices if they exist
-            session.run("DROP INDEX categoryEmbeddingIndex IF EXISTS")
-            session.run("DROP INDEX descriptionEmbeddingIndex IF EXISTS")
-            print(f"Dropped old vector indices")
-
-            # Create category embedding index
-            session.run(f"""
-                CREATE VECTOR INDEX categoryEmbeddingIndex
-                FOR (n:Individual)
-                ON n.category_embedding
-                OPTIONS {{
-                    indexConfig: {{
-                        `vector.dimensions`: {category_dims},
-                        `vector.similarity_function`: 'cosine'
-                    }}
-                }}
-            """)
-            print(f"Created category embedding index ({category_dims}D)")
-
-            # Create description embedding index
-            session.run(f"""
-                CREATE VECTOR INDEX descriptionEmbeddingIndex
-                FOR (n:Individual)
-                ON n.description_embedding
-                OPTIONS {{
-                    indexConfig: {{
-                        `vector.dimensions`: {description_dims},
-                        `vector.similarity_function`: 'cosine'
+            existing = {
+                record["name"]: (record["options"] or {}).get("indexConfig", {}).get("vector.dimensions")
+                for record in session.run("""
+                    SHOW INDEXES YIELD name, options
+                    WHERE name IN $names
+                    RETURN name, options
+                """, names=list(wanted))
+            }
+
+            for name, (prop, dims) in wanted.items():
+                if existing.get(name) == dims:
+                    continue
+                if name in existing:
+                    session.run(f"DROP INDEX {name} IF EXISTS")
+                    print(f"Dropped {name} ({existing[name]}D)")
+                session.run(f"""
+                    CREATE VECTOR INDEX {name}
+                    FOR (n:Individual)
+                    ON n.{prop}
+                    OPTIONS {{
+                        indexConfig: {{
+                            `vector.dimensions`: {dims},
+                            `vector.similarity_function`: 'cosine'
+                        }}
                     }}
-                }}
-            """)
-            print(f"Created description embedding index ({description_dims}D)")
+                """)
+                print(f"Created {name} ({dims}D)")
 
         except Exception as e:
             print(f"WARNING: Vector index setup failed: {e}")
@@ -314,10 +451,202 @@ class OntologyManager:
             traceback.print_exc()
             return {"status": "error", "message": str(e)}
 
-    def load_instances_from_ttl(self, ttl_path: str) -> Dict[str, Any]:
+    def load_instances_from_ttl(self, ttl_path: str, bulk: bool = True) -> Dict[str, Any]:
+        """
+        Load individuals from TTL file.
+
+        Args:
+            ttl_path: Path to TTL file containing individual instances
+            bulk: Write triples straight into the quadstore (default); False uses
+                the per-individual owlready2 API path
+
+        Returns:
+            Status dictionary with count of loaded individuals
+        """
+        if self.world_cache is not None and self.world_cache.has_input(ttl_path):
+            print(f"Skipping {ttl_path}: already loaded into the persistent world and unchanged")
+            return {"status": "success", "added": 0, "failed": 0,
+                    "message": "Already loaded (persistent world, unchanged)"}
+
+        if not bulk:
+            result = self._load_instances_from_ttl_objects(ttl_path)
+        else:
+            result = self.bulk_import_ttl(ttl_path)
+            if result["status"] == "error":
+                return result
+
+            # Run reasoning once for all individuals
+            print("Running reasoning for all individuals...")
+            start = time.perf_counter()
+            sync_result = self.sync_to_neo4j()
+            result["timings"]["reason_sync_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            if sync_result.get("status") != "success":
+                return {"status": "error", "message": sync_result.get("message", "Sync failed")}
+            result["bookmarks"] = sync_result["bookmarks"]
+            print(f"  Load timings (ms): {result['timings']}")
+
+        # Persist the reasoned world together with its new input
+        if result["status"] == "success" and self.world_cache is not None:
+            self.world.save()
+            self.world_cache.add_input(ttl_path)
+        return result
+
+    def _get_schema_index(self) -> Dict[str, Dict[str, int]]:
+        """Local name -> storid of the schema's classes, object and data properties (computed once)."""
+        if self._schema_index is None:
+            self._schema_index = {
+                "classes": {c.name: c.storid for c in self.ontology.classes()},
+                "object_properties": {p.name: p.storid for p in self.ontology.object_properties()},
+                "data_properties": {p.name: p.storid for p in self.ontology.data_properties()},
+            }
+        return self._schema_index
+
+    def _get_entity_storids(self) -> Dict[str, int]:
+        """Local name -> storid of every typed entity in the ontology namespace."""
+        base_iri = self.ontology.base_iri
+        rows = self.world.graph.execute(
+            "SELECT storid, iri FROM resources WHERE storid IN (SELECT s FROM objs WHERE p = ?)",
+            (owl.rdf_type,)
+        )
+        return {iri[len(base_iri):]: storid for storid, iri in rows if iri.startswith(base_iri)}
+
+    def bulk_import_ttl(self, ttl_path: str) -> Dict[str, Any]:
+        """
+        Import individuals from a TTL file directly into the owlready2 quadstore.
+
+        Triples are grouped per subject, checked against the schema's classes
+        and properties, mapped to storids and written with one executemany per
+        table in a single transaction; no Python entity is created. Individuals
+        are placed in the schema namespace by local name, like add_individual.
+        Reasoning and Neo4j sync are left to the caller.
+
+        Args:
+            ttl_path: Path to TTL file containing individual instances
+
+        Returns:
+            Status dictionary with 'added', 'failed', 'triples', 'skipped'
+            (unknown classes/properties and unresolved targets) and per-phase 'timings'
+        """
+        timings = {}
+        start = time.perf_counter()
+
+        def lap(phase: str):
+            nonlocal start
+            now = time.perf_counter()
+            timings[phase] = round((now - start) * 1000, 3)
+            start = now
+
+        try:
+            ttl_file = Path(ttl_path).absolute()
+            if not ttl_file.exists():
+                return {"status": "error", "message": f"TTL file not found: {ttl_path}"}
+
+            if "static.ttl" in str(ttl_path):
+                self.current_data_type = "static"
+            elif "dynamic.ttl" in str(ttl_path):
+                self.current_data_type = "dynamic"
+            else:
+                self.current_data_type = None
+
+            print(f"Bulk importing individuals from TTL: {ttl_path}")
+            model = WorldModel.load(ttl_file)
+            lap("parse_ms")
+
+            schema = self._get_schema_index()
+            entities = self._get_entity_storids()
+            lap("index_ms")
+
+            # Individuals: typed subjects with at least one known class
+            failed = 0
+            skipped: Dict[str, int] = {}
+            new_individuals: Dict[str, List[int]] = {}
+            subject_terms: Dict[str, str] = {}
+            for subject, predicates in model.spo.items():
+                subject_id = local_name(subject)
+                type_names = sorted(local_name(t) for t in predicates.get(RDF_TYPE, ()))
+                if not type_names or "Ontology" in type_names or not subject_id:
+                    continue
+                classes = [schema["classes"][name] for name in type_names if name in schema["classes"]]
+                if subject_id in entities:
+                    failed += 1
+                    print(f"ERROR: Failed to add individual: {subject_id} - Individual {subject_id} already exists")
+                elif not classes:
+                    failed += 1
+                    print(f"ERROR: Failed to add individual: {subject_id} - Class {type_names[0]} not found")
+                else:
+                    new_individuals[subject_id] = classes
+                    subject_terms[subject_id] = subject
+
+            base_iri = self.ontology.base_iri
+            storids = {name: self.world._abbreviate(base_iri + name) for name in new_individuals}
+            entities.update(storids)
+            lap("resolve_ms")
+
+            # Rows for the objs/datas tables of this ontology's context
+            c = self.ontology.graph.c
+            obj_rows = set()
+            data_rows = set()
+            for name, classes in new_individuals.items():
+                s = storids[name]
+                obj_rows.add((c, s, owl.rdf_type, owl.owl_named_individual))
+                obj_rows.update((c, s, owl.rdf_type, cls) for cls in classes)
+                for predicate, objects in model.spo[subject_terms[name]].items():
+                    if predicate == RDF_TYPE:
+                        continue
+                    prop = local_name(predicate)
+                    for obj in objects:
+                        if obj.startswith('"'):
+                            p = schema["data_properties"].get(prop)
+                            if p is None:
+                                skipped[prop] = skipped.get(prop, 0) + 1
+                                continue
+                            o, d = self.world._to_rdf(literal_value(obj))
+                            data_rows.add((c, s, p, o, d))
+                        else:
+                            p = schema["object_properties"].get(prop)
+                            o = entities.get(local_name(obj))
+                            if p is None or o is None:
+                                key = prop if p is None else f"{prop} -> {local_name(obj)}"
+                                skipped[key] = skipped.get(key, 0) + 1
+                                continue
+                            obj_rows.add((c, s, p, o))
+            lap("rows_ms")
+
+            try:
+                self.world.graph.db.executemany("INSERT INTO objs VALUES (?, ?, ?, ?)", obj_rows)
+                self.world.graph.db.executemany("INSERT INTO datas VALUES (?, ?, ?, ?, ?)", data_rows)
+                self.world.graph.commit()
+            except Exception:
+                self.world.graph.db.rollback()
+                raise
+            lap("write_ms")
+
+            if skipped:
+                print(f"  WARNING: Skipped {sum(skipped.values())} triples not matching the schema: "
+                      f"{dict(sorted(skipped.items())[:10])}")
+            print(f"  Imported {len(new_individuals)} individuals "
+                  f"({len(obj_rows)} object + {len(data_rows)} data triples, failed: {failed})")
+            return {
+                "status": "success",
+                "added": len(new_individuals),
+                "failed": failed,
+                "triples": len(obj_rows) + len(data_rows),
+                "skipped": skipped,
+                "timings": timings
+            }
+
+        except Exception as e:
+            print(f"ERROR: Failed to bulk import TTL file: {e}")
+            traceback.print_exc()
+            return {"status": "error", "message": str(e)}
+
+    def _load_instances_from_ttl_objects(self, ttl_path: str) -> Dict[str, Any]:
         """
         Load individuals from TTL file by parsing and using owlready2's add_individual API.
 
+        Slow path (one entity lookup and attribute assignment per property);
+        kept for comparison with the quadstore bulk import.
+
         Args:
             ttl_path: Path to TTL file containing individual instances
 
@@ -518,123 +847,141 @@ class OntologyManager:
             print(f"ERROR: Failed to delete individual: {e}")
             return {"status": "error", "message": str(e)}
 
+    def run_reasoner(self):
+        """Run HermiT over the world, materializing inferred classes and property values."""
+        print("Running HermiT reasoner...")
+        with self.ontology:
+            owl.sync_reasoner_hermit(self.world, infer_property_values=True)
+        print("Reasoner completed")
+
+    def export_graph_rows(self) -> Dict[str, List]:
+        """
+        Individuals of the (reasoned) world as Neo4j rows.
+
+        Returns:
+            Dict with 'nodes' ({id, uri, classes, properties}; classes include
+            superclasses) and 'relationships' ([subject, property, object],
+            including inferred property values)
+        """
+        data_props = list(self.ontology.data_properties())
+        object_props = list(self.ontology.object_properties())
+        nodes, relationships = [], []
+
+        for individual in self.ontology.individuals():
+            classes = [cls.name for cls in individual.INDIRECT_is_a
+                       if hasattr(cls, 'name') and cls.name and cls != owl.Thing]
+            properties = {}
+            for prop in data_props:
+                values = getattr(individual, prop.name, [])
+                if not isinstance(values, list):
+                    values = [values] if values is not None else []
+                if values:
+                    properties[prop.name] = values[0] if len(values) == 1 else list(values)
+            nodes.append({"id": individual.name, "uri": str(individual.iri),
+                          "classes": classes, "properties": properties})
+
+            for prop in object_props:
+                values = getattr(individual, f"INDIRECT_{prop.name}", [])
+                if not isinstance(values, list):
+                    values = [values] if values else []
+                relationships.extend([individual.name, prop.name, value.name]
+                                     for value in values if hasattr(value, 'name'))
+
+        return {"nodes": nodes, "relationships": relationships}
+
+    def _write_graph_rows(self, session, rows: Dict[str, List]) -> Tuple[int, int]:
+        """
+        Create individual nodes, INSTANCE_OF links and relationships with batched UNWIND.
+
+        Labels and relationship types cannot be parameters, so rows are grouped
+        per label set and per property, one statement per group and batch.
+
+        Returns:
+            Tuple of (individuals_count, relationships_count)
+        """
+        by_labels: Dict[tuple, List[Dict]] = {}
+        for node in rows["nodes"]:
+            by_labels.setdefault(tuple(node["classes"]), []).append(node)
+        for classes, nodes in by_labels.items():
+            labels = "Individual" + "".join(f":`{label}`" for label in classes)
+            for i in range(0, len(nodes), NEO4J_BATCH_SIZE):
+                session.run(f"""
+                    UNWIND $rows AS row
+                    MERGE (i:{labels} {{id: row.id}})
+                    SET i.uri = row.uri, i += row.properties
+                    WITH i, row
+                    UNWIND row.classes AS class_id
+                    MATCH (c:Class {{id: class_id}})
+                    MERGE (i)-[:INSTANCE_OF]->(c)
+                """, rows=nodes[i:i + NEO4J_BATCH_SIZE])
+
+        by_property: Dict[str, List[List[str]]] = {}
+        for subject, prop, obj in rows["relationships"]:
+            by_property.setdefault(prop, []).append([subject, obj])
+        for prop, pairs in by_property.items():
+            for i in range(0, len(pairs), NEO4J_BATCH_SIZE):
+                session.run(f"""
+                    UNWIND $pairs AS pair
+                    MATCH (subj:Individual {{id: pair[0]}})
+                    MATCH (obj:Individual {{id: pair[1]}})
+                    MERGE (subj)-[:`{prop}`]->(obj)
+                """, pairs=pairs[i:i + NEO4J_BATCH_SIZE])
+
+        return len(rows["nodes"]), len(rows["relationships"])
+
+    def _stamp_world_version(self, session):
+        """Stamp a new world version so in-process caches (e.g. ObjectIndex) reload."""
+        session.run("""
+            MERGE (m:WorldMeta {id: 'world'})
+            SET m.version = $version, m.synced_at = datetime()
+        """, version=uuid.uuid4().hex)
+
     def sync_to_neo4j(self, skip_reasoning: bool = False) -> Dict[str, Any]:
         """
         Run reasoner (if needed) and sync all individuals to Neo4j.
         
         Args:
             skip_reasoning: If True, skip reasoning step (use when reasoning was already done)
+
+        Returns:
+            Status dictionary with counts and the write's causal 'bookmarks'
         """
         try:
             if not skip_reasoning:
-                print("Running HermiT reasoner...")
-                # Run reasoner
-                with self.ontology:
-                    owl.sync_reasoner_hermit(self.world, infer_property_values=True)
-                print("Reasoner completed")
+                self.run_reasoner()
             else:
                 print("Skipping reasoning (already done)")
 
+            rows = self.export_graph_rows()
+
             # Sync to Neo4j
-            with self.driver.session() as session:
+            with self.session() as session:
                 # Clear existing individuals
                 session.run("MATCH (i:Individual) DETACH DELETE i")
 
-                individuals_count = 0
-                relationships_count = 0
-
-                # BATCH 1: Create all individual nodes with class links and data properties
-                print("  Batch 1: Creating individual nodes...")
-                for individual in self.ontology.individuals():
-                    # Collect all class labels (including superclasses via INDIRECT_is_a)
-                    class_labels = []
-                    for cls in individual.INDIRECT_is_a:
-                        if hasattr(cls, 'name') and cls.name and cls != owl.Thing:
-                            class_labels.append(cls.name)
-
-                    # Build label string for Neo4j multi-labeling
-                    labels = "Individual" + "".join(f":`{label}`" for label in class_labels)
-
-                    # Create individual node with multiple labels
-                    session.run(f"""
-                        MERGE (i:{labels} {{id: $individual_id}})
-                        SET i.uri = $individual_uri
-                    """, individual_id=individual.name,
-                        individual_uri=str(individual.iri))
-
-                    individuals_count += 1
-
-                    # Link to classes (using INDIRECT_is_a to include superclasses)
-                    for cls in individual.INDIRECT_is_a:
-                        if hasattr(cls, 'name') and cls.name and cls != owl.Thing:
-                            session.run("""
-                                MATCH (i:Individual {id: $individual_id})
-                                MATCH (c:Class {id: $class_id})
-                                MERGE (i)-[:INSTANCE_OF]->(c)
-                            """, individual_id=individual.name, class_id=cls.name)
-
-                    # Sync data properties (as node properties)
-                    data_props = {}
-                    for prop in self.ontology.data_properties():
-                        prop_values = getattr(individual, prop.name, [])
-                        if not isinstance(prop_values, list):
-                            prop_values = [prop_values] if prop_values is not None else []
-
-                        if len(prop_values) > 0:
-                            data_props[prop.name] = prop_values[0] if len(prop_values) == 1 else prop_values
-
-                    if data_props:
-                        for key, value in data_props.items():
-                            session.run("""
-                                MATCH (i:Individual {id: $individual_id})
-                                SET i[$prop_name] = $prop_value
-                            """, individual_id=individual.name, prop_name=key, prop_value=value)
-
+                print("  Writing individual nodes and relationships...")
+                individuals_count, relationships_count = self._write_graph_rows(session, rows)
                 print(f"  Created {individuals_count} individual nodes")
-
-                # BATCH 2: Create all object property relationships
-                print("  Batch 2: Creating object property relationships...")
-                for individual in self.ontology.individuals():
-                    for prop in self.ontology.object_properties():
-                        indirect_attr = f"INDIRECT_{prop.name}"
-                        prop_values = getattr(individual, indirect_attr, [])
-                        if not isinstance(prop_values, list):
-                            prop_values = [prop_values] if prop_values else []
-
-                        for value in prop_values:
-                            if hasattr(value, 'name'):
-                                session.run(f"""
-                                    MATCH (subj:Individual {{id: $subj_id}})
-                                    MATCH (obj:Individual {{id: $obj_id}})
-                                    MERGE (subj)-[:{prop.name}]->(obj)
-                                """, subj_id=individual.name, obj_id=value.name)
-                                relationships_count += 1
-
                 print(f"  Created {relationships_count} relationships")
 
                 # Handle embeddings (generate or load from cache)
                 try:
                     from .embedding import EmbeddingManager
-                    from .config import get_config
+                    from .config import get_settings
 
                     # Load embedding configuration from config.yaml
-                    config = get_config()
-                    embedding_config = config.get_embedding_config()
-                    generate_embeddings = embedding_config.get('generate', True)
-
-                    # Extract category and description configs
-                    category_config = embedding_config.get('category', {})
-                    description_config = embedding_config.get('description', {})
+                    embedding = get_settings().embedding
+                    generate_embeddings = embedding.generate
 
                     embedding_manager = EmbeddingManager(
-                        category_model=category_config.get('model', 'text-embedding-3-small'),
-                        category_dimensions=category_config.get('dimensions'),  # None = use recommended
-                        description_model=description_config.get('model', 'text-embedding-3-small'),
-                        description_dimensions=description_config.get('dimensions')  # None = use recommended
+                        category_model=embedding.category.model,
+                        category_dimensions=embedding.category.dimensions,  # None = use recommended
+                        description_model=embedding.description.model,
+                        description_dimensions=embedding.description.dimensions  # None = use recommended
                     )
 
                     # Determine cache file path based on current data type
-                    env_id = os.getenv('ONTOLOGY_ENV_ID')
+                    env_id = self.env_id or os.getenv('ONTOLOGY_ENV_ID')
 
                     if self.current_data_type == "static":
                         # Static data: data/envs/{env_name}/static_embeddings.json
@@ -710,12 +1057,16 @@ class OntologyManager:
                     traceback.print_exc()
                     print("   (This is optional - continuing without embeddings)")
 
+                self._stamp_world_version(session)
+                self._note_world_write(session)
+
             print(f" Synced to Neo4j: {individuals_count} individuals, {relationships_count} relationships")
 
             return {
                 "status": "success",
                 "individuals": individuals_count,
-                "relationships": relationships_count
+                "relationships": relationships_count,
+                "bookmarks": self.last_bookmarks
             }
 
         except Exception as e:
@@ -723,6 +1074,99 @@ class OntologyManager:
             traceback.print_exc()
             return {"status": "error", "message": str(e)}
 
+    def activate_bundle(self, bundle, env_id: str) -> Dict[str, Any]:
+        """
+        Switch to another environment from its precompiled bundle (see core.env_bundle).
+
+        The bundle's reasoned world replaces the current one (copied, so the
+        bundle stays untouched), and Neo4j individuals, relationships and
+        description embeddings are replaced from its rows. No TTL parsing,
+        reasoning or embedding generation happens here.
+
+        Args:
+            bundle: EnvBundle that passed its freshness check
+            env_id: Environment the bundle was built for
+
+        Returns:
+            Status dictionary with counts and per-phase 'timings'
+        """
+        timings = {}
+        start = time.perf_counter()
+
+        def lap(phase: str):
+            nonlocal start
+            now = time.perf_counter()
+            timings[phase] = round((now - start) * 1000, 3)
+            start = now
+
+        try:
+            print(f"Activating environment bundle: {env_id} ({bundle.bundle_dir})")
+            # Copy first: the current world stays usable if copying fails
+            old_scratch = self._scratch_world_path
+            if self.world_path:
+                world_file = Path(self.world_path)
+                world_file.parent.mkdir(parents=True, exist_ok=True)
+                staging = world_file.with_name(world_file.name + ".activating")
+                shutil.copyfile(bundle.world_path, staging)
+            else:
+                fd, scratch = tempfile.mkstemp(prefix=f"world_{env_id}_", suffix=".sqlite3")
+                os.close(fd)
+                world_file = staging = Path(scratch)
+                shutil.copyfile(bundle.world_path, staging)
+
+            self.world.close()
+            if self.world_path:
+                # The bundle world and its fingerprints become the persistent world
+                os.replace(staging, world_file)
+                shutil.copyfile(bundle.world_cache.meta_path, WorldCache(world_file).meta_path)
+                self.world_cache = WorldCache(world_file)
+            self._scratch_world_path = None if self.world_path else world_file
+            if old_scratch is not None:
+                old_scratch.unlink(missing_ok=True)
+
+            self.world = owl.World(filename=str(world_file))
+            self.ontology = self.world.get_ontology(ONTOLOGY_IRI)
+            self._schema_index = None
+            self.current_data_type = None
+            self.env_id = env_id
+            lap("world_ms")
+
+            rows = bundle.load_graph_rows()
+            embeddings = bundle.load_embeddings()
+            self.topology = bundle.load_topology()
+            lap("read_ms")
+
+            with self.session() as session:
+                session.run("MATCH (i:Individual) DETACH DELETE i")
+                individuals_count, relationships_count = self._write_graph_rows(session, rows)
+                lap("neo4j_graph_ms")
+
+                for i in range(0, len(embeddings), NEO4J_BATCH_SIZE):
+                    session.run("""
+                        UNWIND $rows AS row
+                        MATCH (n:Individual {id: row.id})
+                        SET n.description_embedding = row.description_embedding
+                    """, rows=embeddings[i:i + NEO4J_BATCH_SIZE])
+                self._stamp_world_version(session)
+                self._note_world_write(session)
+                lap("neo4j_embeddings_ms")
+
+            print(f" Activated {env_id}: {individuals_count} individuals, {relationships_count} relationships, "
+                  f"{len(embeddings)} embeddings ({sum(timings.values()):.0f} ms)")
+            return {
+                "status": "success",
+                "individuals": individuals_count,
+                "relationships": relationships_count,
+                "embeddings": len(embeddings),
+                "bookmarks": self.last_bookmarks,
+                "timings": timings
+            }
+
+        except Exception as e:
+            print(f"ERROR: Failed to activate bundle: {e}")
+            traceback.print_exc()
+            return {"status": "error", "message": str(e)}
+
     def get_status(self) -> Dict[str, Any]:
         """Get current ontology status."""
         try:
@@ -742,17 +1186,27 @@ class OntologyManager:
     def close(self, cleanup_neo4j: bool = True):
         """Close connections and optionally cleanup Neo4j data.
 
+        The Neo4j driver is shared with other managers and tools in this
+        process and stays open (see neo4j_pool.close_drivers).
+
         Args:
-            cleanup_neo4j: If True, delete all data from Neo4j before closing
+            cleanup_neo4j: If True, delete individuals from Neo4j before closing
+                (the schema and its fingerprint stay for the next startup)
         """
         if self.driver:
             if cleanup_neo4j:
                 try:
-                    with self.driver.session() as session:
-                        session.run("MATCH (n) DETACH DELETE n")
+                    with self.session() as session:
+                        session.run("MATCH (n) WHERE n:Individual OR n:WorldMeta DETACH DELETE n")
                     print(" Cleaned up Neo4j data")
                 except Exception as e:
                     print(f"WARNING: Failed to cleanup Neo4j: {e}")
-
-            self.driver.close()
-            print(" Closed Neo4j connection")
+            self.driver = None
+
+        if self.world_cache is not None and self.world is not None:
+            self.world.save()
+            self.world.close()
+            print(f" Saved persistent world {self.world_path}")
+        elif self._scratch_world_path is not None:
+            self.world.close()
+            self._scratch_world_path.unlink(missing_ok=True)
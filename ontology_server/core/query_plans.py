@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Query Plan Checks
+EXPLAIN every Cypher statement a code path runs and flag full node scans
+"""
+
+from typing import Any, Dict, List, Optional
+
+# Plan operators that read every node in the database
+FULL_SCAN_OPERATORS = ("AllNodesScan",)
+
+
+def plan_operators(plan: Optional[Dict[str, Any]]) -> List[str]:
+    """Operator types of an EXPLAIN plan tree, root first (without the @runtime suffix)."""
+    if not plan:
+        return []
+    operators = [plan.get("operatorType", "").split("@")[0]]
+    for child in plan.get("children", []):
+        operators.extend(plan_operators(child))
+    return operators
+
+
+class PlanCheckSession:
+    """
+    Session wrapper that EXPLAINs each statement before (optionally) running it.
+
+    Transaction functions (execute_read/execute_write) run against the
+    wrapper itself, so their statements are planned too.
+    """
+
+    def __init__(self, session, checker: "PlanChecker"):
+        self._session = session
+        self._checker = checker
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._session.close()
+
+    def close(self):
+        self._session.close()
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs):
+        params = dict(parameters or {}, **kwargs)
+        plan = self._session.run(f"EXPLAIN {query}", params).consume().plan
+        self._checker.record(query, plan_operators(plan))
+        if self._checker.explain_only:
+            return self._session.run("RETURN 1 AS explained LIMIT 0")
+        return self._session.run(query, params)
+
+    def execute_read(self, work, *args, **kwargs):
+        return work(self, *args, **kwargs)
+
+    def execute_write(self, work, *args, **kwargs):
+        return work(self, *args, **kwargs)
+
+
+class PlanChecker:
+    """
+    Stand-in for a Neo4j driver that records the plan of every statement.
+
+    Hand it to GraphTools, PDDLGenerator, filter_valid_object_ids or
+    OntologyManager in place of their driver/session, call the methods to
+    check, then read full_scans(). With explain_only, statements are planned
+    but not executed (for write paths).
+    """
+
+    def __init__(self, driver, database: Optional[str] = None, explain_only: bool = False):
+        """
+        Initialize checker.
+
+        Args:
+            driver: Real Neo4j driver
+            database: Database to plan against (None: default database)
+            explain_only: Plan statements without running them
+        """
+        self.driver = driver
+        self.database = database
+        self.explain_only = explain_only
+        self.current = None
+        self.statements: List[Dict[str, Any]] = []
+
+    def session(self, **kwargs) -> PlanCheckSession:
+        kwargs["database"] = kwargs.get("database") or self.database
+        return PlanCheckSession(self.driver.session(**kwargs), self)
+
+    def close(self):
+        pass
+
+    def record(self, query: str, operators: List[str]):
+        self.statements.append({"name": self.current, "query": " ".join(query.split()), "operators": operators})
+
+    def full_scans(self) -> List[Dict[str, Any]]:
+        """Recorded statements whose plan contains a full node scan."""
+        return [s for s in self.statements if any(op in FULL_SCAN_OPERATORS for op in s["operators"])]
+
+
+if __name__ == "__main__":
+    # Operator extraction from a plan shaped like neo4j's ResultSummary.plan
+    plan = {
+        "operatorType": "ProduceResults@neo4j",
+        "children": [{
+            "operatorType": "Expand(All)@neo4j",
+            "children": [{"operatorType": "NodeUniqueIndexSeek@neo4j", "children": []}],
+        }],
+    }
+    print(f"Operators: {plan_operators(plan)}")
+    scan = {"operatorType": "ProduceResults@neo4j", "children": [{"operatorType": "AllNodesScan@neo4j"}]}
+    print(f"Full scan detected: {any(op in FULL_SCAN_OPERATORS for op in plan_operators(scan))}")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Relationship Mapping
+Compile action/relationship_mapping.json into inference expansion tables and validate it against robot.owx
+"""
+
+import json
+import os
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Local-name triple: (subject, predicate, object)
+Triple = Tuple[str, str, str]
+# lookup(predicate, subject) -> objects; used for the second link of property chains
+Lookup = Callable[[str, str], Iterable[str]]
+
+OWL_NS = "{http://www.w3.org/2002/07/owl#}"
+SUBPROPERTY_TYPES = ("subproperty_inference", "transitive_inference")
+
+
+class CompiledMapping:
+    """
+    Predicate -> expansion table built once from relationship_mapping.json.
+
+    Subproperty and inverse rules become (inferred_predicate, swap) pairs, so
+    expanding a removed triple set is one set comprehension. Property chain
+    rules need the second link's objects and are expanded through a lookup.
+
+    Each inferred relationship derives from 'via' (default: the asserted
+    property); an inverse rule flips the direction of what it derives from,
+    so e.g. hasObject via spaceHasObject is (space, hasObject, robot).
+    """
+
+    def __init__(self, mapping: Dict):
+        """
+        Compile mapping.
+
+        Args:
+            mapping: Parsed relationship_mapping.json
+        """
+        self.rules: List[Dict] = []
+        self.direct: Dict[str, Tuple[Tuple[str, bool], ...]] = {}
+        self.chains: Dict[str, Tuple[Tuple[bool, str, str], ...]] = {}
+
+        for asserted, entry in mapping.get("mappings", {}).items():
+            swapped = {asserted: False}
+            direct, chains = [], []
+            for rule in entry.get("inferred_relationships", []):
+                inferred = rule["relationship"]
+                self.rules.append(dict(rule, asserted=asserted))
+                if rule["type"] == "property_chain_inference":
+                    first, link = rule["chain"][0], rule["chain"][-1]
+                    inverse_first = first.startswith("^")
+                    first = first.lstrip("^")
+                    if first not in swapped:
+                        raise ValueError(f"{asserted}: chain for {inferred} starts with {first}, "
+                                         f"which is not derived from {asserted}")
+                    chains.append((swapped[first] != inverse_first, link, inferred))
+                    continue
+                via = rule.get("via", asserted)
+                if via not in swapped:
+                    raise ValueError(f"{asserted}: {inferred} derives from {via}, which is not derived from {asserted}")
+                swap = swapped[via] != (rule["type"] == "inverse_inference")
+                swapped[inferred] = swap
+                direct.append((inferred, swap))
+            self.direct[asserted] = tuple(direct)
+            if chains:
+                self.chains[asserted] = tuple(chains)
+
+    def expand(self, triples: Iterable[Triple], lookup: Optional[Lookup] = None) -> Set[Triple]:
+        """
+        Inferred triples that depend on the given asserted triples.
+
+        Args:
+            triples: Asserted local-name triples (e.g. removed triples of an action)
+            lookup: Objects of (predicate, subject) in the world before the change;
+                property chain rules are skipped without it
+
+        Returns:
+            Set of inferred local-name triples (asserted input not included)
+        """
+        triples = [t for t in triples if t[1] in self.direct]
+        expanded = {
+            (o, inferred, s) if swap else (s, inferred, o)
+            for s, p, o in triples
+            for inferred, swap in self.direct[p]
+        }
+        if lookup is not None:
+            expanded |= {
+                (o if swap else s, inferred, z)
+                for s, p, o in triples
+                for swap, link, inferred in self.chains.get(p, ())
+                for z in lookup(link, s if swap else o)
+            }
+        return expanded
+
+
+_compiled: Dict[str, Tuple[float, CompiledMapping]] = {}
+
+
+def get_compiled_mapping(mapping_path: Path) -> Optional[CompiledMapping]:
+    """Compiled mapping for a JSON file (recompiled only when the file changes)."""
+    mapping_path = Path(mapping_path)
+    if not mapping_path.exists():
+        print(f"  WARNING: relationship_mapping.json not found at {mapping_path}")
+        return None
+    mtime = os.path.getmtime(mapping_path)
+    cached = _compiled.get(str(mapping_path))
+    if cached is None or cached[0] != mtime:
+        with open(mapping_path, "r", encoding="utf-8") as f:
+            cached = (mtime, CompiledMapping(json.load(f)))
+        _compiled[str(mapping_path)] = cached
+    return cached[1]
+
+
+# ----------------------------------------------------------------------
+# Validation against robot.owx
+# ----------------------------------------------------------------------
+
+def _owx_name(element) -> Optional[str]:
+    iri = element.get("IRI") or element.get("abbreviatedIRI")
+    return iri.rsplit("#", 1)[-1].rsplit(":", 1)[-1] if iri else None
+
+
+def load_property_axioms(owx_path: Path) -> Dict:
+    """
+    Read object property axioms from an OWL/XML file.
+
+    Returns:
+        Dict with 'properties' (declared names), 'super' (name -> direct
+        superproperties), 'inverse' (name -> inverse names) and 'chains'
+        (list of (chain tuple, result))
+    """
+    root = ET.parse(owx_path).getroot()
+    axioms = {"properties": set(), "super": {}, "inverse": {}, "chains": []}
+
+    for declaration in root.findall(f"{OWL_NS}Declaration/{OWL_NS}ObjectProperty"):
+        axioms["properties"].add(_owx_name(declaration))
+    for axiom in root.findall(f"{OWL_NS}SubObjectPropertyOf"):
+        sub, sup = list(axiom)[:2]
+        if sub.tag == f"{OWL_NS}ObjectPropertyChain":
+            axioms["chains"].append((tuple(_owx_name(e) for e in sub), _owx_name(sup)))
+        else:
+            axioms["super"].setdefault(_owx_name(sub), set()).add(_owx_name(sup))
+    for axiom in root.findall(f"{OWL_NS}InverseObjectProperties"):
+        names = [_owx_name(e) for e in axiom if _owx_name(e)]
+        if len(names) == 2:
+            axioms["inverse"].setdefault(names[0], set()).add(names[1])
+            axioms["inverse"].setdefault(names[1], set()).add(names[0])
+    return axioms
+
+
+def _superproperties(axioms: Dict, name: str) -> Set[str]:
+    """Transitive superproperties (excluding owl:topObjectProperty)."""
+    found, stack = set(), [name]
+    while stack:
+        for sup in axioms["super"].get(stack.pop(), ()):
+            if sup not in found and sup != "topObjectProperty":
+                found.add(sup)
+                stack.append(sup)
+    return found
+
+
+def validate_mapping(mapping: Dict, owx_path: Path) -> Dict[str, List[str]]:
+    """
+    Check relationship_mapping.json rules against the property axioms of robot.owx.
+
+    Errors are rules without a supporting axiom; warnings are subproperty and
+    inverse consequences of an asserted property that the mapping omits.
+
+    Returns:
+        Dict with 'errors' and 'warnings' message lists
+    """
+    axioms = load_property_axioms(owx_path)
+    errors, warnings = [], []
+    try:
+        compiled = CompiledMapping(mapping)
+    except ValueError as e:
+        return {"errors": [str(e)], "warnings": []}
+
+    for rule in compiled.rules:
+        asserted, inferred = rule["asserted"], rule["relationship"]
+        label = f"{asserted} -> {inferred} ({rule['type']})"
+        for name in {asserted, inferred} - axioms["properties"]:
+            errors.append(f"{label}: {name} is not an object property in {owx_path.name}")
+
+        if rule["type"] in SUBPROPERTY_TYPES:
+            via = rule.get("via", asserted)
+            if inferred not in _superproperties(axioms, via):
+                errors.append(f"{label}: {via} is not a subproperty of {inferred}")
+        elif rule["type"] == "inverse_inference":
+            via = rule.get("via", asserted)
+            if inferred not in axioms["inverse"].get(via, ()):
+                errors.append(f"{label}: {via} and {inferred} are not inverse properties")
+        elif rule["type"] == "property_chain_inference":
+            links = []
+            for link in rule["chain"]:
+                if link.startswith("^"):
+                    inverses = sorted(axioms["inverse"].get(link[1:], ()))
+                    link = inverses[0] if inverses else link
+                links.append(link)
+            if (tuple(links), inferred) not in axioms["chains"]:
+                errors.append(f"{label}: no property chain {' o '.join(links)} -> {inferred}")
+        else:
+            errors.append(f"{label}: unknown inference type")
+
+    # Subproperty/inverse consequences the mapping does not list
+    for asserted, direct in compiled.direct.items():
+        implied = set()
+        for sup in _superproperties(axioms, asserted):
+            implied.add(sup)
+            for inverse in axioms["inverse"].get(sup, ()):
+                implied.add(inverse)
+                implied |= _superproperties(axioms, inverse)
+        listed = {inferred for inferred, _ in direct}
+        for name in sorted(implied - listed):
+            warnings.append(f"{asserted}: implies {name} in {owx_path.name} but the mapping does not expand it")
+
+    return {"errors": errors, "warnings": warnings}
+
+
+if __name__ == "__main__":
+    project_root = Path(__file__).parent.parent.parent
+    mapping_path = project_root / "action" / "relationship_mapping.json"
+    compiled = get_compiled_mapping(mapping_path)
+
+    storeys = {"corridor_14": ["floor_1"], "door_9": ["floor_1"]}
+    spaces = {"robot1": ["corridor_14"]}
+
+    def lookup(predicate, subject):
+        table = storeys if predicate == "spaceIsInStorey" else spaces
+        return table.get(subject, ())
+
+    removed = {("robot1", "robotIsInSpace", "corridor_14"), ("robot1", "carries", "cup_1")}
+    for triple in sorted(compiled.expand(removed, lookup)):
+        print(f"  - {triple}")
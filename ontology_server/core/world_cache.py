@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+World Cache
+Fingerprint metadata for a persistent owlready2 SQLite world (warm server restarts)
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WorldCache:
+    """
+    Metadata sidecar for a persistent quadstore (world.sqlite3 + world.sqlite3.meta.json).
+
+    The sidecar records the schema fingerprint and, in load order, every TTL
+    imported into the world with its content hash. The stored world is only
+    reused if the schema and all recorded inputs are unchanged and nothing
+    else modified it since (SPARQL updates, individual edits mark it dirty).
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize cache.
+
+        Args:
+            db_path: SQLite quadstore file
+        """
+        self.db_path = Path(db_path)
+        self.meta_path = self.db_path.with_name(self.db_path.name + ".meta.json")
+        self.meta: Optional[Dict[str, Any]] = self._read_meta()
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        if not (self.meta_path.exists() and self.db_path.exists()):
+            return None
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_meta(self):
+        self.meta["saved_at"] = datetime.now().isoformat()
+        tmp_path = self.meta_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp_path, self.meta_path)
+
+    @staticmethod
+    def schema_fingerprint(schema_path: Path, backend_version: str = "") -> str:
+        """Fingerprint of the schema file plus the quadstore library version."""
+        return hashlib.sha256(f"{file_digest(schema_path)}:{backend_version}".encode()).hexdigest()
+
+    def check(self, schema_fingerprint: str) -> Optional[str]:
+        """
+        Check whether the stored world can be reopened.
+
+        Returns:
+            None if it is valid, otherwise the reason to rebuild
+        """
+        if self.meta is None:
+            return "no stored world"
+        if self.meta.get("schema") != schema_fingerprint:
+            return "schema changed"
+        if self.meta.get("dirty"):
+            return "world was modified after loading"
+        for entry in self.meta.get("inputs", []):
+            path = Path(entry["path"])
+            if not path.exists() or file_digest(path) != entry["sha256"]:
+                return f"input changed: {path.name}"
+        return None
+
+    def reset(self, schema_fingerprint: str):
+        """Delete the stored world and start new metadata (call before creating the world)."""
+        for path in (self.db_path, self.meta_path):
+            if path.exists():
+                path.unlink()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.meta = {"schema": schema_fingerprint, "inputs": [], "dirty": False}
+        self._write_meta()
+
+    @property
+    def inputs(self) -> List[Dict[str, str]]:
+        return list(self.meta.get("inputs", [])) if self.meta else []
+
+    def has_input(self, path: Path) -> bool:
+        """True if path is already loaded, unchanged, into a clean world."""
+        if self.meta is None or self.meta.get("dirty"):
+            return False
+        path = str(Path(path).absolute())
+        entry = next((e for e in self.meta.get("inputs", []) if e["path"] == path), None)
+        return entry is not None and file_digest(Path(path)) == entry["sha256"]
+
+    def add_input(self, path: Path):
+        """Record a TTL file imported into the world."""
+        path = Path(path).absolute()
+        self.meta.setdefault("inputs", []).append({"path": str(path), "sha256": file_digest(path)})
+        self._write_meta()
+
+    def mark_dirty(self):
+        """Record that the world changed beyond its recorded inputs."""
+        if self.meta is not None and not self.meta.get("dirty"):
+            self.meta["dirty"] = True
+            self._write_meta()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        schema = tmp / "robot.owx"
+        ttl = tmp / "static.ttl"
+        schema.write_text("<Ontology/>")
+        ttl.write_text(":room_1 a :Space .")
+
+        cache = WorldCache(tmp / "world.sqlite3")
+        fingerprint = WorldCache.schema_fingerprint(schema, "0.0")
+        print(f"Fresh: {cache.check(fingerprint)}")
+        cache.reset(fingerprint)
+        (tmp / "world.sqlite3").write_bytes(b"")
+        cache.add_input(ttl)
+
+        cache = WorldCache(tmp / "world.sqlite3")
+        print(f"Reopen: {cache.check(fingerprint)}, has static.ttl: {cache.has_input(ttl)}")
+        ttl.write_text(":room_2 a :Space .")
+        print(f"After TTL edit: {cache.check(fingerprint)}")
+        print(f"Other schema: {cache.check(WorldCache.schema_fingerprint(schema, '1.0'))}")
+        ttl.write_text(":room_1 a :Space .")
+        cache.mark_dirty()
+        print(f"After update: {WorldCache(tmp / 'world.sqlite3').check(fingerprint)}")
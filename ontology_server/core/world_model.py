@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+World Model
+Indexed in-memory TTL world (subject -> predicate -> objects, plus reverse index)
+with a canonical streaming Turtle serializer
+"""
+
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set, TextIO, Tuple, Union
+
+
+ONTOLOGY_NAMESPACE = "http://www.semanticweb.org/namh_woo/ontologies/2025/9/untitled-ontology-10#"
+RDF_TYPE = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+DEFAULT_PREFIXES = {
+    "": ONTOLOGY_NAMESPACE,
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "owl": "http://www.w3.org/2002/07/owl#",
+    "xsd": XSD,
+}
+
+# Terms are stored as N3 strings with full IRIs, the same form rdflib's
+# term.n3() produces (and the world store's delta log uses):
+#   <http://...#robot1>    "kitchen"    "false"^^<http://www.w3.org/2001/XMLSchema#boolean>
+Term = str
+Triple = Tuple[Term, Term, Term]
+
+_TOKEN_PATTERN = re.compile(r'''
+    (?P<ws>\s+|\#[^\n]*)
+  | (?P<iri><[^<>"{}|^`\\\s]*>)
+  | (?P<string>"""(?:[^"\\]|\\.|"(?!""))*"""|"(?:[^"\\\n]|\\.)*")
+  | (?P<directive>@prefix\b|@base\b|PREFIX\b|BASE\b)
+  | (?P<lang>@[a-zA-Z]+(?:-[a-zA-Z0-9]+)*)
+  | (?P<datatype>\^\^)
+  | (?P<number>[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<pname>(?:[A-Za-z][\w\-.]*)?:(?:[\w\-]|\\.|%[0-9A-Fa-f]{2})*)
+  | (?P<word>@?[A-Za-z]+)
+  | (?P<punct>[;,.\[\]()])
+''', re.VERBOSE)
+
+_LOCAL_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_][A-Za-z0-9_\-]*$')
+
+
+class TurtleParseError(ValueError):
+    """Raised for Turtle the world model cannot read."""
+
+
+def uri(local_name: str, namespace: str = ONTOLOGY_NAMESPACE) -> Term:
+    """N3 IRI term for a local name (e.g. "robot1" -> "<...#robot1>")."""
+    return f"<{namespace}{local_name}>"
+
+
+def literal(value: Union[str, bool, int, float]) -> Term:
+    """N3 literal term (booleans and numbers are typed with xsd)."""
+    if isinstance(value, bool):
+        return f'"{str(value).lower()}"^^<{XSD}boolean>'
+    if isinstance(value, int):
+        return f'"{value}"^^<{XSD}integer>'
+    if isinstance(value, float):
+        return f'"{value}"^^<{XSD}decimal>'
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'"{escaped}"'
+
+
+def local_name(term: Term) -> str:
+    """Local name of an IRI term, or the lexical value of a literal."""
+    if term.startswith('<'):
+        iri = term[1:-1]
+        return re.split(r'[#/]', iri)[-1]
+    if term.startswith('"'):
+        return term[1:term.rindex('"')]
+    return term
+
+
+def literal_value(term: Term) -> Union[str, bool, int, float, None]:
+    """Python value of a literal term (None for IRIs)."""
+    if not term.startswith('"'):
+        return None
+    end = term.rindex('"')
+    lexical = term[1:end]
+    datatype = term[end + 4:-1] if term[end + 1:end + 3] == "^^" else None
+    if datatype == f"{XSD}boolean":
+        return lexical in ("true", "1")
+    if datatype == f"{XSD}integer":
+        return int(lexical)
+    if datatype in (f"{XSD}decimal", f"{XSD}double", f"{XSD}float"):
+        return float(lexical)
+    return lexical
+
+
+class WorldModel:
+    """
+    Triple set indexed both ways for O(1) updates and lookups.
+
+        spo[subject][predicate] -> {objects}
+        ops[object][predicate]  -> {subjects}
+
+    Parses the Turtle subset used by the environment TTL files (prefixes,
+    predicate/object lists, typed and language-tagged literals) and writes
+    canonical Turtle: subjects, predicates and objects sorted, rdf:type
+    first, one subject block at a time.
+    """
+
+    def __init__(self, prefixes: Optional[Dict[str, str]] = None):
+        self.prefixes: Dict[str, str] = dict(DEFAULT_PREFIXES if prefixes is None else prefixes)
+        self.spo: Dict[Term, Dict[Term, Set[Term]]] = defaultdict(lambda: defaultdict(set))
+        self.ops: Dict[Term, Dict[Term, Set[Term]]] = defaultdict(lambda: defaultdict(set))
+        self._size = 0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def load(cls, *paths: Path) -> "WorldModel":
+        """Parse one or more TTL files into a single model."""
+        model = cls(prefixes={})
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                model.parse(f.read())
+        for prefix, namespace in DEFAULT_PREFIXES.items():
+            model.prefixes.setdefault(prefix, namespace)
+        return model
+
+    def _tokens(self, text: str) -> Iterator[Tuple[str, str]]:
+        pos = 0
+        while pos < len(text):
+            match = _TOKEN_PATTERN.match(text, pos)
+            if not match:
+                line = text.count('\n', 0, pos) + 1
+                raise TurtleParseError(f"Unexpected input at line {line}: {text[pos:pos + 30]!r}")
+            pos = match.end()
+            if match.lastgroup != "ws":
+                yield match.lastgroup, match.group()
+
+    def _expand(self, pname: str) -> Term:
+        prefix, _, local = pname.partition(':')
+        if prefix not in self.prefixes:
+            raise TurtleParseError(f"Undeclared prefix: {prefix}:")
+        return f"<{self.prefixes[prefix]}{local}>"
+
+    def parse(self, text: str):
+        """Parse Turtle text and add its triples."""
+        tokens = list(self._tokens(text))
+        i = 0
+
+        def term(position: int) -> Tuple[Term, int]:
+            kind, value = tokens[position]
+            if kind == "iri":
+                return value, position + 1
+            if kind == "pname":
+                return self._expand(value), position + 1
+            if kind == "word" and value == "a":
+                return RDF_TYPE, position + 1
+            if kind == "word" and value in ("true", "false"):
+                return literal(value == "true"), position + 1
+            if kind == "number":
+                return literal(float(value) if any(c in value for c in ".eE") else int(value)), position + 1
+            if kind == "string":
+                lexical = value[3:-3] if value.startswith('"""') else value[1:-1]
+                lexical = lexical.replace('\n', '\\n')
+                nxt = position + 1
+                if nxt < len(tokens) and tokens[nxt][0] == "lang":
+                    return f'"{lexical}"{tokens[nxt][1]}', nxt + 1
+                if nxt < len(tokens) and tokens[nxt][0] == "datatype":
+                    datatype, after = term(nxt + 1)
+                    return f'"{lexical}"^^{datatype}', after
+                return f'"{lexical}"', nxt
+            raise TurtleParseError(f"Unsupported Turtle term: {value!r}")
+
+        while i < len(tokens):
+            kind, value = tokens[i]
+            if kind == "directive" and value.lower().lstrip('@') == "prefix":
+                prefix = tokens[i + 1][1]
+                self.prefixes[prefix[:-1]] = tokens[i + 2][1][1:-1]
+                i += 3
+                if value.startswith('@'):
+                    i += 1  # trailing '.'
+                continue
+            if kind == "directive":
+                raise TurtleParseError("@base is not supported")
+
+            subject, i = term(i)
+            while True:
+                predicate, i = term(i)
+                while True:
+                    obj, i = term(i)
+                    self.add(subject, predicate, obj)
+                    if tokens[i][1] != ',':
+                        break
+                    i += 1
+                if tokens[i][1] == ';':
+                    i += 1
+                    # Allow a trailing ';' before '.'
+                    if tokens[i][1] == '.':
+                        break
+                    continue
+                break
+            if tokens[i][1] != '.':
+                raise TurtleParseError(f"Expected '.' after statement about {subject}, got {tokens[i][1]!r}")
+            i += 1
+
+    # ------------------------------------------------------------------
+    # Updates and lookups
+    # ------------------------------------------------------------------
+
+    def add(self, s: Term, p: Term, o: Term) -> bool:
+        """Add a triple. Returns False if it was already present."""
+        objects = self.spo[s][p]
+        if o in objects:
+            return False
+        objects.add(o)
+        self.ops[o][p].add(s)
+        self._size += 1
+        return True
+
+    def remove(self, s: Term, p: Term, o: Term) -> bool:
+        """Remove a triple. Returns False if it was not present."""
+        objects = self.spo.get(s, {}).get(p)
+        if not objects or o not in objects:
+            return False
+        objects.discard(o)
+        if not objects:
+            del self.spo[s][p]
+            if not self.spo[s]:
+                del self.spo[s]
+        subjects = self.ops[o][p]
+        subjects.discard(s)
+        if not subjects:
+            del self.ops[o][p]
+            if not self.ops[o]:
+                del self.ops[o]
+        self._size -= 1
+        return True
+
+    def set(self, s: Term, p: Term, o: Term) -> Tuple[Set[Triple], Set[Triple]]:
+        """
+        Make o the only object of (s, p), e.g. a functional property like robotIsInSpace.
+
+        Returns:
+            Tuple of (added, removed) triples
+        """
+        removed = {(s, p, old) for old in self.objects(s, p) if old != o}
+        for triple in removed:
+            self.remove(*triple)
+        added = {(s, p, o)} if self.add(s, p, o) else set()
+        return added, removed
+
+    def apply_delta(self, added: Iterable[Triple], removed: Iterable[Triple]):
+        """Apply a triple delta (removals first)."""
+        for triple in removed:
+            self.remove(*triple)
+        for triple in added:
+            self.add(*triple)
+
+    def objects(self, s: Term, p: Term) -> Set[Term]:
+        return set(self.spo.get(s, {}).get(p, ()))
+
+    def subjects(self, p: Term, o: Term) -> Set[Term]:
+        return set(self.ops.get(o, {}).get(p, ()))
+
+    def predicates(self, s: Term) -> Dict[Term, Set[Term]]:
+        return {p: set(objs) for p, objs in self.spo.get(s, {}).items()}
+
+    def value(self, s: Term, p: Term) -> Optional[Term]:
+        """Single object of (s, p), or None (the smallest if there are several)."""
+        objects = self.spo.get(s, {}).get(p)
+        return min(objects) if objects else None
+
+    def __contains__(self, triple: Triple) -> bool:
+        s, p, o = triple
+        return o in self.spo.get(s, {}).get(p, ())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def triples(self) -> Iterator[Triple]:
+        for s, predicates in self.spo.items():
+            for p, objects in predicates.items():
+                for o in objects:
+                    yield s, p, o
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def _compact(self, term: Term) -> str:
+        if term.startswith('<'):
+            iri = term[1:-1]
+            for prefix, namespace in self._prefix_order:
+                if iri.startswith(namespace) and _LOCAL_NAME_PATTERN.match(iri[len(namespace):]):
+                    return f"{prefix}:{iri[len(namespace):]}"
+            return term
+        if '^^<' in term:
+            lexical, datatype = term.rsplit('^^', 1)
+            return f"{lexical}^^{self._compact(datatype)}"
+        return term
+
+    def serialize(self, stream: TextIO):
+        """Write canonical Turtle to an open text stream, one subject block at a time."""
+        # Longest namespace first so the most specific prefix wins
+        self._prefix_order = sorted(self.prefixes.items(), key=lambda item: -len(item[1]))
+        for prefix, namespace in sorted(self.prefixes.items()):
+            stream.write(f"@prefix {prefix}: <{namespace}> .\n")
+
+        for s in sorted(self.spo):
+            predicates = self.spo[s]
+            order = sorted(predicates, key=lambda p: (p != RDF_TYPE, p))
+            lines = []
+            for p in order:
+                objects = ", ".join(self._compact(o) for o in sorted(predicates[p]))
+                lines.append(f"{self._compact(p)} {objects}")
+            stream.write(f"\n{self._compact(s)} " + " ;\n    ".join(lines) + " .\n")
+
+    def write(self, path: Path):
+        """Serialize to path atomically (temp file + rename)."""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            self.serialize(f)
+        os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    import io
+    import time
+
+    env_dir = Path(__file__).parent.parent / "data" / "envs" / "Darden_2"
+    start = time.time()
+    model = WorldModel.load(env_dir / "dynamic.ttl")
+    print(f"Parsed {len(model)} triples from dynamic.ttl in {time.time() - start:.3f}s")
+
+    robot, located = uri("robot1"), uri("robotIsInSpace")
+    print(f"robot1 robotIsInSpace {local_name(model.value(robot, located))}")
+    added, removed = model.set(robot, located, uri("kitchen_20"))
+    print(f"Moved robot1: +{len(added)} -{len(removed)}, now in {local_name(model.value(robot, located))}")
+    print(f"Objects in kitchen_20: {len(model.subjects(uri('artifactIsInSpace'), uri('kitchen_20')))}")
+
+    buffer = io.StringIO()
+    start = time.time()
+    model.serialize(buffer)
+    elapsed = time.time() - start
+    reparsed = WorldModel(prefixes={})
+    reparsed.parse(buffer.getvalue())
+    print(f"Serialized in {elapsed:.3f}s; round trip identical: {set(reparsed.triples()) == set(model.triples())}")
+
+    second = io.StringIO()
+    reparsed.serialize(second)
+    print(f"Canonical output stable: {second.getvalue() == buffer.getvalue()}")
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+World Store
+Versioned world state: one base snapshot plus an append-only triple-delta log
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .world_model import WorldModel
+
+
+def _term_to_n3(term) -> str:
+    """Serialize an rdflib term (or an already N3-formatted string)."""
+    return term.n3() if hasattr(term, "n3") else str(term)
+
+
+def _fsync_write(path: Path, text: str, mode: str = "w"):
+    """Write text and fsync before returning."""
+    with open(path, mode, encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class WorldStore:
+    """
+    Versioned store for the executed world (dynamic TTL).
+
+    Layout under root:
+        base/dynamic.ttl, base/static.ttl   version 0 snapshot (copied once per plan)
+        deltas.jsonl                         one fsync'd line per version: added/removed triples
+        checkpoints/dynamic_<N>.ttl          full snapshot every checkpoint_interval versions
+        head/dynamic_<N>.ttl                 latest text snapshot (single file, replaced in place)
+
+    Version N is base + deltas 1..N; materialize() starts from the nearest
+    checkpoint, so random access replays at most checkpoint_interval deltas.
+    The static TTL never changes during execution and is only stored in base/.
+
+    Log entries are kept in memory and the log is only re-read (from the last
+    known offset) when its size changes, and the latest materialized model is
+    rolled forward for the next checkpoint, so per-version cost does not grow
+    with the run length. Use get_world_store() to share one store per root.
+    """
+
+    def __init__(self, root: Path, checkpoint_interval: int = 10):
+        """
+        Initialize store.
+
+        Args:
+            root: Store directory (e.g. action/world)
+            checkpoint_interval: Write a full checkpoint every N versions
+        """
+        self.root = Path(root)
+        self.checkpoint_interval = checkpoint_interval
+        self.base_dir = self.root / "base"
+        self.checkpoint_dir = self.root / "checkpoints"
+        self.head_dir = self.root / "head"
+        self.materialized_dir = self.root / "materialized"
+        self.log_path = self.root / "deltas.jsonl"
+        self._entries: Optional[List[Dict[str, Any]]] = None
+        self._log_size = 0
+        self._model: Optional[WorldModel] = None
+        self._model_version = 0
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def initialize(self, dynamic_src: Path, static_src: Optional[Path] = None):
+        """
+        Reset the store to a new base snapshot (version 0).
+
+        Args:
+            dynamic_src: Environment dynamic.ttl
+            static_src: Environment static.ttl (optional)
+        """
+        for directory in (self.base_dir, self.checkpoint_dir, self.head_dir, self.materialized_dir):
+            if directory.exists():
+                shutil.rmtree(directory)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+        shutil.copy2(dynamic_src, self.base_dir / "dynamic.ttl")
+        if static_src and Path(static_src).exists():
+            shutil.copy2(static_src, self.base_dir / "static.ttl")
+        _fsync_write(self.log_path, "")
+        self._entries = []
+        self._log_size = 0
+        self._model = None
+
+    @property
+    def base_dynamic_path(self) -> Path:
+        return self.base_dir / "dynamic.ttl"
+
+    @property
+    def static_path(self) -> Path:
+        return self.base_dir / "static.ttl"
+
+    # ------------------------------------------------------------------
+    # Delta log
+    # ------------------------------------------------------------------
+
+    def _load_entries(self) -> List[Dict[str, Any]]:
+        """
+        Get the delta log entries, dropping a torn trailing line from an interrupted write.
+
+        The cached entries are returned as long as the log size matches the
+        last read or write; a grown log is only parsed from that offset.
+        """
+        size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        if self._entries is not None and size == self._log_size:
+            return self._entries
+        if self._entries is None or size < self._log_size:
+            entries, offset = [], 0
+        else:
+            entries, offset = self._entries, self._log_size
+        if size:
+            with open(self.log_path, "rb") as f:
+                f.seek(offset)
+                lines = f.read().decode("utf-8").splitlines(keepends=True)
+            for i, line in enumerate(lines):
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    if i != len(lines) - 1:
+                        raise ValueError(f"Corrupt delta log entry at version {len(entries) + 1}: {self.log_path}")
+                    print(f"  ⚠️  Dropping incomplete last delta log entry in {self.log_path}")
+                    self._rewrite_log(entries)
+                    size = self._log_size
+        self._entries = entries
+        self._log_size = size
+        return entries
+
+    def _rewrite_log(self, entries: List[Dict[str, Any]]):
+        """Atomically replace the delta log with entries."""
+        tmp_path = self.log_path.with_suffix(".jsonl.tmp")
+        text = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries)
+        _fsync_write(tmp_path, text)
+        os.replace(tmp_path, self.log_path)
+        self._log_size = len(text.encode("utf-8"))
+
+    @property
+    def head_version(self) -> int:
+        """Latest version (number of deltas in the log)."""
+        return len(self._load_entries())
+
+    def append(self, added: Iterable, removed: Iterable, action: Optional[str] = None,
+               head_source: Optional[Path] = None) -> int:
+        """
+        Append one version's triple delta (fsync'd before returning).
+
+        Args:
+            added: Added triples (rdflib terms or N3 strings)
+            removed: Removed triples (rdflib terms or N3 strings)
+            action: Action that produced the change
+            head_source: Optional TTL text of the new version; moved to head/
+
+        Returns:
+            New version number
+        """
+        entries = self._load_entries()
+        version = len(entries) + 1
+        entry = {
+            "version": version,
+            "timestamp": datetime.now().isoformat(),
+            "action": action,
+            "added": sorted([_term_to_n3(t) for t in triple] for triple in added),
+            "removed": sorted([_term_to_n3(t) for t in triple] for triple in removed),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        _fsync_write(self.log_path, line, mode="a")
+        entries.append(entry)
+        self._log_size += len(line.encode("utf-8"))
+
+        if head_source is not None:
+            self._set_head(Path(head_source), version)
+        if self.checkpoint_interval and version % self.checkpoint_interval == 0:
+            self._write_checkpoint(version)
+        return version
+
+    def iter_deltas(self, start: int = 1, end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield log entries for versions start..end (inclusive)."""
+        entries = self._load_entries()
+        end = len(entries) if end is None else end
+        for entry in entries[start - 1:end]:
+            yield entry
+
+    def truncate(self, version: int):
+        """
+        Roll the store back to version (drops later deltas and snapshots).
+
+        Args:
+            version: Version to keep as the new head
+        """
+        entries = self._load_entries()
+        if version >= len(entries):
+            return
+        del entries[version:]
+        self._rewrite_log(entries)
+        if self._model is not None and self._model_version > version:
+            self._model = None
+        snapshot_dirs = (self.checkpoint_dir, self.head_dir, self.materialized_dir)
+        for path in [p for d in snapshot_dirs for p in d.glob("dynamic_*.ttl")]:
+            if self._file_version(path) > version:
+                path.unlink()
+        print(f"  ✓ World store truncated to version {version}")
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _file_version(path: Path) -> int:
+        return int(path.stem.rsplit("_", 1)[1])
+
+    def _set_head(self, source: Path, version: int):
+        """Move source into head/ as the only head snapshot."""
+        self.head_dir.mkdir(parents=True, exist_ok=True)
+        head_path = self.head_dir / f"dynamic_{version}.ttl"
+        os.replace(source, head_path)
+        for old in self.head_dir.glob("dynamic_*.ttl"):
+            if old != head_path:
+                old.unlink()
+
+    def _head_path(self, version: int) -> Optional[Path]:
+        if version == 0:
+            return self.base_dynamic_path
+        path = self.head_dir / f"dynamic_{version}.ttl"
+        return path if path.exists() else None
+
+    def _write_checkpoint(self, version: int):
+        """Write a full snapshot of version to checkpoints/."""
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        checkpoint_path = self.checkpoint_dir / f"dynamic_{version}.ttl"
+        head_path = self._head_path(version)
+        if head_path is not None:
+            shutil.copy2(head_path, checkpoint_path)
+        else:
+            self._materialize_model(version).write(checkpoint_path)
+        print(f"  ✓ World checkpoint written: {checkpoint_path.name}")
+
+    def _nearest_checkpoint(self, version: int) -> Tuple[int, Path]:
+        best_version, best_path = 0, self.base_dynamic_path
+        if self.checkpoint_dir.exists():
+            for path in self.checkpoint_dir.glob("dynamic_*.ttl"):
+                v = self._file_version(path)
+                if best_version < v <= version:
+                    best_version, best_path = v, path
+        return best_version, best_path
+
+    def _materialize_model(self, version: int) -> WorldModel:
+        """
+        Build the WorldModel for version.
+
+        Rolls the last model forward when it is at most checkpoint_interval
+        versions behind (the usual checkpoint case); otherwise starts from the
+        nearest checkpoint. The result is kept if it is the newest model so far.
+        """
+        if self._model is not None and 0 <= version - self._model_version <= self.checkpoint_interval:
+            model, start_version = self._model, self._model_version
+        else:
+            start_version, start_path = self._nearest_checkpoint(version)
+            model = WorldModel.load(start_path)
+        for entry in self.iter_deltas(start_version + 1, version):
+            model.apply_delta(map(tuple, entry["added"]), map(tuple, entry["removed"]))
+        if self._model is None or version >= self._model_version:
+            self._model, self._model_version = model, version
+        return model
+
+    def materialize(self, version: Optional[int] = None, dest: Optional[Path] = None) -> Path:
+        """
+        Get a dynamic TTL file for version.
+
+        Returns the base, head or checkpoint file directly when one matches;
+        otherwise replays deltas onto the nearest checkpoint and writes
+        materialized/dynamic_<N>.ttl (or dest).
+
+        Args:
+            version: Version to materialize (default: head)
+            dest: Optional output path
+
+        Returns:
+            Path to the TTL file (treat as read-only unless dest was given)
+        """
+        head = self.head_version
+        version = head if version is None else version
+        if not 0 <= version <= head:
+            raise ValueError(f"Version {version} out of range (head is {head})")
+
+        existing = self._head_path(version)
+        if existing is None:
+            checkpoint_path = self.checkpoint_dir / f"dynamic_{version}.ttl"
+            existing = checkpoint_path if checkpoint_path.exists() else None
+        if existing is not None:
+            if dest is None:
+                return existing
+            shutil.copy2(existing, dest)
+            return Path(dest)
+
+        if dest is None:
+            self.materialized_dir.mkdir(parents=True, exist_ok=True)
+            dest = self.materialized_dir / f"dynamic_{version}.ttl"
+        self._materialize_model(version).write(dest)
+        return Path(dest)
+
+    def stats(self) -> Dict[str, Any]:
+        """Version count and on-disk sizes."""
+        def size(paths):
+            return sum(p.stat().st_size for p in paths if p.exists())
+
+        return {
+            "head_version": self.head_version,
+            "log_bytes": size([self.log_path]),
+            "base_bytes": size(self.base_dir.glob("*.ttl")) if self.base_dir.exists() else 0,
+            "checkpoints": len(list(self.checkpoint_dir.glob("dynamic_*.ttl"))) if self.checkpoint_dir.exists() else 0,
+        }
+
+
+_stores: Dict[Path, WorldStore] = {}
+
+
+def get_world_store(root: Path, checkpoint_interval: int = 10) -> WorldStore:
+    """Get the process-wide store for root, so log entries stay in memory across actions."""
+    key = Path(root).resolve()
+    if key not in _stores:
+        _stores[key] = WorldStore(root, checkpoint_interval=checkpoint_interval)
+    return _stores[key]
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    NS = "http://www.semanticweb.org/namh_woo/ontologies/2025/9/untitled-ontology-10#"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        base = tmp / "dynamic.ttl"
+        base.write_text(f"@prefix : <{NS}> .\n:robot1 :robotIsInSpace :room_0 .\n")
+
+        store = WorldStore(tmp / "world", checkpoint_interval=3)
+        store.initialize(base)
+        rooms = [f"room_{i}" for i in range(8)]
+        for i in range(1, len(rooms)):
+            removed = [(f"<{NS}robot1>", f"<{NS}robotIsInSpace>", f"<{NS}{rooms[i - 1]}>")]
+            added = [(f"<{NS}robot1>", f"<{NS}robotIsInSpace>", f"<{NS}{rooms[i]}>")]
+            head_text = tmp / "next.ttl"
+            head_text.write_text(f"@prefix : <{NS}> .\n:robot1 :robotIsInSpace :{rooms[i]} .\n")
+            store.append(added, removed, action=f"(move robot1 {rooms[i - 1]} {rooms[i]})", head_source=head_text)
+
+        # Reopen from disk: versions 4 and 5 are replayed from checkpoint 3
+        store = WorldStore(tmp / "world", checkpoint_interval=3)
+        print(f"Stats: {store.stats()}")
+        for version in (0, 3, 4, 5, 6, 7):
+            text = store.materialize(version).read_text()
+            print(f"Version {version}: robot in {rooms[version]}: {rooms[version] in text}")
+        print(f"Version 5 delta: {next(store.iter_deltas(5, 5))['added']}")
+
+        store.truncate(5)
+        print(f"After truncate: head={store.head_version}, checkpoints={store.stats()['checkpoints']}")
+
+        # Shared store: a version appended by another instance is read from the log tail
+        shared = get_world_store(tmp / "world", checkpoint_interval=3)
+        print(f"Shared store reused: {shared is get_world_store(tmp / 'world')}, head={shared.head_version}")
+        store.append([(f"<{NS}robot1>", f"<{NS}robotIsInSpace>", f"<{NS}room_0>")], [], action="(teleport robot1)")
+        print(f"After external append: head={shared.head_version}, action={next(shared.iter_deltas(6, 6))['action']}")
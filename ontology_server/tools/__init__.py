@@ -1,9 +1,21 @@
 """
 Graph Query Tools for LLM Integration
 Provides tools for object info, filtering, pathfinding, and semantic search.
+Tools are imported on first access (SemanticTool loads numpy and OpenAI).
 """
+import importlib
 
-from .graph_tools import GraphTools
-from .semantic_tool import SemanticTool
+_EXPORTS = {
+    'GraphTools': '.graph_tools',
+    'SemanticTool': '.semantic_tool',
+}
 
 __all__ = ['GraphTools', 'SemanticTool']
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -4,23 +4,23 @@ Graph Query Tools for Neo4j
 Provides tools for object info, filtering, and pathfinding.
 """
 
-from neo4j import GraphDatabase
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 
+from core.neo4j_pool import execute_read, get_driver
+
 
 class GraphTools:
     """Graph query tools using Neo4j Cypher."""
 
     def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str):
-        """Initialize graph tools with Neo4j connection."""
-        self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+        """Initialize graph tools with the shared Neo4j driver for these credentials."""
+        self.driver = get_driver(neo4j_uri, neo4j_user, neo4j_password)
         self.queries_dir = Path(__file__).parent / "queries"
 
     def close(self):
-        """Close Neo4j connection."""
-        if self.driver:
-            self.driver.close()
+        """Release the Neo4j driver (the shared driver itself stays open)."""
+        self.driver = None
 
     def _load_query(self, query_file: str) -> str:
         """Load Cypher query from file."""
@@ -53,50 +53,49 @@ class GraphTools:
 
         query = self._load_query("get_object_info.cypher")
 
-        with self.driver.session() as session:
-            result = session.run(query, object_ids=ids_list)
-
-            objects = []
-            for record in result:
-                # Start with all properties (excluding internal fields)
-                properties = record["properties"]
-                obj_info = {
-                    k: v for k, v in properties.items()
-                    if k not in ["uri", "name", "category_embedding", "description_embedding"]
-                }
-
-                # Add relationships (exclude affordances)
-                for rel in record["relationships"]:
-                    if rel["type"] and rel["target"]:
-                        rel_type = rel["type"]
-
-                        # Skip affordances
-                        if rel_type == "affords":
-                            continue
-
-                        # Convert relationship names to match ontology
-                        if rel_type == "objectIsInSpace":
-                            rel_type = "isInSpace"
-                        elif rel_type == "robotIsInSpace":
-                            rel_type = "isInSpace"
-                        elif rel_type == "roomIsInStorey" or rel_type == "corridorIsInStorey":
-                            rel_type = "isInStorey"
-
-                        # Store as single value or list
-                        if rel_type in obj_info:
-                            # Convert to list if not already
-                            if not isinstance(obj_info[rel_type], list):
-                                obj_info[rel_type] = [obj_info[rel_type]]
-                            obj_info[rel_type].append(rel["target"])
-                        else:
-                            obj_info[rel_type] = rel["target"]
-
-                objects.append(obj_info)
-
-            # Return format based on input
-            if is_single:
-                return objects[0] if objects else None
-            return objects
+        result = execute_read(query, {"object_ids": ids_list}, driver=self.driver)
+
+        objects = []
+        for record in result:
+            # Start with all properties (excluding internal fields)
+            properties = record["properties"]
+            obj_info = {
+                k: v for k, v in properties.items()
+                if k not in ["uri", "name", "category_embedding", "description_embedding"]
+            }
+
+            # Add relationships (exclude affordances)
+            for rel in record["relationships"]:
+                if rel["type"] and rel["target"]:
+                    rel_type = rel["type"]
+
+                    # Skip affordances
+                    if rel_type == "affords":
+                        continue
+
+                    # Convert relationship names to match ontology
+                    if rel_type == "objectIsInSpace":
+                        rel_type = "isInSpace"
+                    elif rel_type == "robotIsInSpace":
+                        rel_type = "isInSpace"
+                    elif rel_type == "roomIsInStorey" or rel_type == "corridorIsInStorey":
+                        rel_type = "isInStorey"
+
+                    # Store as single value or list
+                    if rel_type in obj_info:
+                        # Convert to list if not already
+                        if not isinstance(obj_info[rel_type], list):
+                            obj_info[rel_type] = [obj_info[rel_type]]
+                        obj_info[rel_type].append(rel["target"])
+                    else:
+                        obj_info[rel_type] = rel["target"]
+
+            objects.append(obj_info)
+
+        # Return format based on input
+        if is_single:
+            return objects[0] if objects else None
+        return objects
 
     def filter_objects(self,
                       class_name: Optional[str] = None,
@@ -138,13 +137,12 @@ class GraphTools:
                 data_properties={"isPowered": True}
             )
         """
-        query_parts = ["MATCH (obj:Individual)"]
+        # Label in the pattern (not 'X' IN labels(obj)) so the planner can scan by label
+        label = f":`{class_name}`" if class_name else ""
+        query_parts = [f"MATCH (obj:Individual{label})"]
         where_clauses = []
         params = {}
 
-        if class_name:
-            where_clauses.append(f"'{class_name}' IN labels(obj)")
-
         if category:
             where_clauses.append("obj.category = $category")
             params["category"] = category
@@ -174,46 +172,45 @@ class GraphTools:
 
         query = "\n".join(query_parts)
 
-        with self.driver.session() as session:
-            result = session.run(query, **params)
-
-            objects = []
-            for record in result:
-                # Start with all properties (excluding internal fields)
-                properties = record["properties"]
-                obj = {
-                    k: v for k, v in properties.items()
-                    if k not in ["uri", "name", "category_embedding", "description_embedding"]
-                }
-
-                # Add relationships (exclude affordances)
-                for rel in record["relationships"]:
-                    if rel["type"] and rel["target"]:
-                        rel_type = rel["type"]
-
-                        # Skip affordances
-                        if rel_type == "affords":
-                            continue
-
-                        # Convert relationship names to match ontology
-                        if rel_type == "objectIsInSpace":
-                            rel_type = "isInSpace"
-                        elif rel_type == "robotIsInSpace":
-                            rel_type = "isInSpace"
-                        elif rel_type == "roomIsInStorey" or rel_type == "corridorIsInStorey":
-                            rel_type = "isInStorey"
-
-                        # Store as single value or list
-                        if rel_type in obj:
-                            if not isinstance(obj[rel_type], list):
-                                obj[rel_type] = [obj[rel_type]]
-                            obj[rel_type].append(rel["target"])
-                        else:
-                            obj[rel_type] = rel["target"]
-
-                objects.append(obj)
-
-            return objects
+        result = execute_read(query, params, driver=self.driver)
+
+        objects = []
+        for record in result:
+            # Start with all properties (excluding internal fields)
+            properties = record["properties"]
+            obj = {
+                k: v for k, v in properties.items()
+                if k not in ["uri", "name", "category_embedding", "description_embedding"]
+            }
+
+            # Add relationships (exclude affordances)
+            for rel in record["relationships"]:
+                if rel["type"] and rel["target"]:
+                    rel_type = rel["type"]
+
+                    # Skip affordances
+                    if rel_type == "affords":
+                        continue
+
+                    # Convert relationship names to match ontology
+                    if rel_type == "objectIsInSpace":
+                        rel_type = "isInSpace"
+                    elif rel_type == "robotIsInSpace":
+                        rel_type = "isInSpace"
+                    elif rel_type == "roomIsInStorey" or rel_type == "corridorIsInStorey":
+                        rel_type = "isInStorey"
+
+                    # Store as single value or list
+                    if rel_type in obj:
+                        if not isinstance(obj[rel_type], list):
+                            obj[rel_type] = [obj[rel_type]]
+                        obj[rel_type].append(rel["target"])
+                    else:
+                        obj[rel_type] = rel["target"]
+
+            objects.append(obj)
+
+        return objects
 
     def find_path(self, from_id: str, to_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -240,18 +237,16 @@ class GraphTools:
         query = self._load_query("find_path.cypher")
 
         try:
-            with self.driver.session() as session:
-                result = session.run(query, from_id=from_id, to_id=to_id)
-                record = result.single()
-
-                if not record:
-                    return None
+            records = execute_read(query, {"from_id": from_id, "to_id": to_id}, driver=self.driver)
+            record = records[0] if records else None
+            if not record:
+                return None
 
-                return {
-                    "path": record["path"],
-                    "cost": record["cost"],
-                    "num_nodes": record["num_nodes"]
-                }
+            return {
+                "path": record["path"],
+                "cost": record["cost"],
+                "num_nodes": record["num_nodes"]
+            }
 
         except Exception as e:
             print(f"Error finding path: {e}")
@@ -260,9 +255,7 @@ class GraphTools:
     def _ensure_spatial_graph(self):
         """Ensure GDS spatialGraph projection exists."""
         # Check if projection exists
-        with self.driver.session() as session:
-            result = session.run("CALL gds.graph.exists('spatialGraph') YIELD exists")
-            exists = result.single()["exists"]
+        exists = execute_read("CALL gds.graph.exists('spatialGraph') YIELD exists", driver=self.driver)[0]["exists"]
 
         if not exists:
             print("Creating spatialGraph projection...")
@@ -272,8 +265,8 @@ class GraphTools:
                 session.run("""
                     CALL gds.graph.project.cypher(
                       'spatialGraph',
-                      'MATCH (n) WHERE n:Space OR n:Portal RETURN id(n) AS id',
-                      'MATCH (s)-[r:hasPathTo]-(t)
+                      'MATCH (n:Individual) WHERE n:Space OR n:Portal RETURN id(n) AS id',
+                      'MATCH (s:Individual)-[r:hasPathTo]-(t:Individual)
                        WHERE (s:Space OR s:Portal) AND (t:Space OR t:Portal)
                        RETURN id(s) AS source, id(t) AS target, 1.0 AS weight'
                     )
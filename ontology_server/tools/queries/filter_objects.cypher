@@ -5,7 +5,7 @@
 MATCH (obj:Individual)
 
 // Filter by class type (if provided)
-// WHERE 'ClassName' IN labels(obj)
+// MATCH (obj:Individual:ClassName)
 
 // Filter by affordance (if provided)
 // MATCH (obj)-[:affords]->(aff:Affordance {id: $affordance})
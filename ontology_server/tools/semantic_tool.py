@@ -3,8 +3,8 @@
 Semantic Search Tool using OpenAI embeddings and Neo4j vector index.
 """
 
-from neo4j import GraphDatabase
 from core.embedding import EmbeddingManager
+from core.neo4j_pool import execute_read, get_driver
 from typing import List, Dict, Any, Optional, Union
 import os
 import numpy as np
@@ -34,7 +34,7 @@ class SemanticTool:
             description_dimensions: Dimensions for description embedding (None = use recommended)
             category_embeddings_path: Path to category embeddings JSON file
         """
-        self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+        self.driver = get_driver(neo4j_uri, neo4j_user, neo4j_password)
 
         # Initialize embedding manager with dual models
         self.embedding_manager = EmbeddingManager(
@@ -56,9 +56,8 @@ class SemanticTool:
                 print(f"WARNING: Category embeddings file not found: {category_embeddings_path}")
 
     def close(self):
-        """Close Neo4j connection."""
-        if self.driver:
-            self.driver.close()
+        """Release the Neo4j driver (the shared driver itself stays open)."""
+        self.driver = None
 
     def search(self, query: str, top_k: int = 5, search_type: str = "description") -> Union[List[str], List[Dict[str, Any]]]:
         """
@@ -124,67 +123,66 @@ class SemanticTool:
             index_name = "descriptionEmbeddingIndex"
 
             # Search using Neo4j vector index
-            with self.driver.session() as session:
-                result = session.run("""
-                    CALL db.index.vector.queryNodes(
-                        $index_name,
-                        $top_k,
-                        $query_embedding
-                    )
-                    YIELD node, score
-
-                    OPTIONAL MATCH (node)-[r]->(target)
-                    WHERE type(r) <> 'INSTANCE_OF'
-
-                    WITH node, score, collect(DISTINCT {type: type(r), target: target.id}) AS relationships
-
-                    RETURN
-                        properties(node) AS properties,
-                        relationships,
-                        score AS similarity
-                    ORDER BY score DESC
-                """, index_name=index_name, query_embedding=query_embedding, top_k=top_k)
-
-                results = []
-                for record in result:
-                    # Start with all properties (excluding internal fields)
-                    properties = record["properties"]
-                    obj = {
-                        k: v for k, v in properties.items()
-                        if k not in ["uri", "name", "category_embedding", "description_embedding"]
-                    }
-
-                    # Add relationships (exclude affordances)
-                    for rel in record["relationships"]:
-                        if rel["type"] and rel["target"]:
-                            rel_type = rel["type"]
-
-                            # Skip affordances
-                            if rel_type == "affords":
-                                continue
-
-                            # Convert relationship names to match ontology
-                            if rel_type == "objectIsInSpace":
-                                rel_type = "isInSpace"
-                            elif rel_type == "robotIsInSpace":
-                                rel_type = "isInSpace"
-                            elif rel_type == "roomIsInStorey" or rel_type == "corridorIsInStorey":
-                                rel_type = "isInStorey"
-
-                            # Store as single value or list
-                            if rel_type in obj:
-                                if not isinstance(obj[rel_type], list):
-                                    obj[rel_type] = [obj[rel_type]]
-                                obj[rel_type].append(rel["target"])
-                            else:
-                                obj[rel_type] = rel["target"]
-
-                    # Add similarity score
-                    obj["similarity"] = record["similarity"]
-
-                    results.append(obj)
-
-                return results
+            result = execute_read("""
+                CALL db.index.vector.queryNodes(
+                    $index_name,
+                    $top_k,
+                    $query_embedding
+                )
+                YIELD node, score
+
+                OPTIONAL MATCH (node)-[r]->(target)
+                WHERE type(r) <> 'INSTANCE_OF'
+
+                WITH node, score, collect(DISTINCT {type: type(r), target: target.id}) AS relationships
+
+                RETURN
+                    properties(node) AS properties,
+                    relationships,
+                    score AS similarity
+                ORDER BY score DESC
+            """, {"index_name": index_name, "query_embedding": query_embedding, "top_k": top_k}, driver=self.driver)
+
+            results = []
+            for record in result:
+                # Start with all properties (excluding internal fields)
+                properties = record["properties"]
+                obj = {
+                    k: v for k, v in properties.items()
+                    if k not in ["uri", "name", "category_embedding", "description_embedding"]
+                }
+
+                # Add relationships (exclude affordances)
+                for rel in record["relationships"]:
+                    if rel["type"] and rel["target"]:
+                        rel_type = rel["type"]
+
+                        # Skip affordances
+                        if rel_type == "affords":
+                            continue
+
+                        # Convert relationship names to match ontology
+                        if rel_type == "objectIsInSpace":
+                            rel_type = "isInSpace"
+                        elif rel_type == "robotIsInSpace":
+                            rel_type = "isInSpace"
+                        elif rel_type == "roomIsInStorey" or rel_type == "corridorIsInStorey":
+                            rel_type = "isInStorey"
+
+                        # Store as single value or list
+                        if rel_type in obj:
+                            if not isinstance(obj[rel_type], list):
+                                obj[rel_type] = [obj[rel_type]]
+                            obj[rel_type].append(rel["target"])
+                        else:
+                            obj[rel_type] = rel["target"]
+
+                # Add similarity score
+                obj["similarity"] = record["similarity"]
+
+                results.append(obj)
+
+            return results
 
     @staticmethod
     def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
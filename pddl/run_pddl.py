@@ -3,8 +3,6 @@
 
 import sys
 import yaml
-import shutil
-import subprocess
 from pathlib import Path
 from neo4j import GraphDatabase
 
@@ -16,6 +14,7 @@ from scripts.pddl_parser import PDDLDomainParser
 from scripts.pddl_generator import PDDLGenerator
 from scripts.pddl_writer import PDDLWriter
 from scripts.pddl_goal_utils import extract_object_ids_from_goal, classify_objects_by_domain_type
+from scripts.pddl_fast_downward import FAST_DOWNWARD_PATH, build_planner_command as build_search_command, run_fast_downward
 from core.config import get_config
 
 
@@ -27,18 +26,9 @@ def load_config(config_path: Path) -> dict:
 
 def build_planner_command(planner_config: dict) -> str:
     """Build Fast Downward search command from planner config."""
-    solver = planner_config.get('solver', 'lazy_wastar')
-    heuristic = planner_config.get('heuristic', 'ff')
-    weight = planner_config.get('weight', 2)
-
-    if solver == 'lazy_wastar':
-        return f"lazy_wastar([{heuristic}()], w={weight})"
-    elif solver == 'astar':
-        return f"astar({heuristic}())"
-    elif solver == 'lama':
-        return "lazy(alt([lama_synergy()], boost=1000), preferred=[lama_synergy()])"
-    else:
-        return f"lazy_wastar([{heuristic}()], w={weight})"
+    return build_search_command(planner_config.get('solver', 'lazy_wastar'),
+                                planner_config.get('heuristic', 'ff'),
+                                planner_config.get('weight', 2))
 
 
 def main():
@@ -200,57 +190,40 @@ def main():
     print(f"  Search command: {search_cmd}")
     print()
 
-    fd_path = base_dir / "fast-downward" / "fast-downward.py"
-    if not fd_path.exists():
-        print(f"ERROR: Fast Downward not found: {fd_path}")
+    if not FAST_DOWNWARD_PATH.exists():
+        print(f"ERROR: Fast Downward not found: {FAST_DOWNWARD_PATH}")
         return 1
 
-    solution_path = solution_dir / f"{task_name}.plan"
-    sas_plan_path = base_dir / "sas_plan"
-
     try:
-        result = subprocess.run(
-            [
-                "python", str(fd_path),
-                str(domain_path),
-                str(problem_path),
-                "--search", search_cmd
-            ],
-            capture_output=True,
-            text=True,
-            cwd=base_dir
-        )
-
-        if result.returncode == 0:
-            print("SUCCESS: Planning successful!")
-            print()
-
-            if sas_plan_path.exists():
-                shutil.copy(sas_plan_path, solution_path)
-                sas_plan_path.unlink()
-
-            for line in result.stdout.split('\n'):
-                if 'Plan length' in line or 'Plan cost' in line or 'Solution found' in line:
-                    print(f"  {line.strip()}")
-
-            print()
-            print(f"📄 Problem file: {problem_path}")
-            print(f"📄 Solution file: {solution_path}")
-
-        else:
-            print("ERROR: Planning failed!")
-            print()
-            print("Planner output:")
-            print(result.stdout)
-            if result.stderr:
-                print("\nErrors:")
-                print(result.stderr)
-            return 1
-
+        result = run_fast_downward(domain_path, problem_path, solution_dir, search_cmd, timeout=None)
     except Exception as e:
         print(f"ERROR: Error running planner: {e}")
         return 1
 
+    if result["status"] != "success":
+        print("ERROR: Planning failed!")
+        print()
+        print("Planner output:")
+        print(result.get("stdout", result.get("error", "")))
+        if result.get("stderr"):
+            print("\nErrors:")
+            print(result["stderr"])
+        return 1
+
+    print("SUCCESS: Planning successful!")
+    print()
+
+    solution_path = solution_dir / f"{task_name}.plan"
+    Path(result["solution_path"]).replace(solution_path)
+
+    for line in result["stdout"].split('\n'):
+        if 'Plan length' in line or 'Plan cost' in line or 'Solution found' in line:
+            print(f"  {line.strip()}")
+
+    print()
+    print(f"📄 Problem file: {problem_path}")
+    print(f"📄 Solution file: {solution_path}")
+
     print()
     print("=" * 70)
     print("SUCCESS: PDDL Task Complete")
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""PDDL Effect Engine - Turn grounded actions into ontology triple deltas."""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .pddl_parser import PDDLDomainParser
+    from .pddl_simulator import PDDLSimulator, parse_action
+except ImportError:  # run as a script (python pddl/scripts/pddl_effects.py)
+    from pddl_parser import PDDLDomainParser
+    from pddl_simulator import PDDLSimulator, parse_action
+
+
+# Ontology triple: (subject, property, object) local names; boolean data properties use True/False objects
+Triple = Tuple[str, str, Any]
+
+
+class PreconditionError(ValueError):
+    """A grounded action's precondition does not hold in the engine state."""
+
+    def __init__(self, action: str, unsatisfied: List[str]):
+        self.action = action
+        self.unsatisfied = unsatisfied
+        super().__init__(f"Precondition of {action} does not hold: {' '.join(unsatisfied)}")
+
+
+class EffectEngine:
+    """
+    Table-driven action effects for world updates.
+
+    Action schemas come from domain.pddl (via PDDLDomainParser) and are
+    grounded by PDDLSimulator, so every action in the domain is supported
+    without per-action code. The resulting PDDL fact changes are mapped to
+    ontology properties with the "pddl_predicates" table of
+    relationship_mapping.json.
+
+    The engine keeps the PDDL facts of the current world version so that
+    preconditions and conditional effects (forall/when) can be evaluated.
+    The TTL files only hold asserted triples; facts the reasoner infers
+    for static predicates (hasPathTo from isDoorOf/isStairsOf, ...) are
+    set once with set_background() and hold in every version.
+    """
+
+    def __init__(self, domain_parser: PDDLDomainParser, mapping: Dict[str, Any]):
+        """
+        Initialize engine.
+
+        Args:
+            domain_parser: PDDLDomainParser with action schemas loaded
+            mapping: Parsed relationship_mapping.json
+        """
+        self.parser = domain_parser
+        self.simulator = PDDLSimulator(domain_parser)
+        self.predicate_types = domain_parser.get_predicates()
+
+        self.predicate_table: Dict[str, Dict[str, str]] = {
+            name: entry for name, entry in mapping.get("pddl_predicates", {}).items()
+            if isinstance(entry, dict)
+        }
+        # Reverse lookup for loading facts from ontology triples
+        self.property_table: Dict[Tuple[str, str], str] = {}
+        for predicate, entry in self.predicate_table.items():
+            key = (entry["property"], predicate if entry["kind"] == "affordance" else entry["kind"])
+            self.property_table[key] = predicate
+
+        unmapped = sorted(self._effect_predicates() - set(self.predicate_table))
+        if unmapped:
+            print(f"  ⚠️  Effect predicates without ontology mapping (ignored): {unmapped}")
+
+        self.state = frozenset()
+        self.background = frozenset()
+        self.version: Optional[int] = None
+        self._pending: Optional[Tuple[frozenset, int]] = None
+
+    def _effect_predicates(self) -> Set[str]:
+        """Predicates that appear in any action effect."""
+        found = set()
+
+        def walk(expr):
+            if not isinstance(expr, list) or not expr:
+                return
+            head = expr[0]
+            if head in ("and", "not"):
+                for sub in expr[1:]:
+                    walk(sub)
+            elif head == "forall":
+                walk(expr[2])
+            elif head == "when":
+                walk(expr[2])
+            elif head not in ("increase", "decrease", "assign"):
+                found.add(head)
+
+        for action in self.simulator.actions.values():
+            walk(action["effect"])
+        return found
+
+    def static_predicates(self) -> Set[str]:
+        """Mapped predicates no action changes (topology, hands, keys): safe to take from the reasoned world."""
+        return set(self.predicate_table) - self._effect_predicates()
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def set_background(self, facts: Iterable[Tuple[str, ...]]):
+        """
+        Set facts that hold in every world version (reasoned static facts, e.g. hasPathTo).
+
+        Only facts of static_predicates() are kept, so a background fact is
+        never added or removed by an action and never appears in a delta.
+        """
+        static = self.static_predicates()
+        background = frozenset(tuple(f) for f in facts if f[0] in static)
+        self.state = (self.state - self.background) | background
+        self.background = background
+        self._register_objects(background)
+        self._pending = None
+
+    def load_facts(self, facts: Iterable[Tuple[str, ...]], version: Optional[int] = None):
+        """
+        Set the current PDDL facts (objects and their types are inferred from predicate signatures).
+
+        Args:
+            facts: Fact tuples, e.g. ('robotIsInSpace', 'robot1', 'kitchen_5')
+            version: World version these facts describe
+        """
+        self.state = frozenset(tuple(f) for f in facts) | self.background
+        self.simulator.set_objects({})
+        self._register_objects(self.state)
+        self.version = version
+        self._pending = None
+
+    def _register_objects(self, facts: Iterable[Tuple[str, ...]]):
+        """Add objects mentioned in facts, typed by the predicate signatures."""
+        objects = dict(self.simulator.objects)
+        for fact in facts:
+            for (_, param_type), arg in zip(self.predicate_types.get(fact[0], []), fact[1:]):
+                current = objects.get(arg)
+                # Keep the most specific type seen for the object
+                if current is None or self.parser.is_subtype_of(param_type, current):
+                    objects[arg] = param_type
+        if objects != self.simulator.objects:
+            self.simulator.set_objects(objects)
+
+    def facts_from_triples(self, triples: Iterable[Triple]) -> Set[Tuple[str, ...]]:
+        """Map ontology triples (local names) to PDDL facts; unmapped triples are skipped."""
+        facts = set()
+        for subject, prop, obj in triples:
+            if isinstance(obj, bool):
+                predicate = self.property_table.get((prop, "boolean"))
+                if predicate and obj:
+                    facts.add((predicate, subject))
+            elif prop == "affords":
+                predicate = self.property_table.get(("affords", obj))
+                if predicate:
+                    facts.add((predicate, subject))
+            else:
+                predicate = self.property_table.get((prop, "object"))
+                if predicate:
+                    facts.add((predicate, subject, obj))
+        return facts
+
+    def default_locked(self, triples: Iterable[Triple], facts: Iterable[Tuple[str, ...]]) -> Set[Tuple[str, ...]]:
+        """
+        isLocked facts implied by hasRequiredKey (as PDDLWriter writes the initial state).
+
+        A safe that requires a key starts locked unless the world has an
+        explicit isLocked literal for it (e.g. written by unlock-safe).
+        """
+        if "isLocked" not in self.predicate_table or "hasRequiredKey" not in self.predicate_table:
+            return set()
+        lock_property = self.predicate_table["isLocked"]["property"]
+        explicit = {subject for subject, prop, obj in triples if prop == lock_property and isinstance(obj, bool)}
+        return {("isLocked", fact[1]) for fact in facts
+                if fact[0] == "hasRequiredKey" and fact[1] not in explicit}
+
+    def load_triples(self, triples: Iterable[Triple], version: Optional[int] = None):
+        """Set the current state from ontology triples (plus the isLocked defaults of default_locked())."""
+        triples = list(triples)
+        facts = self.facts_from_triples(triples)
+        self.load_facts(facts | self.default_locked(triples, facts | self.background), version)
+        # Objects only seen with a false boolean (e.g. closed doors) still need their type for quantifiers
+        self._register_objects(
+            (self.property_table[(prop, "boolean")], subject)
+            for subject, prop, obj in triples
+            if obj is False and (prop, "boolean") in self.property_table
+        )
+
+    # ------------------------------------------------------------------
+    # Effects
+    # ------------------------------------------------------------------
+
+    def fact_to_triples(self, fact: Tuple[str, ...], holds: bool) -> Tuple[Set[Triple], Set[Triple]]:
+        """
+        Ontology triples to add/remove when a fact becomes true (holds) or false.
+
+        Returns:
+            Tuple of (added, removed)
+        """
+        entry = self.predicate_table.get(fact[0])
+        if entry is None:
+            return set(), set()
+        prop, kind = entry["property"], entry["kind"]
+        if kind == "boolean":
+            return {(fact[1], prop, holds)}, {(fact[1], prop, not holds)}
+        if kind == "affordance":
+            triple = (fact[1], prop, fact[0])
+        else:
+            triple = (fact[1], prop, fact[2])
+        return ({triple}, set()) if holds else (set(), {triple})
+
+    def facts_to_triples(self, added_facts: Iterable[Tuple[str, ...]],
+                         removed_facts: Iterable[Tuple[str, ...]]) -> Tuple[Set[Triple], Set[Triple]]:
+        """Ontology triples (added, removed) for a set of fact changes."""
+        added, removed = set(), set()
+        for facts, holds in ((added_facts, True), (removed_facts, False)):
+            for fact in facts:
+                a, r = self.fact_to_triples(fact, holds)
+                added |= a
+                removed |= r
+        return added, removed
+
+    def compute(self, action: str, check: bool = True) -> Dict[str, Any]:
+        """
+        Compute the triple delta of a grounded action against the current state.
+
+        Call commit() once the delta has been applied to the world.
+
+        Args:
+            action: PDDL action string, e.g. "(pick-one-hand robot1 left_hand cup_3)"
+            check: Fail if the action's precondition does not hold
+
+        Returns:
+            Dict with 'action' (name), 'args', 'added'/'removed' triples and
+            'added_facts'/'removed_facts'
+
+        Raises:
+            PreconditionError: If check is set and the precondition does not hold
+            ValueError: If the action is malformed or not in the domain
+        """
+        name, args = parse_action(action)
+        if check:
+            unsatisfied = self.simulator.unsatisfied_conditions(self.state, name, args)
+            if unsatisfied:
+                raise PreconditionError(action, unsatisfied)
+        adds, deletes, _ = self.simulator.effects(self.state, name, args)
+        new_state = frozenset((set(self.state) - deletes) | adds)
+        added_facts = new_state - self.state
+        removed_facts = self.state - new_state
+        added, removed = self.facts_to_triples(added_facts, removed_facts)
+
+        next_version = self.version + 1 if self.version is not None else None
+        self._pending = (new_state, next_version)
+        return {
+            "action": name,
+            "args": list(args),
+            "added": added,
+            "removed": removed,
+            "added_facts": sorted(added_facts),
+            "removed_facts": sorted(removed_facts),
+        }
+
+    def dry_run(self, actions: List[str], goal: Any = None) -> Dict[str, Any]:
+        """
+        Simulate a whole plan from the current state without changing it.
+
+        Every action's precondition is checked before its effects are
+        applied, so an invalid step (wrong from-location, closed door, empty
+        hand) is found before anything is sent to the ontology server.
+
+        Args:
+            actions: PDDL action strings in order
+            goal: Optional goal (s-expression or PDDL string) checked at the end
+
+        Returns:
+            PDDLSimulator.simulate() result ('valid', 'failed_index',
+            'failed_action', 'reason', 'state', ...) plus 'added'/'removed'
+            (projected net triple delta up to the last valid step) and 'elapsed_ms'
+        """
+        start = time.perf_counter()
+        result = self.simulator.simulate(self.state, actions, goal=goal)
+        final = result["state"]
+        result["added"], result["removed"] = self.facts_to_triples(final - self.state, self.state - final)
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return result
+
+    def commit(self):
+        """Advance the state to the result of the last compute()."""
+        if self._pending is None:
+            return
+        new_state, self.version = self._pending
+        self._register_objects(new_state - self.state)
+        self.state = new_state
+        self._pending = None
+
+
+def load_relationship_mapping(mapping_path: Path) -> Dict[str, Any]:
+    """Load relationship_mapping.json."""
+    with open(mapping_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+_engines: Dict[Tuple[str, str], EffectEngine] = {}
+
+
+def get_effect_engine(domain_path: Path, mapping_path: Path) -> EffectEngine:
+    """Get the process-wide engine for a domain/mapping pair (schemas parsed once)."""
+    key = (str(domain_path), str(mapping_path))
+    if key not in _engines:
+        _engines[key] = EffectEngine(PDDLDomainParser(domain_path), load_relationship_mapping(mapping_path))
+    return _engines[key]
+
+
+if __name__ == "__main__":
+    project_root = Path(__file__).parent.parent.parent
+    engine = get_effect_engine(project_root / "pddl" / "domain.pddl",
+                               project_root / "action" / "relationship_mapping.json")
+
+    engine.load_triples([
+        ("robot1", "robotIsInSpace", "kitchen_1"),
+        ("robot1", "hasHand", "left_hand"),
+        ("robot1", "hasHand", "right_hand"),
+        ("cup_3", "artifactIsInSpace", "kitchen_1"),
+        ("cup_3", "affords", "Affordance_PickupOneHand"),
+        ("fridge_2", "artifactIsInSpace", "kitchen_1"),
+        ("fridge_2", "isOpen", False),
+        ("fridge_2", "affords", "Affordance_Open"),
+        ("fridge_2", "affords", "Affordance_PlaceIn"),
+        ("door_4", "isOpenDoor", False),
+    ], version=0)
+    # hasPathTo is inferred by the reasoner (door_4 isDoorOf kitchen_1/corridor_2), not asserted in the TTL
+    engine.set_background([
+        ("hasPathTo", "kitchen_1", "door_4"), ("hasPathTo", "door_4", "kitchen_1"),
+        ("hasPathTo", "door_4", "corridor_2"), ("hasPathTo", "corridor_2", "door_4"),
+    ])
+    print(f"Static predicates: {sorted(engine.static_predicates())}")
+
+    # A safe that requires a key starts locked without an isLocked literal (as PDDLWriter writes it)
+    key_safe = [("safe_5", "requiresKey", "key_6"), ("key_6", "unlocks", "safe_5")]
+    facts = engine.facts_from_triples(key_safe)
+    print(f"Default locks: {engine.default_locked(key_safe, facts)}, "
+          f"with an explicit literal: {engine.default_locked(key_safe + [('safe_5', 'isLocked', False)], facts)}")
+
+    plan = [
+        "(access robot1 cup_3 kitchen_1)",
+        "(pick-one-hand robot1 left_hand cup_3)",
+        "(access robot1 fridge_2 kitchen_1)",
+        "(open robot1 fridge_2)",
+        "(place-in-one-hand robot1 left_hand cup_3 fridge_2)",
+        "(move robot1 kitchen_1 door_4)",
+    ]
+    for steps in (plan, plan + ["(move robot1 door_4 corridor_2)"]):
+        result = engine.dry_run(steps)
+        print(f"Dry run of {len(steps)} actions: valid={result['valid']} in {result['elapsed_ms']} ms"
+              + (f", step {result['failed_index'] + 1}: {result['reason']}" if not result["valid"] else ""))
+
+    try:
+        engine.compute("(move robot1 door_4 corridor_2)")
+    except PreconditionError as e:
+        print(f"compute() refuses an inapplicable action: {e}")
+
+    for step in plan:
+        delta = engine.compute(step)
+        engine.commit()
+        print(f"v{engine.version} {step}")
+        for triple in sorted(delta["removed"], key=str):
+            print(f"    - {triple}")
+        for triple in sorted(delta["added"], key=str):
+            print(f"    + {triple}")
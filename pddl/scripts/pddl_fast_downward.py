@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Fast Downward Runner - Build search commands, run the planner and read back its plan."""
+
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+FAST_DOWNWARD_PATH = Path(__file__).parent.parent / "fast-downward" / "fast-downward.py"
+
+
+def build_planner_command(solver: str = "lazy_wastar", heuristic: str = "ff", weight: int = 2) -> str:
+    """Build Fast Downward search command."""
+    if solver == 'lazy_wastar':
+        return f"lazy_wastar([{heuristic}()], w={weight})"
+    elif solver == 'astar':
+        return f"astar({heuristic}())"
+    elif solver == 'lama':
+        return "lazy(alt([lama_synergy()], boost=1000), preferred=[lama_synergy()])"
+    else:
+        return f"lazy_wastar([{heuristic}()], w={weight})"
+
+
+DEFAULT_SEARCH = build_planner_command()
+
+
+def read_plan(solution_path: Path) -> List[str]:
+    """Grounded actions of a solution.plan file (comments such as "; cost = 12" skipped)."""
+    with open(solution_path, 'r') as f:
+        return [line.strip() for line in f if line.strip().startswith('(')]
+
+
+def parse_metrics(stdout: str) -> Dict[str, Any]:
+    """Plan length/cost reported by Fast Downward, with the lines they came from."""
+    metrics = {"lines": [], "plan_length": None, "plan_cost": None}
+    for line in stdout.split('\n'):
+        for label, key in (('Plan length', 'plan_length'), ('Plan cost', 'plan_cost')):
+            if label in line:
+                metrics["lines"].append(line.strip())
+                match = re.search(r'(\d+)', line)
+                if match:
+                    metrics[key] = int(match.group(1))
+    return metrics
+
+
+def run_fast_downward(domain_path: Path, problem_path: Path, output_dir: Path,
+                      search_cmd: str = DEFAULT_SEARCH, timeout: Optional[int] = 60) -> Dict[str, Any]:
+    """
+    Run Fast Downward and read back the plan.
+
+    The planner runs with the current interpreter in output_dir, so its
+    intermediate files (output.sas, sas_plan) never collide between runs.
+
+    Args:
+        domain_path: Path to domain.pddl
+        problem_path: Path to problem.pddl
+        output_dir: Directory for solution.plan (also the planner's working directory)
+        search_cmd: Fast Downward search configuration
+        timeout: Planner timeout in seconds (None: no limit)
+
+    Returns:
+        Dict with 'status' ("success", "failed" or "timeout"), 'actions',
+        'solution_path', 'plan_length', 'plan_cost', 'metrics', 'returncode',
+        'stdout' and 'stderr' ('error' instead of the process details if
+        the planner could not run)
+    """
+    if not FAST_DOWNWARD_PATH.exists():
+        return {"status": "failed", "actions": [], "error": f"Fast Downward not found at {FAST_DOWNWARD_PATH}"}
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        result = subprocess.run(
+            [sys.executable, str(FAST_DOWNWARD_PATH), str(Path(domain_path).resolve()),
+             str(Path(problem_path).resolve()), "--search", search_cmd],
+            capture_output=True,
+            text=True,
+            cwd=output_dir,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {"status": "timeout", "actions": [], "error": f"Planner timeout ({timeout}s)"}
+
+    solution_path = output_dir / "solution.plan"
+    sas_plan_path = output_dir / "sas_plan"
+    if result.returncode == 0 and sas_plan_path.exists():
+        shutil.move(str(sas_plan_path), str(solution_path))
+
+    success = result.returncode == 0 and solution_path.exists()
+    metrics = parse_metrics(result.stdout)
+    return {
+        "status": "success" if success else "failed",
+        "actions": read_plan(solution_path) if success else [],
+        "solution_path": str(solution_path),
+        "plan_length": metrics["plan_length"],
+        "plan_cost": metrics["plan_cost"],
+        "metrics": metrics["lines"],
+        "returncode": result.returncode,
+        "stdout": result.stdout,
+        "stderr": result.stderr
+    }
+
+
+if __name__ == "__main__":
+    print(f"Search commands: {DEFAULT_SEARCH} | {build_planner_command('astar', 'ff')} | "
+          f"{build_planner_command('lama')}")
+    sample_stdout = "Solution found!\nPlan length: 7 step(s).\nPlan cost: 12\n"
+    print(f"Metrics: {parse_metrics(sample_stdout)}")
+    print(f"Fast Downward: {FAST_DOWNWARD_PATH} ({'found' if FAST_DOWNWARD_PATH.exists() else 'not installed'})")
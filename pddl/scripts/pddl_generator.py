@@ -4,23 +4,26 @@
 import math
 from pathlib import Path
 from typing import Dict, List, Set, Any
-from neo4j import GraphDatabase
 
 
 class PDDLGenerator:
     """Generate PDDL problem data from Neo4j knowledge graph."""
 
-    def __init__(self, driver, domain_parser):
+    def __init__(self, driver, domain_parser, object_index=None):
         """
         Initialize PDDL generator.
 
         Args:
             driver: Neo4j driver instance
             domain_parser: PDDLDomainParser instance
+            object_index: Optional ObjectIndex; types/affordances are served from it
         """
         self.driver = driver
         self.parser = domain_parser
+        self.object_index = object_index
         self._types_cache = {}  # Cache for type lookups to avoid redundant queries
+        if object_index is not None:
+            self._types_cache.update(object_index.types)
 
     def get_types(self, ids: List[str]) -> Dict[str, str]:
         """Get domain types for given IDs.
@@ -44,7 +47,7 @@ class PDDLGenerator:
         with self.driver.session() as session:
             result = session.run("""
                 UNWIND $ids AS obj_id
-                MATCH (n {id: obj_id})
+                MATCH (n:Individual {id: obj_id})
                 OPTIONAL MATCH (n)-[:INSTANCE_OF]->(c:Class)
                 RETURN obj_id, 
                        labels(n) as node_labels,
@@ -52,62 +55,12 @@ class PDDLGenerator:
             """, ids=uncached_ids)
 
             for record in result:
-                obj_id = record["obj_id"]
-                node_labels = record["node_labels"] or []
-                class_names = record["class_names"] or []
-                
-                # Combine node labels and class names
-                # Node labels are more direct (e.g., :Door, :Opening, :Stairs, :Space)
-                all_type_candidates = list(set(node_labels + class_names))
-                
-                # Remove non-domain labels (Individual, Environment, etc.)
-                # But keep Space, Door, Stairs, Opening even if not in parser.get_all_types()
-                # because these are the actual domain types we need
-                domain_types_in_parser = self.parser.get_all_types()
-                domain_labels = [label for label in all_type_candidates 
-                               if label in domain_types_in_parser]
-                
-                # Also check for direct Space, Door, Stairs, Opening labels (case-insensitive)
-                direct_type_labels = ["Space", "Door", "Stairs", "Opening"]
-                for direct_type in direct_type_labels:
-                    if direct_type in node_labels:
-                        types_map[obj_id] = direct_type
-                        break
-                else:
-                    # If no direct type label found, check domain_labels
-                    if domain_labels:
-                        # Prioritize most specific types: Door, Stairs, Opening, Space (leaf nodes in hierarchy)
-                        # These are more specific than Portal or Environment
-                        priority_types = ["Door", "Stairs", "Opening", "Space"]
-                        for priority_type in priority_types:
-                            if priority_type in domain_labels:
-                                types_map[obj_id] = priority_type
-                                break
-                        else:
-                            # If no leaf type found, use map_class_to_domain_type to find most specific
-                            domain_type = self.parser.map_class_to_domain_type(domain_labels)
-                            if domain_type:
-                                types_map[obj_id] = domain_type
-                            else:
-                                # Last resort: use first domain label
-                                types_map[obj_id] = domain_labels[0]
-                    else:
-                        # Fallback: try to infer from labels even if not in domain types
-                        # Check for common patterns (case-insensitive)
-                        all_labels_lower = [label.lower() for label in node_labels]
-                        if any("door" in label for label in all_labels_lower):
-                            types_map[obj_id] = "Door"
-                        elif any("stair" in label for label in all_labels_lower):
-                            types_map[obj_id] = "Stairs"
-                        elif any("opening" in label for label in all_labels_lower):
-                            types_map[obj_id] = "Opening"
-                        elif any("space" in label for label in all_labels_lower):
-                            types_map[obj_id] = "Space"
-                        elif class_names:
-                            # Last resort: try class names
-                            domain_type = self.parser.map_class_to_domain_type(class_names)
-                            if domain_type:
-                                types_map[obj_id] = domain_type
+                domain_type = self.resolve_domain_type(
+                    record["node_labels"] or [],
+                    record["class_names"] or []
+                )
+                if domain_type:
+                    types_map[record["obj_id"]] = domain_type
         
         # Update cache with newly queried types
         self._types_cache.update(types_map)
@@ -120,6 +73,64 @@ class PDDLGenerator:
         
         return result_map
 
+    def resolve_domain_type(self, node_labels: List[str], class_names: List[str]) -> str:
+        """
+        Resolve the most specific domain type from node labels and class names.
+
+        Args:
+            node_labels: Neo4j labels of the individual node
+            class_names: Names of classes linked via INSTANCE_OF
+
+        Returns:
+            Domain type string, or None if no type matches
+        """
+        # Combine node labels and class names
+        # Node labels are more direct (e.g., :Door, :Opening, :Stairs, :Space)
+        all_type_candidates = list(set(node_labels + class_names))
+
+        # Remove non-domain labels (Individual, Environment, etc.)
+        # But keep Space, Door, Stairs, Opening even if not in parser.get_all_types()
+        # because these are the actual domain types we need
+        domain_types_in_parser = self.parser.get_all_types()
+        domain_labels = [label for label in all_type_candidates 
+                       if label in domain_types_in_parser]
+
+        # Also check for direct Space, Door, Stairs, Opening labels (case-insensitive)
+        direct_type_labels = ["Space", "Door", "Stairs", "Opening"]
+        for direct_type in direct_type_labels:
+            if direct_type in node_labels:
+                return direct_type
+
+        # If no direct type label found, check domain_labels
+        if domain_labels:
+            # Prioritize most specific types: Door, Stairs, Opening, Space (leaf nodes in hierarchy)
+            # These are more specific than Portal or Environment
+            priority_types = ["Door", "Stairs", "Opening", "Space"]
+            for priority_type in priority_types:
+                if priority_type in domain_labels:
+                    return priority_type
+
+            # If no leaf type found, use map_class_to_domain_type to find most specific
+            # Last resort: use first domain label
+            return self.parser.map_class_to_domain_type(domain_labels) or domain_labels[0]
+
+        # Fallback: try to infer from labels even if not in domain types
+        # Check for common patterns (case-insensitive)
+        all_labels_lower = [label.lower() for label in node_labels]
+        if any("door" in label for label in all_labels_lower):
+            return "Door"
+        elif any("stair" in label for label in all_labels_lower):
+            return "Stairs"
+        elif any("opening" in label for label in all_labels_lower):
+            return "Opening"
+        elif any("space" in label for label in all_labels_lower):
+            return "Space"
+        elif class_names:
+            # Last resort: try class names
+            return self.parser.map_class_to_domain_type(class_names)
+
+        return None
+
     def get_robot_info(self) -> Dict[str, Any]:
         """Get robot and hand information."""
         with self.driver.session() as session:
@@ -202,7 +213,7 @@ class PDDLGenerator:
             # When we find a path, we extract distances for ALL pairs in that path
             result = session.run("""
                 UNWIND $pairs AS pair
-                MATCH (a {id: pair.loc1}), (b {id: pair.loc2})
+                MATCH (a:Individual {id: pair.loc1}), (b:Individual {id: pair.loc2})
                 WHERE (a:Space OR a:Door OR a:Stairs OR a:Opening)
                   AND (b:Space OR b:Door OR b:Stairs OR b:Opening)
                 OPTIONAL MATCH p = shortestPath((a)-[:hasPathTo*1..50]-(b))
@@ -305,7 +316,7 @@ class PDDLGenerator:
             # Get all hasPathTo relationships between locations in the set
             # This includes Space->Portal, Portal->Space, and any other connections
             result = session.run("""
-                MATCH (a)-[:hasPathTo]->(b)
+                MATCH (a:Individual)-[:hasPathTo]->(b:Individual)
                 WHERE a.id IN $all_locs
                   AND b.id IN $all_locs
                   AND a.id <> b.id
@@ -336,7 +347,7 @@ class PDDLGenerator:
             # Try to find any hasPathTo relationships involving these locations
             with self.driver.session() as session:
                 debug_result = session.run("""
-                    MATCH (a)-[:hasPathTo]->(b)
+                    MATCH (a:Individual)-[:hasPathTo]->(b:Individual)
                     WHERE a.id IN $all_locs OR b.id IN $all_locs
                     RETURN a.id as from_id, b.id as to_id
                     LIMIT 10
@@ -398,7 +409,7 @@ class PDDLGenerator:
             # Query: Check artifact -> space relationships only
             result = session.run("""
                 UNWIND $goal_ids AS goal_id
-                MATCH (artifact {id: goal_id})
+                MATCH (artifact:Individual {id: goal_id})
                 
                 // 1. Direct artifact -> space relationships
                 OPTIONAL MATCH (artifact)-[:isInSpace|objectIsInSpace]->(space:Space)
@@ -444,7 +455,7 @@ class PDDLGenerator:
                 # Try more flexible query without label constraints
                 fallback_result = session.run("""
                     UNWIND $artifact_ids AS artifact_id
-                    MATCH (artifact {id: artifact_id})
+                    MATCH (artifact:Individual {id: artifact_id})
                     
                     // Check artifact -> space relationships only
                     OPTIONAL MATCH (artifact)-[r]->(target)
@@ -474,7 +485,7 @@ class PDDLGenerator:
                     # Check if artifacts exist in Neo4j
                     existence_check = session.run("""
                         UNWIND $artifact_ids AS artifact_id
-                        OPTIONAL MATCH (n {id: artifact_id})
+                        OPTIONAL MATCH (n:Individual {id: artifact_id})
                         RETURN artifact_id, n IS NOT NULL as exists, labels(n) as node_labels
                     """, artifact_ids=list(still_missing))
                     
@@ -491,6 +502,9 @@ class PDDLGenerator:
 
     def get_affordances(self, artifact_ids: List[str]) -> Dict[str, List[str]]:
         """Get affordances for artifacts."""
+        if self.object_index is not None and self.object_index.contains_all(artifact_ids):
+            return self.object_index.get_affordances(artifact_ids)
+
         affordances_map = {}
 
         with self.driver.session() as session:
@@ -551,8 +565,8 @@ class PDDLGenerator:
             # Find Door nodes - check both Door label and INSTANCE_OF relationship
             result = session.run("""
                 UNWIND $ids AS door_id
-                MATCH (d {id: door_id})
-                WHERE d:Door OR (d:Individual AND (d)-[:INSTANCE_OF]->(:Class {name: "Door"}))
+                MATCH (d:Individual {id: door_id})
+                WHERE d:Door OR (d)-[:INSTANCE_OF]->(:Class {name: "Door"})
                 RETURN door_id, 
                        d.isOpenDoor as is_open,
                        labels(d) as labels,
@@ -782,6 +796,7 @@ if __name__ == "__main__":
     import sys
     sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+    from neo4j import GraphDatabase
     from pddl.scripts.pddl_parser import PDDLDomainParser
     from ontology_server.core.config import get_config
 
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""PDDL Goal AST - Tokenize, parse, normalize and print goal formulas in one pass."""
+
+import hashlib
+from typing import Dict, List, Set, Tuple
+
+try:
+    from .pddl_parser import tokenize_sexpr
+except ImportError:  # run as a script (python pddl/scripts/pddl_goal_ast.py)
+    from pddl_parser import tokenize_sexpr
+
+
+CONNECTIVES = {"and", "or", "not", "imply"}
+QUANTIFIERS = {"exists", "forall"}
+
+# (lowercase predicate, arity) -> domain predicate
+PREDICATE_ALIASES: Dict[Tuple[str, int], str] = {
+    # Domain uses artifactIsInSpace / isOntopOf, LLM goals often don't
+    ("isinspace", 2): "artifactIsInSpace",
+    ("isontopof", 2): "isOntopOf",
+    ("isontop", 1): "isON",  # common typo
+    # Case-insensitive matching of domain predicates
+    ("ison", 1): "isON",
+    ("isopen", 1): "isOpen",
+    ("isheldby", 2): "isHeldBy",
+    ("isinsideof", 2): "isInsideOf",
+    ("robotisinspace", 2): "robotIsInSpace",
+    ("artifactisonfloorof", 2): "artifactIsOnFloorOf",
+    ("artifactisinspace", 2): "artifactIsInSpace",
+    ("isadjacentto", 2): "isAdjacentTo",
+    ("islocked", 1): "isLocked",
+    ("isopendoor", 1): "isOpenDoor",
+}
+
+# (lowercase predicate, arity) -> domain predicate that must be negated
+NEGATED_ALIASES: Dict[Tuple[str, int], str] = {
+    ("isclosed", 1): "isOpen",
+}
+
+# Goal predicate -> affordance the artifact needs
+PREDICATE_AFFORDANCES: Dict[str, str] = {
+    "isON": "Affordance_Power",
+    "isOpen": "Affordance_Open",
+}
+
+
+class GoalParseError(ValueError):
+    """Raised when a goal formula cannot be parsed."""
+
+
+class GoalNode:
+    """
+    Node of a goal formula.
+
+    op is one of 'atom', 'and', 'or', 'not', 'imply', 'exists', 'forall'.
+    Atoms carry predicate/args; quantifiers carry params (raw tokens);
+    everything else carries children.
+    """
+
+    __slots__ = ("op", "predicate", "args", "params", "children")
+
+    def __init__(self, op: str, predicate: str = None, args: Tuple[str, ...] = (),
+                 params: Tuple[str, ...] = (), children: List["GoalNode"] = None):
+        self.op = op
+        self.predicate = predicate
+        self.args = tuple(args)
+        self.params = tuple(params)
+        self.children = children or []
+
+    def __eq__(self, other):
+        return isinstance(other, GoalNode) and to_pddl(self) == to_pddl(other)
+
+    def __hash__(self):
+        return hash(to_pddl(self))
+
+    def __repr__(self):
+        return f"GoalNode({to_pddl(self)})"
+
+
+# ----------------------------------------------------------------------
+# Parsing
+# ----------------------------------------------------------------------
+
+def _read_lists(tokens: List[str]) -> List:
+    """Group tokens into nested lists."""
+    stack: List[List] = [[]]
+    for token in tokens:
+        if token == "(":
+            stack.append([])
+        elif token == ")":
+            if len(stack) == 1:
+                raise GoalParseError("Unbalanced ')' in goal formula")
+            expr = stack.pop()
+            stack[-1].append(expr)
+        else:
+            stack[-1].append(token)
+    if len(stack) != 1:
+        raise GoalParseError("Unbalanced '(' in goal formula")
+    return stack[0]
+
+
+def _wrap_bare_not(items: List) -> List:
+    """Turn ``not (p ...)`` written without enclosing parentheses into ``(not (p ...))``."""
+    fixed = []
+    i = 0
+    while i < len(items):
+        item = items[i]
+        if isinstance(item, str) and item.lower() == "not" and i + 1 < len(items) \
+                and isinstance(items[i + 1], list):
+            fixed.append(["not", items[i + 1]])
+            i += 2
+            continue
+        fixed.append(item)
+        i += 1
+    return fixed
+
+
+def _build(expr, normalize: bool) -> GoalNode:
+    """Convert a nested list into a GoalNode, applying alias tables when normalizing."""
+    if isinstance(expr, str):
+        raise GoalParseError(f"Unexpected token '{expr}' outside of a predicate")
+    if not expr:
+        raise GoalParseError("Empty expression '()' in goal formula")
+
+    head = expr[0]
+    if not isinstance(head, str):
+        raise GoalParseError("Expression must start with a predicate or connective")
+    keyword = head.lower()
+
+    if keyword in CONNECTIVES:
+        rest = _wrap_bare_not(expr[1:]) if keyword != "not" else expr[1:]
+        children = [_build(sub, normalize) for sub in rest]
+        if keyword == "not" and len(children) != 1:
+            raise GoalParseError("'not' takes exactly one argument")
+        if keyword == "imply" and len(children) != 2:
+            raise GoalParseError("'imply' takes exactly two arguments")
+        return GoalNode(keyword, children=children)
+
+    if keyword in QUANTIFIERS:
+        if len(expr) != 3 or not isinstance(expr[1], list):
+            raise GoalParseError(f"Malformed '{keyword}' expression")
+        return GoalNode(keyword, params=tuple(expr[1]), children=[_build(expr[2], normalize)])
+
+    args = []
+    for arg in expr[1:]:
+        if not isinstance(arg, str):
+            raise GoalParseError(f"Nested expression inside predicate '{head}'")
+        args.append(arg)
+
+    if normalize:
+        key = (keyword, len(args))
+        if key in NEGATED_ALIASES:
+            atom = GoalNode("atom", predicate=NEGATED_ALIASES[key], args=args)
+            return GoalNode("not", children=[atom])
+        head = PREDICATE_ALIASES.get(key, head)
+
+    return GoalNode("atom", predicate=head, args=args)
+
+
+def parse_goal(goal_formula: str, normalize: bool = True) -> GoalNode:
+    """
+    Parse a PDDL goal formula into a GoalNode tree.
+
+    Lenient about LLM-style input: ``not (p x)`` without enclosing parentheses
+    is accepted, and several top-level expressions are wrapped in ``and``.
+
+    Args:
+        goal_formula: PDDL goal formula string
+        normalize: Apply predicate alias tables (isClosed, isInSpace, case fixes)
+
+    Returns:
+        Root GoalNode
+
+    Raises:
+        GoalParseError: If the formula is malformed
+    """
+    items = _wrap_bare_not(_read_lists(tokenize_sexpr(goal_formula)))
+    if not items:
+        raise GoalParseError("Empty goal formula")
+
+    nodes = [_build(item, normalize) for item in items]
+    if len(nodes) == 1:
+        return nodes[0]
+    return GoalNode("and", children=nodes)
+
+
+# ----------------------------------------------------------------------
+# Printing
+# ----------------------------------------------------------------------
+
+def to_pddl(node: GoalNode) -> str:
+    """Print a GoalNode as canonical single-line PDDL."""
+    if node.op == "atom":
+        return "(" + " ".join((node.predicate,) + node.args) + ")"
+    if node.op in QUANTIFIERS:
+        return f"({node.op} ({' '.join(node.params)}) {to_pddl(node.children[0])})"
+    return "(" + " ".join([node.op] + [to_pddl(c) for c in node.children]) + ")"
+
+
+def format_goal(node: GoalNode, indent: str = "  ") -> str:
+    """Print a goal with one top-level conjunct per line."""
+    if node.op != "and":
+        return to_pddl(node)
+    if not node.children:
+        return "(and)"
+    lines = ["(and"]
+    lines.extend(f"{indent}{to_pddl(child)}" for child in node.children)
+    lines.append(")")
+    return "\n".join(lines)
+
+
+def canonical_key(node: GoalNode) -> str:
+    """Order-insensitive canonical form (and/or operands sorted and deduplicated)."""
+    if node.op == "atom":
+        return to_pddl(node)
+    if node.op in ("and", "or"):
+        parts = sorted({canonical_key(c) for c in node.children})
+        if len(parts) == 1:
+            return parts[0]
+        return "(" + " ".join([node.op] + parts) + ")"
+    if node.op in QUANTIFIERS:
+        return f"({node.op} ({' '.join(node.params)}) {canonical_key(node.children[0])})"
+    return "(" + " ".join([node.op] + [canonical_key(c) for c in node.children]) + ")"
+
+
+def goal_hash(node: GoalNode) -> str:
+    """Stable SHA-256 of the canonical goal (conjunct order does not matter)."""
+    return hashlib.sha256(canonical_key(node).encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Queries
+# ----------------------------------------------------------------------
+
+def iter_literals(node: GoalNode, positive: bool = True):
+    """Yield (atom_node, positive) for every atom; polarity flips under 'not'."""
+    if node.op == "atom":
+        yield node, positive
+    elif node.op == "not":
+        yield from iter_literals(node.children[0], not positive)
+    elif node.op == "imply":
+        yield from iter_literals(node.children[0], not positive)
+        yield from iter_literals(node.children[1], positive)
+    else:
+        for child in node.children:
+            yield from iter_literals(child, positive)
+
+
+def collect_identifiers(node: GoalNode) -> Set[str]:
+    """Collect constant arguments (object IDs) used in the goal."""
+    return {arg for atom, _ in iter_literals(node) for arg in atom.args if not arg.startswith("?")}
+
+
+def collect_affordance_requirements(node: GoalNode) -> List[Tuple[str, str, str]]:
+    """
+    List (predicate, object_id, required_affordance) for every goal atom that
+    needs an affordance on its arguments.
+    """
+    requirements = []
+    for atom, _ in iter_literals(node):
+        affordance = PREDICATE_AFFORDANCES.get(atom.predicate)
+        if affordance:
+            requirements.extend((atom.predicate, arg, affordance) for arg in atom.args)
+    return requirements
+
+
+def normalize_goal(goal_formula: str) -> str:
+    """Parse with alias tables and print canonically (single pass)."""
+    return to_pddl(parse_goal(goal_formula, normalize=True))
+
+
+if __name__ == "__main__":
+    # Differential check against the pre-AST regex normalizer: goal_corpus.json holds
+    # goal_generator prompt goals and common LLM variants with that normalizer's output
+    # (kept as a regression set), and a seeded fuzz run compares randomized goals
+    # against the frozen normalizer in pddl_goal_baseline
+    import json
+    import random
+    import re
+    from pathlib import Path
+
+    try:
+        from .pddl_goal_baseline import normalize_goal_formula
+    except ImportError:
+        from pddl_goal_baseline import normalize_goal_formula
+
+    def tokens(text: str) -> List[str]:
+        """Parentheses and atoms, so only whitespace/layout differences are ignored."""
+        return re.findall(r'[()]|[^\s()]+', text)
+
+    corpus = json.loads((Path(__file__).parent / "goal_corpus.json").read_text())
+    mismatches = 0
+    for case in corpus:
+        actual = normalize_goal(case["goal"])
+        if tokens(actual) != tokens(case["baseline"]):
+            mismatches += 1
+            print(f"MISMATCH:\n  input:    {case['goal']!r}\n  baseline: {case['baseline']!r}\n  ast:      {actual}")
+
+    print(f"Differential check: {len(corpus) - mismatches}/{len(corpus)} goals match the baseline normalizer")
+
+    stale = [case["goal"] for case in corpus if tokens(normalize_goal_formula(case["goal"])) != tokens(case["baseline"])]
+    if stale:
+        print(f"WARNING: {len(stale)} corpus baselines differ from pddl_goal_baseline: {stale}")
+
+    # Fuzz: nested and/or/not (including bare "not (...)" items), alias and case
+    # spellings, and whitespace variants. The regex baseline only matches atoms with
+    # "(" directly before the predicate and a single space in bare "not (", so the
+    # generator keeps those two spots tight
+    camel_aliases = {("isinspace", 2): "isInSpace", ("isontopof", 2): "isOnTopOf",
+                     ("isontop", 1): "isOnTop", ("isclosed", 1): "isClosed"}
+    predicates = [(camel_aliases.get(key) or PREDICATE_ALIASES[key], key[1])
+                  for key in list(PREDICATE_ALIASES) + list(NEGATED_ALIASES)]
+    objects = ["robot1", "cup_3", "kitchen_5", "left_hand", "safe_121", "door_9", "tv_52"]
+    separators = [" ", "  ", "\n    ", "\t", " \n\t "]
+    rng = random.Random(27)
+
+    def spelling(name: str) -> str:
+        roll = rng.random()
+        if roll < 0.5:
+            return name
+        if roll < 0.65:
+            return name.lower()
+        if roll < 0.75:
+            return name.upper()
+        return "".join(c.upper() if rng.random() < 0.5 else c.lower() for c in name)
+
+    def random_atom() -> str:
+        name, arity = rng.choice(predicates)
+        args = "".join(rng.choice(separators) + rng.choice(objects) for _ in range(arity))
+        return f"({spelling(name)}{args})"
+
+    def random_formula(depth: int) -> str:
+        if depth == 0 or rng.random() < 0.3:
+            return random_atom()
+        op = rng.choice(["and", "and", "or", "not"])
+        if op == "not":
+            return f"(not{rng.choice(separators)}{random_formula(depth - 1)})"
+        items = ["not (" + random_atom()[1:] if rng.random() < 0.15 else random_formula(depth - 1)
+                 for _ in range(rng.randint(1, 4))]
+        return f"({op}" + "".join(rng.choice(separators) + item for item in items) + ")"
+
+    fuzz_cases = 2000
+    fuzz_mismatches = 0
+    for _ in range(fuzz_cases):
+        goal = rng.choice(["", " ", "\n"]) + random_formula(rng.randint(0, 4)) + rng.choice(["", "\n", "  "])
+        try:
+            actual = normalize_goal(goal)
+        except GoalParseError as e:
+            actual = f"<GoalParseError: {e}>"
+        expected = normalize_goal_formula(goal)
+        if tokens(actual) != tokens(expected):
+            fuzz_mismatches += 1
+            if fuzz_mismatches <= 5:
+                print(f"FUZZ MISMATCH:\n  input:    {goal!r}\n  baseline: {expected!r}\n  ast:      {actual}")
+
+    print(f"Fuzz check: {fuzz_cases - fuzz_mismatches}/{fuzz_cases} random goals match the baseline normalizer")
+
+    sample = "(and (isON tv_52) not (isOpen oven_53) (isClosed safe_3) (isInSpace cup_12 kitchen_5))"
+    root = parse_goal(sample)
+    print(f"\nNormalized: {to_pddl(root)}")
+    print(f"Formatted:\n{format_goal(root)}")
+    print(f"Identifiers: {sorted(collect_identifiers(root))}")
+    print(f"Affordance requirements: {collect_affordance_requirements(root)}")
+    print(f"Hash: {goal_hash(root)[:16]}...")
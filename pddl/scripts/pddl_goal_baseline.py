@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+PDDL Goal Baseline - Frozen copy of the regex goal normalizer that pddl_goal_ast replaced.
+
+Kept unchanged (from agent/tools/pddl_plan.py before the goal AST) as the
+reference for pddl_goal_ast's differential and fuzz checks; not used at runtime.
+"""
+
+import re
+
+
+def normalize_goal_formula(goal_formula: str) -> str:
+    """
+    Normalize goal formula by converting unsupported predicates to supported ones
+    and fixing syntax errors.
+    
+    Converts:
+    - (isClosed ?a) -> (not (isOpen ?a))
+    - (isInSpace ?a ?l) -> (artifactIsInSpace ?a ?l)  (domain uses artifactIsInSpace, not isInSpace)
+    - Case-insensitive predicate matching for common typos
+    - not (predicate) -> (not (predicate))  (fix missing parentheses)
+    
+    Args:
+        goal_formula: Original PDDL goal formula
+        
+    Returns:
+        Normalized goal formula with domain-compatible predicates
+    """
+    # Define predicate mappings (case-insensitive matching)
+    # Format: (pattern, correct_predicate, num_args, special_handling)
+    # special_handling: None or function to handle special cases
+    predicate_mappings = [
+        # isInSpace -> artifactIsInSpace (domain uses artifactIsInSpace, not isInSpace)
+        (r'\(isInSpace\s+(\w+)\s+(\w+)\)', 'artifactIsInSpace', 2, None),
+        
+        # isOnTopOf -> isOntopOf (domain uses isOntopOf, not isOnTopOf)
+        (r'\(isOnTopOf\s+(\w+)\s+(\w+)\)', 'isOntopOf', 2, None),
+        (r'\(isOnTop\s+(\w+)\)', 'isON', 1, None),  # isOnTop -> isON (common typo)
+        
+        # Standard predicates with case-insensitive matching
+        (r'\(isON\s+(\w+)\)', 'isON', 1, None),
+        (r'\(isOpen\s+(\w+)\)', 'isOpen', 1, None),
+        (r'\(isHeldBy\s+(\w+)\s+(\w+)\)', 'isHeldBy', 2, None),
+        (r'\(isInsideOf\s+(\w+)\s+(\w+)\)', 'isInsideOf', 2, None),
+        (r'\(isOntopOf\s+(\w+)\s+(\w+)\)', 'isOntopOf', 2, None),
+        (r'\(robotIsInSpace\s+(\w+)\s+(\w+)\)', 'robotIsInSpace', 2, None),
+        (r'\(artifactIsOnFloorOf\s+(\w+)\s+(\w+)\)', 'artifactIsOnFloorOf', 2, None),
+        (r'\(artifactIsInSpace\s+(\w+)\s+(\w+)\)', 'artifactIsInSpace', 2, None),
+        (r'\(isAdjacentTo\s+(\w+)\s+(\w+)\)', 'isAdjacentTo', 2, None),
+        (r'\(isLocked\s+(\w+)\)', 'isLocked', 1, None),
+        (r'\(isOpenDoor\s+(\w+)\)', 'isOpenDoor', 1, None),
+    ]
+    
+    # Apply all predicate mappings with case-insensitive matching
+    for pattern, correct_pred, num_args, special_handler in predicate_mappings:
+        def make_replacer(pred_name, num_args, handler):
+            if handler:
+                return handler
+            elif num_args == 1:
+                def replacer(match):
+                    arg1 = match.group(1)
+                    return f"({pred_name} {arg1})"
+                return replacer
+            elif num_args == 2:
+                def replacer(match):
+                    arg1 = match.group(1)
+                    arg2 = match.group(2)
+                    return f"({pred_name} {arg1} {arg2})"
+                return replacer
+            else:
+                return lambda m: m.group(0)  # No change
+        
+        replacer = make_replacer(correct_pred, num_args, special_handler)
+        # Use case-insensitive matching to handle all case variations
+        goal_formula = re.sub(pattern, replacer, goal_formula, flags=re.IGNORECASE)
+    
+    # Convert isClosed to (not (isOpen ...))
+    # Pattern: (isClosed artifact_id) -> (not (isOpen artifact_id))
+    def replace_isclosed(match):
+        artifact_id = match.group(1)
+        return f"(not (isOpen {artifact_id}))"
+    
+    # Match (isClosed artifact_id) - case-insensitive
+    goal_formula = re.sub(r'\(isClosed\s+(\w+)\)', replace_isclosed, goal_formula, flags=re.IGNORECASE)
+    
+    # Fix: not (predicate) -> (not (predicate))
+    # This handles cases like: (and ... not (predicate)) -> (and ... (not (predicate)))
+    # Pattern: "not (" that is not already wrapped in parentheses
+    # We need to match "not (" followed by a complete predicate and wrap it
+    
+    # Simple approach: find "not (" that's not already "(not ("
+    # and wrap the entire predicate including parentheses
+    def fix_not_syntax(text):
+        # Find "not (" patterns and wrap them
+        # Match: whitespace or opening paren, then "not ", then opening paren
+        # But not if it's already "(not ("
+        result = []
+        i = 0
+        while i < len(text):
+            # Look for "not (" pattern
+            if i + 4 < len(text) and text[i:i+5] == "not (":
+                # Check if it's already wrapped (look back one char)
+                if i == 0 or text[i-1] != '(':
+                    # Find matching closing paren for the predicate
+                    depth = 1
+                    j = i + 5  # Start after "not ("
+                    while j < len(text) and depth > 0:
+                        if text[j] == '(':
+                            depth += 1
+                        elif text[j] == ')':
+                            depth -= 1
+                        j += 1
+                    
+                    if depth == 0:
+                        # Found complete predicate, wrap "not (predicate)" with parentheses
+                        result.append("(not ")
+                        result.append(text[i+4:j])  # "(" + predicate content + ")"
+                        result.append(")")
+                        i = j
+                        continue
+            
+            result.append(text[i])
+            i += 1
+        
+        return ''.join(result)
+    
+    goal_formula = fix_not_syntax(goal_formula)
+    
+    return goal_formula
@@ -4,17 +4,36 @@
 import re
 from typing import List, Set, Tuple, Dict
 
+try:
+    from .pddl_goal_ast import (
+        GoalParseError,
+        parse_goal,
+        collect_identifiers,
+        collect_affordance_requirements
+    )
+except ImportError:  # run as a script (python pddl/scripts/pddl_goal_utils.py)
+    from pddl_goal_ast import (
+        GoalParseError,
+        parse_goal,
+        collect_identifiers,
+        collect_affordance_requirements
+    )
+
+GOAL_KEYWORDS = {
+    'and', 'or', 'not', 'forall', 'exists', 'when', 'imply',
+    'either', 'increase', 'decrease', 'assign'
+}
+_IDENTIFIER_PATTERN = re.compile(r'\b([a-zA-Z][a-zA-Z0-9_-]*)\b')
 
-def extract_identifiers_from_goal(goal_formula: str) -> Set[str]:
-    """Extract all potential identifiers from PDDL goal formula."""
-    keywords = {
-        'and', 'or', 'not', 'forall', 'exists', 'when', 'imply',
-        'either', 'increase', 'decrease', 'assign'
-    }
 
-    pattern = r'\b([a-zA-Z][a-zA-Z0-9_-]*)\b'
-    identifiers = re.findall(pattern, goal_formula)
-    return {id for id in identifiers if id.lower() not in keywords}
+def extract_identifiers_from_goal(goal_formula: str) -> Set[str]:
+    """Extract all potential identifiers (predicate arguments) from PDDL goal formula."""
+    try:
+        return collect_identifiers(parse_goal(goal_formula, normalize=False))
+    except GoalParseError:
+        # Malformed goal: fall back to scanning every word
+        identifiers = _IDENTIFIER_PATTERN.findall(goal_formula)
+        return {id for id in identifiers if id.lower() not in GOAL_KEYWORDS}
 
 
 def filter_valid_object_ids(identifiers: Set[str], driver) -> List[str]:
@@ -32,9 +51,11 @@ def filter_valid_object_ids(identifiers: Set[str], driver) -> List[str]:
         return [record["id"] for record in result]
 
 
-def extract_object_ids_from_goal(goal_formula: str, driver) -> List[str]:
-    """Extract valid object IDs from PDDL goal formula."""
+def extract_object_ids_from_goal(goal_formula: str, driver, object_index=None) -> List[str]:
+    """Extract valid object IDs from PDDL goal formula (index lookup when object_index is given)."""
     identifiers = extract_identifiers_from_goal(goal_formula)
+    if object_index is not None:
+        return object_index.filter_valid_ids(identifiers)
     return filter_valid_object_ids(identifiers, driver)
 
 
@@ -80,33 +101,20 @@ def validate_goal_affordances(
     warnings = []
     artifacts_with_issues = []
     
-    # Map predicates to required affordances
-    predicate_to_affordance = {
-        'isON': 'Affordance_Power',
-        'isOpen': 'Affordance_Open',
-        # Add more mappings as needed
-    }
-    
-    # Extract predicates from goal formula
-    predicate_pattern = r'\((\w+)\s+([^)]+)\)'
-    matches = re.findall(predicate_pattern, goal_formula)
-    
-    for predicate, args in matches:
-        required_affordance = predicate_to_affordance.get(predicate)
-        if not required_affordance:
-            continue
-            
-        # Extract artifact IDs from arguments
-        arg_ids = args.split()
-        for arg_id in arg_ids:
-            arg_id = arg_id.strip()
-            if arg_id in artifact_ids:
-                artifact_affordances = affordances_map.get(arg_id, [])
-                if required_affordance not in artifact_affordances:
-                    warning = f"Artifact '{arg_id}' needs '{required_affordance}' for predicate '{predicate}' but only has: {artifact_affordances}"
-                    warnings.append(warning)
-                    if arg_id not in artifacts_with_issues:
-                        artifacts_with_issues.append(arg_id)
+    # Atoms whose arguments need an affordance (isON -> Affordance_Power, isOpen -> Affordance_Open)
+    try:
+        requirements = collect_affordance_requirements(parse_goal(goal_formula, normalize=False))
+    except GoalParseError:
+        requirements = []
+
+    for predicate, arg_id, required_affordance in requirements:
+        if arg_id in artifact_ids:
+            artifact_affordances = affordances_map.get(arg_id, [])
+            if required_affordance not in artifact_affordances:
+                warning = f"Artifact '{arg_id}' needs '{required_affordance}' for predicate '{predicate}' but only has: {artifact_affordances}"
+                warnings.append(warning)
+                if arg_id not in artifacts_with_issues:
+                    artifacts_with_issues.append(arg_id)
     
     validation = {
         "has_issues": len(warnings) > 0,
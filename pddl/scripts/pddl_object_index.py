@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""PDDL Object Index - In-process ID/type/affordance lookup, reloaded after world writes."""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .pddl_generator import PDDLGenerator
+except ImportError:  # run as a script (python pddl/scripts/pddl_object_index.py)
+    from pddl_generator import PDDLGenerator
+
+
+def known_bookmarks() -> Tuple[str, ...]:
+    """Neo4j bookmarks of the world writes this process knows about (see core.neo4j_pool)."""
+    try:
+        from ontology_server.core.neo4j_pool import current_bookmarks
+    except ImportError:  # pddl scripts run without the ontology server package
+        return ()
+    return tuple(current_bookmarks())
+
+
+class ObjectIndex:
+    """
+    Snapshot of every individual's ID, domain type and affordances.
+
+    Loaded with a single query and reused until this process learns of a
+    new world write: every sync returns Neo4j bookmarks, which OntologyClient
+    and the pool's write helpers note in core.neo4j_pool. Checking for
+    staleness is a local comparison and goal validation is set/dict
+    lookups, so planning makes no Neo4j calls while the world is unchanged.
+    Writes made by other processes are not seen; call invalidate() after them.
+    """
+
+    def __init__(self, driver, domain_parser):
+        """
+        Initialize empty index.
+
+        Args:
+            driver: Neo4j driver instance
+            domain_parser: PDDLDomainParser instance (for type resolution)
+        """
+        self.driver = driver
+        self.parser = domain_parser
+        self.version = None
+        self.bookmarks: Optional[Tuple[str, ...]] = None
+        self._loaded = False
+        self.ids: Set[str] = set()
+        self.types: Dict[str, str] = {}
+        self.affordances: Dict[str, List[str]] = {}
+        self.stats = {
+            "loads": 0,
+            "lookups": 0,
+            "misses": 0,
+        }
+
+    def current_version(self) -> Optional[str]:
+        """Read the world version stamped by the last sync (None if never stamped)."""
+        with self.driver.session() as session:
+            record = session.run("""
+                MATCH (m:WorldMeta {id: 'world'})
+                RETURN m.version AS version
+            """).single()
+            return record["version"] if record else None
+
+    def load(self):
+        """Load all individuals (IDs, types, affordances) in one query."""
+        bookmarks = known_bookmarks()
+        version = self.current_version()
+        resolver = PDDLGenerator(self.driver, self.parser)
+        ids, types, affordances = set(), {}, {}
+
+        with self.driver.session() as session:
+            result = session.run("""
+                MATCH (n:Individual)
+                OPTIONAL MATCH (n)-[:INSTANCE_OF]->(c:Class)
+                WITH n, collect(DISTINCT c.name) AS class_names
+                OPTIONAL MATCH (n)-[:affords]->(aff:Individual)
+                RETURN n.id AS id,
+                       labels(n) AS node_labels,
+                       class_names,
+                       collect(DISTINCT aff.id) AS affordance_ids
+            """)
+
+            for record in result:
+                obj_id = record["id"]
+                if not obj_id:
+                    continue
+                ids.add(obj_id)
+                class_names = record["class_names"] or []
+                domain_type = resolver.resolve_domain_type(record["node_labels"] or [], class_names)
+                if domain_type:
+                    types[obj_id] = domain_type
+                if record["affordance_ids"] and "Artifact" in class_names:
+                    affordances[obj_id] = record["affordance_ids"]
+
+        self.ids, self.types, self.affordances = ids, types, affordances
+        self.version, self.bookmarks = version, bookmarks
+        self._loaded = True
+        self.stats["loads"] += 1
+        print(f"  ✓ Object index loaded: {len(ids)} individuals (world version {version})")
+
+    def refresh_if_stale(self) -> bool:
+        """Reload if a world write was noted since the last load. Returns True if reloaded."""
+        if self._loaded and known_bookmarks() == self.bookmarks:
+            return False
+        self.load()
+        return True
+
+    def invalidate(self):
+        """Force a reload on the next refresh_if_stale()."""
+        self._loaded = False
+
+    def contains_all(self, ids: Iterable[str]) -> bool:
+        """Check whether every ID is in the index."""
+        return self.ids.issuperset(ids)
+
+    def filter_valid_ids(self, identifiers: Iterable[str]) -> List[str]:
+        """Keep identifiers that are known individuals (misses are invalid, not looked up)."""
+        self.stats["lookups"] += 1
+        identifiers = set(identifiers)
+        valid = identifiers & self.ids
+        self.stats["misses"] += len(identifiers) - len(valid)
+        return sorted(valid)
+
+    def get_types(self, ids: Iterable[str]) -> Dict[str, str]:
+        """Domain types for the given IDs (unknown IDs omitted)."""
+        return {obj_id: self.types[obj_id] for obj_id in ids if obj_id in self.types}
+
+    def get_affordances(self, ids: Iterable[str]) -> Dict[str, List[str]]:
+        """Affordances for the given artifact IDs (artifacts without affordances omitted)."""
+        return {obj_id: list(self.affordances[obj_id]) for obj_id in ids if obj_id in self.affordances}
+
+
+_object_index: Optional[ObjectIndex] = None
+
+
+def get_object_index(driver, domain_parser) -> ObjectIndex:
+    """
+    Get the process-wide object index, reloading it after a noted world write.
+
+    Args:
+        driver: Neo4j driver instance (the index keeps using the latest one)
+        domain_parser: PDDLDomainParser instance
+
+    Returns:
+        Fresh ObjectIndex
+    """
+    global _object_index
+    if _object_index is None:
+        _object_index = ObjectIndex(driver, domain_parser)
+    _object_index.driver = driver
+    _object_index.parser = domain_parser
+    _object_index.refresh_if_stale()
+    return _object_index
@@ -1,26 +1,130 @@
 #!/usr/bin/env python3
-"""PDDL Domain Parser - Extract types and hierarchy from domain.pddl."""
+"""PDDL Domain Parser - Extract types, predicates and action schemas from domain.pddl."""
 
 import re
 from pathlib import Path
-from typing import Dict, Set, List
+from typing import Any, Dict, Set, List, Tuple
+
+_TOKEN_PATTERN = re.compile(r'\(|\)|[^\s()]+')
+_COMMENT_PATTERN = re.compile(r';[^\n]*')
+
+
+def tokenize_sexpr(text: str) -> List[str]:
+    """Split PDDL text into parenthesis and atom tokens (comments removed)."""
+    return _TOKEN_PATTERN.findall(_COMMENT_PATTERN.sub('', text))
+
+
+def parse_sexpr(text: str) -> List[Any]:
+    """
+    Parse PDDL text into nested lists of string atoms.
+
+    Args:
+        text: PDDL text containing one or more s-expressions
+
+    Returns:
+        List of top-level expressions (each a nested list or atom)
+    """
+    stack: List[List[Any]] = [[]]
+    for token in tokenize_sexpr(text):
+        if token == '(':
+            stack.append([])
+        elif token == ')':
+            if len(stack) == 1:
+                raise ValueError("Unbalanced ')' in PDDL text")
+            expr = stack.pop()
+            stack[-1].append(expr)
+        else:
+            stack[-1].append(token)
+    if len(stack) != 1:
+        raise ValueError("Unbalanced '(' in PDDL text")
+    return stack[0]
+
+
+def parse_typed_list(tokens: List[str]) -> List[Tuple[str, str]]:
+    """
+    Parse a typed parameter list such as ['?r', '-', 'Robot', '?a', '?b', '-', 'Artifact'].
+
+    Returns:
+        List of (name, type) tuples; untyped names get type 'object'
+    """
+    typed = []
+    pending = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == '-' and i + 1 < len(tokens):
+            typed.extend((name, tokens[i + 1]) for name in pending)
+            pending = []
+            i += 2
+            continue
+        pending.append(token)
+        i += 1
+    typed.extend((name, 'object') for name in pending)
+    return typed
+
+
+def parse_problem(problem_text: str) -> Dict[str, Any]:
+    """
+    Parse a PDDL problem into objects, init facts, numeric fluents and goal.
+
+    Args:
+        problem_text: Contents of a problem.pddl file
+
+    Returns:
+        Dict with 'name', 'domain', 'objects' (id -> type), 'init' (set of fact
+        tuples such as ('robotIsInSpace', 'robot1', 'kitchen_5')), 'fluents'
+        ((function, args...) -> number) and 'goal' (s-expression)
+    """
+    expressions = parse_sexpr(problem_text)
+    define = next((e for e in expressions if isinstance(e, list) and e and e[0] == 'define'), None)
+    if define is None:
+        raise ValueError("No define block found in problem")
+
+    problem = {"name": None, "domain": None, "objects": {}, "init": set(), "fluents": {}, "goal": None}
+    for section in define[1:]:
+        if not isinstance(section, list) or not section:
+            continue
+        head = section[0]
+        if head == 'problem':
+            problem["name"] = section[1]
+        elif head == ':domain':
+            problem["domain"] = section[1]
+        elif head == ':objects':
+            problem["objects"] = dict(parse_typed_list(section[1:]))
+        elif head == ':init':
+            for fact in section[1:]:
+                if not isinstance(fact, list) or not fact:
+                    continue
+                if fact[0] == '=' and len(fact) == 3:
+                    function = fact[1] if isinstance(fact[1], list) else [fact[1]]
+                    problem["fluents"][tuple(function)] = float(fact[2])
+                else:
+                    problem["init"].add(tuple(fact))
+        elif head == ':goal':
+            problem["goal"] = section[1]
+    return problem
 
 
 class PDDLDomainParser:
-    """Parse PDDL domain file to extract types and hierarchy."""
+    """Parse PDDL domain file to extract types, predicates and action schemas."""
 
     def __init__(self, domain_path: str):
         """Initialize parser with domain file path."""
         self.domain_path = Path(domain_path)
         self.types_hierarchy = {}  # type -> parent_type
         self.all_types = set()
+        self.predicates = {}  # predicate -> [(param, type), ...]
+        self.derived_predicates = {}  # predicate -> {"parameters", "body"}
+        self.actions = {}  # action -> {"parameters", "precondition", "effect"}
         self._parse_domain()
 
     def _parse_domain(self):
-        """Parse domain file and extract types."""
+        """Parse domain file and extract types and schemas."""
         with open(self.domain_path, 'r') as f:
             content = f.read()
 
+        self._parse_schemas(content)
+
         types_match = re.search(r'\(:types\s+(.*?)\)', content, re.DOTALL)
         if not types_match:
             print("WARNING: No types section found in domain")
@@ -59,6 +163,61 @@ class PDDLDomainParser:
 
         print(f"Parsed domain types: {sorted(self.all_types)}")
 
+    def _parse_schemas(self, content: str):
+        """Parse :predicates, :derived and :action sections into s-expressions."""
+        try:
+            expressions = parse_sexpr(content)
+        except ValueError as e:
+            print(f"WARNING: Could not parse domain schemas: {e}")
+            return
+
+        define = next((e for e in expressions if isinstance(e, list) and e and e[0] == 'define'), None)
+        if define is None:
+            print("WARNING: No define block found in domain")
+            return
+
+        for section in define[1:]:
+            if not isinstance(section, list) or not section:
+                continue
+            head = section[0]
+
+            if head == ':predicates':
+                for atom in section[1:]:
+                    if isinstance(atom, list) and atom:
+                        self.predicates[atom[0]] = parse_typed_list(atom[1:])
+
+            elif head == ':derived' and len(section) >= 3:
+                signature = section[1]
+                self.derived_predicates[signature[0]] = {
+                    "parameters": parse_typed_list(signature[1:]),
+                    "body": section[2]
+                }
+
+            elif head == ':action' and len(section) >= 2:
+                action = {"parameters": [], "precondition": None, "effect": None}
+                for i in range(2, len(section) - 1, 2):
+                    key = section[i]
+                    value = section[i + 1]
+                    if key == ':parameters':
+                        action["parameters"] = parse_typed_list(value)
+                    elif key == ':precondition':
+                        action["precondition"] = value
+                    elif key == ':effect':
+                        action["effect"] = value
+                self.actions[section[1]] = action
+
+    def get_predicates(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Get predicate signatures (predicate -> [(param, type), ...])."""
+        return self.predicates
+
+    def get_derived_predicates(self) -> Dict[str, Dict[str, Any]]:
+        """Get derived predicate definitions (predicate -> parameters, body)."""
+        return self.derived_predicates
+
+    def get_actions(self) -> Dict[str, Dict[str, Any]]:
+        """Get action schemas (action -> parameters, precondition, effect)."""
+        return self.actions
+
     def get_all_types(self) -> Set[str]:
         """Get all types defined in domain."""
         return self.all_types
@@ -151,3 +310,10 @@ if __name__ == "__main__":
     for classes in test_cases:
         result = parser.map_class_to_domain_type(classes)
         print(f"  {classes} -> {result}")
+
+    print(f"\nPredicates: {len(parser.get_predicates())}")
+    print(f"Derived predicates: {sorted(parser.get_derived_predicates())}")
+    print(f"Actions:")
+    for name, schema in parser.get_actions().items():
+        params = ' '.join(f"{p} - {t}" for p, t in schema['parameters'])
+        print(f"  {name} ({params})")
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""PDDL Relevance Analysis - Prune problem objects and facts not needed for the goal."""
+
+import itertools
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+try:
+    from .pddl_parser import PDDLDomainParser
+    from .pddl_goal_ast import parse_goal, iter_literals
+except ImportError:  # run as a script (python pddl/scripts/pddl_relevance.py)
+    from pddl_parser import PDDLDomainParser
+    from pddl_goal_ast import parse_goal, iter_literals
+
+
+# Literal: (predicate, args, positive)
+Literal = Tuple[str, Tuple[str, ...], bool]
+
+# Neo4j location relationship -> PDDL init predicate (see PDDLWriter)
+ARTIFACT_LOCATION_PREDICATES = {
+    "isInSpace": "artifactIsOnFloorOf",
+    "isInsideOf": "isInsideOf",
+    "isOntopOf": "isOntopOf",
+}
+
+LOCATION_TYPES = {"Location", "Space", "Door", "Stairs", "Opening"}
+
+QUANTIFIERS = {"exists", "forall"}
+
+
+class RelevanceAnalyzer:
+    """
+    Backward relevance analysis over the action schemas of a PDDL domain.
+
+    Starting from the goal literals, actions that can achieve a relevant
+    literal make their preconditions relevant (derived predicates are
+    expanded into their bodies) until a fixpoint is reached. The relevant
+    literals then decide which init facts and objects the problem needs.
+    """
+
+    def __init__(self, domain_parser: PDDLDomainParser):
+        """
+        Initialize analyzer with a parsed domain.
+
+        Args:
+            domain_parser: PDDLDomainParser with action schemas loaded
+        """
+        self.domain_parser = domain_parser
+        self.derived = domain_parser.get_derived_predicates()
+        self._fresh = itertools.count()
+
+        # Per-action literal tables (computed once per domain)
+        self.action_tables = {}
+        for name, schema in domain_parser.get_actions().items():
+            params = [p for p, _ in schema["parameters"]]
+            preconditions = []
+            effects = []
+            self._collect_literals(schema["precondition"], True, preconditions)
+            self._collect_effects(schema["effect"], [], effects)
+            self.action_tables[name] = {
+                "parameters": params,
+                "preconditions": self._expand_derived(preconditions),
+                "effects": [
+                    (pred, args, positive, self._expand_derived(guard))
+                    for pred, args, positive, guard in effects
+                ],
+                "effect_params": {a for _, args, _, _ in effects for a in args} & set(params),
+            }
+
+    # ------------------------------------------------------------------
+    # Schema walking
+    # ------------------------------------------------------------------
+
+    def _collect_literals(self, expr: Any, positive: bool, out: List[Literal]):
+        """Flatten a condition into literals with polarity (over-approximation)."""
+        if not isinstance(expr, list) or not expr:
+            return
+        head = expr[0]
+        if head in ("and", "or"):
+            for sub in expr[1:]:
+                self._collect_literals(sub, positive, out)
+        elif head == "not":
+            self._collect_literals(expr[1], not positive, out)
+        elif head == "imply":
+            self._collect_literals(expr[1], not positive, out)
+            self._collect_literals(expr[2], positive, out)
+        elif head in QUANTIFIERS:
+            self._collect_literals(expr[2], positive, out)
+        elif head == "=":
+            return
+        else:
+            out.append((head, tuple(a for a in expr[1:] if isinstance(a, str)), positive))
+
+    def _collect_effects(self, expr: Any, guard: List[Literal], out: List[Tuple]):
+        """Collect (predicate, args, is_add, guard literals) for each effect atom."""
+        if not isinstance(expr, list) or not expr:
+            return
+        head = expr[0]
+        if head == "and":
+            for sub in expr[1:]:
+                self._collect_effects(sub, guard, out)
+        elif head == "forall":
+            self._collect_effects(expr[2], guard, out)
+        elif head == "when":
+            condition = list(guard)
+            self._collect_literals(expr[1], True, condition)
+            self._collect_effects(expr[2], condition, out)
+        elif head == "not":
+            atom = expr[1]
+            out.append((atom[0], tuple(atom[1:]), False, guard))
+        elif head in ("increase", "decrease", "assign"):
+            return
+        else:
+            out.append((head, tuple(expr[1:]), True, guard))
+
+    def _expand_derived(self, literals: List[Literal]) -> List[Literal]:
+        """Replace derived literals by their (variable-substituted) body literals."""
+        expanded = []
+        seen = set()
+        stack = list(literals)
+        while stack:
+            pred, args, positive = stack.pop()
+            if pred not in self.derived:
+                expanded.append((pred, args, positive))
+                continue
+            # Fresh variables are interchangeable, so recursion stops on them
+            key = (pred, tuple("?#" if "#" in a else a for a in args), positive)
+            if key in seen:
+                continue  # recursive derived predicate (e.g. artifactIsInSpace)
+            seen.add(key)
+            definition = self.derived[pred]
+            binding = {p: a for (p, _), a in zip(definition["parameters"], args)}
+            body = []
+            self._collect_literals(definition["body"], positive, body)
+            for body_pred, body_args, body_positive in body:
+                # Quantified variables get fresh names so they never alias action parameters
+                for a in body_args:
+                    if a.startswith("?") and a not in binding:
+                        binding[a] = f"{a}#{next(self._fresh)}"
+                renamed = tuple(binding.get(a, a) for a in body_args)
+                stack.append((body_pred, renamed, body_positive))
+        return expanded
+
+    # ------------------------------------------------------------------
+    # Predicate-level relevance
+    # ------------------------------------------------------------------
+
+    def goal_literals(self, goal_formula: str) -> List[Literal]:
+        """Extract goal literals (derived predicates expanded)."""
+        literals = [(atom.predicate, atom.args, positive)
+                    for atom, positive in iter_literals(parse_goal(goal_formula, normalize=False))]
+        return self._expand_derived(literals)
+
+    def relevant_literals(self, goal_formula: str) -> Tuple[Set[Tuple[str, bool]], Set[str]]:
+        """
+        Backchain from the goal through action schemas.
+
+        Returns:
+            Tuple of (relevant (predicate, polarity) pairs, relevant action names)
+        """
+        relevant = {(pred, positive) for pred, _, positive in self.goal_literals(goal_formula)}
+        relevant_actions = set()
+
+        changed = True
+        while changed:
+            changed = False
+            for name, table in self.action_tables.items():
+                if name in relevant_actions:
+                    continue
+                achieving = [guard for pred, _, is_add, guard in table["effects"]
+                             if (pred, is_add) in relevant]
+                if not achieving:
+                    continue
+                relevant_actions.add(name)
+                # Conditional effect guards only matter for effects that achieve something
+                needed = list(table["preconditions"])
+                for guard in achieving:
+                    needed.extend(guard)
+                for pred, _, positive in needed:
+                    relevant.add((pred, positive))
+                changed = True
+
+        return relevant, relevant_actions
+
+    def pull_rules(self, relevant_actions: Set[str]) -> Set[Tuple[str, int, int]]:
+        """
+        Derive object pull rules (predicate, from_pos, to_pos) from relevant actions.
+
+        If an action changes the object bound at ``from_pos`` and its precondition
+        mentions another object at ``to_pos`` of the same atom, that other object
+        is needed whenever the first one is (container of an item, key of a safe,
+        item stacked on top of something to be picked, location of an artifact).
+        """
+        rules = set()
+        for name in relevant_actions:
+            table = self.action_tables[name]
+            effect_params = table["effect_params"]
+            conditions = list(table["preconditions"])
+            for _, _, _, guard in table["effects"]:
+                conditions.extend(guard)
+            for pred, args, _ in conditions:
+                for i, j in itertools.permutations(range(len(args)), 2):
+                    if args[i] in effect_params and args[j] not in effect_params:
+                        rules.add((pred, i, j))
+        return rules
+
+    # ------------------------------------------------------------------
+    # Problem pruning
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def collect_init_facts(
+        topology: Dict[str, Any],
+        robot_info: Dict[str, Any],
+        artifact_locs: Dict[str, Dict[str, str]],
+        affordances_map: Dict[str, List[str]],
+        door_states: Dict[str, bool] = None,
+        key_safe_rels: Dict[str, Dict[str, List[str]]] = None
+    ) -> List[Tuple[str, Tuple[str, ...]]]:
+        """Flatten problem data into init facts, mirroring what PDDLWriter emits."""
+        facts = []
+        for from_id, to_id in topology.get("connections", []):
+            facts.append(("hasPathTo", (from_id, to_id)))
+            facts.append(("hasPathTo", (to_id, from_id)))
+        for (from_id, to_id) in topology.get("distances", {}):
+            facts.append(("distance", (from_id, to_id)))
+
+        robot_id = robot_info["robot_id"]
+        for hand_id in robot_info.get("hands", []):
+            facts.append(("hasHand", (robot_id, hand_id)))
+        if robot_info.get("location"):
+            facts.append(("robotIsInSpace", (robot_id, robot_info["location"])))
+
+        for artifact_id, loc_info in artifact_locs.items():
+            for rel, pred in ARTIFACT_LOCATION_PREDICATES.items():
+                if rel in loc_info:
+                    facts.append((pred, (artifact_id, loc_info[rel])))
+
+        for artifact_id, affordances in affordances_map.items():
+            for affordance_id in affordances:
+                facts.append((affordance_id, (artifact_id,)))
+
+        for door_id, is_open in (door_states or {}).items():
+            if is_open:
+                facts.append(("isOpenDoor", (door_id,)))
+
+        if key_safe_rels:
+            for key_id, safe_ids in key_safe_rels.get("unlocks", {}).items():
+                for safe_id in safe_ids:
+                    facts.append(("unlocks", (key_id, safe_id)))
+            for safe_id, key_ids in key_safe_rels.get("requiresKey", {}).items():
+                for key_id in key_ids:
+                    facts.append(("hasRequiredKey", (safe_id, key_id)))
+                facts.append(("isLocked", (safe_id,)))
+
+        return facts
+
+    def prune_problem(
+        self,
+        goal_formula: str,
+        types_map: Dict[str, str],
+        topology: Dict[str, Any],
+        robot_info: Dict[str, Any],
+        artifact_locs: Dict[str, Dict[str, str]],
+        affordances_map: Dict[str, List[str]],
+        door_states: Dict[str, bool] = None,
+        key_safe_rels: Dict[str, Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute the relevant object/fact subset and return pruned problem data.
+
+        Args:
+            goal_formula: Normalized PDDL goal formula
+            types_map: Object ID -> domain type
+            topology: Dict with 'connections' and 'distances'
+            robot_info: Dict with robot_id, hands, location
+            artifact_locs: Artifact location data
+            affordances_map: Artifact ID -> affordance predicates
+            door_states: Door ID -> isOpenDoor
+            key_safe_rels: Dict with 'unlocks' and 'requiresKey'
+
+        Returns:
+            Dict with pruned 'types_map', 'topology', 'robot_info', 'artifact_locs',
+            'affordances_map', 'door_states', 'key_safe_rels' and 'stats'
+        """
+        door_states = door_states or {}
+        key_safe_rels = key_safe_rels or {}
+
+        relevant, relevant_actions = self.relevant_literals(goal_formula)
+        relevant_preds = {pred for pred, _ in relevant}
+        rules = self.pull_rules(relevant_actions)
+
+        facts_before = self.collect_init_facts(
+            topology, robot_info, artifact_locs, affordances_map, door_states, key_safe_rels
+        )
+
+        # Seed: goal objects, robot (+ its location and hands when hands matter)
+        goal_objects = {a for _, args, _ in self.goal_literals(goal_formula)
+                        for a in args if not a.startswith("?")}
+        robot_id = robot_info["robot_id"]
+        needed = set(goal_objects) | {robot_id}
+        if robot_info.get("location"):
+            needed.add(robot_info["location"])
+        if "hasHand" in relevant_preds:
+            needed.update(robot_info.get("hands", []))
+
+        # Object closure over init facts using schema-derived pull rules
+        rules_by_pred: Dict[str, List[Tuple[int, int]]] = {}
+        for pred, i, j in rules:
+            rules_by_pred.setdefault(pred, []).append((i, j))
+        changed = True
+        while changed:
+            changed = False
+            for pred, args in facts_before:
+                if pred not in relevant_preds:
+                    continue
+                for i, j in rules_by_pred.get(pred, []):
+                    if j < len(args) and args[i] in needed and args[j] not in needed:
+                        needed.add(args[j])
+                        changed = True
+
+        # Keep path locations between needed locations; trim dead-end branches
+        locations = {obj_id for obj_id, obj_type in types_map.items() if obj_type in LOCATION_TYPES}
+        kept_locations = self._prune_topology(locations, needed, topology, "hasPathTo" in relevant_preds)
+        needed |= kept_locations
+
+        pruned_types = {obj_id: obj_type for obj_id, obj_type in types_map.items() if obj_id in needed}
+        kept = set(pruned_types)
+
+        pruned_topology = {
+            "connections": [(a, b) for a, b in topology.get("connections", [])
+                            if a in kept and b in kept and "hasPathTo" in relevant_preds],
+            "distances": {(a, b): d for (a, b), d in topology.get("distances", {}).items()
+                          if a in kept and b in kept and "move" in relevant_actions},
+        }
+        pruned_robot = dict(robot_info)
+        if "hasHand" not in relevant_preds:
+            pruned_robot["hands"] = []
+
+        pruned_locs = {}
+        for artifact_id, loc_info in artifact_locs.items():
+            if artifact_id not in kept:
+                continue
+            info = {rel: target for rel, target in loc_info.items()
+                    if ARTIFACT_LOCATION_PREDICATES.get(rel) in relevant_preds and target in kept}
+            if info:
+                pruned_locs[artifact_id] = info
+
+        pruned_affordances = {}
+        for artifact_id, affordances in affordances_map.items():
+            if artifact_id not in kept:
+                continue
+            relevant_affs = [a for a in affordances if a in relevant_preds]
+            if relevant_affs:
+                pruned_affordances[artifact_id] = relevant_affs
+
+        pruned_doors = {door_id: is_open for door_id, is_open in door_states.items()
+                        if door_id in kept and "isOpenDoor" in relevant_preds}
+
+        pruned_key_safe = {"unlocks": {}, "requiresKey": {}}
+        if "isLocked" in relevant_preds:
+            for key_id, safe_ids in key_safe_rels.get("unlocks", {}).items():
+                safes = [s for s in safe_ids if key_id in kept and s in kept]
+                if safes:
+                    pruned_key_safe["unlocks"][key_id] = safes
+            for safe_id, key_ids in key_safe_rels.get("requiresKey", {}).items():
+                if safe_id not in kept:
+                    continue
+                pruned_key_safe["requiresKey"][safe_id] = [k for k in key_ids if k in kept]
+
+        facts_after = self.collect_init_facts(
+            pruned_topology, pruned_robot, pruned_locs, pruned_affordances, pruned_doors, pruned_key_safe
+        )
+
+        stats = {
+            "relevant_actions": sorted(relevant_actions),
+            "relevant_predicates": sorted(relevant_preds),
+            "objects_before": len(types_map),
+            "objects_after": len(pruned_types),
+            "objects_pruned": len(types_map) - len(pruned_types),
+            "facts_before": len(facts_before),
+            "facts_after": len(facts_after),
+            "facts_pruned": len(facts_before) - len(facts_after),
+            "pruned_object_ids": sorted(set(types_map) - kept),
+        }
+
+        return {
+            "types_map": pruned_types,
+            "topology": pruned_topology,
+            "robot_info": pruned_robot,
+            "artifact_locs": pruned_locs,
+            "affordances_map": pruned_affordances,
+            "door_states": pruned_doors,
+            "key_safe_rels": pruned_key_safe if any(pruned_key_safe.values()) else None,
+            "stats": stats,
+        }
+
+    @staticmethod
+    def _prune_topology(locations: Set[str], needed: Set[str],
+                        topology: Dict[str, Any], movement_relevant: bool) -> Set[str]:
+        """
+        Keep needed locations plus path locations that connect them.
+
+        Non-needed locations are removed if they are unreachable from a needed
+        location or are dead ends (degree <= 1), repeated until stable.
+        """
+        required = locations & needed
+        if not movement_relevant:
+            return required
+
+        adjacency: Dict[str, Set[str]] = {loc: set() for loc in locations}
+        for a, b in topology.get("connections", []):
+            if a in adjacency and b in adjacency and a != b:
+                adjacency[a].add(b)
+                adjacency[b].add(a)
+
+        # Reachability from needed locations
+        reachable = set(required)
+        frontier = list(required)
+        while frontier:
+            loc = frontier.pop()
+            for neighbor in adjacency.get(loc, ()):
+                if neighbor not in reachable:
+                    reachable.add(neighbor)
+                    frontier.append(neighbor)
+        for loc in locations - reachable:
+            for neighbor in adjacency.pop(loc, set()):
+                if neighbor in adjacency:
+                    adjacency[neighbor].discard(loc)
+
+        # Iteratively trim dead-end branches that lead nowhere needed
+        leaves = [loc for loc, nbrs in adjacency.items() if len(nbrs) <= 1 and loc not in required]
+        while leaves:
+            loc = leaves.pop()
+            if loc not in adjacency:
+                continue
+            for neighbor in adjacency.pop(loc):
+                nbrs = adjacency.get(neighbor)
+                if nbrs is None:
+                    continue
+                nbrs.discard(loc)
+                if len(nbrs) <= 1 and neighbor not in required:
+                    leaves.append(neighbor)
+
+        return set(adjacency) | required
+
+
+if __name__ == "__main__":
+    # Test relevance analysis on the project domain
+    domain_path = Path(__file__).parent.parent / "domain.pddl"
+    analyzer = RelevanceAnalyzer(PDDLDomainParser(domain_path))
+
+    print("\n" + "=" * 60)
+    print("PDDL Relevance Analysis Test")
+    print("=" * 60)
+
+    types_map = {
+        "robot1": "Robot", "left_hand": "Hand", "right_hand": "Hand",
+        "room1": "Space", "door1": "Door", "room2": "Space", "closet3": "Space",
+        "safe1": "Artifact", "key1": "Artifact", "tv1": "Artifact", "chair1": "Artifact",
+    }
+    topology = {
+        "connections": [("room1", "door1"), ("door1", "room2"), ("room2", "closet3")],
+        "distances": {("room1", "room2"): 4, ("room2", "room1"): 4,
+                      ("room2", "closet3"): 2, ("closet3", "room2"): 2},
+    }
+    robot_info = {"robot_id": "robot1", "hands": ["left_hand", "right_hand"], "location": "room1"}
+    artifact_locs = {
+        "safe1": {"isInSpace": "room2"}, "key1": {"isInSpace": "room1"},
+        "tv1": {"isInSpace": "room2"}, "chair1": {"isInSpace": "closet3"},
+    }
+    affordances = {
+        "safe1": ["Affordance_Open", "Affordance_PlaceIn"], "key1": ["Affordance_PickupOneHand"],
+        "tv1": ["Affordance_Power"], "chair1": ["Affordance_Sit", "Affordance_PickupTwoHands"],
+    }
+    door_states = {"door1": True}
+    key_safe_rels = {"unlocks": {"key1": ["safe1"]}, "requiresKey": {"safe1": ["key1"]}}
+
+    for goal in ["(and (isOpen safe1))", "(and (isON tv1))", "(and (robotIsInSpace robot1 room2))"]:
+        result = analyzer.prune_problem(goal, types_map, topology, robot_info, artifact_locs,
+                                        affordances, door_states, key_safe_rels)
+        stats = result["stats"]
+        print(f"\nGoal: {goal}")
+        print(f"  Relevant actions: {stats['relevant_actions']}")
+        print(f"  Objects: {stats['objects_before']} -> {stats['objects_after']} "
+              f"(pruned {stats['pruned_object_ids']})")
+        print(f"  Facts: {stats['facts_before']} -> {stats['facts_after']}")
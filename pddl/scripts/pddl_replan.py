@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""PDDL Incremental Replanner - Patch the last problem with world deltas and reuse valid plan suffixes."""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .pddl_fast_downward import DEFAULT_SEARCH, run_fast_downward
+    from .pddl_parser import PDDLDomainParser, parse_problem
+    from .pddl_simulator import PDDLSimulator, parse_action
+except ImportError:  # run as a script (python pddl/scripts/pddl_replan.py)
+    from pddl_fast_downward import DEFAULT_SEARCH, run_fast_downward
+    from pddl_parser import PDDLDomainParser, parse_problem
+    from pddl_simulator import PDDLSimulator, parse_action
+
+
+def _format_fact(fact: Tuple[str, ...]) -> str:
+    return f"({' '.join(fact)})"
+
+
+def _format_fluent(key: Tuple[str, ...], value: float) -> str:
+    number = int(value) if float(value).is_integer() else value
+    return f"(= ({' '.join(key)}) {number})"
+
+
+def _find_section(text: str, keyword: str) -> Optional[Tuple[int, int]]:
+    """Find the [start, end) span of a top-level "(keyword ...)" section, ignoring comments."""
+    start = text.find(f"({keyword}")
+    if start < 0:
+        return None
+    depth = 0
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if ch == ';':
+            newline = text.find('\n', i)
+            i = len(text) if newline < 0 else newline
+            continue
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                return start, i + 1
+        i += 1
+    return None
+
+
+class IncrementalReplanner:
+    """
+    Keeps the last generated problem and plan, tracks the world delta
+    produced by executed actions, and only calls the planner when the
+    remaining plan suffix no longer reaches the goal.
+
+    Typical execution-monitoring loop:
+        replanner.load(domain_path, problem_path, plan_actions)
+        replanner.observe_executed("(move robot1 a b)")
+        replanner.observe_delta(added=[...], removed=[...])   # unexpected changes
+        result = replanner.replan()   # "reused" or "replanned"
+    """
+
+    def __init__(self, search_cmd: str = DEFAULT_SEARCH, timeout: int = 60):
+        """
+        Initialize empty replanner.
+
+        Args:
+            search_cmd: Fast Downward search configuration used for replanning
+            timeout: Planner timeout in seconds
+        """
+        self.search_cmd = search_cmd
+        self.timeout = timeout
+        self.domain_path: Optional[Path] = None
+        self.problem_path: Optional[Path] = None
+        self.problem_text = ""
+        self.problem: Dict[str, Any] = {}
+        self.simulator: Optional[PDDLSimulator] = None
+        self.state = frozenset()
+        self.remaining: List[str] = []
+        self.executed: List[str] = []
+        self.added = set()
+        self.removed = set()
+        self.replan_count = 0
+        self.stats = {
+            "executed_actions": 0,
+            "external_deltas": 0,
+            "planner_skipped": 0,
+            "planner_calls": 0,
+            "diverged_actions": 0,
+        }
+        self._parsers: Dict[Path, PDDLDomainParser] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.simulator is not None
+
+    def load(self, domain_path: Path, problem_path: Path, plan_actions: List[str]):
+        """
+        Remember a freshly generated problem and its plan.
+
+        Args:
+            domain_path: Path to domain.pddl
+            problem_path: Path to the problem.pddl the plan was computed for
+            plan_actions: Grounded plan actions in order
+        """
+        domain_path, problem_path = Path(domain_path), Path(problem_path)
+        if domain_path not in self._parsers:
+            self._parsers[domain_path] = PDDLDomainParser(domain_path)
+
+        with open(problem_path, 'r') as f:
+            self.problem_text = f.read()
+        self.problem = parse_problem(self.problem_text)
+        self.domain_path = domain_path
+        self.problem_path = problem_path
+        self.simulator = PDDLSimulator(self._parsers[domain_path], self.problem["objects"], self.problem["fluents"])
+        self.state = frozenset(self.problem["init"])
+        self.remaining = list(plan_actions)
+        self.executed = []
+        self.added, self.removed = set(), set()
+        print(f"  ✓ Replanner loaded {problem_path.name}: {len(self.state)} facts, {len(self.remaining)} plan actions")
+
+    def unload(self):
+        """Forget the loaded problem (e.g. a new plan came without one)."""
+        self.problem_path = None
+        self.problem_text = ""
+        self.problem = {}
+        self.simulator = None
+        self.state = frozenset()
+        self.remaining = []
+        self.executed = []
+        self.added, self.removed = set(), set()
+
+    def _record(self, before: frozenset, after: frozenset):
+        """Fold a state change into the delta accumulated since load()."""
+        for fact in after - before:
+            if fact in self.removed:
+                self.removed.discard(fact)
+            else:
+                self.added.add(fact)
+        for fact in before - after:
+            if fact in self.added:
+                self.added.discard(fact)
+            else:
+                self.removed.add(fact)
+
+    def observe_executed(self, action: str):
+        """
+        Apply an executed action's effects to the stored world state.
+
+        The action is popped from the remaining plan if it is the next step;
+        otherwise the execution diverged and the suffix is left for replan()
+        to validate.
+        """
+        name, args = parse_action(action)
+        before = self.state
+        self.state, _ = self.simulator.apply(before, name, args, check=False)
+        self._record(before, self.state)
+        self.executed.append(action)
+        self.stats["executed_actions"] += 1
+
+        if self.remaining and parse_action(self.remaining[0]) == (name, args):
+            self.remaining.pop(0)
+        else:
+            self.stats["diverged_actions"] += 1
+
+    def observe_delta(self, added: Iterable[Tuple[str, ...]] = (), removed: Iterable[Tuple[str, ...]] = ()):
+        """
+        Apply facts changed outside the plan (e.g. perception updates).
+
+        Args:
+            added: Facts as tuples, e.g. ('isOpenDoor', 'door_3')
+            removed: Facts as tuples
+        """
+        before = self.state
+        self.state = frozenset((set(before) - set(map(tuple, removed))) | set(map(tuple, added)))
+        self._record(before, self.state)
+        self.stats["external_deltas"] += 1
+
+    def check_remaining(self) -> Dict[str, Any]:
+        """Simulate the remaining plan from the current state and check the goal."""
+        return self.simulator.simulate(self.state, self.remaining, goal=self.problem["goal"])
+
+    def render_problem(self) -> str:
+        """Problem text with the :init section replaced by the current state (canonical order)."""
+        lines = ["(:init"]
+        lines.extend(f"    {_format_fact(fact)}" for fact in sorted(self.state))
+        lines.extend(f"    {_format_fluent(key, value)}" for key, value in sorted(self.problem["fluents"].items()))
+        lines.append("  )")
+        span = _find_section(self.problem_text, ":init")
+        if span is None:
+            raise ValueError("Problem has no :init section")
+        start, end = span
+        return self.problem_text[:start] + "\n".join(lines) + self.problem_text[end:]
+
+    def write_problem(self, path: Path) -> Path:
+        """Write the patched problem to path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(self.render_problem())
+        return path
+
+    def replan(self, output_dir: Optional[Path] = None, force: bool = False) -> Dict[str, Any]:
+        """
+        Return a plan for the current state, calling the planner only if needed.
+
+        Args:
+            output_dir: Where to write the patched problem and new plan
+                (default: replan_<n>/ next to the loaded problem)
+            force: Always call the planner
+
+        Returns:
+            Dict with 'status' ("reused", "replanned", "goal_reached" or
+            "failed"), 'actions' and the simulation/planner details
+        """
+        if not self.is_loaded:
+            return {"status": "failed", "actions": [], "error": "No problem loaded"}
+
+        check = self.check_remaining()
+        if check["valid"] and not force:
+            self.stats["planner_skipped"] += 1
+            status = "goal_reached" if not self.remaining else "reused"
+            print(f"  ✓ Remaining plan still valid ({len(self.remaining)} actions), planner skipped")
+            return {"status": status, "actions": list(self.remaining), "cost": check["cost"]}
+
+        if not check["valid"]:
+            print(f"  ⚠️  Remaining plan invalid at step {check['failed_index']}: {check['reason']}")
+
+        self.replan_count += 1
+        if output_dir is None:
+            output_dir = self.problem_path.parent / f"replan_{self.replan_count}"
+        output_dir = Path(output_dir)
+        problem_path = self.write_problem(output_dir / "problem.pddl")
+
+        self.stats["planner_calls"] += 1
+        result = run_fast_downward(self.domain_path, problem_path, output_dir, self.search_cmd, self.timeout)
+        result["problem_path"] = str(problem_path)
+        result["invalid_step"] = check["failed_index"]
+        if result["status"] != "success":
+            return result
+
+        self.load(self.domain_path, problem_path, result["actions"])
+        result["status"] = "replanned"
+        return result
+
+    def get_delta(self) -> Dict[str, List[Tuple[str, ...]]]:
+        """Facts added/removed since the loaded problem."""
+        return {"added": sorted(self.added), "removed": sorted(self.removed)}
+
+
+_replanner: Optional[IncrementalReplanner] = None
+
+
+def get_replanner() -> IncrementalReplanner:
+    """Get the process-wide replanner."""
+    global _replanner
+    if _replanner is None:
+        _replanner = IncrementalReplanner()
+    return _replanner
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    domain_path = Path(__file__).parent.parent / "domain.pddl"
+    problem_text = """(define (problem demo)
+  (:domain robot-domain)
+  (:objects
+    robot1 - Robot
+    left_hand right_hand - Hand
+    room1 room2 - Space
+    door1 - Door
+    key1 safe1 - Artifact
+  )
+  (:init
+    ; Topology
+    (hasPathTo room1 door1) (hasPathTo door1 room1)
+    (hasPathTo door1 room2) (hasPathTo room2 door1)
+    (hasHand robot1 left_hand) (hasHand robot1 right_hand)
+    (robotIsInSpace robot1 room1) (isOpenDoor door1)
+    (artifactIsOnFloorOf key1 room1) (artifactIsOnFloorOf safe1 room2)
+    (Affordance_PickupOneHand key1) (Affordance_Open safe1)
+    (unlocks key1 safe1) (hasRequiredKey safe1 key1) (isLocked safe1)
+    (= (distance room1 door1) 2)
+    (= (distance door1 room2) 2)
+  )
+  (:goal (and (isOpen safe1)))
+  (:metric minimize (total-cost))
+)
+"""
+    plan = [
+        "(access robot1 key1 room1)",
+        "(pick-one-hand robot1 left_hand key1)",
+        "(move robot1 room1 door1)",
+        "(move robot1 door1 room2)",
+        "(access robot1 safe1 room2)",
+        "(unlock-safe robot1 safe1 key1)",
+        "(open robot1 safe1)",
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        problem_path = Path(tmp) / "problem.pddl"
+        problem_path.write_text(problem_text)
+
+        replanner = IncrementalReplanner()
+        replanner.load(domain_path, problem_path, plan)
+        for action in plan[:3]:
+            replanner.observe_executed(action)
+        result = replanner.replan()
+        print(f"After 3 actions: {result['status']} ({len(result['actions'])} remaining)")
+        print(f"Delta: {replanner.get_delta()}")
+
+        # Someone closed the door behind the robot's path: suffix no longer valid
+        replanner.observe_delta(removed=[("isOpenDoor", "door1")])
+        check = replanner.check_remaining()
+        print(f"After door closed: valid={check['valid']} (fails at step {check['failed_index']})")
+
+        patched = parse_problem(replanner.render_problem())
+        print(f"Patched :init parses back identically: {frozenset(patched['init']) == replanner.state}")
+        print(f"Fluents preserved: {patched['fluents'] == replanner.problem['fluents']}")
+        print(f"Stats: {replanner.stats}")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""PDDL Simulator - Apply grounded actions to a fact state using domain.pddl schemas."""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+try:
+    from .pddl_parser import PDDLDomainParser, parse_sexpr, parse_typed_list
+except ImportError:  # run as a script (python pddl/scripts/pddl_simulator.py)
+    from pddl_parser import PDDLDomainParser, parse_sexpr, parse_typed_list
+
+
+Fact = Tuple[str, ...]
+State = FrozenSet[Fact]
+
+_ACTION_PATTERN = re.compile(r'\(\s*([^\s()]+)((?:\s+[^\s()]+)*)\s*\)')
+
+
+def parse_action(action: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Parse a grounded plan action such as "(move robot1 corridor_14 door_3)".
+
+    Returns:
+        Tuple of (action_name, args)
+    """
+    match = _ACTION_PATTERN.match(action.strip())
+    if not match:
+        raise ValueError(f"Invalid action format: {action}")
+    return match.group(1).lower(), tuple(match.group(2).split())
+
+
+def _ground(expr: Any, binding: Dict[str, str]) -> str:
+    """Format a condition s-expression with variables replaced by their binding."""
+    if not isinstance(expr, list):
+        return binding.get(expr, expr)
+    return f"({' '.join(_ground(e, binding) for e in expr)})"
+
+
+class _Evaluation:
+    """Condition evaluation over one state (memoizes derived predicates)."""
+
+    def __init__(self, simulator: "PDDLSimulator", state: State):
+        self.simulator = simulator
+        self.state = state
+        self.derived_cache: Dict[Fact, bool] = {}
+        self.in_progress = set()
+
+    def holds(self, expr: Any, binding: Dict[str, str]) -> bool:
+        """Evaluate a condition under a variable binding."""
+        head = expr[0]
+        if head == "and":
+            return all(self.holds(sub, binding) for sub in expr[1:])
+        if head == "or":
+            return any(self.holds(sub, binding) for sub in expr[1:])
+        if head == "not":
+            return not self.holds(expr[1], binding)
+        if head == "imply":
+            return not self.holds(expr[1], binding) or self.holds(expr[2], binding)
+        if head in ("exists", "forall"):
+            check = any if head == "exists" else all
+            return check(self.holds(expr[2], b) for b in self.simulator.bindings(expr[1], binding))
+        args = tuple(binding.get(a, a) for a in expr[1:])
+        if head == "=":
+            return args[0] == args[1]
+        if head in self.simulator.derived:
+            return self.derived(head, args)
+        return (head,) + args in self.state
+
+    def derived(self, predicate: str, args: Tuple[str, ...]) -> bool:
+        """Evaluate a derived predicate (least fixpoint; cycles evaluate to False)."""
+        key = (predicate,) + args
+        if key in self.derived_cache:
+            return self.derived_cache[key]
+        if key in self.in_progress:
+            return False
+        self.in_progress.add(key)
+        definition = self.simulator.derived[predicate]
+        binding = {p: a for (p, _), a in zip(definition["parameters"], args)}
+        value = self.holds(definition["body"], binding)
+        self.in_progress.discard(key)
+        self.derived_cache[key] = value
+        return value
+
+
+class PDDLSimulator:
+    """
+    Forward simulator for grounded plans over domain.pddl action schemas.
+
+    Supports the domain's features: typed parameters, negative and
+    quantified preconditions, derived predicates, conditional effects
+    and total-cost increases.
+    """
+
+    def __init__(self, domain_parser: PDDLDomainParser, objects: Dict[str, str] = None,
+                 fluents: Dict[Tuple[str, ...], float] = None):
+        """
+        Initialize simulator.
+
+        Args:
+            domain_parser: PDDLDomainParser with action schemas loaded
+            objects: Problem objects (id -> type)
+            fluents: Numeric fluents, e.g. ('distance', 'a', 'b') -> 4
+        """
+        self.parser = domain_parser
+        self.actions = domain_parser.get_actions()
+        self.derived = domain_parser.get_derived_predicates()
+        self.fluents = fluents or {}
+        self.set_objects(objects or {})
+
+    def set_objects(self, objects: Dict[str, str]):
+        """Set problem objects and rebuild the per-type object lists."""
+        self.objects = dict(objects)
+        self._objects_by_type: Dict[str, List[str]] = {}
+
+    def objects_of_type(self, type_name: str) -> List[str]:
+        """Objects whose type is type_name or one of its subtypes."""
+        if type_name not in self._objects_by_type:
+            self._objects_by_type[type_name] = sorted(
+                obj_id for obj_id, obj_type in self.objects.items()
+                if type_name == "object" or self.parser.is_subtype_of(obj_type, type_name)
+            )
+        return self._objects_by_type[type_name]
+
+    def bindings(self, params: List[str], binding: Dict[str, str]) -> Iterable[Dict[str, str]]:
+        """Enumerate bindings for a quantifier's typed variable list."""
+        typed = parse_typed_list(params)
+        domains = [self.objects_of_type(t) for _, t in typed]
+
+        def extend(i: int, current: Dict[str, str]):
+            if i == len(typed):
+                yield current
+                return
+            for obj_id in domains[i]:
+                nxt = dict(current)
+                nxt[typed[i][0]] = obj_id
+                yield from extend(i + 1, nxt)
+
+        return extend(0, dict(binding))
+
+    # ------------------------------------------------------------------
+    # Actions
+    # ------------------------------------------------------------------
+
+    def _action_binding(self, name: str, args: Tuple[str, ...]) -> Dict[str, str]:
+        """Bind action parameters to arguments, checking arity and types."""
+        if name not in self.actions:
+            raise ValueError(f"Unknown action: {name}")
+        params = self.actions[name]["parameters"]
+        if len(params) != len(args):
+            raise ValueError(f"Action {name} expects {len(params)} arguments, got {len(args)}")
+        for (param, param_type), arg in zip(params, args):
+            arg_type = self.objects.get(arg)
+            if arg_type is not None and not self.parser.is_subtype_of(arg_type, param_type):
+                raise ValueError(f"Argument {arg} of {name} is {arg_type}, expected {param_type}")
+        return {param: arg for (param, _), arg in zip(params, args)}
+
+    def unsatisfied_conditions(self, state: State, name: str, args: Tuple[str, ...]) -> List[str]:
+        """
+        Grounded top-level precondition conjuncts that do not hold in state.
+
+        Returns:
+            e.g. ["(robotIsInSpace robot1 corridor_14)"]; empty if applicable
+        """
+        binding = self._action_binding(name, args)
+        precondition = self.actions[name]["precondition"]
+        if precondition is None:
+            return []
+        conjuncts = precondition[1:] if precondition[0] == "and" else [precondition]
+        evaluation = _Evaluation(self, state)
+        return [_ground(c, binding) for c in conjuncts if not evaluation.holds(c, binding)]
+
+    def is_applicable(self, state: State, name: str, args: Tuple[str, ...]) -> bool:
+        """Check the action's precondition in state."""
+        binding = self._action_binding(name, args)
+        precondition = self.actions[name]["precondition"]
+        return precondition is None or _Evaluation(self, state).holds(precondition, binding)
+
+    def effects(self, state: State, name: str, args: Tuple[str, ...]) -> Tuple[set, set, float]:
+        """
+        Compute (adds, deletes, cost) of a grounded action in state.
+
+        Conditional effects are evaluated against the state before the action.
+        """
+        binding = self._action_binding(name, args)
+        evaluation = _Evaluation(self, state)
+        adds, deletes = set(), set()
+        cost = [0.0]
+
+        def walk(expr: Any, current: Dict[str, str]):
+            if not isinstance(expr, list) or not expr:
+                return
+            head = expr[0]
+            if head == "and":
+                for sub in expr[1:]:
+                    walk(sub, current)
+            elif head == "forall":
+                for b in self.bindings(expr[1], current):
+                    walk(expr[2], b)
+            elif head == "when":
+                if evaluation.holds(expr[1], current):
+                    walk(expr[2], current)
+            elif head == "not":
+                atom = expr[1]
+                deletes.add((atom[0],) + tuple(current.get(a, a) for a in atom[1:]))
+            elif head == "increase":
+                value = expr[2]
+                if isinstance(value, list):
+                    key = (value[0],) + tuple(current.get(a, a) for a in value[1:])
+                    cost[0] += self.fluents.get(key, 0.0)
+                else:
+                    cost[0] += float(value)
+            elif head in ("decrease", "assign"):
+                return
+            else:
+                adds.add((head,) + tuple(current.get(a, a) for a in expr[1:]))
+
+        walk(self.actions[name]["effect"], binding)
+        return adds, deletes, cost[0]
+
+    def apply(self, state: State, name: str, args: Tuple[str, ...],
+              check: bool = True) -> Tuple[State, float]:
+        """
+        Apply a grounded action (delete effects first, then add effects).
+
+        Raises:
+            ValueError: If check is set and the precondition does not hold
+        """
+        if check and not self.is_applicable(state, name, args):
+            unsatisfied = " ".join(self.unsatisfied_conditions(state, name, args))
+            raise ValueError(f"Precondition of ({name} {' '.join(args)}) does not hold: {unsatisfied}")
+        adds, deletes, cost = self.effects(state, name, args)
+        return frozenset((set(state) - deletes) | adds), cost
+
+    def simulate(self, state: State, plan: List[str], goal: Any = None) -> Dict[str, Any]:
+        """
+        Simulate a plan from state.
+
+        Args:
+            state: Initial fact state
+            plan: Grounded actions, e.g. ["(move robot1 a b)", ...]
+            goal: Optional goal s-expression (or string) checked at the end
+
+        Returns:
+            Dict with 'valid', 'state', 'cost', 'steps', 'failed_index',
+            'failed_action', 'reason' and 'goal_reached'
+        """
+        cost = 0.0
+        for index, action in enumerate(plan):
+            try:
+                name, args = parse_action(action)
+                state, step_cost = self.apply(state, name, args)
+                cost += step_cost
+            except ValueError as e:
+                return {
+                    "valid": False, "state": state, "cost": cost, "steps": index,
+                    "failed_index": index, "failed_action": action, "reason": str(e),
+                    "goal_reached": False
+                }
+
+        goal_reached = None
+        if goal is not None:
+            goal_reached = self.satisfies(state, goal)
+        return {
+            "valid": goal_reached is not False, "state": state, "cost": cost, "steps": len(plan),
+            "failed_index": None, "failed_action": None,
+            "reason": None if goal_reached is not False else "Goal not reached at end of plan",
+            "goal_reached": goal_reached
+        }
+
+    def satisfies(self, state: State, goal: Any) -> bool:
+        """Check a goal (s-expression or PDDL string) in state."""
+        if isinstance(goal, str):
+            goal = parse_sexpr(goal)[0]
+        return _Evaluation(self, state).holds(goal, {})
+
+
+if __name__ == "__main__":
+    # Simulate a small plan on the project domain
+    domain_path = Path(__file__).parent.parent / "domain.pddl"
+    simulator = PDDLSimulator(
+        PDDLDomainParser(domain_path),
+        objects={"robot1": "Robot", "left_hand": "Hand", "right_hand": "Hand",
+                 "room1": "Space", "door1": "Door", "room2": "Space",
+                 "safe1": "Artifact", "key1": "Artifact"},
+        fluents={("distance", "room1", "door1"): 2, ("distance", "door1", "room2"): 2}
+    )
+    init = frozenset({
+        ("hasPathTo", "room1", "door1"), ("hasPathTo", "door1", "room1"),
+        ("hasPathTo", "door1", "room2"), ("hasPathTo", "room2", "door1"),
+        ("hasHand", "robot1", "left_hand"), ("hasHand", "robot1", "right_hand"),
+        ("robotIsInSpace", "robot1", "room1"), ("isOpenDoor", "door1"),
+        ("artifactIsOnFloorOf", "key1", "room1"), ("artifactIsOnFloorOf", "safe1", "room2"),
+        ("Affordance_PickupOneHand", "key1"), ("Affordance_Open", "safe1"),
+        ("unlocks", "key1", "safe1"), ("hasRequiredKey", "safe1", "key1"), ("isLocked", "safe1"),
+    })
+    plan = [
+        "(access robot1 key1 room1)",
+        "(pick-one-hand robot1 left_hand key1)",
+        "(move robot1 room1 door1)",
+        "(move robot1 door1 room2)",
+        "(access robot1 safe1 room2)",
+        "(unlock-safe robot1 safe1 key1)",
+        "(open robot1 safe1)",
+    ]
+    result = simulator.simulate(init, plan, goal="(and (isOpen safe1))")
+    print(f"Plan valid: {result['valid']}, goal reached: {result['goal_reached']}, cost: {result['cost']}")
+
+    result = simulator.simulate(init, plan[2:], goal="(and (isOpen safe1))")
+    print(f"Without picking the key: valid={result['valid']} at step {result['failed_index']}: {result['reason']}")
@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 """PDDL Writer - Generate PDDL problem file from collected data."""
 
+import hashlib
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterable, Iterator, List, Any
+
+try:
+    from .pddl_goal_ast import GoalParseError, parse_goal, format_goal
+except ImportError:  # run as a script (python pddl/scripts/pddl_writer.py)
+    from pddl_goal_ast import GoalParseError, parse_goal, format_goal
 
 
 class PDDLWriter:
-    """Generate PDDL problem file from data."""
+    """Generate PDDL problem file from data.
+
+    Output is canonical: facts are deduplicated and sorted within each
+    section, so identical worlds always produce identical problem bodies.
+    """
 
     def __init__(self, problem_name: str, domain_name: str = "robot"):
         """
@@ -18,6 +28,20 @@ class PDDLWriter:
         """
         self.problem_name = problem_name
         self.domain_name = domain_name
+        self.content_hash = None  # SHA-256 of the problem body (set by write_problem)
+
+    @staticmethod
+    def _section(title: str, facts: Iterable[str], notes: List[str] = None) -> List[str]:
+        """Build a commented init section with deduplicated, sorted facts."""
+        lines = [
+            "    ; ====================================================================",
+            f"    ; {title}",
+            "    ; ====================================================================",
+        ]
+        for note in notes or []:
+            lines.append(f"    ; {note}")
+        lines.extend(f"    {fact}" for fact in sorted(set(facts)))
+        return lines
 
     def generate_objects(self, types_map: Dict[str, str]) -> str:
         """
@@ -32,9 +56,7 @@ class PDDLWriter:
         # Group by type
         types_grouped = {}
         for obj_id, obj_type in types_map.items():
-            if obj_type not in types_grouped:
-                types_grouped[obj_type] = []
-            types_grouped[obj_type].append(obj_id)
+            types_grouped.setdefault(obj_type, set()).add(obj_id)
 
         # Generate PDDL
         lines = ["  (:objects"]
@@ -47,7 +69,8 @@ class PDDLWriter:
             lines.append("")
 
         # Remove last empty line and add closing
-        lines = lines[:-1]
+        if len(lines) > 1:
+            lines = lines[:-1]
         lines.append("  )")
 
         return "\n".join(lines)
@@ -63,30 +86,25 @@ class PDDLWriter:
         Returns:
             List of PDDL init statements
         """
-        lines = []
-
-        lines.append("    ; ====================================================================")
-        lines.append("    ; TOPOLOGY")
-        lines.append("    ; ====================================================================")
-
         connections = topology['connections']
         distances = topology['distances']
 
-        # Group connections by pairs
-        for from_id, to_id in sorted(connections):
-            lines.append(f"    (hasPathTo {from_id} {to_id})")
-            lines.append(f"    (hasPathTo {to_id} {from_id})")
+        # hasPathTo is emitted in both directions
+        path_facts = set()
+        for from_id, to_id in connections:
+            path_facts.add(f"(hasPathTo {from_id} {to_id})")
+            path_facts.add(f"(hasPathTo {to_id} {from_id})")
+
+        lines = self._section("TOPOLOGY", path_facts)
 
         if distances:
             lines.append("")
-            lines.append("    ; ====================================================================")
-            lines.append("    ; DISTANCES (Location->Location)")
-            lines.append("    ; ====================================================================")
-            lines.append("    ; Distance between locations via hasPathTo relationships")
-
             # Use all distances (Location->Location)
-            for (from_id, to_id), dist in sorted(distances.items()):
-                lines.append(f"    (= (distance {from_id} {to_id}) {dist})")
+            lines.extend(self._section(
+                "DISTANCES (Location->Location)",
+                (f"(= (distance {from_id} {to_id}) {dist})" for (from_id, to_id), dist in distances.items()),
+                notes=["Distance between locations via hasPathTo relationships"]
+            ))
 
         return lines
 
@@ -100,23 +118,16 @@ class PDDLWriter:
         Returns:
             List of PDDL init statements
         """
-        lines = []
-
-        lines.append("    ; ====================================================================")
-        lines.append("    ; ROBOT STRUCTURE")
-        lines.append("    ; ====================================================================")
-
         robot_id = robot_info['robot_id']
 
         # hasHand relationships
-        for hand_id in sorted(robot_info['hands']):
-            lines.append(f"    (hasHand {robot_id} {hand_id})")
+        facts = [f"(hasHand {robot_id} {hand_id})" for hand_id in robot_info['hands']]
 
         # Initial location
         if robot_info['location']:
-            lines.append(f"    (robotIsInSpace {robot_id} {robot_info['location']})")
+            facts.append(f"(robotIsInSpace {robot_id} {robot_info['location']})")
 
-        return lines
+        return self._section("ROBOT STRUCTURE", facts)
 
     def generate_init_artifact_locations(self, artifact_locs: Dict[str, Dict[str, str]]) -> List[str]:
         """
@@ -131,28 +142,21 @@ class PDDLWriter:
         Returns:
             List of PDDL init statements
         """
-        lines = []
-
-        lines.append("    ; ====================================================================")
-        lines.append("    ; ARTIFACT LOCATIONS")
-        lines.append("    ; ====================================================================")
-
-        for artifact_id in sorted(artifact_locs.keys()):
-            loc_info = artifact_locs[artifact_id]
-
+        facts = []
+        for artifact_id, loc_info in artifact_locs.items():
             # Map Neo4j isInSpace to PDDL artifactIsOnFloorOf
             if "isInSpace" in loc_info:
-                lines.append(f"    (artifactIsOnFloorOf {artifact_id} {loc_info['isInSpace']})")
-            
+                facts.append(f"(artifactIsOnFloorOf {artifact_id} {loc_info['isInSpace']})")
+
             # Container relationships
             if "isInsideOf" in loc_info:
-                lines.append(f"    (isInsideOf {artifact_id} {loc_info['isInsideOf']})")
-            
+                facts.append(f"(isInsideOf {artifact_id} {loc_info['isInsideOf']})")
+
             # Surface relationships
             if "isOntopOf" in loc_info:
-                lines.append(f"    (isOntopOf {artifact_id} {loc_info['isOntopOf']})")
+                facts.append(f"(isOntopOf {artifact_id} {loc_info['isOntopOf']})")
 
-        return lines
+        return self._section("ARTIFACT LOCATIONS", facts)
 
     def generate_init_affordances(self, affordances_map: Dict[str, List[str]]) -> List[str]:
         """
@@ -164,18 +168,12 @@ class PDDLWriter:
         Returns:
             List of PDDL init statements
         """
-        lines = []
-
-        lines.append("    ; ====================================================================")
-        lines.append("    ; AFFORDANCES")
-        lines.append("    ; ====================================================================")
-
-        for artifact_id in sorted(affordances_map.keys()):
-            affordances = sorted(affordances_map[artifact_id])
-            for affordance_id in affordances:
-                lines.append(f"    ({affordance_id} {artifact_id})")
-
-        return lines
+        facts = [
+            f"({affordance_id} {artifact_id})"
+            for artifact_id, affordances in affordances_map.items()
+            for affordance_id in affordances
+        ]
+        return self._section("AFFORDANCES", facts)
 
     def generate_init_door_states(self, door_states: Dict[str, bool]) -> List[str]:
         """
@@ -187,21 +185,11 @@ class PDDLWriter:
         Returns:
             List of PDDL init statements
         """
-        lines = []
-
         if not door_states:
-            return lines
-
-        lines.append("    ; ====================================================================")
-        lines.append("    ; DOOR STATES")
-        lines.append("    ; ====================================================================")
-
-        for door_id in sorted(door_states.keys()):
-            is_open = door_states[door_id]
-            if is_open:
-                lines.append(f"    (isOpenDoor {door_id})")
+            return []
 
-        return lines
+        facts = [f"(isOpenDoor {door_id})" for door_id, is_open in door_states.items() if is_open]
+        return self._section("DOOR STATES", facts)
 
     def generate_init_key_safe_relationships(self, key_safe_rels: Dict[str, Dict[str, List[str]]]) -> List[str]:
         """
@@ -217,46 +205,57 @@ class PDDLWriter:
         Returns:
             List of PDDL init statements
         """
-        lines = []
-
         unlocks_map = key_safe_rels.get('unlocks', {})
         requires_key_map = key_safe_rels.get('requiresKey', {})
 
         if not unlocks_map and not requires_key_map:
-            return lines
-
-        lines.append("    ; ====================================================================")
-        lines.append("    ; KEY-SAFE RELATIONSHIPS")
-        lines.append("    ; ====================================================================")
+            return []
 
         # unlocks relationships (key unlocks safe) - bidirectional relationship
-        for key_id in sorted(unlocks_map.keys()):
-            for safe_id in sorted(unlocks_map[key_id]):
-                lines.append(f"    (unlocks {key_id} {safe_id})")
+        lines = self._section("KEY-SAFE RELATIONSHIPS", (
+            f"(unlocks {key_id} {safe_id})"
+            for key_id, safe_ids in unlocks_map.items()
+            for safe_id in safe_ids
+        ))
 
-        lines.append("")
-        lines.append("    ; ====================================================================")
-        lines.append("    ; SAFE KEY ATTRIBUTES (hasRequiredKey)")
-        lines.append("    ; ====================================================================")
-        lines.append("    ; Each safe has its required key as an attribute")
-        
         # hasRequiredKey: each safe has its required key as an attribute
-        for safe_id in sorted(requires_key_map.keys()):
-            for key_id in sorted(requires_key_map[safe_id]):
-                lines.append(f"    (hasRequiredKey {safe_id} {key_id})")
-
         lines.append("")
-        lines.append("    ; ====================================================================")
-        lines.append("    ; LOCKED STATES")
-        lines.append("    ; ====================================================================")
-        lines.append("    ; Safes with hasRequiredKey attribute are locked by default")
-        
+        lines.extend(self._section("SAFE KEY ATTRIBUTES (hasRequiredKey)", (
+            f"(hasRequiredKey {safe_id} {key_id})"
+            for safe_id, key_ids in requires_key_map.items()
+            for key_id in key_ids
+        ), notes=["Each safe has its required key as an attribute"]))
+
         # All safes that require a key are locked by default
-        for safe_id in sorted(requires_key_map.keys()):
-            lines.append(f"    (isLocked {safe_id})")
+        lines.append("")
+        lines.extend(self._section(
+            "LOCKED STATES",
+            (f"(isLocked {safe_id})" for safe_id in requires_key_map),
+            notes=["Safes with hasRequiredKey attribute are locked by default"]
+        ))
 
         return lines
 
+    def iter_init_sections(
+        self,
+        topology: Dict[str, Any],
+        robot_info: Dict[str, Any],
+        artifact_locs: Dict[str, Dict[str, str]],
+        affordances_map: Dict[str, List[str]],
+        door_states: Dict[str, bool] = None,
+        key_safe_rels: Dict[str, Dict[str, List[str]]] = None,
+        types_map: Dict[str, str] = None
+    ) -> Iterator[List[str]]:
+        """Yield init subsections one at a time (in a fixed order)."""
+        yield self.generate_init_topology(topology, types_map)
+        yield self.generate_init_robot(robot_info)
+        yield self.generate_init_artifact_locations(artifact_locs)
+        yield self.generate_init_affordances(affordances_map)
+        if door_states:
+            yield self.generate_init_door_states(door_states)
+        if key_safe_rels:
+            yield self.generate_init_key_safe_relationships(key_safe_rels)
+
     def generate_init(
         self,
         topology: Dict[str, Any],
@@ -282,33 +281,18 @@ class PDDLWriter:
         Returns:
             PDDL init section string
         """
-        lines = ["  (:init"]
-        lines.append("    (= (total-cost) 0)")
-        lines.append("")
-
-        # Add all subsections
-        lines.extend(self.generate_init_topology(topology, types_map))
-        lines.append("")
-
-        lines.extend(self.generate_init_robot(robot_info))
-        lines.append("")
-
-        lines.extend(self.generate_init_artifact_locations(artifact_locs))
-        lines.append("")
-
-        lines.extend(self.generate_init_affordances(affordances_map))
-        
-        if door_states:
-            lines.append("")
-            lines.extend(self.generate_init_door_states(door_states))
-
-        if key_safe_rels:
-            lines.append("")
-            lines.extend(self.generate_init_key_safe_relationships(key_safe_rels))
-
-        lines.append("  )")
-
-        return "\n".join(lines)
+        return "".join(self._iter_init_chunks(
+            topology, robot_info, artifact_locs, affordances_map, door_states, key_safe_rels, types_map
+        )).rstrip("\n")
+
+    def _iter_init_chunks(self, *section_args) -> Iterator[str]:
+        """Yield the init section as text chunks, one subsection at a time."""
+        yield "  (:init\n"
+        yield "    (= (total-cost) 0)\n"
+        for section in self.iter_init_sections(*section_args):
+            if section:
+                yield "\n" + "\n".join(section) + "\n"
+        yield "  )\n"
 
     def generate_goal(self, goal_formula: str) -> str:
         """
@@ -320,9 +304,14 @@ class PDDLWriter:
         Returns:
             PDDL goal section string
         """
-        # Indent goal formula properly
-        goal_lines = goal_formula.strip().split('\n')
-        indented = ["    " + line.strip() for line in goal_lines]
+        # Canonical goal layout (one conjunct per line); raw text if unparsable
+        try:
+            goal_lines = format_goal(parse_goal(goal_formula, normalize=False)).split('\n')
+            indented = ["    " + line for line in goal_lines]
+        except GoalParseError:
+            # Indent goal formula properly
+            goal_lines = goal_formula.strip().split('\n')
+            indented = ["    " + line.strip() for line in goal_lines]
 
         return "  (:goal\n" + "\n".join(indented) + "\n  )"
 
@@ -337,9 +326,9 @@ class PDDLWriter:
         goal_formula: str,
         door_states: Dict[str, bool] = None,
         key_safe_rels: Dict[str, Dict[str, List[str]]] = None
-    ):
+    ) -> str:
         """
-        Write complete PDDL problem file.
+        Stream complete PDDL problem file to disk.
 
         Args:
             output_path: Path to output problem.pddl file
@@ -351,42 +340,48 @@ class PDDLWriter:
             goal_formula: Goal formula string
             door_states: Door states data (optional)
             key_safe_rels: Key-safe relationships data (optional)
+
+        Returns:
+            SHA-256 content hash of the problem body (objects, init, goal, metric).
+            The header and problem name are excluded so equal worlds hash equally.
         """
-        lines = []
+        hasher = hashlib.sha256()
 
-        # Header
-        lines.append(";; ====================================================================")
-        lines.append(f";; PDDL Problem: {self.problem_name}")
-        lines.append(";; Auto-generated from knowledge graph")
-        lines.append(";; ====================================================================")
-        lines.append("")
+        with open(output_path, 'w') as f:
+            # Header (not hashed: contains the timestamped problem name)
+            f.write(";; ====================================================================\n")
+            f.write(f";; PDDL Problem: {self.problem_name}\n")
+            f.write(";; Auto-generated from knowledge graph\n")
+            f.write(";; ====================================================================\n")
+            f.write("\n")
+            f.write(f"(define (problem {self.problem_name})\n")
 
-        # Problem definition
-        lines.append(f"(define (problem {self.problem_name})")
-        lines.append(f"  (:domain {self.domain_name})")
-        lines.append("")
+            def emit(chunk: str):
+                f.write(chunk)
+                hasher.update(chunk.encode("utf-8"))
 
-        # Objects
-        lines.append(self.generate_objects(objects))
-        lines.append("")
+            emit(f"  (:domain {self.domain_name})\n\n")
 
-        # Init (pass objects as types_map for filtering Space->Space distances)
-        lines.append(self.generate_init(topology, robot_info, artifact_locs, affordances_map, door_states, key_safe_rels, types_map=objects))
-        lines.append("")
+            # Objects
+            emit(self.generate_objects(objects) + "\n\n")
 
-        # Goal
-        lines.append(self.generate_goal(goal_formula))
-        lines.append("")
+            # Init, one subsection at a time (objects passed as types_map)
+            for chunk in self._iter_init_chunks(topology, robot_info, artifact_locs, affordances_map,
+                                                door_states, key_safe_rels, objects):
+                emit(chunk)
+            emit("\n")
+
+            # Goal
+            emit(self.generate_goal(goal_formula) + "\n\n")
 
-        # Metric
-        lines.append("  (:metric minimize (total-cost))")
-        lines.append(")")
+            # Metric
+            emit("  (:metric minimize (total-cost))\n")
+            emit(")")
 
-        # Write to file
-        output_file = Path(output_path)
-        output_file.write_text("\n".join(lines))
+        self.content_hash = hasher.hexdigest()
+        print(f"Generated PDDL problem: {output_path} (content hash {self.content_hash[:12]})")
 
-        print(f"Generated PDDL problem: {output_path}")
+        return self.content_hash
 
 
 if __name__ == "__main__":
@@ -428,7 +423,7 @@ if __name__ == "__main__":
     goal = "(and\n  (isOntopOf cup1 table1)\n)"
 
     # Write test problem
-    writer.write_problem(
+    content_hash = writer.write_problem(
         "test_problem.pddl",
         objects,
         topology,
@@ -440,3 +435,20 @@ if __name__ == "__main__":
 
     print("\nGenerated test problem:")
     print(Path("test_problem.pddl").read_text())
+
+    # Same world with shuffled/duplicated input must hash identically
+    shuffled_topology = {
+        "connections": [("door1", "room1"), ("room1", "door1")],
+        "distances": dict(reversed(list(topology["distances"].items())))
+    }
+    shuffled_affordances = {k: list(reversed(v)) * 2 for k, v in reversed(list(affordances.items()))}
+    other_hash = PDDLWriter("another-name", "robot").write_problem(
+        "test_problem.pddl",
+        dict(reversed(list(objects.items()))),
+        shuffled_topology,
+        robot_info,
+        artifact_locs,
+        shuffled_affordances,
+        goal
+    )
+    print(f"\nContent hash stable across input order: {content_hash == other_hash}")
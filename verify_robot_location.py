@@ -1,65 +1,24 @@
 #!/usr/bin/env python3
 """
-Verify that only robot location changes between dynamic TTL files.
-Compares all dynamic_N.ttl files and checks against solution.plan.
+Verify that only robot location changes between world versions.
+Reads the world store's delta log (action/world/deltas.jsonl) and checks against solution.plan.
 """
 
 import re
+import sys
 from pathlib import Path
 from typing import Dict, Set, Tuple, List
 
-def extract_robot_location(ttl_path: Path) -> str:
-    """Extract robot1's location from TTL file."""
-    with open(ttl_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Find robot1 block
-    match = re.search(r':robot1\s+rdf:type\s+:Robot\s*;(.*?)(?=\n\n|\n:[a-z_]|\Z)', content, re.DOTALL)
-    if not match:
-        return None
-    
-    robot_block = match.group(1)
-    
-    # Extract robotIsInSpace value
-    location_match = re.search(r':robotIsInSpace\s+:(\w+)', robot_block)
-    if location_match:
-        return location_match.group(1)
-    
-    return None
+sys.path.insert(0, str(Path(__file__).parent / "ontology_server"))
 
-def extract_all_triples(ttl_path: Path) -> Set[Tuple[str, str, str]]:
-    """Extract all triples from TTL file for comparison."""
-    triples = set()
-    
-    with open(ttl_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Extract all subject-predicate-object triples
-    # Pattern: :subject rdf:type :Type ; or :subject :predicate :object ;
-    pattern = r':(\w+)\s+(?:rdf:type\s+)?:(\w+)\s+:(?:(\w+)|"([^"]+)"|(\d+\.?\d*))'
-    
-    for match in re.finditer(pattern, content):
-        subject = match.group(1)
-        predicate = match.group(2)
-        obj = match.group(3) or match.group(4) or match.group(5)
-        if obj:
-            triples.add((subject, predicate, obj))
-    
-    return triples
+from core.world_store import WorldStore
+from core.world_model import WorldModel, local_name, uri
 
-def compare_files(file1: Path, file2: Path) -> Dict:
-    """Compare two TTL files and return differences."""
-    triples1 = extract_all_triples(file1)
-    triples2 = extract_all_triples(file2)
-    
-    added = triples2 - triples1
-    removed = triples1 - triples2
-    
-    return {
-        'added': added,
-        'removed': removed,
-        'same': triples1 & triples2
-    }
+def extract_robot_location(ttl_path: Path) -> str:
+    """Extract robot1's location from TTL file."""
+    model = WorldModel.load(ttl_path)
+    location = model.value(uri("robot1"), uri("robotIsInSpace"))
+    return local_name(location) if location else None
 
 def main():
     project_root = Path(__file__).parent
@@ -84,84 +43,70 @@ def main():
     print("=" * 80)
     print(f"\nExpected locations from solution.plan:")
     for i, loc in enumerate(expected_locations):
-        print(f"  dynamic_{i}.ttl: {loc}")
+        print(f"  version {i}: {loc}")
     
     print(f"\n{'='*80}")
-    print("Checking actual locations in TTL files...")
+    print("Checking actual locations in world store...")
     print(f"{'='*80}\n")
     
-    # Check each file
-    actual_locations = []
-    all_match = True
+    # Replay robot location through the delta log
+    store = WorldStore(world_dir)
+    actual_locations = [extract_robot_location(store.base_dynamic_path)]
+    other_changes: Dict[int, Tuple[Set, Set]] = {}
+    
+    for entry in store.iter_deltas():
+        location = actual_locations[-1]
+        other_added, other_removed = set(), set()
+        for triple in entry["added"]:
+            s_, p_, o_ = (local_name(t) for t in triple)
+            if s_ == 'robot1' and p_ == 'robotIsInSpace':
+                location = o_
+            else:
+                other_added.add((s_, p_, o_))
+        for triple in entry["removed"]:
+            s_, p_, o_ = (local_name(t) for t in triple)
+            if not (s_ == 'robot1' and p_ == 'robotIsInSpace'):
+                other_removed.add((s_, p_, o_))
+        actual_locations.append(location)
+        if other_added or other_removed:
+            other_changes[entry["version"]] = (other_added, other_removed)
     
-    for i in range(len(expected_locations)):
-        ttl_file = world_dir / f"dynamic_{i}.ttl"
-        if not ttl_file.exists():
-            print(f"❌ dynamic_{i}.ttl not found!")
+    all_match = True
+    for i, expected in enumerate(expected_locations):
+        if i >= len(actual_locations):
+            print(f"❌ version {i}: not in world store!")
             all_match = False
             continue
-        
-        location = extract_robot_location(ttl_file)
-        actual_locations.append(location)
-        expected = expected_locations[i]
-        
+        location = actual_locations[i]
         if location == expected:
-            print(f"✅ dynamic_{i}.ttl: {location} (expected: {expected})")
+            print(f"✅ version {i}: {location} (expected: {expected})")
         else:
-            print(f"❌ dynamic_{i}.ttl: {location} (expected: {expected})")
+            print(f"❌ version {i}: {location} (expected: {expected})")
             all_match = False
     
     print(f"\n{'='*80}")
-    print("Checking for other changes between files...")
+    print("Checking for other changes between versions...")
     print(f"{'='*80}\n")
     
-    # Compare consecutive files to check for other changes
-    other_changes_found = False
-    
-    for i in range(len(expected_locations) - 1):
-        file1 = world_dir / f"dynamic_{i}.ttl"
-        file2 = world_dir / f"dynamic_{i+1}.ttl"
-        
-        if not file1.exists() or not file2.exists():
+    other_changes_found = bool(other_changes)
+    for version in range(1, len(actual_locations)):
+        if version not in other_changes:
+            print(f"✅ version {version - 1} → {version}: Only robot location changed")
             continue
-        
-        diff = compare_files(file1, file2)
-        
-        # Filter out robot location changes
-        robot_location_added = set()
-        robot_location_removed = set()
-        other_added = set()
-        other_removed = set()
-        
-        for triple in diff['added']:
-            if triple[0] == 'robot1' and triple[1] == 'robotIsInSpace':
-                robot_location_added.add(triple)
-            else:
-                other_added.add(triple)
-        
-        for triple in diff['removed']:
-            if triple[0] == 'robot1' and triple[1] == 'robotIsInSpace':
-                robot_location_removed.add(triple)
-            else:
-                other_removed.add(triple)
-        
-        if other_added or other_removed:
-            print(f"⚠️  dynamic_{i}.ttl → dynamic_{i+1}.ttl: Other changes detected!")
-            if other_added:
-                print(f"   Added (non-robot): {len(other_added)} triples")
-                for triple in list(other_added)[:5]:  # Show first 5
-                    print(f"     + {triple}")
-                if len(other_added) > 5:
-                    print(f"     ... and {len(other_added) - 5} more")
-            if other_removed:
-                print(f"   Removed (non-robot): {len(other_removed)} triples")
-                for triple in list(other_removed)[:5]:  # Show first 5
-                    print(f"     - {triple}")
-                if len(other_removed) > 5:
-                    print(f"     ... and {len(other_removed) - 5} more")
-            other_changes_found = True
-        else:
-            print(f"✅ dynamic_{i}.ttl → dynamic_{i+1}.ttl: Only robot location changed")
+        other_added, other_removed = other_changes[version]
+        print(f"⚠️  version {version - 1} → {version}: Other changes detected!")
+        if other_added:
+            print(f"   Added (non-robot): {len(other_added)} triples")
+            for triple in sorted(other_added)[:5]:  # Show first 5
+                print(f"     + {triple}")
+            if len(other_added) > 5:
+                print(f"     ... and {len(other_added) - 5} more")
+        if other_removed:
+            print(f"   Removed (non-robot): {len(other_removed)} triples")
+            for triple in sorted(other_removed)[:5]:  # Show first 5
+                print(f"     - {triple}")
+            if len(other_removed) > 5:
+                print(f"     ... and {len(other_removed) - 5} more")
     
     print(f"\n{'='*80}")
     print("Summary")